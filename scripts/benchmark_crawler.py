@@ -0,0 +1,144 @@
+"""
+Benchmark SmartCrawler throughput and fetch latency against the mock town site
+
+Starts tests/mock_api on a local port and crawls /site/page/0, comparing the
+level-by-level asyncio.gather crawl the crawler used to do with the
+frontier worker pool at several concurrency and parse-worker settings
+(0 parse workers parses on the event loop). Bigger pages (--parcels)
+make parsing dominate; "blocked" is the time the event loop was stalled.
+
+Usage:
+    python scripts/benchmark_crawler.py --pages 500 --concurrency 4 16 64 --parse-workers 0 4
+    python scripts/benchmark_crawler.py --pages 200 --parcels 2000 --concurrency 16 --parse-workers 0 2
+
+Finally the site is crawled twice through a fresh HTTP cache to show what
+a recollection of unchanged pages transfers.
+"""
+import sys
+import asyncio
+import argparse
+import logging
+import tempfile
+import threading
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import aiohttp
+from werkzeug.serving import make_server
+
+from src.collectors.smart_crawler import SmartCrawler
+from src.collectors.crawl_frontier import CrawlStats
+from src.utils.http_cache import HTTPCache
+from tests.mock_api.api_server import app, SITE_CONFIG
+
+
+class LevelCrawler(SmartCrawler):
+    """The previous crawl: every URL at a depth at once, one default session"""
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession()
+        return self
+
+    async def crawl(self, start_url):
+        self.stats = CrawlStats()
+        watch = asyncio.create_task(self.stats.watch_loop())
+        visited_urls, pending_urls, pages_data = set(), {start_url}, {}
+        base_domain = start_url.split('/site/')[0]
+        depth = 0
+        while pending_urls and depth < self.max_depth:
+            current_urls = pending_urls.copy()
+            pending_urls.clear()
+            results = await asyncio.gather(*[
+                self._process_url(url, base_domain) for url in current_urls if url not in visited_urls
+            ])
+            for url, page_data in results:
+                if page_data:
+                    pages_data[url] = page_data
+                    visited_urls.add(url)
+                    pending_urls.update(u for u in page_data.related_pages if u not in visited_urls)
+            depth += 1
+            if len(pages_data) >= self.max_pages:
+                break
+        watch.cancel()
+        self.stats.pages = len(pages_data)
+        self.stats.finish()
+        return pages_data
+
+
+def start_server():
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(crawler_class, config, start_url):
+    async with crawler_class(config) as crawler:
+        await crawler.crawl(start_url)
+    return crawler.stats.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=500, help='pages on the mock site')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[4, 16, 64])
+    parser.add_argument('--parse-workers', type=int, nargs='+', default=[0, 2])
+    parser.add_argument('--parcels', type=int, default=20, help='parcel rows per page')
+    parser.add_argument('--per-host-rate', type=float, default=0,
+                        help='requests/s per host (0 = unlimited)')
+    parser.add_argument('--slow-fraction', type=float, default=0.02)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    SITE_CONFIG['pages'] = args.pages
+    SITE_CONFIG['slow_fraction'] = args.slow_fraction
+    SITE_CONFIG['parcels'] = args.parcels
+    server = start_server()
+    start_url = f"http://127.0.0.1:{server.server_port}/site/page/0"
+    base = {
+        'max_depth': 10,
+        'max_pages': args.pages,
+        'cache_dir': tempfile.mkdtemp(prefix='crawler_'),
+        'per_host_rate': args.per_host_rate,
+        'per_host_burst': max(args.per_host_rate, 1),
+        'use_http_cache': False
+    }
+
+    runs = [('levels (gather)', LevelCrawler,
+             {**base, 'per_host_concurrency': 10 ** 6, 'per_host_rate': 0, 'parse_workers': 0})]
+    for concurrency in args.concurrency:
+        for workers in args.parse_workers:
+            runs.append((f"frontier x{concurrency}/{workers}p", SmartCrawler,
+                         {**base, 'concurrency': concurrency, 'per_host_concurrency': concurrency,
+                          'parse_workers': workers}))
+
+    print(f"{'crawl':>18} {'pages':>6} {'seconds':>8} {'pages/s':>8} {'p50 ms':>7} "
+          f"{'p95 ms':>7} {'p99 ms':>7} {'peak':>5} {'blocked s':>10} {'max lag ms':>11}")
+    for name, crawler_class, config in runs:
+        summary = asyncio.run(run(crawler_class, config, start_url))
+        print(f"{name:>18} {summary['pages']:>6} {summary['seconds']:8.2f} "
+              f"{summary['pages_per_second']:8.1f} {summary['latency_p50'] * 1000:7.0f} "
+              f"{summary['latency_p95'] * 1000:7.0f} {summary['latency_p99'] * 1000:7.0f} "
+              f"{summary['peak_in_flight']:>5} {summary['loop_blocked_seconds']:10.2f} "
+              f"{summary['loop_lag_max'] * 1000:11.0f}")
+
+    # Nightly recollection: recrawl through the HTTP cache, mock pages revalidate by ETag
+    config = {**base, 'concurrency': args.concurrency[-1], 'per_host_concurrency': args.concurrency[-1],
+              'use_http_cache': True, 'http_cache_dir': tempfile.mkdtemp(prefix='http_cache_')}
+    print(f"\n{'http cache':>18} {'seconds':>8} {'requests':>9} {'304s':>6} {'MB down':>8} {'MB saved':>9}")
+    cache = HTTPCache.shared(config['http_cache_dir'])
+    for name in ('first crawl', 'recrawl'):
+        before = cache.stats()
+        summary = asyncio.run(run(SmartCrawler, config, start_url))
+        after = cache.stats()
+        delta = {key: after[key] - before[key] for key in ('revalidated', 'bytes_downloaded', 'bytes_saved')}
+        print(f"{name:>18} {summary['seconds']:8.2f} {summary['requests']:>9} {delta['revalidated']:>6} "
+              f"{delta['bytes_downloaded'] / 2 ** 20:8.1f} {delta['bytes_saved'] / 2 ** 20:9.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Benchmark DataMerger on synthetic county-roll sized inputs
+
+Usage:
+    python scripts/benchmark_merger.py property --sizes 10000 100000 1000000
+    python scripts/benchmark_merger.py owner --sizes 1000 5000 20000
+    python scripts/benchmark_merger.py chains --count 2000000 --run-size 100000
+"""
+import sys
+import time
+import random
+import resource
+import argparse
+import multiprocessing
+from pathlib import Path
+from datetime import date, timedelta
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.processors.merger import DataMerger
+
+
+def generate_property_tables(num_properties: int, seed: int = 42) -> dict:
+    """Generate assessment rows plus child tables keyed by property_id"""
+    rng = random.Random(seed)
+    start = date(1990, 1, 1)
+
+    def pid():
+        return f"P{rng.randrange(num_properties):07d}"
+
+    def day():
+        return (start + timedelta(days=rng.randrange(12000))).isoformat()
+
+    assessment = [
+        {
+            'property_id': f"P{i:07d}",
+            'parcel_id': f"{i // 100:03d}-{i % 100:03d}",
+            'address': f"{i} Maine Street",
+            'city': 'Brunswick',
+            'state': 'ME',
+            'land_value': rng.randrange(50000, 200000),
+            'building_value': rng.randrange(100000, 600000),
+            'total_value': rng.randrange(150000, 800000)
+        }
+        for i in range(num_properties)
+    ]
+    transactions = [
+        {'property_id': pid(), 'date': day(), 'price': rng.randrange(100000, 900000),
+         'buyer': f"Owner {rng.randrange(num_properties)}"}
+        for _ in range(num_properties)
+    ]
+    permits = [
+        {'property_id': pid(), 'issue_date': day(),
+         'status': rng.choice(['in_progress', 'closed']),
+         'estimated_cost': rng.randrange(1000, 100000),
+         'permit_type': rng.choice(['BUILDING', 'ELECTRICAL', 'PLUMBING'])}
+        for _ in range(num_properties // 3)
+    ]
+    violations = [
+        {'property_id': pid(), 'reported_date': day(),
+         'status': rng.choice(['open', 'closed']), 'fines': rng.randrange(0, 500),
+         'violation_type': 'CODE', 'severity': rng.choice(['low', 'high'])}
+        for _ in range(num_properties // 10)
+    ]
+    utilities = [
+        {'property_id': pid(), 'reading_date': day(),
+         'utility_type': rng.choice(['water', 'electric']), 'usage': rng.random() * 100}
+        for _ in range(num_properties // 2)
+    ]
+    return {
+        'assessment_data': assessment,
+        'transaction_data': transactions,
+        'permit_data': permits,
+        'violation_data': violations,
+        'utility_data': utilities
+    }
+
+
+def generate_owner_lists(num_owners: int, seed: int = 42) -> tuple:
+    """Generate two owner lists with overlapping, noisily formatted names"""
+    rng = random.Random(seed)
+    surnames = [f"{rng.choice('BCDFGHKLMNPRSTW')}{rng.choice('aeiou')}"
+                f"{rng.choice('lmnrst')}{rng.choice(['son', 'ey', 'er', 'ton', 'ing'])}"
+                for _ in range(max(num_owners // 4, 50))]
+    given = ['John', 'Mary', 'Robert', 'Linda', 'James', 'Susan', 'David', 'Karen']
+
+    def owner_name(surname, first):
+        style = rng.random()
+        if style < 0.4:
+            return f"{surname.upper()} {first.upper()}"
+        if style < 0.7:
+            return f"{first} {surname}"
+        return f"{surname.upper()}, {first.upper()} {rng.choice('ABCDE')}"
+
+    people = [(rng.choice(surnames), rng.choice(given)) for _ in range(num_owners)]
+    primary = [{'name': owner_name(*person), 'phone': f"207555{i:04d}"}
+               for i, person in enumerate(people)]
+    secondary = [{'name': owner_name(*person), 'email': f"owner{i}@example.com"}
+                 for i, person in enumerate(rng.sample(people, len(people)))]
+    return primary, secondary
+
+
+def benchmark_owner_merge(sizes, dense_limit):
+    """Time dense vs blocked merge_owner_data for each list size"""
+    merger = DataMerger()
+    print(f"{'owners':>10} {'dense (s)':>12} {'blocked (s)':>12} {'speedup':>10}")
+    for size in sizes:
+        primary, secondary = generate_owner_lists(size)
+
+        start = time.perf_counter()
+        merger.merge_owner_data(primary, secondary, mode='blocked')
+        blocked = time.perf_counter() - start
+
+        dense = None
+        if size <= dense_limit:
+            start = time.perf_counter()
+            merger.merge_owner_data(primary, secondary, mode='dense')
+            dense = time.perf_counter() - start
+
+        dense_text = f"{dense:12.2f}" if dense is not None else f"{'skipped':>12}"
+        speedup = f"{dense / blocked:9.1f}x" if dense is not None else f"{'-':>10}"
+        print(f"{size:>10} {dense_text} {blocked:12.2f} {speedup}")
+
+
+def generate_transactions(count: int, num_properties: int, seed: int = 42):
+    """Lazily generate registry-of-deeds style transactions"""
+    rng = random.Random(seed)
+    start = date(1960, 1, 1)
+    for i in range(count):
+        yield {
+            'property_id': f"P{rng.randrange(num_properties):07d}",
+            'date': (start + timedelta(days=rng.randrange(23000))).isoformat(),
+            'price': rng.randrange(20000, 900000),
+            'buyer': f"Buyer {i}",
+            'seller': f"Seller {i}",
+            'book_page': f"{rng.randrange(1, 9000)}/{rng.randrange(1, 400)}"
+        }
+
+
+def _run_chain_mode(mode, count, num_properties, run_size, results):
+    """Build all chains in one mode and report elapsed time and peak RSS"""
+    merger = DataMerger({'chain_run_size': run_size})
+    start = time.perf_counter()
+    chains = 0
+    if mode == 'memory':
+        chains = len(merger.merge_transaction_chains(
+            list(generate_transactions(count, num_properties))
+        ))
+    else:
+        for _ in merger.iter_transaction_chains(generate_transactions(count, num_properties)):
+            chains += 1
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((mode, chains, elapsed, peak_mb))
+
+
+def benchmark_transaction_chains(count, num_properties, run_size, memory_limit):
+    """Compare peak RSS of in-memory vs streaming transaction chains"""
+    # Each mode runs in a fresh process so peak RSS is not shared
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    modes = ['streaming'] + (['memory'] if count <= memory_limit else [])
+
+    print(f"{'mode':>10} {'chains':>10} {'time (s)':>10} {'peak RSS (MB)':>14}")
+    for mode in modes:
+        process = context.Process(
+            target=_run_chain_mode,
+            args=(mode, count, num_properties, run_size, results)
+        )
+        process.start()
+        mode, chains, elapsed, peak_mb = results.get()
+        process.join()
+        print(f"{mode:>10} {chains:>10} {elapsed:10.2f} {peak_mb:14.1f}")
+
+
+def benchmark_property_merge(sizes, scan_limit):
+    """Time scan vs indexed merge_property_data for each roll size"""
+    merger = DataMerger()
+    print(f"{'rows':>10} {'scan (s)':>12} {'indexed (s)':>12} {'speedup':>10}")
+    for size in sizes:
+        tables = generate_property_tables(size)
+
+        start = time.perf_counter()
+        merger.merge_property_data(**tables, mode='indexed')
+        indexed = time.perf_counter() - start
+
+        scan = None
+        if size <= scan_limit:
+            start = time.perf_counter()
+            merger.merge_property_data(**tables, mode='scan')
+            scan = time.perf_counter() - start
+
+        scan_text = f"{scan:12.2f}" if scan is not None else f"{'skipped':>12}"
+        speedup = f"{scan / indexed:9.1f}x" if scan is not None else f"{'-':>10}"
+        print(f"{size:>10} {scan_text} {indexed:12.2f} {speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    prop = subparsers.add_parser('property', help='merge_property_data scan vs indexed')
+    prop.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    prop.add_argument('--scan-limit', type=int, default=10000,
+                      help='largest roll to run the quadratic scan mode on')
+
+    owner = subparsers.add_parser('owner', help='merge_owner_data dense vs blocked')
+    owner.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000])
+    owner.add_argument('--dense-limit', type=int, default=1000,
+                       help='largest list to run the all-pairs dense mode on')
+
+    chains = subparsers.add_parser('chains', help='merge_transaction_chains memory vs streaming')
+    chains.add_argument('--count', type=int, default=2000000)
+    chains.add_argument('--properties', type=int, default=200000)
+    chains.add_argument('--run-size', type=int, default=100000)
+    chains.add_argument('--memory-limit', type=int, default=5000000,
+                        help='largest export to run the in-memory mode on')
+
+    args = parser.parse_args()
+    if args.benchmark == 'property':
+        benchmark_property_merge(args.sizes, args.scan_limit)
+    elif args.benchmark == 'owner':
+        benchmark_owner_merge(args.sizes, args.dense_limit)
+    elif args.benchmark == 'chains':
+        benchmark_transaction_chains(
+            args.count, args.properties, args.run_size, args.memory_limit
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark PredictiveAnalyzer value inference throughput
+
+Usage:
+    python scripts/benchmark_predictions.py --sizes 10000 1000000 --per-property-limit 10000
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import pandas as pd
+
+from src.processors.predictive_analyzer import PredictiveAnalyzer
+
+
+def generate_properties(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    properties = []
+    for i in range(count):
+        square_feet = rng.randrange(600, 4000)
+        year_built = rng.randrange(1850, 2024)
+        properties.append({
+            'property_id': f"P{i:07d}",
+            'square_feet': square_feet,
+            'bedrooms': rng.randrange(1, 6),
+            'bathrooms': rng.randrange(1, 4),
+            'year_built': year_built,
+            'lot_size': rng.randrange(2000, 80000),
+            'latitude': rng.gauss(43.91, 0.03),
+            'longitude': rng.gauss(-69.96, 0.04),
+            'assessment': {'total_value': square_feet * 160 + (year_built - 1850) * 700
+                                          + rng.gauss(0, 20000)}
+        })
+    return properties
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 1000000])
+    parser.add_argument('--train', type=int, default=20000, help='training set size')
+    parser.add_argument('--per-property-limit', type=int, default=10000,
+                        help='largest size to run the per-property path on')
+    args = parser.parse_args()
+
+    analyzer = PredictiveAnalyzer()
+    analyzer._train_value_model(pd.DataFrame(generate_properties(args.train, seed=1)))
+
+    print(f"{'rows':>9} {'path':>13} {'seconds':>9} {'props/s':>10}")
+    for size in args.sizes:
+        properties = generate_properties(size)
+        runs = [('batch', True)]
+        if size <= args.per_property_limit:
+            runs.append(('per-property', False))
+        for name, batch in runs:
+            start = time.perf_counter()
+            predictions = analyzer.predict_property_values(properties, batch=batch)
+            elapsed = time.perf_counter() - start
+            print(f"{size:>9} {name:>13} {elapsed:9.2f} {len(predictions) / elapsed:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
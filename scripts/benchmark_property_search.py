@@ -0,0 +1,206 @@
+"""
+Benchmark PropertyFinder latency on a synthetic parcel table
+
+Usage:
+    python scripts/benchmark_property_search.py text --parcels 1000000 --queries 200
+    python scripts/benchmark_property_search.py map --parcels 1000000 --pans 200
+"""
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.models.property_models import Property, Owner
+from src.interface.search_index import PropertySearchIndex
+from src.interface.spatial_index import PropertySpatialIndex
+
+STREETS = ['Maine St', 'Federal St', 'Bath Rd', 'Pleasant St', 'Mill St', 'Harpswell Rd',
+           'Union St', 'Jordan Ave', 'Baribeau Dr', 'Old Portland Rd', 'Meadowbrook Rd']
+SURNAMES = ['SMITH', 'JOHNSON', 'BROWN', 'TARDIFF', 'LEBLANC', 'CURTIS', 'DUNNING',
+            'MORIN', 'GAGNON', 'PELLETIER', 'THIBODEAU', 'OUELLETTE']
+GIVEN = ['JOHN', 'MARY', 'ROBERT', 'LINDA', 'JAMES', 'SUSAN', 'DAVID', 'KAREN']
+# Downtown Brunswick; parcels are concentrated around it
+DOWNTOWN = (43.9145, -69.9653)
+
+
+def populate(engine, parcels: int, seed: int = 42):
+    """Bulk load owners and properties with raw executemany"""
+    rng = random.Random(seed)
+    Owner.__table__.create(engine)
+    Property.__table__.create(engine)
+    owners = max(parcels // 3, 1)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO owners (id, name, business_name) VALUES (?, ?, ?)",
+            [
+                (i, f"{rng.choice(SURNAMES)} {rng.choice(GIVEN)} {i}",
+                 f"{rng.choice(SURNAMES).title()} Holdings {i} LLC" if rng.random() < 0.2 else None)
+                for i in range(1, owners + 1)
+            ]
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO properties (id, parcel_id, address, owner_id, latitude, longitude) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (i, f"U{i:07d}", f"{rng.randrange(1, 999)} {rng.choice(STREETS)}",
+                 rng.randrange(1, owners + 1),
+                 rng.gauss(DOWNTOWN[0], 0.03), rng.gauss(DOWNTOWN[1], 0.04))
+                for i in range(1, parcels + 1)
+            ]
+        )
+
+
+def sample_queries(count: int, seed: int = 7):
+    """Search-box style input: street fragments, house + street, owner names"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append(rng.choice(STREETS).split()[0][:rng.randrange(4, 8)])
+        elif kind < 0.7:
+            queries.append(f"{rng.randrange(1, 999)} {rng.choice(STREETS)}")
+        else:
+            queries.append(f"{rng.choice(SURNAMES)} {rng.randrange(1, 5000)}")
+    return queries
+
+
+def sample_viewports(count: int, seed: int = 11):
+    """Map pans around downtown at zooms from town-wide to street level"""
+    rng = random.Random(seed)
+    viewports = []
+    for _ in range(count):
+        zoom = rng.randrange(12, 19)
+        # 1280 x 800 px map: width/height in degrees at this zoom
+        width = 360.0 / 2 ** zoom * 5
+        height = width * 0.6
+        lat = rng.gauss(DOWNTOWN[0], 0.01)
+        lng = rng.gauss(DOWNTOWN[1], 0.01)
+        viewports.append(((lat - height / 2, lng - width / 2, lat + height / 2, lng + width / 2), zoom))
+    return viewports
+
+
+def scan_bounds(session, bounds):
+    """The unindexed latitude/longitude BETWEEN query"""
+    lat1, lng1, lat2, lng2 = bounds
+    return session.query(Property.id, Property.latitude, Property.longitude).filter(
+        Property.latitude.between(lat1, lat2),
+        Property.longitude.between(lng1, lng2)
+    ).all()
+
+
+def scan_search(session, text):
+    """The pre-index _smart_search queries"""
+    address = session.query(Property.id).filter(Property.address.ilike(f"%{text}%")).limit(5).all()
+    owner = session.query(Property.id).join(Owner).filter(Owner.name.ilike(f"%{text}%")).limit(5).all()
+    return address + owner
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def build_database(tmp_dir: str, parcels: int):
+    engine = create_engine(f"sqlite:///{Path(tmp_dir) / 'search.db'}")
+    start = time.perf_counter()
+    populate(engine, parcels)
+    print(f"loaded {parcels} parcels in {time.perf_counter() - start:.1f}s")
+    return sessionmaker(bind=engine)
+
+
+def report(timings):
+    print(f"{'method':>8} {'queries':>8} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for name, samples in timings.items():
+        print(f"{name:>8} {len(samples):>8} {percentile(samples, 50) * 1000:10.2f} "
+              f"{percentile(samples, 99) * 1000:10.2f}")
+
+
+def benchmark_text(parcels: int, queries: int, scan_queries: int):
+    """quick_find latency: ILIKE scan vs FTS5 index"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        Session = build_database(tmp_dir, parcels)
+        index = PropertySearchIndex()
+        with Session() as session:
+            start = time.perf_counter()
+            index.ensure(session)
+            session.commit()
+            print(f"built {index.tokenizer} index in {time.perf_counter() - start:.1f}s")
+
+        texts = sample_queries(queries)
+        timings = {'scan': [], 'fts5': []}
+        with Session() as session:
+            for text in texts[:scan_queries]:
+                start = time.perf_counter()
+                scan_search(session, text)
+                timings['scan'].append(time.perf_counter() - start)
+            for text in texts:
+                start = time.perf_counter()
+                index.search(session, text, limit=10)
+                timings['fts5'].append(time.perf_counter() - start)
+    report(timings)
+
+
+def benchmark_map(parcels: int, pans: int, scan_pans: int, limit: int):
+    """find_in_bounds latency: coordinate scan vs R*Tree with clustering"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        Session = build_database(tmp_dir, parcels)
+        index = PropertySpatialIndex()
+        with Session() as session:
+            start = time.perf_counter()
+            index.ensure(session)
+            session.commit()
+            print(f"built R*Tree in {time.perf_counter() - start:.1f}s")
+
+        viewports = sample_viewports(pans)
+        timings = {'scan': [], 'rtree': []}
+        clustered = 0
+        with Session() as session:
+            for bounds, _ in viewports[:scan_pans]:
+                start = time.perf_counter()
+                scan_bounds(session, bounds)
+                timings['scan'].append(time.perf_counter() - start)
+            for bounds, zoom in viewports:
+                start = time.perf_counter()
+                found = index.query(session, bounds, zoom=zoom, limit=limit)
+                timings['rtree'].append(time.perf_counter() - start)
+                clustered += bool(found['clusters'])
+    report(timings)
+    print(f"{clustered}/{pans} pans returned clusters")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    text = subparsers.add_parser('text', help='quick_find ILIKE scan vs FTS5')
+    text.add_argument('--parcels', type=int, default=1000000)
+    text.add_argument('--queries', type=int, default=200)
+    text.add_argument('--scan-queries', type=int, default=50,
+                      help='queries to run through the unindexed ILIKE path')
+
+    map_parser = subparsers.add_parser('map', help='find_in_bounds scan vs R*Tree')
+    map_parser.add_argument('--parcels', type=int, default=1000000)
+    map_parser.add_argument('--pans', type=int, default=200)
+    map_parser.add_argument('--scan-pans', type=int, default=50,
+                            help='pans to run through the unindexed BETWEEN path')
+    map_parser.add_argument('--limit', type=int, default=500)
+
+    args = parser.parse_args()
+    if args.benchmark == 'text':
+        benchmark_text(args.parcels, args.queries, args.scan_queries)
+    elif args.benchmark == 'map':
+        benchmark_map(args.parcels, args.pans, args.scan_pans, args.limit)
+
+
+if __name__ == "__main__":
+    main()
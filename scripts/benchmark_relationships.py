@@ -0,0 +1,189 @@
+"""
+Benchmark owner network analysis on synthetic registry-of-deeds data
+
+Usage:
+    python scripts/benchmark_relationships.py networks --transactions 500000 --batch 1000
+    python scripts/benchmark_relationships.py owners --sizes 2000 10000 50000
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import networkx as nx
+from rapidfuzz import fuzz
+
+from src.processors.relationship_analyzer import RelationshipAnalyzer
+from src.processors.network_analyzer import NetworkAnalyzer
+
+
+# Properties per neighborhood; owners trade within their neighborhood
+BLOCK_SIZE = 20
+
+
+def local_owner(rng, property_index: int, num_owners: int) -> str:
+    """Owners mostly trade near home; a few (investors) trade anywhere"""
+    if rng.random() < 0.001:
+        return f"Owner {rng.randrange(num_owners)}"
+    block = property_index // BLOCK_SIZE * BLOCK_SIZE * 3 // 2
+    return f"Owner {min(block + rng.randrange(BLOCK_SIZE * 3 // 2), num_owners - 1)}"
+
+
+def generate_properties(num_transactions: int, seed: int = 42):
+    """Properties with current owners and buyer/seller history"""
+    rng = random.Random(seed)
+    num_properties = max(num_transactions // 3, 1)
+    num_owners = max(num_transactions // 2, 2)
+
+    properties = [
+        {
+            'property_id': f"P{i:07d}",
+            'owner': {'name': local_owner(rng, i, num_owners)},
+            'property_type': rng.choice(['residential', 'commercial', 'land']),
+            'assessment': {'total_value': rng.randrange(50000, 900000)},
+            'transactions': []
+        }
+        for i in range(num_properties)
+    ]
+    for _ in range(num_transactions):
+        index = rng.randrange(num_properties)
+        properties[index]['transactions'].append({
+            'buyer': local_owner(rng, index, num_owners),
+            'seller': local_owner(rng, index, num_owners),
+            'price': rng.randrange(20000, 900000)
+        })
+    return properties
+
+
+def new_transactions(count: int, num_transactions: int, seed: int = 7):
+    rng = random.Random(seed)
+    num_properties = max(num_transactions // 3, 1)
+    num_owners = max(num_transactions // 2, 2)
+    updates = []
+    for _ in range(count):
+        index = rng.randrange(num_properties)
+        updates.append({
+            'property_id': f"P{index:07d}",
+            'buyer': local_owner(rng, index, num_owners),
+            'seller': local_owner(rng, index, num_owners),
+            'price': rng.randrange(20000, 900000)
+        })
+    return updates
+
+
+def benchmark_networks(num_transactions: int, batch: int):
+    """Full analyze_owner_networks vs update_owner_networks for a new batch"""
+    properties = generate_properties(num_transactions)
+    analyzer = RelationshipAnalyzer()
+
+    start = time.perf_counter()
+    networks = analyzer.analyze_owner_networks(properties)
+    full = time.perf_counter() - start
+    largest = max((len(n['owners']) for n in networks), default=0)
+
+    updates = new_transactions(batch, num_transactions)
+    start = time.perf_counter()
+    updated = analyzer.update_owner_networks(updates)
+    incremental = time.perf_counter() - start
+
+    print(f"{len(properties)} properties, {num_transactions} transactions")
+    print(f"full build:   {full:8.2f}s  {len(networks)} networks, largest {largest} owners")
+    print(f"+{batch} transactions: {incremental:8.2f}s  {len(updated)} networks")
+
+
+def generate_owner_properties(num_owners: int, seed: int = 42) -> dict:
+    """Owner name -> property ids, with noisy duplicate spellings of many owners"""
+    rng = random.Random(seed)
+    surnames = [f"{rng.choice('BCDFGHKLMNPRSTW')}{rng.choice('aeiou')}"
+                f"{rng.choice('lmnrst')}{rng.choice(['son', 'ey', 'er', 'ton', 'ing'])}".upper()
+                for _ in range(max(num_owners // 4, 50))]
+    given = ['JOHN', 'MARY', 'ROBERT', 'LINDA', 'JAMES', 'SUSAN', 'DAVID', 'KAREN']
+
+    owner_properties = {}
+    while len(owner_properties) < num_owners:
+        name = f"{rng.choice(surnames)} {rng.choice(given)}"
+        style = rng.random()
+        if style < 0.3:
+            name += f" {rng.choice('ABCDEFGH')}"
+        elif style < 0.4:
+            name = f"{name.title()} Trust"
+        owner_properties.setdefault(name, []).extend(
+            f"P{rng.randrange(num_owners):07d}" for _ in range(rng.randrange(1, 4))
+        )
+    return owner_properties
+
+
+def pairwise_connect(G, owner_properties, threshold):
+    """Reference all-pairs loop, scoring each pair like fuzzywuzzy's fuzz.ratio"""
+    owners = list(owner_properties)
+    for i in range(len(owners)):
+        for j in range(i + 1, len(owners)):
+            score = int(round(fuzz.ratio(owners[i], owners[j])))
+            if score >= threshold:
+                G.add_edge(owners[i], owners[j], relationship_type='similar_name',
+                           strength=score / 100)
+    for i in range(len(owners)):
+        for j in range(i + 1, len(owners)):
+            shared = set(owner_properties[owners[i]]) & set(owner_properties[owners[j]])
+            if shared:
+                G.add_edge(owners[i], owners[j], relationship_type='shared_property',
+                           shared_properties=list(shared), strength=len(shared))
+
+
+def benchmark_owner_edges(sizes, pairwise_limit):
+    """NetworkAnalyzer._connect_related_owners vs the all-pairs loop"""
+    analyzer = NetworkAnalyzer()
+    threshold = analyzer.params['name_similarity_threshold']
+    print(f"{'owners':>8} {'edges':>9} {'pairwise (s)':>13} {'blocked (s)':>12} {'same':>6}")
+    for size in sizes:
+        owner_properties = generate_owner_properties(size)
+
+        blocked_graph = nx.Graph()
+        blocked_graph.add_nodes_from(owner_properties)
+        start = time.perf_counter()
+        analyzer._connect_related_owners(blocked_graph, owner_properties)
+        blocked = time.perf_counter() - start
+
+        pairwise, same = None, '-'
+        if size <= pairwise_limit:
+            pairwise_graph = nx.Graph()
+            pairwise_graph.add_nodes_from(owner_properties)
+            start = time.perf_counter()
+            pairwise_connect(pairwise_graph, owner_properties, threshold)
+            pairwise = time.perf_counter() - start
+            same = str(
+                {frozenset(e) for e in pairwise_graph.edges} == {frozenset(e) for e in blocked_graph.edges}
+            )
+
+        pairwise_text = f"{pairwise:13.2f}" if pairwise is not None else f"{'skipped':>13}"
+        print(f"{size:>8} {blocked_graph.number_of_edges():>9} {pairwise_text} {blocked:12.2f} {same:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    networks = subparsers.add_parser('networks', help='RelationshipAnalyzer owner networks')
+    networks.add_argument('--transactions', type=int, default=500000)
+    networks.add_argument('--batch', type=int, default=1000,
+                          help='new transactions applied incrementally')
+
+    owners = subparsers.add_parser('owners', help='NetworkAnalyzer owner edge generation')
+    owners.add_argument('--sizes', type=int, nargs='+', default=[2000, 10000, 50000])
+    owners.add_argument('--pairwise-limit', type=int, default=10000,
+                        help='largest owner count to run the all-pairs loop on')
+
+    args = parser.parse_args()
+    if args.benchmark == 'networks':
+        benchmark_networks(args.transactions, args.batch)
+    elif args.benchmark == 'owners':
+        benchmark_owner_edges(args.sizes, args.pairwise_limit)
+
+
+if __name__ == "__main__":
+    main()
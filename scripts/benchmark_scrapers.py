@@ -0,0 +1,133 @@
+"""
+Benchmark the FSBO scrapers against the mock Craigslist in tests/mock_api
+
+Usage:
+    python scripts/benchmark_scrapers.py craigslist --listings 500 --concurrency 1 4 8 --rate 10
+    python scripts/benchmark_scrapers.py fsbo --sources 4 --listings 200 --rate 10
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from werkzeug.serving import make_server
+
+from src.scrapers.fsbo_scraper import CraigslistScraper, FSBOScraper
+from tests.mock_api.api_server import app, CRAIGSLIST_CONFIG
+
+
+def start_server():
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def benchmark_craigslist(args, base_url):
+    """Listing throughput per number of concurrent detail fetches"""
+    max_pages = -(-args.listings // CRAIGSLIST_CONFIG['per_page'])
+    print(f"{args.listings} listings, {args.rate} requests/s per domain")
+    print(f"{'concurrency':>12} {'leads':>6} {'seconds':>8} {'leads/s':>8}")
+    for concurrency in args.concurrency:
+        scraper = CraigslistScraper(
+            base_url=base_url,
+            output_dir=tempfile.mkdtemp(),
+            cache_dir=tempfile.mkdtemp(),
+            config={'http_cache_dir': tempfile.mkdtemp()},
+            max_concurrency=concurrency,
+            requests_per_second=args.rate
+        )
+        start = time.perf_counter()
+        leads = scraper.run(max_pages=max_pages, max_listings=args.listings)
+        seconds = time.perf_counter() - start
+        print(f"{concurrency:>12} {len(leads):>6} {seconds:8.2f} {len(leads) / seconds:8.1f}")
+
+
+def output_bytes(directory):
+    return sum(path.stat().st_size for path in Path(directory).rglob('*') if path.is_file())
+
+
+def benchmark_fsbo(args, base_url):
+    """Several sources run one after another vs FSBOScraper running them in parallel"""
+    max_pages = -(-args.listings // CRAIGSLIST_CONFIG['per_page'])
+
+    def make_fsbo(output_dir):
+        fsbo = FSBOScraper(output_dir=output_dir, use_craigslist=False)
+        for i in range(args.sources):
+            scraper = CraigslistScraper(
+                base_url=base_url,
+                search_area=f"area{i}",
+                output_dir=output_dir,
+                cache_dir=tempfile.mkdtemp(),
+                config={'http_cache_dir': tempfile.mkdtemp()},
+                max_concurrency=args.concurrency,
+                requests_per_second=args.rate
+            )
+            # Each mock area is its own source
+            scraper.name = f"craigslist_area{i}"
+            scraper.run = lambda run=scraper.run: run(max_pages=max_pages, max_listings=args.listings)
+            fsbo.scrapers.append(scraper)
+        return fsbo
+
+    print(f"{args.sources} sources x {args.listings} listings, {args.rate} requests/s per domain")
+    print(f"{'run':>22} {'leads':>6} {'seconds':>8} {'KB written':>11}")
+
+    # Previous behaviour: one source at a time, then a combined indent=2 copy
+    output_dir = tempfile.mkdtemp()
+    fsbo = make_fsbo(output_dir)
+    start = time.perf_counter()
+    combined = []
+    for scraper in fsbo.scrapers:
+        combined.extend(scraper.run())
+    with open(Path(output_dir) / 'fsbo_leads.json', 'w') as f:
+        json.dump(combined, f, indent=2)
+    seconds = time.perf_counter() - start
+    print(f"{'sequential + json':>22} {len(combined):>6} {seconds:8.2f} {output_bytes(output_dir) / 1024:11.0f}")
+
+    output_dir = tempfile.mkdtemp()
+    fsbo = make_fsbo(output_dir)
+    start = time.perf_counter()
+    total = sum(fsbo.run().values())
+    seconds = time.perf_counter() - start
+    print(f"{'parallel + jsonl':>22} {total:>6} {seconds:8.2f} {output_bytes(output_dir) / 1024:11.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    craigslist = subparsers.add_parser('craigslist', help='Craigslist listing detail fetching')
+    craigslist.add_argument('--listings', type=int, default=500)
+    craigslist.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+    craigslist.add_argument('--rate', type=float, default=10.0,
+                            help='requests/s per domain (0 = unlimited)')
+
+    fsbo = subparsers.add_parser('fsbo', help='FSBOScraper running several sources')
+    fsbo.add_argument('--sources', type=int, default=4)
+    fsbo.add_argument('--listings', type=int, default=200, help='listings per source')
+    fsbo.add_argument('--concurrency', type=int, default=4, help='detail fetches per source')
+    fsbo.add_argument('--rate', type=float, default=10.0,
+                      help='requests/s per domain (0 = unlimited)')
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    CRAIGSLIST_CONFIG['listings'] = args.listings
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_port}/cl"
+
+    if args.benchmark == 'craigslist':
+        benchmark_craigslist(args, base_url)
+    elif args.benchmark == 'fsbo':
+        benchmark_fsbo(args, base_url)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark EmbeddingIndex build, incremental update and query latency
+
+Synthetic clustered embeddings stand in for encoded listing descriptions,
+so the benchmark measures the index rather than the encoder.
+
+Usage:
+    python scripts/benchmark_semantic_search.py --documents 1000000 --dim 384 --queries 200
+"""
+import sys
+import time
+import tempfile
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import numpy as np
+
+from src.processors.embedding_index import EmbeddingIndex
+
+
+def clustered_vectors(count: int, dim: int, clusters: int = 2000, seed: int = 42) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = np.empty((count, dim), dtype=np.float32)
+    for start in range(0, count, 65536):
+        stop = min(start + 65536, count)
+        vectors[start:stop] = centers[rng.integers(clusters, size=stop - start)]
+        vectors[start:stop] += 0.5 * rng.standard_normal((stop - start, dim), dtype=np.float32)
+    return vectors
+
+
+def latency(index: EmbeddingIndex, queries: np.ndarray, top_k: int):
+    times, hits = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits.append([doc_id for doc_id, _ in index.search(query, top_k)])
+        times.append(time.perf_counter() - start)
+    times = np.array(times) * 1000
+    return np.percentile(times, 50), np.percentile(times, 95), hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--documents', type=int, default=1000000)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--probes', type=int, nargs='+', default=[4, 8, 16])
+    parser.add_argument('--changed', type=int, default=1000,
+                        help='documents edited between runs')
+    args = parser.parse_args()
+
+    vectors = clustered_vectors(args.documents, args.dim)
+    documents = {f"L{i:07d}": f"listing {i}" for i in range(args.documents)}
+    lookup = lambda texts: vectors[[int(text.split()[-1]) for text in texts]]
+    # Queries near indexed listings, like a search for a listing's wording
+    rng = np.random.default_rng(7)
+    queries = vectors[rng.integers(args.documents, size=args.queries)]
+    queries += 0.3 * rng.standard_normal(queries.shape, dtype=np.float32)
+
+    with tempfile.TemporaryDirectory() as root:
+        index = EmbeddingIndex(root, model='synthetic', ivf_min_rows=args.documents + 1)
+        start = time.perf_counter()
+        index.update(documents, lookup, batch_size=65536)
+        print(f"indexed {len(index)} documents ({args.dim}d) in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        reopened = EmbeddingIndex(root, model='synthetic', ivf_min_rows=args.documents + 1)
+        print(f"reopened index in {time.perf_counter() - start:.2f}s")
+
+        for i in range(args.changed):
+            documents[f"L{i:07d}"] = f"edited listing {i}"
+        start = time.perf_counter()
+        encoded = reopened.update(documents, lookup)
+        print(f"rerun with {args.changed} edits: {encoded} encoded in {time.perf_counter() - start:.2f}s")
+
+        p50, p95, exact = latency(reopened, queries, args.top_k)
+        print(f"\n{'search':>12} {'p50 ms':>8} {'p95 ms':>8} {'recall':>7}")
+        print(f"{'exact':>12} {p50:8.1f} {p95:8.1f} {1.0:7.3f}")
+
+        start = time.perf_counter()
+        reopened.build_ivf()
+        print(f"{'(ivf build':>12} {time.perf_counter() - start:.1f}s)")
+        for probes in args.probes:
+            reopened.n_probe = probes
+            p50, p95, approx = latency(reopened, queries, args.top_k)
+            recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approx, exact)])
+            print(f"{f'ivf/{probes}':>12} {p50:8.1f} {p95:8.1f} {recall:7.3f}")
+
+
+if __name__ == "__main__":
+    main()
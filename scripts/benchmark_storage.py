@@ -0,0 +1,144 @@
+"""
+Benchmark BrunswickDataStore load throughput on synthetic parcels
+
+Usage:
+    python scripts/benchmark_storage.py store --rows 500000 --single-limit 20000
+    python scripts/benchmark_storage.py pipeline --rows 500000 --workers 4
+    python scripts/benchmark_storage.py search --rows 200000 --page-size 100
+"""
+import sys
+import json
+import time
+import asyncio
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.storage.brunswick_data_store import BrunswickDataStore
+from src.storage.brunswick_data_manager import BrunswickDataManager
+
+STREETS = ['Maine St', 'Federal St', 'Bath Rd', 'Pleasant St', 'Mill St', 'Harpswell Rd']
+ZONES = ['TC1', 'TC2', 'HC1', 'GI', 'R1', 'R2']
+
+
+def generate_properties(count: int, seed: int = 42):
+    """Lazily generate property records with unique map-lots"""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            'map_lot': f"{i // 1000:03d}-{chr(65 + (i // 40) % 26)}-{i % 1000}",
+            'address': f"{rng.randrange(1, 999)} {rng.choice(STREETS)}",
+            'assessment': f"${rng.randrange(80000, 900000):,}",
+            'zoning': rng.choice(ZONES),
+            'tax_account': f"TA{i:07d}"
+        }
+
+
+def benchmark_store(rows: int, single_limit: int, batch_size: int):
+    """Compare rows/second of store_property vs bulk_store_properties"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        single_rows = min(rows, single_limit)
+        store = BrunswickDataStore(db_path=str(Path(tmp_dir) / "single.db"))
+        start = time.perf_counter()
+        for item in generate_properties(single_rows):
+            store.store_property(item)
+        single = single_rows / (time.perf_counter() - start)
+
+        store = BrunswickDataStore(
+            db_path=str(Path(tmp_dir) / "bulk.db"),
+            bulk_batch_size=batch_size
+        )
+        start = time.perf_counter()
+        store.bulk_store_properties(generate_properties(rows))
+        bulk = rows / (time.perf_counter() - start)
+
+    print(f"{'method':>22} {'rows':>10} {'rows/s':>12}")
+    print(f"{'store_property':>22} {single_rows:>10} {single:12.0f}")
+    print(f"{'bulk_store_properties':>22} {rows:>10} {bulk:12.0f}")
+    print(f"speedup: {bulk / single:.1f}x")
+
+
+def benchmark_pipeline(rows: int, workers: int, queue_depth: int, write_batch_size: int):
+    """Run BrunswickDataManager.batch_process and print per-stage throughput"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BrunswickDataStore(db_path=str(Path(tmp_dir) / "pipeline.db"))
+        manager = BrunswickDataManager(store=store)
+        start = time.perf_counter()
+        results = asyncio.run(manager.batch_process(
+            list(generate_properties(rows)),
+            'property',
+            max_workers=workers,
+            queue_depth=queue_depth,
+            write_batch_size=write_batch_size
+        ))
+        elapsed = time.perf_counter() - start
+
+    print(f"stored {len(results)} rows in {elapsed:.1f}s ({len(results) / elapsed:.0f} rows/s)")
+    print(json.dumps(manager.last_pipeline_stats.summary(), indent=2))
+
+
+def benchmark_search(rows: int, page_size: int):
+    """Page through a zoning-sorted result set with OFFSET vs keyset cursors"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BrunswickDataStore(db_path=str(Path(tmp_dir) / "search.db"))
+        store.bulk_store_properties(generate_properties(rows))
+        manager = BrunswickDataManager(store=store)
+        query = {'zoning': {'in': ['TC1', 'HC1']}}
+
+        start = time.perf_counter()
+        offset = 0
+        while manager.search(query, 'properties', limit=page_size, offset=offset, sort_by='assessment'):
+            offset += page_size
+        offset_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cursor, pages = None, 0
+        while True:
+            page = manager.search_page(query, 'properties', limit=page_size,
+                                       sort_by='assessment', after=cursor)
+            pages += 1
+            if (cursor := page['next_cursor']) is None:
+                break
+        keyset_elapsed = time.perf_counter() - start
+
+    print(f"{'pagination':>12} {'pages':>8} {'total (s)':>10} {'per page (ms)':>14}")
+    print(f"{'offset':>12} {pages:>8} {offset_elapsed:10.2f} {offset_elapsed / pages * 1000:14.2f}")
+    print(f"{'keyset':>12} {pages:>8} {keyset_elapsed:10.2f} {keyset_elapsed / pages * 1000:14.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    store = subparsers.add_parser('store', help='store_property vs bulk_store_properties')
+    store.add_argument('--rows', type=int, default=500000)
+    store.add_argument('--single-limit', type=int, default=20000,
+                       help='rows to load through the one-connection-per-row path')
+    store.add_argument('--batch-size', type=int, default=10000)
+
+    pipeline = subparsers.add_parser('pipeline', help='batch_process clean/write pipeline')
+    pipeline.add_argument('--rows', type=int, default=500000)
+    pipeline.add_argument('--workers', type=int, default=4)
+    pipeline.add_argument('--queue-depth', type=int, default=8)
+    pipeline.add_argument('--write-batch-size', type=int, default=5000)
+
+    search = subparsers.add_parser('search', help='OFFSET vs keyset pagination')
+    search.add_argument('--rows', type=int, default=200000)
+    search.add_argument('--page-size', type=int, default=100)
+
+    args = parser.parse_args()
+    if args.benchmark == 'store':
+        benchmark_store(args.rows, args.single_limit, args.batch_size)
+    elif args.benchmark == 'pipeline':
+        benchmark_pipeline(args.rows, args.workers, args.queue_depth, args.write_batch_size)
+    elif args.benchmark == 'search':
+        benchmark_search(args.rows, args.page_size)
+
+
+if __name__ == "__main__":
+    main()
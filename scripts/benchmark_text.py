@@ -0,0 +1,123 @@
+"""
+Benchmark text analyzer startup time, per-document throughput and similar-pair search
+
+Usage:
+    python scripts/benchmark_text.py models --documents 2000 --backends pytorch quantized onnx --processes 1 4
+    python scripts/benchmark_text.py similarity --documents 50000 --block-sizes 500 1000 2000
+"""
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+start = time.perf_counter()
+from src.processors.text_analyzer import TextAnalyzer
+from src.processors.model_pool import ModelPool
+IMPORT_SECONDS = time.perf_counter() - start
+
+
+FEATURES = ['hardwood floors', 'new kitchen appliances', 'a spacious backyard', 'granite counters',
+            'a finished basement', 'central air', 'an updated roof', 'a two-car garage']
+PLACES = ['Brunswick', 'Topsham', 'Harpswell', 'Bath', 'Freeport']
+
+
+def generate_descriptions(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        f"Charming {rng.randrange(1, 6)}-bedroom home in {rng.choice(PLACES)} with "
+        f"{rng.choice(FEATURES)}, {rng.choice(FEATURES)} and {rng.choice(FEATURES)}. "
+        f"Needs some work but priced to sell at ${rng.randrange(150, 900)},000. "
+        f"Close to schools, shopping and the water."
+        for _ in range(count)
+    ]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def benchmark_models(args):
+    """Startup, first-use load and docs/s for per-document vs batched inference"""
+    descriptions = generate_descriptions(args.documents)
+    reports = [{'report_id': i, 'content': text, 'date': None} for i, text in enumerate(descriptions)]
+
+    analyzer, construct = timed(TextAnalyzer)
+    print(f"import: {IMPORT_SECONDS:.2f}s  construct: {construct:.3f}s  models loaded: {len(analyzer.model_pool.loaded())}")
+
+    _, first = timed(lambda: analyzer.nlp)
+    print(f"spaCy first use: {first:.2f}s")
+
+    print(f"\n{'stage':>22} {'setting':>10} {'seconds':>9} {'docs/s':>9}")
+    _, loop = timed(lambda: [analyzer.nlp(text) for text in descriptions])
+    print(f"{'spaCy per document':>22} {'-':>10} {loop:9.2f} {len(descriptions) / loop:9.0f}")
+    for processes in args.processes:
+        analyzer.params['nlp_processes'] = processes
+        _, piped = timed(analyzer._extract_property_features, descriptions)
+        print(f"{'spaCy nlp.pipe':>22} {f'{processes} proc':>10} {piped:9.2f} {len(descriptions) / piped:9.0f}")
+
+    analyzer.params['inference_batch_size'] = args.batch_size
+    for backend in args.backends:
+        analyzer.params['model_backend'] = backend
+        try:
+            _, load = timed(lambda: analyzer.sentiment_analyzer)
+        except Exception as e:
+            print(f"{'sentiment load':>22} {backend:>10} failed: {e}")
+            continue
+        _, single = timed(lambda: [analyzer.sentiment_analyzer(text, truncation=True) for text in descriptions[:200]])
+        _, batched = timed(analyzer._analyze_market_sentiment, reports)
+        print(f"{'sentiment load':>22} {backend:>10} {load:9.2f}")
+        print(f"{'sentiment per document':>22} {backend:>10} {single:9.2f} {200 / single:9.0f}")
+        print(f"{'sentiment batched':>22} {backend:>10} {batched:9.2f} {len(reports) / batched:9.0f}")
+
+
+def benchmark_similarity(args):
+    """Blocked sparse similar-pair search: time and peak memory per block size"""
+    descriptions = generate_descriptions(args.documents)
+    analyzer = TextAnalyzer()
+    vectors = analyzer.vectorizer.fit_transform(descriptions)
+
+    print(f"{args.documents} descriptions, threshold {analyzer.params['similarity_threshold']}")
+    print(f"{'block':>8} {'seconds':>9} {'peak MB':>9} {'pairs':>10}")
+    for block_size in args.block_sizes:
+        analyzer.params['similarity_block_size'] = block_size
+        tracemalloc.start()
+        pairs, seconds = timed(analyzer._find_similar_descriptions, vectors)
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+        print(f"{block_size:>8} {seconds:9.2f} {peak:9.0f} {len(pairs):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    models = subparsers.add_parser('models', help='model startup and inference throughput')
+    models.add_argument('--documents', type=int, default=2000)
+    models.add_argument('--backends', nargs='+', default=['pytorch', 'quantized', 'onnx'],
+                        choices=ModelPool.BACKENDS)
+    models.add_argument('--processes', type=int, nargs='+', default=[1, 4],
+                        help='nlp.pipe worker process counts to try')
+    models.add_argument('--batch-size', type=int, default=16,
+                        help='transformers inference batch size')
+
+    similarity = subparsers.add_parser('similarity', help='similar description pairs')
+    similarity.add_argument('--documents', type=int, default=50000)
+    similarity.add_argument('--block-sizes', type=int, nargs='+', default=[500, 1000, 2000])
+
+    args = parser.parse_args()
+    if args.benchmark == 'models':
+        benchmark_models(args)
+    elif args.benchmark == 'similarity':
+        benchmark_similarity(args)
+
+
+if __name__ == "__main__":
+    main()
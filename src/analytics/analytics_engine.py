@@ -9,13 +9,15 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
 import xgboost as xgb
-from prophet import Prophet
 import tensorflow as tf
 from datetime import datetime, timedelta
 import logging
 from dataclasses import dataclass
 import joblib
 import json
+from pathlib import Path
+from ..processors.model_registry import ModelRegistry
+from ..processors.forecast_scheduler import ForecastScheduler
 
 @dataclass
 class AnalysisResult:
@@ -31,6 +33,11 @@ class AnalyticsEngine:
         self.logger = logging.getLogger(__name__)
         self.models = {}
         self.scalers = {}
+        self.registry = ModelRegistry(config['model_dir'])
+        self.forecast_scheduler = ForecastScheduler(
+            max_workers=config.get('forecast_workers'),
+            cache_dir=f"{config['model_dir']}/forecasts"
+        )
         self._init_models()
         
     def _init_models(self):
@@ -40,9 +47,6 @@ class AnalyticsEngine:
             self.models['price'] = self._load_or_create_model('price')
             self.scalers['price'] = self._load_or_create_scaler('price')
             
-            # Market trend model
-            self.models['market_trend'] = Prophet()
-            
             # Anomaly detection model
             self.models['anomaly'] = IsolationForest(
                 contamination=0.1,
@@ -60,19 +64,26 @@ class AnalyticsEngine:
             raise
             
     def _load_or_create_model(self, model_type: str) -> Any:
-        """Load existing model or create new one"""
+        """
+        Load the active registered model, or a legacy <type>_model.joblib,
+        or create a new untrained one
+        """
         try:
-            model_path = f"{self.config['model_dir']}/{model_type}_model.joblib"
-            try:
-                return joblib.load(model_path)
-            except:
-                if model_type == 'price':
-                    return xgb.XGBRegressor(
-                        n_estimators=1000,
-                        learning_rate=0.01,
-                        max_depth=7
-                    )
-                return None
+            model = self._load_artifact(model_type, 'model')
+            if model is not None:
+                return model
+                
+            if model_type == 'price':
+                self.logger.warning(
+                    f"No trained {model_type} model in {self.config['model_dir']}; "
+                    f"using an untrained XGBRegressor"
+                )
+                return xgb.XGBRegressor(
+                    n_estimators=1000,
+                    learning_rate=0.01,
+                    max_depth=7
+                )
+            return None
                 
         except Exception as e:
             self.logger.error(f"Error loading/creating model: {str(e)}")
@@ -81,16 +92,31 @@ class AnalyticsEngine:
     def _load_or_create_scaler(self, scaler_type: str) -> StandardScaler:
         """Load existing scaler or create new one"""
         try:
-            scaler_path = f"{self.config['model_dir']}/{scaler_type}_scaler.joblib"
-            try:
-                return joblib.load(scaler_path)
-            except:
-                return StandardScaler()
+            scaler = self._load_artifact(scaler_type, 'scaler')
+            if scaler is not None:
+                return scaler
+                
+            self.logger.warning(f"No fitted {scaler_type} scaler; using an unfitted StandardScaler")
+            return StandardScaler()
                 
         except Exception as e:
             self.logger.error(f"Error loading/creating scaler: {str(e)}")
             raise
             
+    def _load_artifact(self, name: str, artifact: str) -> Any:
+        """Active registry version first, then the unversioned <name>_<artifact>.joblib"""
+        obj = self.registry.load(name, artifact)
+        if obj is not None:
+            self.logger.info(
+                f"Loaded {name} {artifact} version {self.registry.active_version(name)}"
+            )
+            return obj
+            
+        legacy_path = Path(self.config['model_dir']) / f"{name}_{artifact}.joblib"
+        if legacy_path.exists():
+            return joblib.load(legacy_path, mmap_mode='r')
+        return None
+            
     async def analyze_property(self, property_data: Dict) -> Dict[str, AnalysisResult]:
         """Perform comprehensive property analysis"""
         try:
@@ -156,14 +182,20 @@ class AnalyticsEngine:
                 property_data['location']
             )
             
-            # Fit Prophet model
-            self.models['market_trend'].fit(historical_data)
-            
-            # Make future predictions
-            future = self.models['market_trend'].make_future_dataframe(
-                periods=365  # Predict one year ahead
+            # Fit Prophet model and predict one year ahead; unchanged
+            # history is served from the forecast cache
+            result = self.forecast_scheduler.forecast_one(
+                historical_data, periods=365
             )
-            forecast = self.models['market_trend'].predict(future)
+            if result is None:
+                # The fit failed (already logged); report a neutral trend
+                return AnalysisResult(
+                    type='market',
+                    data={'forecast': {}, 'trend': 0.5, 'seasonal_patterns': {}},
+                    score=0.5,
+                    confidence=0.0
+                )
+            forecast = result['forecast']
             
             # Calculate trend score
             trend_score = self._calculate_market_trend_score(forecast)
@@ -3,7 +3,7 @@ Collector for Brunswick Commitment Book data
 """
 import logging
 import tempfile
-import requests
+from datetime import datetime
 import re
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -11,11 +11,13 @@ import pandas as pd
 import PyPDF2
 from .base_collector import BaseCollector
 from ..utils.data_manager import DataManager
+from ..utils.http_cache import CachedSession
 
 class CommitmentBookCollector(BaseCollector):
     def __init__(self):
         super().__init__()
         self.data_manager = DataManager()
+        self.session = CachedSession()
         self.commitment_book_url = "https://www.brunswickme.gov/DocumentCenter/View/9924/2024-Real-Estate-Commitment-Book"
         
         # Initialize data quality tracking
@@ -92,20 +94,22 @@ class CommitmentBookCollector(BaseCollector):
             return data
             
     def _download_commitment_book(self) -> Optional[Dict]:
-        """Download commitment book PDF"""
+        """Download commitment book PDF, unless the server reports it unchanged"""
         try:
-            # Check if we already have the file
-            existing_files = self.data_manager.list_files('raw', 'commitment_books')
-            for file_info in existing_files:
-                if self.commitment_book_url in file_info.get('metadata', {}).get('source_url', ''):
-                    self.logger.info("Using existing commitment book file")
-                    return file_info
-            
-            # Download new file
-            self.logger.info("Downloading commitment book...")
-            response = requests.get(self.commitment_book_url)
+            # Conditional request: an unchanged book comes back from the HTTP cache
+            response = self.session.get(self.commitment_book_url)
             response.raise_for_status()
             
+            # Check if we already have the file
+            if response.from_cache:
+                existing_files = self.data_manager.list_files('raw', 'commitment_books')
+                for file_info in existing_files:
+                    if self.commitment_book_url in file_info.get('metadata', {}).get('source_url', ''):
+                        self.logger.info("Commitment book unchanged, using existing file")
+                        return file_info
+            
+            self.logger.info("Saving downloaded commitment book...")
+            
             # Save to temporary file first
             with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
                 temp_file.write(response.content)
@@ -377,20 +381,27 @@ class CommitmentBookCollector(BaseCollector):
             if sqft_match:
                 property_dict['square_feet'] = int(sqft_match.group(1))
                 success = True
-        
-        # Deed information
-        deed_match = re.search(r'([0-9]{5}/[0-9]{4})\s+([0-9]{2}/[0-9]{2}/[0-9]{4})', text)
-        if deed_match:
-            property_dict['deed_book_page'] = deed_match.group(1)
-            property_dict['deed_date'] = deed_match.group(2)
-        
-        # Map/Lot information
-        map_lot_match = re.search(r'([A-Z0-9]+)-([0-9]+)-([0-9]+)-([0-9]+)', text)
-        if map_lot_match:
-            property_dict['map'] = map_lot_match.group(1)
-            property_dict['lot'] = map_lot_match.group(2)
-            property_dict['sublot'] = map_lot_match.group(3)
-            property_dict['unit'] = map_lot_match.group(4)
+            
+            # Deed information
+            deed_match = re.search(r'([0-9]{5}/[0-9]{4})\s+([0-9]{2}/[0-9]{2}/[0-9]{4})', text)
+            if deed_match:
+                property_dict['deed_book_page'] = deed_match.group(1)
+                property_dict['deed_date'] = deed_match.group(2)
+                success = True
+            
+            # Map/Lot information
+            map_lot_match = re.search(r'([A-Z0-9]+)-([0-9]+)-([0-9]+)-([0-9]+)', text)
+            if map_lot_match:
+                property_dict['map'] = map_lot_match.group(1)
+                property_dict['lot'] = map_lot_match.group(2)
+                property_dict['sublot'] = map_lot_match.group(3)
+                property_dict['unit'] = map_lot_match.group(4)
+                success = True
+        except Exception as e:
+            self.logger.error(f"Error extracting details: {str(e)}")
+        finally:
+            if success:
+                self.quality_metrics['extraction_success']['details'] += 1
 
     def _validate_property_data(self, property_dict: Dict) -> List[str]:
         """Validate property data for consistency and completeness"""
@@ -583,7 +594,10 @@ class CommitmentBookCollector(BaseCollector):
             # Track performance
             elapsed = (datetime.now() - start_time).total_seconds()
             self.performance_metrics['extraction_times'].append(elapsed)
-            
+            if success:
+                self.quality_metrics['extraction_success']['values'] += 1
+        
+        try:
             # Land value - look for pattern: digits followed by 'Land'
             land_match = re.search(r'Land\s+([0-9,]+)', text)
             if land_match:
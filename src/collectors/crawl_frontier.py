@@ -0,0 +1,188 @@
+"""
+Crawl frontier - priority URL queue, per-host politeness and fetch statistics
+"""
+import time
+import asyncio
+import itertools
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urldefrag
+
+class TokenBucket:
+    """
+    Rate limiter allowing rate requests per second with bursts of up to burst
+
+    A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        """Wait until a token is available, then take it"""
+        if self.rate <= 0:
+            return
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class HostPoliteness:
+    """
+    Per-host concurrency and request rate limits
+
+    Each host gets its own semaphore and token bucket on first use, so a
+    slow or strict host never holds back requests to the others.
+    """
+
+    def __init__(self, concurrency: int = 4, rate: float = 4.0, burst: float = 4):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        """Hold one of host's request slots, after its rate limit allows it"""
+        if host not in self.semaphores:
+            self.semaphores[host] = asyncio.Semaphore(self.concurrency)
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        async with self.semaphores[host]:
+            await self.buckets[host].acquire()
+            yield
+
+class CrawlFrontier:
+    """
+    Priority queue of URLs still to crawl
+
+    Entries are served lowest priority value first, ties in the order they
+    were pushed; by default the priority is the link depth, which gives a
+    breadth-first crawl. Each URL (without fragment) is queued at most once
+    and links deeper than max_depth are dropped.
+    """
+
+    def __init__(self,
+                 max_depth: int = 5,
+                 priority: Optional[Callable[[str, int], float]] = None):
+        self.max_depth = max_depth
+        self.priority = priority or (lambda url, depth: depth)
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self.seen = set()
+        self._counter = itertools.count()
+
+    def push(self, url: str, depth: int) -> bool:
+        """Queue url found at depth; False if already seen or too deep"""
+        url = urldefrag(url)[0]
+        if depth >= self.max_depth or url in self.seen:
+            return False
+        self.seen.add(url)
+        self.queue.put_nowait((self.priority(url, depth), next(self._counter), depth, url))
+        return True
+
+    async def get(self) -> Tuple[int, str]:
+        """Next (depth, url), waiting if the queue is empty"""
+        _, _, depth, url = await self.queue.get()
+        return depth, url
+
+    def task_done(self):
+        self.queue.task_done()
+
+    async def join(self):
+        """Wait until every queued URL has been marked done"""
+        await self.queue.join()
+
+    def __len__(self) -> int:
+        return self.queue.qsize()
+
+class CrawlStats:
+    """
+    Fetch latencies, status codes and throughput for one crawl
+
+    watch_loop also measures how long the event loop was blocked: it
+    sleeps in short ticks and counts every tick that overran by more than
+    LAG_THRESHOLD as blocked for the overrun.
+    """
+
+    LOOP_INTERVAL = 0.01
+    LAG_THRESHOLD = 0.005
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.hosts: Dict[str, int] = defaultdict(int)
+        self.bytes = 0
+        self.errors = 0
+        self.pages = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.parse_seconds = 0.0
+        self.loop_blocked = 0.0
+        self.loop_lag_max = 0.0
+
+    @asynccontextmanager
+    async def fetch(self, host: str):
+        """Time one request; the body should be read inside the block"""
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+            self.hosts[host] += 1
+            self.in_flight -= 1
+
+    async def watch_loop(self):
+        """Accumulate event loop lag until cancelled"""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.LOOP_INTERVAL)
+            lag = time.perf_counter() - start - self.LOOP_INTERVAL
+            if lag > self.LAG_THRESHOLD:
+                self.loop_blocked += lag
+                self.loop_lag_max = max(self.loop_lag_max, lag)
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    def summary(self) -> Dict:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        latencies = sorted(self.latencies)
+
+        def percentile(q: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        return {
+            'pages': self.pages,
+            'requests': len(latencies),
+            'errors': self.errors,
+            'bytes': self.bytes,
+            'seconds': elapsed,
+            'pages_per_second': self.pages / elapsed if elapsed else 0.0,
+            'latency_p50': percentile(0.50),
+            'latency_p95': percentile(0.95),
+            'latency_p99': percentile(0.99),
+            'latency_max': latencies[-1] if latencies else 0.0,
+            'peak_in_flight': self.peak_in_flight,
+            'parse_seconds': self.parse_seconds,
+            'loop_blocked_seconds': self.loop_blocked,
+            'loop_lag_max': self.loop_lag_max,
+            'statuses': dict(self.statuses),
+            'hosts': dict(self.hosts)
+        }
@@ -0,0 +1,254 @@
+"""
+Page parsing for the smart crawler - HTML in, plain picklable data out
+
+Everything here is synchronous and CPU-bound, and parse_page takes and
+returns only bytes, strings, lists and dicts, so the crawler can run it in
+a worker process and keep its event loop free for network I/O.
+"""
+import re
+import time
+import logging
+from importlib import util
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+# lxml builds the tree several times faster than the pure-Python parser
+PARSER = 'lxml' if util.find_spec('lxml') else 'html.parser'
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_PATTERN = re.compile(r'\.(pdf|doc|csv|xlsx?|zip)$')
+API_PATTERNS = [
+    re.compile(r'api/[\w/]+'),
+    re.compile(r'v\d+/[\w/]+'),
+    re.compile(r'rest/[\w/]+'),
+    re.compile(r'graphql')
+]
+
+class FrameworkDetector:
+    """Detects web frameworks and technologies used"""
+
+    def __init__(self):
+        self.frameworks = {
+            'react': [
+                'react.development.js',
+                'react.production.min.js',
+                '_reactjs_'
+            ],
+            'angular': [
+                'ng-app',
+                'angular.js',
+                'ng-controller'
+            ],
+            'vue': [
+                'vue.js',
+                'v-bind',
+                'v-model'
+            ],
+            'jquery': [
+                'jquery.js',
+                'jquery.min.js'
+            ],
+            'bootstrap': [
+                'bootstrap.css',
+                'bootstrap.min.css'
+            ]
+        }
+
+    def detect(self, soup: BeautifulSoup, page_text: Optional[str] = None) -> List[str]:
+        """Detect frameworks used in the page"""
+        detected = []
+        page_text = page_text if page_text is not None else str(soup)
+
+        for framework, patterns in self.frameworks.items():
+            if any(pattern in page_text for pattern in patterns):
+                detected.append(framework)
+
+        return detected
+
+FRAMEWORK_DETECTOR = FrameworkDetector()
+
+def make_soup(body, encoding: Optional[str] = None) -> BeautifulSoup:
+    """Parse page bytes (or text) with the fastest available parser"""
+    if isinstance(body, bytes):
+        return BeautifulSoup(body, PARSER, from_encoding=encoding)
+    return BeautifulSoup(body, PARSER)
+
+def extract_tables(soup: BeautifulSoup) -> List[List[Dict]]:
+    """Extract data from HTML tables"""
+    tables = []
+    for table in soup.find_all('table'):
+        try:
+            # Convert table to pandas DataFrame
+            df = pd.read_html(str(table))[0]
+            tables.append(df.to_dict('records'))
+        except Exception as e:
+            logger.error(f"Error extracting table data: {e}")
+    return tables
+
+def extract_forms(soup: BeautifulSoup) -> List[Dict]:
+    """Extract form structure and fields"""
+    forms = []
+    for form in soup.find_all('form'):
+        form_data = {
+            'action': form.get('action'),
+            'method': form.get('method', 'get'),
+            'fields': []
+        }
+
+        for input_field in form.find_all(['input', 'select', 'textarea']):
+            form_data['fields'].append({
+                'type': input_field.get('type', 'text'),
+                'name': input_field.get('name'),
+                'id': input_field.get('id'),
+                'required': input_field.has_attr('required')
+            })
+
+        forms.append(form_data)
+    return forms
+
+def extract_maps(soup: BeautifulSoup, page_text: Optional[str] = None) -> List[Dict]:
+    """Extract data from map elements"""
+    maps = []
+    page_text = page_text if page_text is not None else str(soup)
+
+    # ArcGIS detection
+    arcgis_elements = soup.find_all(
+        'div',
+        {'class': lambda x: x and 'arcgis' in x.lower()}
+    )
+    if arcgis_elements:
+        maps.append({
+            'type': 'arcgis',
+            'elements': len(arcgis_elements)
+        })
+
+    # Google Maps detection
+    if 'maps.google.com' in page_text or 'google.com/maps' in page_text:
+        maps.append({
+            'type': 'google_maps',
+            'embed': soup.find('iframe', {'src': re.compile(r'google.com/maps')}) is not None
+        })
+
+    # Leaflet detection
+    leaflet_elements = soup.find_all('div', {'class': 'leaflet-container'})
+    if leaflet_elements:
+        maps.append({
+            'type': 'leaflet',
+            'elements': len(leaflet_elements)
+        })
+
+    return maps
+
+def extract_api_endpoints(soup: BeautifulSoup) -> List[str]:
+    """Extract potential API endpoints referenced in scripts"""
+    endpoints = []
+    for script in soup.find_all('script'):
+        script_text = script.string if script.string else ''
+        for pattern in API_PATTERNS:
+            endpoints.extend(pattern.findall(script_text))
+    return list(set(endpoints))
+
+def find_related_pages(soup: BeautifulSoup, url: str, base_domain: str) -> List[str]:
+    """Find related pages from the current page"""
+    related = []
+
+    for link in soup.find_all('a', href=True):
+        href = link.get('href')
+        if not href:
+            continue
+
+        full_url = urljoin(url, href)
+        parsed = urlparse(full_url)
+
+        # Skip if different domain
+        if parsed.netloc and parsed.netloc not in base_domain:
+            continue
+
+        # Skip non-web URLs
+        if not parsed.scheme in ['http', 'https']:
+            continue
+
+        related.append(full_url)
+
+    return related
+
+def detect_content_type(soup: BeautifulSoup) -> str:
+    """Detect the type of content on the page"""
+    if soup.find('article'):
+        return 'article'
+    elif soup.find('form'):
+        return 'form'
+    elif soup.find('table'):
+        return 'data'
+    elif soup.find('div', {'class': re.compile(r'map|arcgis')}):
+        return 'map'
+    else:
+        return 'general'
+
+def parse_page(url: str,
+               body,
+               base_domain: str,
+               encoding: Optional[str] = None,
+               max_images: int = 5) -> Dict:
+    """
+    Detect features, extract data and find links in one page
+
+    Returns a dict with the url, title, content_type, features (the
+    PageFeatures fields), extracted_data, related_pages, image_urls (for
+    OCR, which needs the network and stays with the caller) and
+    parse_seconds.
+    """
+    start = time.perf_counter()
+    soup = make_soup(body, encoding)
+    # Several detectors search the serialized page; serialize it once
+    page_text = str(soup)
+
+    maps = extract_maps(soup, page_text)
+    api_endpoints = extract_api_endpoints(soup)
+    features = {
+        'has_tables': bool(soup.find('table')),
+        'has_forms': bool(soup.find('form')),
+        'has_maps': bool(maps),
+        'has_downloads': bool(soup.find('a', href=DOWNLOAD_PATTERN)),
+        'has_search': bool(
+            soup.find('input', {'type': 'search'}) or
+            soup.find('form', {'role': 'search'})
+        ),
+        'has_pagination': bool(
+            soup.find('div', {'class': re.compile(r'pagination|pager')})
+        ),
+        'has_api_endpoints': bool(api_endpoints),
+        'interactive_elements': [
+            elem.name for elem in soup.find_all(['button', 'select', 'input'])
+        ],
+        'frameworks_detected': FRAMEWORK_DETECTOR.detect(soup, page_text)
+    }
+
+    extracted_data = {}
+    if features['has_tables']:
+        extracted_data['tables'] = extract_tables(soup)
+    if features['has_forms']:
+        extracted_data['forms'] = extract_forms(soup)
+    if maps:
+        extracted_data['maps'] = maps
+    if api_endpoints:
+        extracted_data['api_endpoints'] = api_endpoints
+
+    image_urls = [
+        urljoin(url, img['src']) for img in soup.find_all('img', src=True)[:max_images]
+    ]
+
+    return {
+        'url': url,
+        'title': str(soup.title.string) if soup.title and soup.title.string else "",
+        'content_type': detect_content_type(soup),
+        'features': features,
+        'extracted_data': extracted_data,
+        'related_pages': find_related_pages(soup, url, base_domain),
+        'image_urls': image_urls,
+        'parse_seconds': time.perf_counter() - start
+    }
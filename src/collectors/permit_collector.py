@@ -5,13 +5,13 @@ Handles both permits and violations since they often come from the same system
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 
 from .base_collector import BaseCollector
 from ..models.property_models import Permit, Violation
 from ..utils.retry import retry_with_backoff
+from ..utils.http_cache import CachedSession, HTTPCache
 from ..utils.address_matcher import AddressMatcher
 
 class PermitCollector(BaseCollector):
@@ -28,7 +28,7 @@ class PermitCollector(BaseCollector):
         super().__init__(config)
         self.base_url = config.get('permit_url', 'https://www.brunswickme.org/permits')
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.session = requests.Session()
+        self.session = CachedSession(HTTPCache.shared(config.get('http_cache_dir')))
         self.address_matcher = AddressMatcher()
         
         # Configure data sources
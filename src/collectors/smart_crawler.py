@@ -5,10 +5,11 @@ import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
 import logging
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 import re
-from urllib.parse import urljoin, urlparse, parse_qs
+from urllib.parse import urlparse, parse_qs
 import json
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 import hashlib
@@ -19,7 +20,6 @@ import matplotlib.pyplot as plt
 from PIL import Image
 import io
 import pytesseract
-import pandas as pd
 import numpy as np
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -27,6 +27,18 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from .site_specific_extractors import (
+    VisionGovExtractor,
+    MaineGovExtractor,
+    MunicipalityExtractor,
+    AssessorExtractor,
+    GISExtractor
+)
+from . import page_parser
+from .page_parser import FrameworkDetector
+from .crawl_frontier import CrawlFrontier, CrawlStats, HostPoliteness
+from ..utils.http_cache import HTTPCache
+
 @dataclass
 class PageFeatures:
     """Features detected on a webpage"""
@@ -56,151 +68,61 @@ class PageData:
 class DataExtractor:
     """Extracts structured data from various sources"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         self.logger = logging.getLogger(__name__)
+        self.session = session
         
     async def extract_table_data(self, soup: BeautifulSoup) -> List[Dict]:
         """Extract data from HTML tables"""
-        tables = []
-        for table in soup.find_all('table'):
-            try:
-                # Convert table to pandas DataFrame
-                df = pd.read_html(str(table))[0]
-                tables.append(df.to_dict('records'))
-            except Exception as e:
-                self.logger.error(f"Error extracting table data: {e}")
-        return tables
+        return page_parser.extract_tables(soup)
         
     async def extract_form_data(self, soup: BeautifulSoup) -> Dict:
         """Extract form structure and fields"""
-        forms = []
-        for form in soup.find_all('form'):
-            form_data = {
-                'action': form.get('action'),
-                'method': form.get('method', 'get'),
-                'fields': []
-            }
-            
-            for input_field in form.find_all(['input', 'select', 'textarea']):
-                field = {
-                    'type': input_field.get('type', 'text'),
-                    'name': input_field.get('name'),
-                    'id': input_field.get('id'),
-                    'required': input_field.has_attr('required')
-                }
-                form_data['fields'].append(field)
-                
-            forms.append(form_data)
-        return forms
+        return page_parser.extract_forms(soup)
         
     async def extract_map_data(self, soup: BeautifulSoup, url: str) -> Dict:
         """Extract data from map elements"""
-        maps = []
-        
-        # ArcGIS detection
-        arcgis_elements = soup.find_all(
-            'div',
-            {'class': lambda x: x and 'arcgis' in x.lower()}
-        )
-        if arcgis_elements:
-            maps.append({
-                'type': 'arcgis',
-                'elements': len(arcgis_elements)
-            })
-            
-        # Google Maps detection
-        if 'maps.google.com' in str(soup) or 'google.com/maps' in str(soup):
-            maps.append({
-                'type': 'google_maps',
-                'embed': soup.find('iframe', {'src': re.compile(r'google.com/maps')}) is not None
-            })
-            
-        # Leaflet detection
-        if soup.find_all('div', {'class': 'leaflet-container'}):
-            maps.append({
-                'type': 'leaflet',
-                'elements': len(soup.find_all('div', {'class': 'leaflet-container'}))
-            })
-            
-        return maps
+        return page_parser.extract_maps(soup)
         
     async def extract_api_endpoints(self, soup: BeautifulSoup, url: str) -> List[str]:
         """Extract potential API endpoints"""
-        endpoints = []
-        
-        # Look for API references in scripts
-        scripts = soup.find_all('script')
-        for script in scripts:
-            script_text = script.string if script.string else ''
-            # Look for API URL patterns
-            api_patterns = [
-                r'api/[\w/]+',
-                r'v\d+/[\w/]+',
-                r'rest/[\w/]+',
-                r'graphql'
-            ]
-            for pattern in api_patterns:
-                matches = re.findall(pattern, script_text)
-                endpoints.extend(matches)
-                
-        return list(set(endpoints))
+        return page_parser.extract_api_endpoints(soup)
         
     async def extract_text_with_ocr(self, image_url: str) -> str:
         """Extract text from images using OCR"""
+        session = self.session or aiohttp.ClientSession()
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(image_url) as response:
-                    if response.status == 200:
-                        image_data = await response.read()
-                        image = Image.open(io.BytesIO(image_data))
-                        return pytesseract.image_to_string(image)
+            async with session.get(image_url) as response:
+                if response.status == 200:
+                    image_data = await response.read()
+                    image = Image.open(io.BytesIO(image_data))
+                    return pytesseract.image_to_string(image)
         except Exception as e:
             self.logger.error(f"Error performing OCR: {e}")
+        finally:
+            if session is not self.session:
+                await session.close()
         return ""
 
-class FrameworkDetector:
-    """Detects web frameworks and technologies used"""
-    
-    def __init__(self):
-        self.frameworks = {
-            'react': [
-                'react.development.js',
-                'react.production.min.js',
-                '_reactjs_'
-            ],
-            'angular': [
-                'ng-app',
-                'angular.js',
-                'ng-controller'
-            ],
-            'vue': [
-                'vue.js',
-                'v-bind',
-                'v-model'
-            ],
-            'jquery': [
-                'jquery.js',
-                'jquery.min.js'
-            ],
-            'bootstrap': [
-                'bootstrap.css',
-                'bootstrap.min.css'
-            ]
-        }
-        
-    def detect(self, soup: BeautifulSoup) -> List[str]:
-        """Detect frameworks used in the page"""
-        detected = []
-        page_text = str(soup)
-        
-        for framework, patterns in self.frameworks.items():
-            if any(pattern in page_text for pattern in patterns):
-                detected.append(framework)
-                
-        return detected
-
 class SmartCrawler:
-    """Intelligent web crawler with advanced detection and data extraction"""
+    """
+    Intelligent web crawler with advanced detection and data extraction
+
+    URLs wait in a priority frontier (shallow and data-looking pages first)
+    and a fixed pool of workers fetches and processes them as they come
+    off the queue, so one slow page holds up only its own worker. Requests
+    are limited per host by a semaphore and a token bucket, and share one
+    pooled keep-alive session with DNS caching.
+
+    Parsing, feature detection and link extraction run in a pool of
+    parse_workers processes (0 parses on the event loop), so the loop only
+    moves bytes; CrawlStats measures how long it was blocked regardless.
+    """
+
+    # URLs matching these are crawled ahead of other links at the same depth
+    PRIORITY_PATTERNS = [
+        r'assess', r'parcel', r'propert', r'tax', r'gis', r'map', r'permit', r'deed'
+    ]
     
     def __init__(self, config: Dict):
         self.config = config
@@ -209,6 +131,23 @@ class SmartCrawler:
         self.state_file = os.path.join(self.cache_dir, 'crawler_state.pkl')
         self.max_depth = config.get('max_depth', 5)
         self.max_pages = config.get('max_pages', 1000)
+        self.concurrency = config.get('concurrency', 16)
+        self.politeness = HostPoliteness(
+            concurrency=config.get('per_host_concurrency', 4),
+            rate=config.get('per_host_rate', 4.0),
+            burst=config.get('per_host_burst', 4)
+        )
+        self.priority_pattern = re.compile(
+            '|'.join(config.get('priority_patterns', self.PRIORITY_PATTERNS)),
+            re.IGNORECASE
+        )
+        self.parse_workers = config.get('parse_workers', os.cpu_count())
+        self.parse_pool = None
+        self.stats = CrawlStats()
+        self.http_cache = (
+            HTTPCache.shared(config.get('http_cache_dir'))
+            if config.get('use_http_cache', True) else None
+        )
         self.session = None
         self.data_extractor = DataExtractor()
         self.framework_detector = FrameworkDetector()
@@ -232,9 +171,26 @@ class SmartCrawler:
             self.driver = webdriver.Chrome(options=chrome_options)
         else:
             self.driver = None
+        # The browser renders one page at a time
+        self._driver_lock = asyncio.Lock()
             
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.politeness.concurrency,
+            ttl_dns_cache=self.config.get('dns_cache_ttl', 300),
+            keepalive_timeout=self.config.get('keepalive_timeout', 30)
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=self.config.get('request_timeout', 30),
+                connect=self.config.get('connect_timeout', 10)
+            )
+        )
+        self.data_extractor.session = self.session
+        if self.parse_workers:
+            self.parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
         
         # Update sessions for specialized extractors
         for extractor in self.specialized_extractors:
@@ -246,6 +202,9 @@ class SmartCrawler:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
+        if self.parse_pool:
+            self.parse_pool.shutdown(cancel_futures=True)
+            self.parse_pool = None
         if self.driver:
             self.driver.quit()
             
@@ -260,43 +219,15 @@ class SmartCrawler:
             Dictionary of discovered pages and their data
         """
         try:
-            visited_urls = set()
-            pending_urls = {start_url}
             pages_data = {}
-            
-            parsed = urlparse(start_url)
-            base_domain = f"{parsed.scheme}://{parsed.netloc}"
-            
-            depth = 0
-            while pending_urls and depth < self.max_depth:
-                current_urls = pending_urls.copy()
-                pending_urls.clear()
-                
-                # Process current batch of URLs
-                tasks = [
-                    self._process_url(url, base_domain)
-                    for url in current_urls
-                    if url not in visited_urls
-                ]
+            async for page_data in self.crawl_iter(start_url):
+                pages_data[page_data.url] = page_data
                 
-                if tasks:
-                    results = await asyncio.gather(*tasks)
-                    for url, page_data in results:
-                        if page_data:
-                            pages_data[url] = page_data
-                            visited_urls.add(url)
-                            # Add new URLs to pending
-                            pending_urls.update(
-                                url for url in page_data.related_pages
-                                if url not in visited_urls
-                            )
-                            
-                depth += 1
+            if len(pages_data) >= self.max_pages:
+                self.logger.info(f"Reached max pages limit: {self.max_pages}")
+            if self.http_cache is not None:
+                self.logger.info(f"HTTP cache: {self.http_cache.stats()}")
                 
-                if len(pages_data) >= self.max_pages:
-                    self.logger.info(f"Reached max pages limit: {self.max_pages}")
-                    break
-                    
             # Build relationship graph
             self._build_graph(pages_data)
             
@@ -306,6 +237,71 @@ class SmartCrawler:
             self.logger.error(f"Error during crawl: {e}")
             raise
             
+    async def crawl_iter(self, start_url: str) -> AsyncIterator[PageData]:
+        """
+        Crawl website starting from given URL, yielding pages as they are processed
+        
+        Pages arrive in completion order. Stops after max_pages pages or
+        once the frontier is exhausted; per-fetch statistics are kept in
+        self.stats.
+        """
+        parsed = urlparse(start_url)
+        base_domain = f"{parsed.scheme}://{parsed.netloc}"
+        
+        frontier = CrawlFrontier(self.max_depth, priority=self._url_priority)
+        frontier.push(start_url, 0)
+        results: asyncio.Queue = asyncio.Queue()
+        self.stats = CrawlStats()
+        
+        async def drained():
+            # Workers queue a page before marking its URL done, so this
+            # sentinel always arrives after the last page
+            await frontier.join()
+            await results.put(None)
+            
+        tasks = [
+            asyncio.create_task(self._crawl_worker(frontier, results, base_domain))
+            for _ in range(self.concurrency)
+        ]
+        tasks.append(asyncio.create_task(drained()))
+        tasks.append(asyncio.create_task(self.stats.watch_loop()))
+        
+        try:
+            while self.stats.pages < self.max_pages:
+                page_data = await results.get()
+                if page_data is None:
+                    break
+                self.stats.pages += 1
+                yield page_data
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.stats.finish()
+            
+    async def _crawl_worker(
+        self,
+        frontier: CrawlFrontier,
+        results: asyncio.Queue,
+        base_domain: str
+    ):
+        """Take URLs off the frontier until cancelled"""
+        while True:
+            depth, url = await frontier.get()
+            try:
+                _, page_data = await self._process_url(url, base_domain)
+                if page_data:
+                    for related in page_data.related_pages:
+                        if related.startswith(base_domain):
+                            frontier.push(related, depth + 1)
+                    await results.put(page_data)
+            finally:
+                frontier.task_done()
+                
+    def _url_priority(self, url: str, depth: int) -> float:
+        """Frontier priority: depth, pulled ahead half a level for data-looking URLs"""
+        return depth - 0.5 if self.priority_pattern.search(url) else depth
+            
     async def _process_url(
         self,
         url: str,
@@ -319,32 +315,29 @@ class SmartCrawler:
                 
             # Fetch page content
             if self.driver and self.config.get('use_selenium', False):
-                page_content = await self._fetch_with_selenium(url)
+                body, encoding = await self._fetch_with_selenium(url), None
             else:
-                async with self.session.get(url) as response:
-                    if response.status != 200:
-                        return url, None
-                    page_content = await response.text()
-                    
-            soup = BeautifulSoup(page_content, 'html.parser')
-            
-            # Detect page features
-            features = await self._detect_features(soup, url)
-            
-            # Extract data based on features
-            extracted_data = await self._extract_data(soup, url, features)
-            
-            # Find related pages
-            related_pages = await self._find_related_pages(soup, url, base_domain)
+                fetched = await self._fetch(url)
+                if fetched is None:
+                    return url, None
+                body, encoding = fetched
+                
+            parsed = await self._parse(url, body, base_domain, encoding)
+            self.stats.parse_seconds += parsed['parse_seconds']
             
+            # Extract text from images
+            extracted_data = parsed['extracted_data']
+            if parsed['image_urls']:
+                extracted_data['image_text'] = await self._extract_image_text(parsed['image_urls'])
+                
             # Create page data
             page_data = PageData(
                 url=url,
-                title=soup.title.string if soup.title else "",
-                content_type=self._detect_content_type(soup),
-                features=features,
+                title=parsed['title'],
+                content_type=parsed['content_type'],
+                features=PageFeatures(**parsed['features']),
                 extracted_data=extracted_data,
-                related_pages=related_pages,
+                related_pages=parsed['related_pages'],
                 timestamp=datetime.utcnow()
             )
             
@@ -354,150 +347,69 @@ class SmartCrawler:
             self.logger.error(f"Error processing URL {url}: {e}")
             return url, None
             
+    async def _fetch(self, url: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        """
+        Fetch page body and charset within the host's politeness limits (None unless 200)
+        
+        Through the HTTP cache, fresh pages need no request and stale ones
+        are revalidated, so unchanged pages aren't downloaded again.
+        """
+        if self.http_cache is not None:
+            cached = self.http_cache.fresh(url)
+            if cached is not None:
+                return cached.body, cached.charset
+                
+        host = urlparse(url).netloc
+        async with self.politeness.slot(host):
+            async with self.stats.fetch(host):
+                if self.http_cache is not None:
+                    result = await self.http_cache.get(self.session, url)
+                    status, charset = result.status, result.charset
+                    body = result.body if status == 200 else None
+                    if not result.from_cache:
+                        self.stats.bytes += len(result.body)
+                else:
+                    async with self.session.get(url) as response:
+                        status, charset = response.status, response.charset
+                        body = await response.read() if status == 200 else None
+                        self.stats.bytes += len(body or b'')
+                self.stats.statuses[status] += 1
+                return (body, charset) if body is not None else None
+                    
+    async def _parse(self, url: str, body, base_domain: str, encoding: Optional[str] = None) -> Dict:
+        """page_parser.parse_page in the parse pool, or inline without one"""
+        if self.parse_pool is None:
+            return page_parser.parse_page(url, body, base_domain, encoding)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.parse_pool, page_parser.parse_page, url, body, base_domain, encoding
+        )
+        
+    async def _extract_image_text(self, image_urls: List[str]) -> Dict[str, str]:
+        """OCR text by image URL, for images that have any"""
+        image_text = {}
+        for img_url in image_urls:
+            text = await self.data_extractor.extract_text_with_ocr(img_url)
+            if text:
+                image_text[img_url] = text
+        return image_text
+            
     async def _fetch_with_selenium(self, url: str) -> str:
         """Fetch page content using Selenium for JavaScript rendering"""
-        try:
+        def render() -> str:
             self.driver.get(url)
             WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             return self.driver.page_source
+            
+        try:
+            async with self.politeness.slot(urlparse(url).netloc), self._driver_lock:
+                return await asyncio.to_thread(render)
         except Exception as e:
             self.logger.error(f"Error fetching with Selenium: {e}")
             return ""
             
-    async def _detect_features(
-        self,
-        soup: BeautifulSoup,
-        url: str
-    ) -> PageFeatures:
-        """Detect features present on the page"""
-        features = PageFeatures()
-        
-        # Detect tables
-        features.has_tables = bool(soup.find_all('table'))
-        
-        # Detect forms
-        features.has_forms = bool(soup.find_all('form'))
-        
-        # Detect maps
-        maps_detected = await self.data_extractor.extract_map_data(soup, url)
-        features.has_maps = bool(maps_detected)
-        
-        # Detect downloads
-        features.has_downloads = bool(
-            soup.find_all('a', href=re.compile(r'\.(pdf|doc|csv|xlsx?|zip)$'))
-        )
-        
-        # Detect search functionality
-        features.has_search = bool(
-            soup.find_all('input', {'type': 'search'}) or
-            soup.find_all('form', {'role': 'search'})
-        )
-        
-        # Detect pagination
-        features.has_pagination = bool(
-            soup.find_all('div', {'class': re.compile(r'pagination|pager')})
-        )
-        
-        # Detect API endpoints
-        api_endpoints = await self.data_extractor.extract_api_endpoints(soup, url)
-        features.has_api_endpoints = bool(api_endpoints)
-        
-        # Detect interactive elements
-        features.interactive_elements = [
-            elem.name for elem in soup.find_all(['button', 'select', 'input'])
-        ]
-        
-        # Detect frameworks
-        features.frameworks_detected = self.framework_detector.detect(soup)
-        
-        return features
-        
-    async def _extract_data(
-        self,
-        soup: BeautifulSoup,
-        url: str,
-        features: PageFeatures
-    ) -> Dict:
-        """Extract data based on detected features"""
-        data = {}
-        
-        # Extract table data
-        if features.has_tables:
-            data['tables'] = await self.data_extractor.extract_table_data(soup)
-            
-        # Extract form data
-        if features.has_forms:
-            data['forms'] = await self.data_extractor.extract_form_data(soup)
-            
-        # Extract map data
-        if features.has_maps:
-            data['maps'] = await self.data_extractor.extract_map_data(soup, url)
-            
-        # Extract API endpoints
-        if features.has_api_endpoints:
-            data['api_endpoints'] = await self.data_extractor.extract_api_endpoints(
-                soup,
-                url
-            )
-            
-        # Extract text from images
-        images = soup.find_all('img')
-        if images:
-            data['image_text'] = {}
-            for img in images[:5]:  # Limit to first 5 images
-                if 'src' in img.attrs:
-                    img_url = urljoin(url, img['src'])
-                    text = await self.data_extractor.extract_text_with_ocr(img_url)
-                    if text:
-                        data['image_text'][img_url] = text
-                        
-        return data
-        
-    async def _find_related_pages(
-        self,
-        soup: BeautifulSoup,
-        url: str,
-        base_domain: str
-    ) -> List[str]:
-        """Find related pages from the current page"""
-        related = []
-        
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            if not href:
-                continue
-                
-            full_url = urljoin(url, href)
-            parsed = urlparse(full_url)
-            
-            # Skip if different domain
-            if parsed.netloc and parsed.netloc not in base_domain:
-                continue
-                
-            # Skip non-web URLs
-            if not parsed.scheme in ['http', 'https']:
-                continue
-                
-            related.append(full_url)
-            
-        return related
-        
-    def _detect_content_type(self, soup: BeautifulSoup) -> str:
-        """Detect the type of content on the page"""
-        # Check for common page types
-        if soup.find('article'):
-            return 'article'
-        elif soup.find('form'):
-            return 'form'
-        elif soup.find('table'):
-            return 'data'
-        elif soup.find('div', {'class': re.compile(r'map|arcgis')}):
-            return 'map'
-        else:
-            return 'general'
-            
     def _build_graph(self, pages_data: Dict[str, PageData]):
         """Build a graph of page relationships"""
         for url, data in pages_data.items():
@@ -15,6 +15,8 @@ import hashlib
 import os
 import pickle
 
+from ..utils.http_cache import HTTPCache
+
 @dataclass
 class TaxMapMetadata:
     url: str
@@ -49,6 +51,7 @@ class TaxMapCrawler:
         ]
         self.max_depth = config.get('max_crawl_depth', 5)
         self.max_maps = config.get('max_maps', 1000)
+        self.http_cache = HTTPCache.shared(config.get('http_cache_dir'))
         os.makedirs(self.cache_dir, exist_ok=True)
         
     async def __aenter__(self):
@@ -124,6 +127,7 @@ class TaxMapCrawler:
                     self.logger.info(f"Reached max maps limit: {self.max_maps}")
                     break
                     
+            self.logger.info(f"HTTP cache: {self.http_cache.stats()}")
             return state.found_maps
             
         except Exception as e:
@@ -138,20 +142,20 @@ class TaxMapCrawler:
                 
             self.logger.debug(f"Processing URL: {url}")
             
-            async with self.session.get(url) as response:
-                if response.status != 200:
-                    return
-                    
-                text = await response.text()
-                soup = BeautifulSoup(text, 'html.parser')
+            # Unchanged pages come from the HTTP cache after a 304
+            response = await self.http_cache.get(self.session, url)
+            if response.status != 200:
+                return
                 
-                # Check if current page is a tax map
-                if await self._is_tax_map(url, soup):
-                    metadata = await self._extract_map_metadata(url, soup)
-                    state.found_maps[url] = metadata
-                    
-                # Find related maps and navigation links
-                await self._find_related_links(url, soup, state)
+            soup = BeautifulSoup(response.text(), 'html.parser')
+            
+            # Check if current page is a tax map
+            if await self._is_tax_map(url, soup):
+                metadata = await self._extract_map_metadata(url, soup)
+                state.found_maps[url] = metadata
+                
+            # Find related maps and navigation links
+            await self._find_related_links(url, soup, state)
                 
             state.visited_urls.add(url)
             
@@ -4,7 +4,6 @@ Collector for Vision Government Solutions assessment data
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional
-import requests
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -14,6 +13,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from .base_collector import BaseCollector
 from ..models.property_models import Property, Owner
 from ..utils.retry import retry_with_backoff
+from ..utils.http_cache import CachedSession, HTTPCache
 
 class VisionCollector(BaseCollector):
     """
@@ -25,7 +25,7 @@ class VisionCollector(BaseCollector):
         super().__init__(config)
         self.base_url = config.get('vision_url', 'https://gis.vgsi.com/brunswickme')
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.session = requests.Session()
+        self.session = CachedSession(HTTPCache.shared(config.get('http_cache_dir')))
         
         # Initialize Selenium for complex pages
         if config.get('use_selenium', False):
@@ -5,9 +5,11 @@ Think of this as the 'Finder' for properties
 from typing import Dict, List, Optional
 from datetime import datetime
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from ..models.property_models import Property, Owner, PropertyScore
 from ..services.db_service import DatabaseService
+from .search_index import PropertySearchIndex
+from .spatial_index import PropertySpatialIndex
 
 class PropertyFinder:
     """
@@ -18,6 +20,10 @@ class PropertyFinder:
     def __init__(self):
         self.db = DatabaseService()
         self.logger = logging.getLogger(self.__class__.__name__)
+        # One index of each kind per process, so each flush syncs them once
+        # however many finders exist
+        self.search_index = PropertySearchIndex.shared()
+        self.spatial_index = PropertySpatialIndex.shared()
 
     def quick_find(self, search_text: str) -> List[Dict]:
         """
@@ -44,6 +50,36 @@ class PropertyFinder:
             self.logger.error(f"Error in quick find: {str(e)}")
             return []
 
+    def find_in_bounds(self, lat1: float, lng1: float, lat2: float, lng2: float,
+                       zoom: Optional[int] = None, limit: int = 500) -> Dict:
+        """
+        Properties in a map viewport
+        Like zooming around in Maps - far out you see clusters, close in you see pins
+        """
+        try:
+            with self.db.session() as session:
+                found = self.spatial_index.query(session, (lat1, lng1, lat2, lng2),
+                                                 zoom=zoom, limit=limit)
+                if found is None:
+                    found = self._scan_bounds(session, (lat1, lng1, lat2, lng2), limit)
+
+                properties = []
+                if found['points']:
+                    rows = session.query(Property).options(selectinload(Property.scores)).filter(
+                        Property.id.in_(found['points'])
+                    ).all()
+                    properties = [self._format_map_point(p) for p in rows]
+
+                return {
+                    "properties": properties,
+                    "clusters": found['clusters'],
+                    "truncated": found['truncated']
+                }
+
+        except Exception as e:
+            self.logger.error(f"Error finding properties in bounds: {str(e)}")
+            return {"properties": [], "clusters": [], "truncated": False}
+
     def get_property_preview(self, property_id: int) -> Dict:
         """
         Quick preview of a property
@@ -190,27 +226,57 @@ class PropertyFinder:
             self.logger.error(f"Error in feature search: {str(e)}")
             return []
 
-    def _smart_search(self, session: Session, search_text: str) -> List[Dict]:
+    def _smart_search(self, session: Session, search_text: str, limit: int = 10) -> List[Dict]:
         """Smart search that looks everywhere"""
         try:
-            # Look for partial matches in addresses
-            address_matches = session.query(Property).filter(
-                Property.address.ilike(f"%{search_text}%")
-            ).limit(5).all()
-
-            # Look for owner names
-            owner_matches = session.query(Property).join(Owner).filter(
-                Owner.name.ilike(f"%{search_text}%")
-            ).limit(5).all()
+            # Ranked full-text match over addresses, owners and business names
+            property_ids = self.search_index.search(session, search_text, limit=limit)
+            if property_ids is None:
+                return self._scan_search(session, search_text)
 
-            # Combine and deduplicate results
-            all_properties = list(set(address_matches + owner_matches))
-            return [self._format_quick_result(p) for p in all_properties]
+            properties = session.query(Property).filter(Property.id.in_(property_ids)).all()
+            by_id = {p.id: p for p in properties}
+            return [self._format_quick_result(by_id[pid]) for pid in property_ids if pid in by_id]
 
         except Exception as e:
             self.logger.error(f"Error in smart search: {str(e)}")
             return []
 
+    def _scan_search(self, session: Session, search_text: str) -> List[Dict]:
+        """Unindexed fallback for text the search index can't match"""
+        # Look for partial matches in addresses
+        address_matches = session.query(Property).filter(
+            Property.address.ilike(f"%{search_text}%")
+        ).limit(5).all()
+
+        # Look for owner names
+        owner_matches = session.query(Property).join(Owner).filter(
+            Owner.name.ilike(f"%{search_text}%")
+        ).limit(5).all()
+
+        # Combine and deduplicate results
+        all_properties = list(set(address_matches + owner_matches))
+        return [self._format_quick_result(p) for p in all_properties]
+
+    def _scan_bounds(self, session: Session, bounds, limit: int) -> Dict:
+        """Unindexed fallback for databases without R*Tree support"""
+        lat1, lng1, lat2, lng2 = bounds
+        ids = [row.id for row in session.query(Property.id).filter(
+            Property.latitude.between(min(lat1, lat2), max(lat1, lat2)),
+            Property.longitude.between(min(lng1, lng2), max(lng1, lng2))
+        ).limit(limit + 1).all()]
+        return {"points": ids[:limit], "clusters": [], "truncated": len(ids) > limit}
+
+    def _format_map_point(self, property: Property) -> Dict:
+        """Format property for a map pin"""
+        return {
+            "id": property.id,
+            "address": property.address,
+            "latitude": property.latitude,
+            "longitude": property.longitude,
+            "score": property.scores[0].total_score if property.scores else None
+        }
+
     def _format_quick_result(self, property: Property) -> Dict:
         """Format property for quick search results"""
         try:
@@ -0,0 +1,259 @@
+"""
+Full-text search index for the property finder
+Keeps an SQLite FTS5 table of addresses, owner names and business names
+in step with the Property and Owner models
+"""
+import re
+import logging
+import threading
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from ..models.property_models import Property, Owner
+
+class PropertySearchIndex:
+    """
+    FTS5 shadow index over properties
+
+    One row per property (rowid = properties.id) holding its address and
+    its owner's name and business name. The trigram tokenizer gives the same
+    substring matching as ILIKE '%text%' but from the index; on SQLite
+    builds without trigram support it falls back to unicode61 with prefix
+    indexes. Rows are re-synced from the after_flush hook whenever an
+    indexed column changes, so the index commits or rolls back with the
+    session's own transaction.
+    """
+
+    TABLE = 'property_search'
+    COLUMNS = ('address', 'owner_name', 'business_name')
+    # bm25 weights per column: an address hit outranks an owner hit
+    COLUMN_WEIGHTS = (10.0, 5.0, 3.0)
+    PROPERTY_FIELDS = ('address', 'owner_id')
+    OWNER_FIELDS = ('name', 'business_name')
+    MIN_TRIGRAM_LENGTH = 3
+    SYNC_CHUNK_SIZE = 500
+
+    _shared: Optional['PropertySearchIndex'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, tokenizer: str = 'trigram'):
+        self.tokenizer = tokenizer
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._ready: Set[str] = set()
+
+    @classmethod
+    def shared(cls) -> 'PropertySearchIndex':
+        """The process-wide index, registered for session flushes once"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            cls._shared.register()
+            return cls._shared
+
+    def register(self):
+        """Keep the index in sync with every session flush"""
+        if not event.contains(Session, 'after_flush', self._after_flush):
+            event.listen(Session, 'after_flush', self._after_flush)
+
+    def unregister(self):
+        if event.contains(Session, 'after_flush', self._after_flush):
+            event.remove(Session, 'after_flush', self._after_flush)
+
+    def ensure(self, session: Session) -> bool:
+        """
+        Create and fill the index table if needed; returns False if unsupported
+
+        The build runs in its own committed transaction, since search
+        sessions are read-only and would roll it back on close. When the
+        session already holds uncommitted writes (the after_flush hook) the
+        build joins its transaction instead, as a second connection could
+        not write to the locked database, and the index is checked again
+        on the next call. An existing index is only trusted once its row
+        count matches the properties table.
+        """
+        bind = session.get_bind()
+        if bind.dialect.name != 'sqlite':
+            return False
+        if str(bind.url) in self._ready:
+            return True
+
+        conn = session.connection()
+        if conn.connection.dbapi_connection.in_transaction:
+            self._build(conn)
+            return True
+
+        with bind.begin() as build_conn:
+            self._build(build_conn)
+        self._ready.add(str(bind.url))
+        return True
+
+    def rebuild(self, session: Session) -> int:
+        """Repopulate the whole index from the properties and owners tables"""
+        return self._fill(session.connection())
+
+    def _build(self, conn):
+        """Create the index table, or rebuild it if it is out of step with properties"""
+        existing = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (self.TABLE,)
+        ).fetchone()
+
+        if existing:
+            if 'trigram' not in existing[0].lower():
+                self.tokenizer = 'unicode61'
+            indexed = conn.exec_driver_sql(f"SELECT COUNT(*) FROM {self.TABLE}").scalar()
+            if indexed == conn.exec_driver_sql("SELECT COUNT(*) FROM properties").scalar():
+                return
+        else:
+            self._create_table(conn)
+        self._fill(conn)
+
+    def _fill(self, conn) -> int:
+        conn.exec_driver_sql(f"DELETE FROM {self.TABLE}")
+        conn.exec_driver_sql(f"INSERT INTO {self.TABLE} (rowid, {', '.join(self.COLUMNS)}) {self._select_sql()}")
+        count = conn.exec_driver_sql(f"SELECT COUNT(*) FROM {self.TABLE}").scalar()
+        self.logger.info(f"Indexed {count} properties for search")
+        return count
+
+    def search(self, session: Session, search_text: str, limit: int = 10) -> Optional[List[int]]:
+        """
+        Property ids matching search_text, best match first
+
+        Returns None when the index cannot answer the query (non-SQLite
+        database, or text too short for trigrams) so the caller can fall
+        back to a LIKE scan.
+        """
+        if not self.ensure(session):
+            return None
+        expression = self._match_expression(search_text)
+        if expression is None:
+            return None
+
+        weights = ', '.join(str(weight) for weight in self.COLUMN_WEIGHTS)
+        rows = session.connection().exec_driver_sql(
+            f"SELECT rowid FROM {self.TABLE} WHERE {self.TABLE} MATCH ? "
+            f"ORDER BY bm25({self.TABLE}, {weights}) LIMIT ?",
+            (expression, limit)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def sync_properties(self, session: Session, property_ids: Iterable[int]):
+        """Re-index the given properties"""
+        self._sync(session, 'p.id', list(property_ids))
+
+    def sync_owners(self, session: Session, owner_ids: Iterable[int]):
+        """Re-index every property belonging to the given owners"""
+        self._sync(session, 'p.owner_id', list(owner_ids))
+
+    def remove_properties(self, session: Session, property_ids: Iterable[int]):
+        conn = session.connection()
+        for chunk in self._chunks(list(property_ids)):
+            conn.exec_driver_sql(
+                f"DELETE FROM {self.TABLE} WHERE rowid IN ({', '.join('?' for _ in chunk)})",
+                tuple(chunk)
+            )
+
+    def _after_flush(self, session: Session, flush_context):
+        """Collect changed properties/owners from the flush and re-index them"""
+        try:
+            if session.get_bind().dialect.name != 'sqlite':
+                return
+
+            property_ids, owner_ids, removed_ids = set(), set(), set()
+            for obj in session.new:
+                if isinstance(obj, Property):
+                    property_ids.add(obj.id)
+            for obj in session.dirty:
+                if isinstance(obj, Property) and self._changed(obj, self.PROPERTY_FIELDS):
+                    property_ids.add(obj.id)
+                elif isinstance(obj, Owner) and self._changed(obj, self.OWNER_FIELDS):
+                    owner_ids.add(obj.id)
+            for obj in session.deleted:
+                if isinstance(obj, Property):
+                    removed_ids.add(obj.id)
+
+            if not (property_ids or owner_ids or removed_ids):
+                return
+            if not self.ensure(session):
+                return
+
+            self.remove_properties(session, removed_ids)
+            self.sync_properties(session, property_ids)
+            self.sync_owners(session, owner_ids)
+
+        except Exception as e:
+            self.logger.error(f"Error syncing search index: {str(e)}")
+
+    def _sync(self, session: Session, key: str, ids: List[int]):
+        conn = session.connection()
+        for chunk in self._chunks(ids):
+            placeholders = ', '.join('?' for _ in chunk)
+            conn.exec_driver_sql(
+                f"DELETE FROM {self.TABLE} WHERE rowid IN "
+                f"(SELECT p.id FROM properties p WHERE {key} IN ({placeholders}))",
+                tuple(chunk)
+            )
+            conn.exec_driver_sql(
+                f"INSERT INTO {self.TABLE} (rowid, {', '.join(self.COLUMNS)}) "
+                f"{self._select_sql()} WHERE {key} IN ({placeholders})",
+                tuple(chunk)
+            )
+
+    def _create_table(self, conn):
+        columns = ', '.join(self.COLUMNS)
+        try:
+            conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE {self.TABLE} USING fts5({columns}, tokenize='{self.tokenizer}')"
+            )
+        except Exception as e:
+            # SQLite before 3.34 has no trigram tokenizer
+            self.logger.warning(f"Falling back to unicode61 search index: {str(e)}")
+            self.tokenizer = 'unicode61'
+            conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE {self.TABLE} USING fts5({columns}, prefix='2 3 4')"
+            )
+
+    def _match_expression(self, search_text: str) -> Optional[str]:
+        """
+        Build an FTS5 query: the whole text as a phrase, OR every word
+
+        Each word is quoted so punctuation in addresses ("12-A", "O'Brien")
+        is not parsed as FTS syntax. With trigrams, words shorter than three
+        characters cannot be matched on their own and are only used inside
+        the phrase.
+        """
+        text = ' '.join(search_text.split())
+        words = text.split(' ')
+        if self.tokenizer == 'trigram':
+            if len(text) < self.MIN_TRIGRAM_LENGTH:
+                return None
+            phrase = self._quote(text)
+            terms = [self._quote(word) for word in words if len(word) >= self.MIN_TRIGRAM_LENGTH]
+        else:
+            terms = [self._quote(word) + '*' for word in re.findall(r'\w+', text)]
+            if not terms:
+                return None
+            phrase = ' '.join(terms)
+
+        if len(words) == 1 or not terms:
+            return phrase
+        return f"({phrase}) OR ({' AND '.join(terms)})"
+
+    def _select_sql(self) -> str:
+        return (
+            "SELECT p.id, p.address, o.name, o.business_name "
+            "FROM properties p LEFT JOIN owners o ON o.id = p.owner_id"
+        )
+
+    def _changed(self, obj, fields) -> bool:
+        state = inspect(obj)
+        return any(state.attrs[field].history.has_changes() for field in fields)
+
+    def _chunks(self, ids: List[int]):
+        for start in range(0, len(ids), self.SYNC_CHUNK_SIZE):
+            yield ids[start:start + self.SYNC_CHUNK_SIZE]
+
+    @staticmethod
+    def _quote(term: str) -> str:
+        return '"' + term.replace('"', '""') + '"'
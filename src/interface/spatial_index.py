@@ -0,0 +1,292 @@
+"""
+Spatial index for the property map
+Keeps an SQLite R*Tree of property coordinates, plus per-zoom cluster
+counts, in step with the Property model
+"""
+import math
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from ..models.property_models import Property
+
+class PropertySpatialIndex:
+    """
+    R*Tree shadow index over property locations
+
+    One R*Tree entry per geocoded property (id = properties.id) answers
+    point queries. For wide views a second table holds, for every zoom below
+    MAX_CLUSTER_ZOOM, a count and coordinate sums per grid cell, so a
+    clustered viewport reads a few hundred cells instead of aggregating
+    every parcel in view. The grid is anchored to the globe rather than the
+    viewport, so clusters stay put while the map pans.
+
+    Both tables are re-synced from the after_flush hook, like the search
+    index. Cluster sums are taken from the R*Tree's stored coordinates so
+    that removing an entry subtracts exactly what adding it added.
+    """
+
+    TABLE = 'property_locations'
+    CLUSTER_TABLE = 'property_location_clusters'
+    FIELDS = ('latitude', 'longitude')
+    # Clustering grid: cells per 256px web-mercator tile at a given zoom
+    CELLS_PER_TILE = 4
+    # Approximate cells across the viewport when no zoom is given
+    DEFAULT_GRID_CELLS = 16
+    # At or above this zoom points are never clustered, only capped
+    MAX_CLUSTER_ZOOM = 17
+    SYNC_CHUNK_SIZE = 500
+
+    _shared: Optional['PropertySpatialIndex'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._ready: Set[str] = set()
+
+    @classmethod
+    def shared(cls) -> 'PropertySpatialIndex':
+        """The process-wide index, registered for session flushes once"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            cls._shared.register()
+            return cls._shared
+
+    def register(self):
+        """Keep the index in sync with every session flush"""
+        if not event.contains(Session, 'after_flush', self._after_flush):
+            event.listen(Session, 'after_flush', self._after_flush)
+
+    def unregister(self):
+        if event.contains(Session, 'after_flush', self._after_flush):
+            event.remove(Session, 'after_flush', self._after_flush)
+
+    def ensure(self, session: Session) -> bool:
+        """
+        Create and fill the index tables if needed; returns False if unsupported
+
+        Built in its own committed transaction, or in the session's when it
+        already holds writes, as the search index does.
+        """
+        bind = session.get_bind()
+        if bind.dialect.name != 'sqlite':
+            return False
+        if str(bind.url) in self._ready:
+            return True
+
+        conn = session.connection()
+        if conn.connection.dbapi_connection.in_transaction:
+            self._build(conn)
+            return True
+
+        with bind.begin() as build_conn:
+            self._build(build_conn)
+        self._ready.add(str(bind.url))
+        return True
+
+    def rebuild(self, session: Session) -> int:
+        """Repopulate the index from the properties table"""
+        return self._fill(session.connection())
+
+    def _build(self, conn):
+        """Create the index tables, or rebuild them if out of step with properties"""
+        existing = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (self.TABLE,)
+        ).fetchone()
+        if existing:
+            indexed = conn.exec_driver_sql(f"SELECT COUNT(*) FROM {self.TABLE}").scalar()
+            located = conn.exec_driver_sql(
+                "SELECT COUNT(*) FROM properties WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+            ).scalar()
+            if indexed == located:
+                return
+        else:
+            conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE {self.TABLE} USING rtree(id, min_lat, max_lat, min_lng, max_lng)"
+            )
+            conn.exec_driver_sql(
+                f"CREATE TABLE {self.CLUSTER_TABLE} ("
+                f"zoom INTEGER, cell_lat INTEGER, cell_lng INTEGER, "
+                f"count INTEGER, sum_lat REAL, sum_lng REAL, "
+                f"PRIMARY KEY (zoom, cell_lat, cell_lng)) WITHOUT ROWID"
+            )
+        self._fill(conn)
+
+    def _fill(self, conn) -> int:
+        conn.exec_driver_sql(f"DELETE FROM {self.TABLE}")
+        conn.exec_driver_sql(f"DELETE FROM {self.CLUSTER_TABLE}")
+        conn.exec_driver_sql(
+            f"INSERT INTO {self.TABLE} {self._select_sql()} "
+            f"WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+        )
+        self._adjust_clusters(conn, None, 1)
+        count = conn.exec_driver_sql(f"SELECT COUNT(*) FROM {self.TABLE}").scalar()
+        self.logger.info(f"Indexed {count} property locations")
+        return count
+
+    def query(
+        self,
+        session: Session,
+        bounds: Tuple[float, float, float, float],
+        zoom: Optional[int] = None,
+        limit: int = 500
+    ) -> Optional[Dict]:
+        """
+        Points or clusters inside (lat1, lng1, lat2, lng2)
+
+        Returns {'points': [property ids], 'clusters': [...], 'truncated'}.
+        Points are returned when at most limit properties are in view (or
+        zoom >= MAX_CLUSTER_ZOOM, where the first limit are returned and
+        truncated is set). Otherwise the view is clustered on the grid for
+        zoom, or for the zoom that fits the viewport when zoom is not given;
+        each cluster carries its grid cell as bounds. Returns None when the
+        index is unavailable.
+        """
+        if not self.ensure(session):
+            return None
+
+        lat_lo, lng_lo, lat_hi, lng_hi = self._normalise(bounds)
+        conn = session.connection()
+        # R*Tree stores float32 boxes, so test for overlap rather than containment
+        ids = [row[0] for row in conn.exec_driver_sql(
+            f"SELECT id FROM {self.TABLE} "
+            f"WHERE max_lat >= ? AND min_lat <= ? AND max_lng >= ? AND min_lng <= ? LIMIT ?",
+            (lat_lo, lat_hi, lng_lo, lng_hi, limit + 1)
+        ).fetchall()]
+        if len(ids) <= limit:
+            return {'points': ids, 'clusters': [], 'truncated': False}
+        if zoom is None:
+            zoom = self._fit_zoom(lng_hi - lng_lo)
+        if zoom >= self.MAX_CLUSTER_ZOOM:
+            return {'points': ids[:limit], 'clusters': [], 'truncated': True}
+
+        zoom = max(zoom, 0)
+        cell = self._cell_size(zoom)
+        rows = conn.exec_driver_sql(
+            f"SELECT cell_lat, cell_lng, count, sum_lat, sum_lng FROM {self.CLUSTER_TABLE} "
+            f"WHERE zoom = ? AND cell_lat BETWEEN ? AND ? AND cell_lng BETWEEN ? AND ? "
+            f"ORDER BY count DESC LIMIT ?",
+            (zoom, self._cell(lat_lo + 90.0, cell), self._cell(lat_hi + 90.0, cell),
+             self._cell(lng_lo + 180.0, cell), self._cell(lng_hi + 180.0, cell), limit + 1)
+        ).fetchall()
+
+        clusters = [
+            {
+                'count': count,
+                'latitude': sum_lat / count,
+                'longitude': sum_lng / count,
+                'bounds': [cell_lat * cell - 90.0, cell_lng * cell - 180.0,
+                           (cell_lat + 1) * cell - 90.0, (cell_lng + 1) * cell - 180.0]
+            }
+            for cell_lat, cell_lng, count, sum_lat, sum_lng in rows[:limit]
+        ]
+        return {'points': [], 'clusters': clusters, 'truncated': len(rows) > limit}
+
+    def sync_properties(self, session: Session, property_ids: Iterable[int]):
+        """Re-index the given properties"""
+        conn = session.connection()
+        for chunk in self._chunks(list(property_ids)):
+            self._remove(conn, chunk)
+            placeholders = ', '.join('?' for _ in chunk)
+            conn.exec_driver_sql(
+                f"INSERT INTO {self.TABLE} {self._select_sql()} "
+                f"WHERE latitude IS NOT NULL AND longitude IS NOT NULL AND id IN ({placeholders})",
+                chunk
+            )
+            self._adjust_clusters(conn, chunk, 1)
+
+    def remove_properties(self, session: Session, property_ids: Iterable[int]):
+        conn = session.connection()
+        for chunk in self._chunks(list(property_ids)):
+            self._remove(conn, chunk)
+
+    def _remove(self, conn, chunk: Tuple[int, ...]):
+        self._adjust_clusters(conn, chunk, -1)
+        conn.exec_driver_sql(
+            f"DELETE FROM {self.TABLE} WHERE id IN ({', '.join('?' for _ in chunk)})", chunk
+        )
+
+    def _adjust_clusters(self, conn, chunk: Optional[Tuple[int, ...]], sign: int):
+        """Add (sign=1) or subtract (sign=-1) R*Tree entries from every zoom's cell counts"""
+        where, params = "WHERE 1", ()
+        if chunk is not None:
+            where, params = f"WHERE id IN ({', '.join('?' for _ in chunk)})", chunk
+
+        for zoom in range(self.MAX_CLUSTER_ZOOM):
+            cell = self._cell_size(zoom)
+            conn.exec_driver_sql(
+                f"INSERT INTO {self.CLUSTER_TABLE} (zoom, cell_lat, cell_lng, count, sum_lat, sum_lng) "
+                f"SELECT ?, CAST((min_lat + 90.0) / ? AS INTEGER), CAST((min_lng + 180.0) / ? AS INTEGER), "
+                f"? * COUNT(*), ? * SUM(min_lat), ? * SUM(min_lng) FROM {self.TABLE} {where} "
+                f"GROUP BY 2, 3 "
+                f"ON CONFLICT (zoom, cell_lat, cell_lng) DO UPDATE SET "
+                f"count = count + excluded.count, "
+                f"sum_lat = sum_lat + excluded.sum_lat, "
+                f"sum_lng = sum_lng + excluded.sum_lng",
+                (zoom, cell, cell, sign, sign, sign) + params
+            )
+        if sign < 0:
+            conn.exec_driver_sql(f"DELETE FROM {self.CLUSTER_TABLE} WHERE count <= 0")
+
+    def _after_flush(self, session: Session, flush_context):
+        """Re-index properties whose coordinates were added, moved or removed"""
+        try:
+            if session.get_bind().dialect.name != 'sqlite':
+                return
+
+            changed, removed = set(), set()
+            for obj in session.new:
+                if isinstance(obj, Property):
+                    changed.add(obj.id)
+            for obj in session.dirty:
+                if isinstance(obj, Property) and self._moved(obj):
+                    changed.add(obj.id)
+            for obj in session.deleted:
+                if isinstance(obj, Property):
+                    removed.add(obj.id)
+
+            if not (changed or removed):
+                return
+            if not self.ensure(session):
+                return
+
+            self.remove_properties(session, removed)
+            self.sync_properties(session, changed)
+
+        except Exception as e:
+            self.logger.error(f"Error syncing spatial index: {str(e)}")
+
+    def _cell_size(self, zoom: int) -> float:
+        """Cluster cell width in degrees"""
+        return 360.0 / (2 ** zoom) / self.CELLS_PER_TILE
+
+    def _fit_zoom(self, lng_span: float) -> int:
+        """Zoom whose grid puts about DEFAULT_GRID_CELLS cells across the view"""
+        cells = 360.0 / max(lng_span, 1e-9) * self.DEFAULT_GRID_CELLS / self.CELLS_PER_TILE
+        return max(0, int(math.log2(cells)))
+
+    def _moved(self, obj) -> bool:
+        state = inspect(obj)
+        return any(state.attrs[field].history.has_changes() for field in self.FIELDS)
+
+    def _chunks(self, ids: List[int]):
+        for start in range(0, len(ids), self.SYNC_CHUNK_SIZE):
+            yield tuple(ids[start:start + self.SYNC_CHUNK_SIZE])
+
+    @staticmethod
+    def _cell(offset: float, cell: float) -> int:
+        return int(offset / cell)
+
+    @staticmethod
+    def _normalise(bounds: Tuple[float, float, float, float]) -> Tuple[float, float, float, float]:
+        """Accept corners in either order: returns (lat_lo, lng_lo, lat_hi, lng_hi)"""
+        lat1, lng1, lat2, lng2 = bounds
+        return min(lat1, lat2), min(lng1, lng2), max(lat1, lat2), max(lng1, lng2)
+
+    @staticmethod
+    def _select_sql() -> str:
+        return "SELECT id, latitude, latitude, longitude, longitude FROM properties"
@@ -6,16 +6,9 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
-from transformers import (
-    pipeline,
-    AutoModelForSequenceClassification,
-    AutoTokenizer
-)
-import spacy
 from textblob import TextBlob
 import re
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from gensim.models import Word2Vec
 from gensim.models.doc2vec import Doc2Vec, TaggedDocument
 from nltk.tokenize import word_tokenize, sent_tokenize
@@ -23,6 +16,10 @@ from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 import json
 
+from .model_pool import ModelPool
+from .embedding_index import EmbeddingIndex
+from .nlp_cache import NLPResultCache, NullResultCache
+
 class AdvancedTextAnalyzer:
     """
     Advanced text analysis including:
@@ -35,17 +32,23 @@ class AdvancedTextAnalyzer:
     7. Comparative analysis
     """
     
-    def __init__(self, config: Dict = None):
+    def __init__(self,
+                 config: Dict = None,
+                 model_pool: Optional[ModelPool] = None,
+                 result_cache: Optional[NLPResultCache] = None):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.config = config or {}
         
+        # NLP models load on first use and are shared process-wide
+        self.model_pool = model_pool or ModelPool.shared()
+        
         # Initialize NLP components
-        self.nlp = spacy.load('en_core_web_sm')
         self.lemmatizer = WordNetLemmatizer()
         self.stop_words = set(stopwords.words('english'))
         
         # Initialize models
         self._initialize_models()
+        self._embedding_index = None
         
         # Configure analysis parameters
         self.params = {
@@ -53,11 +56,84 @@ class AdvancedTextAnalyzer:
             'max_summary_length': 200,
             'similarity_threshold': 0.7,
             'min_topic_coherence': 0.6,
-            'max_topics': 10
+            'max_topics': 10,
+            'spacy_model': 'en_core_web_sm',
+            'classifier_model': 'distilbert-base-uncased',
+            'sentiment_model': 'distilbert-base-uncased-finetuned-sst-2-english',
+            'summarization_model': 'facebook/bart-large-cnn',
+            'model_backend': 'pytorch',     # 'pytorch', 'quantized' or 'onnx'
+            'nlp_batch_size': 64,           # Documents per nlp.pipe batch
+            'nlp_processes': 1,             # nlp.pipe worker processes
+            'inference_batch_size': 16,     # Texts per transformers forward pass
+            'max_sequence_length': 256,     # Tokens per text when embedding
+            'max_highlights': 3,            # Sentences returned per search hit
+            'search_probes': 8,             # IVF lists scanned per query
+            'search_ivf_min_rows': 50000,   # Index size at which search turns approximate
+            'nlp_cache_max_bytes': 512 * 2 ** 20
         }
         
-        if 'text_params' in config:
-            self.params.update(config['text_params'])
+        if 'text_params' in self.config:
+            self.params.update(self.config['text_params'])
+        
+        # Per-text results are cached across runs when nlp_cache_path is set
+        if result_cache is None:
+            cache_path = self.config.get('nlp_cache_path')
+            result_cache = NLPResultCache(
+                cache_path,
+                max_bytes=self.params['nlp_cache_max_bytes']
+            ) if cache_path else NullResultCache()
+        self.result_cache = result_cache
+
+    @property
+    def nlp(self):
+        return self.model_pool.spacy(self.params['spacy_model'])
+
+    @property
+    def tokenizer(self):
+        return self.model_pool.tokenizer(self.params['classifier_model'])
+
+    @property
+    def model(self):
+        return self.model_pool.sequence_classifier(
+            self.params['classifier_model'],
+            self.params['model_backend']
+        )
+
+    @property
+    def encoder(self):
+        """Headless classifier model used for embeddings, on any backend"""
+        return self.model_pool.encoder(
+            self.params['classifier_model'],
+            self.params['model_backend']
+        )
+
+    @property
+    def sentiment_pipeline(self):
+        return self.model_pool.pipeline(
+            'sentiment-analysis',
+            self.params['sentiment_model'],
+            self.params['model_backend']
+        )
+
+    @property
+    def summarization_pipeline(self):
+        return self.model_pool.pipeline(
+            'summarization',
+            self.params['summarization_model'],
+            self.params['model_backend']
+        )
+
+    @property
+    def embedding_index(self) -> EmbeddingIndex:
+        """Document embeddings, persisted under embedding_index_dir when configured"""
+        if self._embedding_index is None:
+            self._embedding_index = EmbeddingIndex(
+                self.config.get('embedding_index_dir'),
+                model=f"{self.params['classifier_model']}:{self.params['model_backend']}",
+                n_probe=self.params['search_probes'],
+                ivf_min_rows=self.params['search_ivf_min_rows']
+            )
+        return self._embedding_index
 
     def analyze_property_content(self, properties: List[Dict]) -> Dict:
         """
@@ -142,71 +218,128 @@ class AdvancedTextAnalyzer:
         Extract and classify entities from text
         """
         try:
-            entities = {
-                'people': [],
-                'organizations': [],
-                'locations': [],
-                'dates': [],
-                'money': [],
-                'percentages': [],
-                'other': []
-            }
-            
-            # Process with spaCy
-            doc = self.nlp(text)
-            
-            # Extract entities
-            for ent in doc.ents:
-                if ent.label_ in ['PERSON']:
-                    entities['people'].append({
-                        'text': ent.text,
-                        'start': ent.start_char,
-                        'end': ent.end_char
-                    })
-                elif ent.label_ in ['ORG']:
-                    entities['organizations'].append({
-                        'text': ent.text,
-                        'start': ent.start_char,
-                        'end': ent.end_char
-                    })
-                elif ent.label_ in ['GPE', 'LOC']:
-                    entities['locations'].append({
-                        'text': ent.text,
-                        'start': ent.start_char,
-                        'end': ent.end_char
-                    })
-                elif ent.label_ in ['DATE']:
-                    entities['dates'].append({
-                        'text': ent.text,
-                        'start': ent.start_char,
-                        'end': ent.end_char
-                    })
-                elif ent.label_ in ['MONEY']:
-                    entities['money'].append({
-                        'text': ent.text,
-                        'start': ent.start_char,
-                        'end': ent.end_char
-                    })
-                elif ent.label_ in ['PERCENT']:
-                    entities['percentages'].append({
-                        'text': ent.text,
-                        'start': ent.start_char,
-                        'end': ent.end_char
-                    })
-                else:
-                    entities['other'].append({
-                        'text': ent.text,
-                        'label': ent.label_,
-                        'start': ent.start_char,
-                        'end': ent.end_char
-                    })
-            
-            return entities
+            return self._cached_entities([text])[0]
             
         except Exception as e:
             self.logger.error(f"Error extracting entities: {str(e)}")
             return {}
 
+    def extract_entities_batch(self, texts: List[str]) -> List[Dict]:
+        """
+        Extract and classify entities from many texts in batched spaCy passes
+        """
+        try:
+            return self._cached_entities(texts)
+
+        except Exception as e:
+            self.logger.error(f"Error extracting entities: {str(e)}")
+            return []
+
+    def summarize_texts(self, texts: List[str]) -> List[str]:
+        """
+        Summarize texts in batched forward passes
+        """
+        try:
+            return self.result_cache.cached(
+                self._transformer_key(self.params['summarization_model'], self.params['max_summary_length']),
+                'summary',
+                texts,
+                lambda uncached: [
+                    summary['summary_text']
+                    for summary in self.summarization_pipeline(
+                        uncached,
+                        batch_size=self.params['inference_batch_size'],
+                        max_length=self.params['max_summary_length'],
+                        truncation=True
+                    )
+                ]
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error summarizing texts: {str(e)}")
+            return []
+
+    def _cached_entities(self, texts: List[str]) -> List[Dict]:
+        """Entities per text, parsing only text not already in the result cache"""
+        def parse(uncached: List[str]) -> List[Dict]:
+            docs = self.nlp.pipe(
+                uncached,
+                batch_size=self.params['nlp_batch_size'],
+                n_process=self.params['nlp_processes']
+            )
+            return [self._classify_entities(doc) for doc in docs]
+        
+        return self.result_cache.cached(
+            NLPResultCache.model_key(self.params['spacy_model'], self.params['spacy_model'], 'spacy'),
+            'entities',
+            texts,
+            parse
+        )
+
+    def _transformer_key(self, model: str, *settings) -> str:
+        """Result cache model key for a transformers model on the configured backend"""
+        name = ':'.join(str(part) for part in (model, self.params['model_backend'], *settings))
+        return NLPResultCache.model_key(name, 'transformers')
+
+    def _classify_entities(self, doc) -> Dict:
+        """Group a parsed document's entities by kind"""
+        entities = {
+            'people': [],
+            'organizations': [],
+            'locations': [],
+            'dates': [],
+            'money': [],
+            'percentages': [],
+            'other': []
+        }
+
+        for ent in doc.ents:
+            if ent.label_ in ['PERSON']:
+                entities['people'].append({
+                    'text': ent.text,
+                    'start': ent.start_char,
+                    'end': ent.end_char
+                })
+            elif ent.label_ in ['ORG']:
+                entities['organizations'].append({
+                    'text': ent.text,
+                    'start': ent.start_char,
+                    'end': ent.end_char
+                })
+            elif ent.label_ in ['GPE', 'LOC']:
+                entities['locations'].append({
+                    'text': ent.text,
+                    'start': ent.start_char,
+                    'end': ent.end_char
+                })
+            elif ent.label_ in ['DATE']:
+                entities['dates'].append({
+                    'text': ent.text,
+                    'start': ent.start_char,
+                    'end': ent.end_char
+                })
+            elif ent.label_ in ['MONEY']:
+                entities['money'].append({
+                    'text': ent.text,
+                    'start': ent.start_char,
+                    'end': ent.end_char
+                })
+            elif ent.label_ in ['PERCENT']:
+                entities['percentages'].append({
+                    'text': ent.text,
+                    'start': ent.start_char,
+                    'end': ent.end_char
+                })
+            else:
+                entities['other'].append({
+                    'text': ent.text,
+                    'label': ent.label_,
+                    'start': ent.start_char,
+                    'end': ent.end_char
+                })
+        
+        return entities
+
     def analyze_topics(self, texts: List[str]) -> Dict:
         """
         Analyze topics in text collection
@@ -251,43 +384,37 @@ class AdvancedTextAnalyzer:
 
     def semantic_search(self,
                        query: str,
-                       documents: List[Dict],
+                       documents: Optional[List[Dict]] = None,
                        top_k: int = 5) -> List[Dict]:
         """
         Perform semantic search over documents
+        
+        Documents are embedded into the persistent embedding index, so only
+        new or changed content is encoded. Without documents the search runs
+        over everything indexed so far and results carry just the document_id.
         """
         try:
             results = []
             
-            # Encode query
-            query_embedding = self._encode_text(query)
+            # Index documents; unchanged content is not re-encoded
+            keyed = self.index_documents(documents) if documents is not None else None
             
-            # Encode documents
-            doc_embeddings = [
-                self._encode_text(doc.get('content', ''))
-                for doc in documents
-            ]
-            
-            # Calculate similarities
-            similarities = [
-                cosine_similarity(
-                    query_embedding.reshape(1, -1),
-                    doc_emb.reshape(1, -1)
-                )[0][0]
-                for doc_emb in doc_embeddings
-            ]
-            
-            # Get top results
-            top_indices = np.argsort(similarities)[-top_k:][::-1]
+            # Encode query and search the index
+            hits = self.embedding_index.search(
+                self._encode_text(query),
+                top_k,
+                doc_ids=list(keyed) if keyed is not None else None
+            )
             
-            for idx in top_indices:
+            for doc_id, score in hits:
+                document = keyed[doc_id] if keyed is not None else {'document_id': doc_id}
                 results.append({
-                    'document': documents[idx],
-                    'score': float(similarities[idx]),
+                    'document': document,
+                    'score': score,
                     'highlights': self._get_highlights(
                         query,
-                        documents[idx].get('content', '')
-                    )
+                        document['content']
+                    ) if 'content' in document else []
                 })
             
             return results
@@ -296,6 +423,26 @@ class AdvancedTextAnalyzer:
             self.logger.error(f"Error performing semantic search: {str(e)}")
             return []
 
+    def index_documents(self, documents: List[Dict]) -> Dict:
+        """
+        Add or refresh documents in the embedding index
+        
+        Documents are keyed by document_id, or by content hash when they
+        have none. Returns the documents by key.
+        """
+        keyed = {}
+        for doc in documents:
+            content = doc.get('content', '')
+            keyed.setdefault(doc.get('document_id') or self.embedding_index.content_hash(content), doc)
+        
+        encoded = self.embedding_index.update(
+            {key: doc.get('content', '') for key, doc in keyed.items()},
+            self._encode_texts
+        )
+        if encoded:
+            self.logger.info(f"Encoded {encoded} new or changed documents")
+        return keyed
+
     def detect_trends(self, texts: List[Dict]) -> Dict:
         """
         Detect trends in text data over time
@@ -364,23 +511,8 @@ class AdvancedTextAnalyzer:
     def _initialize_models(self):
         """Initialize NLP models"""
         try:
-            # Initialize transformers
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                'distilbert-base-uncased'
-            )
-            self.model = AutoModelForSequenceClassification.from_pretrained(
-                'distilbert-base-uncased'
-            )
-            
-            # Initialize pipelines
-            self.sentiment_pipeline = pipeline(
-                'sentiment-analysis',
-                model='distilbert-base-uncased-finetuned-sst-2-english'
-            )
-            self.summarization_pipeline = pipeline(
-                'summarization',
-                model='facebook/bart-large-cnn'
-            )
+            # Transformer models are not loaded here; see the properties
+            # above, which fetch them from the model pool on first use
             
             # Initialize Word2Vec model
             self.word2vec = Word2Vec(
@@ -393,6 +525,53 @@ class AdvancedTextAnalyzer:
         except Exception as e:
             self.logger.error(f"Error initializing models: {str(e)}")
 
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Mean-pooled final hidden states of the classifier model, one row per text
+        
+        Not result-cached: document vectors are persisted by the embedding
+        index, which only asks for new or changed content.
+        """
+        import torch
+        
+        vectors = []
+        batch_size = self.params['inference_batch_size']
+        for start in range(0, len(texts), batch_size):
+            batch = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.params['max_sequence_length'],
+                return_tensors='pt'
+            )
+            with torch.no_grad():
+                hidden = self.encoder(**batch).last_hidden_state
+            mask = batch['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            vectors.append(pooled.numpy().astype(np.float32))
+        
+        return np.vstack(vectors)
+
+    def _encode_text(self, text: str) -> np.ndarray:
+        return self._encode_texts([text])[0]
+
+    def _get_highlights(self, query: str, content: str) -> List[str]:
+        """Sentences of content sharing the most terms with query, in document order"""
+        terms = set(re.findall(r'\w+', query.lower())) - self.stop_words
+        if not terms:
+            return []
+        
+        sentences = [s.strip() for s in re.split(r'(?<=[.!?])\s+|\n+', content) if s.strip()]
+        scored = [
+            (len(terms & set(re.findall(r'\w+', sentence.lower()))), i)
+            for i, sentence in enumerate(sentences)
+        ]
+        best = sorted(
+            (item for item in scored if item[0]),
+            key=lambda item: (-item[0], item[1])
+        )[:self.params['max_highlights']]
+        return [sentences[i] for _, i in sorted(best, key=lambda item: item[1])]
+
     def _preprocess_text(self, text: str) -> str:
         """Preprocess text for analysis"""
         try:
@@ -0,0 +1,251 @@
+"""
+Incremental anomaly scoring against a persisted IsolationForest
+"""
+import logging
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import IsolationForest, RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from .model_registry import ModelRegistry
+
+class AnomalyService:
+    """
+    Scores only new or changed properties between runs
+
+    Each run fingerprints every property's feature row. Rows whose
+    fingerprint matches the last run keep their stored score; the rest are
+    scored against the persisted model. The model is refitted on the full
+    feature set only when it is missing, older than refit_days, or when
+    the changed rows have drifted from the training data: their anomaly
+    rate exceeds drift_rate_factor x contamination, or a feature mean has
+    moved more than drift_mean_shift training standard deviations.
+
+    The model and scaler live in the registry under 'anomaly'; fingerprints
+    and scores of the properties in the latest run are kept in state_path
+    between processes. Fits are promoted only with promote, and scheduled
+    or drift refits never replace a version an operator rolled back to;
+    unpromoted fits are registered while the active version keeps scoring.
+    """
+
+    MODEL_NAME = 'anomaly'
+
+    def __init__(self,
+                 registry: Optional[ModelRegistry] = None,
+                 state_path: Optional[str] = None,
+                 config: Dict = None,
+                 promote: bool = True):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.registry = registry
+        self.promote = promote
+        self.state_path = Path(state_path) if state_path else None
+        self.config = config or {}
+
+        self.params = {
+            'contamination': 0.1,
+            'refit_days': 7,
+            'min_drift_rows': 50,
+            'drift_rate_factor': 3.0,
+            'drift_mean_shift': 0.5,
+            'feature_importance': False    # Fit the RandomForest explainer on refit
+        }
+        self.params.update(self.config)
+
+        self.model = None
+        self.scaler = None
+        self.reference: Dict = {}
+        self.fitted_at: Optional[datetime] = None
+        self.version: Optional[str] = None
+        self.feature_importance: Dict = {}
+        self.state: Optional[pd.DataFrame] = None
+
+    def score(self, features: pd.DataFrame) -> pd.DataFrame:
+        """
+        Scores for every row of features (indexed by property_id)
+
+        Returns a frame with score (higher is more anomalous), label (-1
+        for anomalies, 1 otherwise) and changed (scored this run).
+        """
+        fingerprints = pd.Series(
+            pd.util.hash_pandas_object(features, index=False).values, index=features.index
+        )
+        self._load()
+
+        if self._refit_due():
+            self._refit(features)
+
+        state = self._current_state()
+        known = fingerprints.index.isin(state.index)
+        changed = ~known
+        if known.any():
+            changed[known] = state.loc[fingerprints.index[known], 'fingerprint'].values != fingerprints[known].values
+
+        scores = self._score_rows(features[changed])
+        if self._drifted(features[changed], scores):
+            self.logger.info(f"Anomaly drift in {int(changed.sum())} changed properties; refitting")
+            self._refit(features)
+            changed = np.ones(len(features), dtype=bool)
+            scores = self._score_rows(features)
+
+        # Stored rows for unchanged properties, fresh scores for the rest
+        result = state.reindex(features.index)[['score', 'label']]
+        result.loc[changed, ['score', 'label']] = scores[['score', 'label']].values
+        result['label'] = result['label'].astype(int)
+        result['changed'] = changed
+
+        # Properties no longer in the feature set drop out of the state
+        self.state = result[['score', 'label']].assign(fingerprint=fingerprints.values)
+        self._save_state()
+        return result
+
+    def fit(self, features: pd.DataFrame, explain: Optional[bool] = None,
+            data_hash: Optional[str] = None, promote: Optional[bool] = None) -> Dict:
+        """
+        Refit the scaler and IsolationForest on the full feature set
+
+        promote defaults to the service's promote setting. An unpromoted
+        fit is registered, but the active version keeps scoring.
+        """
+        promote = self.promote if promote is None else promote
+        scaler = StandardScaler()
+        scaled = scaler.fit_transform(features)
+        model = IsolationForest(contamination=self.params['contamination'], random_state=42)
+        model.fit(scaled)
+
+        self.model, self.scaler = model, scaler
+        self.reference = {
+            'mean': features.mean().to_dict(),
+            'std': features.std(ddof=0).replace(0, 1).fillna(1).to_dict()
+        }
+        self.fitted_at = datetime.now()
+        self.feature_importance = {}
+
+        if explain if explain is not None else self.params['feature_importance']:
+            # Which features separate the forest's anomalies from the rest
+            rf_model = RandomForestClassifier(n_estimators=100)
+            rf_model.fit(scaled, model.predict(scaled))
+            self.feature_importance = dict(zip(features.columns, rf_model.feature_importances_))
+
+        metrics = {
+            'n_samples_train': len(features),
+            'n_features': features.shape[1],
+            'feature_importance': self.feature_importance,
+            'reference': self.reference
+        }
+        self.version = None
+        # Stored scores came from the previous model
+        self.state = self._empty_state()
+        if self.registry:
+            self.version = self.registry.save(
+                self.MODEL_NAME, {'model': model, 'scaler': scaler},
+                data_hash or ModelRegistry.data_hash(features),
+                ModelRegistry.feature_schema(features), metrics, promote=promote
+            )
+            if self.registry.active_version(self.MODEL_NAME) not in (None, self.version):
+                # Keep serving the active version; the new one waits for promotion
+                self._load()
+        return metrics
+
+    def _refit(self, features: pd.DataFrame):
+        """Scheduled or drift refit, promoted unless an operator rolled back"""
+        promote = self.promote
+        if promote and self.registry:
+            version = ModelRegistry.version_key(
+                ModelRegistry.data_hash(features), ModelRegistry.feature_schema(features)
+            )
+            if (self.registry.active_from_rollback(self.MODEL_NAME)
+                    or self.registry.is_rolled_back(self.MODEL_NAME, version)):
+                self.logger.info("Anomaly model was rolled back; registering the refit without promoting it")
+                promote = False
+        self.fit(features, promote=promote)
+
+    def _score_rows(self, features: pd.DataFrame) -> pd.DataFrame:
+        if features.empty:
+            return pd.DataFrame({'score': [], 'label': []}, index=features.index)
+        scaled = self.scaler.transform(features)
+        return pd.DataFrame({
+            'score': -self.model.score_samples(scaled),
+            'label': self.model.predict(scaled)
+        }, index=features.index)
+
+    def _drifted(self, changed: pd.DataFrame, scores: pd.DataFrame) -> bool:
+        if len(changed) < self.params['min_drift_rows']:
+            return False
+        anomaly_rate = float((scores['label'] == -1).mean())
+        if anomaly_rate > self.params['drift_rate_factor'] * self.params['contamination']:
+            return True
+        mean = pd.Series(self.reference['mean'])[changed.columns]
+        std = pd.Series(self.reference['std'])[changed.columns]
+        shift = ((changed.mean() - mean).abs() / std).max()
+        return bool(shift > self.params['drift_mean_shift'])
+
+    def _refit_due(self) -> bool:
+        if self.model is None:
+            return True
+        if self.fitted_at is None:
+            return False
+        last_fit = self.fitted_at
+        if self.registry:
+            # An unpromoted refit counts too, so it isn't repeated every run
+            versions = self.registry.versions(self.MODEL_NAME)
+            if versions:
+                last_fit = max(last_fit, datetime.fromisoformat(versions[-1]['created_at']))
+        return datetime.now() - last_fit > timedelta(days=self.params['refit_days'])
+
+    def _load(self):
+        """Pick up the active registered model if it isn't the one in memory"""
+        if not self.registry:
+            return
+        version = self.registry.active_version(self.MODEL_NAME)
+        if version is None or version == self.version:
+            return
+        meta = self.registry.metadata(self.MODEL_NAME, version)
+        if 'reference' not in meta['metrics']:
+            return
+        self.model = self.registry.load(self.MODEL_NAME, 'model', version)
+        self.scaler = self.registry.load(self.MODEL_NAME, 'scaler', version)
+        self.reference = meta['metrics']['reference']
+        self.feature_importance = meta['metrics'].get('feature_importance', {})
+        self.fitted_at = datetime.fromisoformat(meta['created_at'])
+        self.version = version
+        self.state = None
+
+    def _current_state(self) -> pd.DataFrame:
+        """Stored fingerprints and scores, valid for the loaded model only"""
+        if self.state is None:
+            self.state = self._empty_state()
+            if self.state_path and self.state_path.exists():
+                stored = joblib.load(self.state_path)
+                if stored.get('version') == self.version:
+                    ids = stored['property_ids']
+                    self.state = pd.DataFrame(
+                        {column: stored[column] for column in ('score', 'label', 'fingerprint')},
+                        index=ids.astype(object) if ids.dtype.kind == 'U' else ids
+                    )
+        return self.state
+
+    def _save_state(self):
+        if self.state_path:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            # Plain arrays (string ids as fixed-width unicode) load far faster than a
+            # pickled frame; other object ids (e.g. mixed int/str) are pickled as they are
+            ids = self.state.index.to_numpy()
+            state = {
+                'version': self.version,
+                'property_ids': ids.astype(str) if self.state.index.inferred_type == 'string' else ids
+            }
+            state.update({column: self.state[column].to_numpy() for column in ('score', 'label', 'fingerprint')})
+            joblib.dump(state, self.state_path)
+
+    @staticmethod
+    def _empty_state() -> pd.DataFrame:
+        return pd.DataFrame({
+            'score': pd.Series(dtype=float),
+            'label': pd.Series(dtype=int),
+            'fingerprint': pd.Series(dtype='uint64')
+        })
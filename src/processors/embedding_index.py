@@ -0,0 +1,331 @@
+"""
+Persistent document embedding index for semantic search
+"""
+import os
+import hashlib
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+import joblib
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+
+class EmbeddingIndex:
+    """
+    Normalized float32 document embeddings searchable by inner product
+
+    Each document id owns one row of a memory-mapped float32 matrix and the
+    content hash it was encoded from. update() only encodes documents whose
+    content hash changed (or is new); rows of documents with identical
+    content are copied instead of re-encoded, and removed documents free
+    their rows for reuse.
+
+    Queries are a single matrix product against the stored rows. Once the
+    index holds ivf_min_rows documents, an inverted-file (IVF) layer
+    clusters rows around k-means centroids and a query scans only the
+    n_probe nearest clusters, which keeps latency in milliseconds at
+    millions of rows at the cost of approximate recall.
+
+    Without root the index lives in memory only.
+
+    Layout:
+        <root>/vectors.f32      capacity x dim float32 matrix
+        <root>/index.joblib     ids, hashes, cluster assignments, centroids
+    """
+
+    VECTORS_FILE = 'vectors.f32'
+    INDEX_FILE = 'index.joblib'
+
+    def __init__(self,
+                 root: Optional[str] = None,
+                 model: Optional[str] = None,
+                 n_probe: int = 8,
+                 ivf_min_rows: int = 50000,
+                 block_rows: int = 262144):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.root = Path(root) if root else None
+        self.model = model
+        self.n_probe = n_probe
+        self.ivf_min_rows = ivf_min_rows
+        self.block_rows = block_rows
+
+        self.dim: Optional[int] = None
+        self.vectors: Optional[np.ndarray] = None
+        self.ids: List[Optional[Hashable]] = []
+        self.hashes = np.zeros(0, dtype='S32')
+        self.row_of: Dict[Hashable, int] = {}
+        self.free: List[int] = []
+        self.valid = np.zeros(0, dtype=bool)
+        self.centroids: Optional[np.ndarray] = None
+        self.list_ids = np.zeros(0, dtype=np.int32)
+        self.ivf_rows = 0
+        self._lists: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+        if self.root:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self.row_of
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    @classmethod
+    def _digest(cls, text: str) -> bytes:
+        # Hex rather than raw bytes: numpy's fixed-width bytes drop trailing NULs
+        return cls.content_hash(text).encode('ascii')
+
+    def update(self,
+               documents: Mapping[Hashable, str],
+               encode: Callable[[List[str]], np.ndarray],
+               batch_size: int = 1024) -> int:
+        """
+        Bring documents (id -> text) up to date; returns the number encoded
+
+        encode maps a list of texts to a (len, dim) array.
+        """
+        stale = {}
+        hashes = self.hashes.tolist()
+        for doc_id, text in documents.items():
+            digest = self._digest(text)
+            row = self.row_of.get(doc_id)
+            if row is None or hashes[row] != digest:
+                stale[doc_id] = (digest, text)
+        if not stale:
+            return 0
+
+        # Reuse vectors of identical content already in the index; copy them
+        # first, since a reused row may itself be among the stale ones
+        hash_rows = {digest: row for row, digest in enumerate(hashes[:len(self.ids)]) if digest}
+        copies = {
+            digest: np.array(self.vectors[hash_rows[digest]])
+            for digest, _ in stale.values() if digest in hash_rows
+        }
+
+        # Encode and write in batches so memory stays bounded by batch_size
+        items = list(stale.items())
+        written: Dict[str, int] = {}
+        encoded = 0
+        for start in range(0, len(items), batch_size):
+            chunk = items[start:start + batch_size]
+            pending: Dict[str, str] = {}
+            for _, (digest, text) in chunk:
+                if digest not in copies and digest not in written:
+                    pending.setdefault(digest, text)
+            fresh = {}
+            if pending:
+                vectors = self._normalize(np.asarray(encode(list(pending.values())), dtype=np.float32))
+                fresh = dict(zip(pending, vectors))
+                encoded += len(pending)
+
+            batch = np.stack([
+                fresh[digest] if digest in fresh
+                else copies[digest] if digest in copies
+                else self.vectors[written[digest]]
+                for _, (digest, _) in chunk
+            ])
+            rows = np.array([self._row_for(doc_id, batch.shape[1]) for doc_id, _ in chunk])
+            self.vectors[rows] = batch
+            self.valid[rows] = True
+            if self.centroids is not None:
+                self.list_ids[rows] = np.argmax(batch @ self.centroids.T, axis=1)
+                self._lists = None
+            for row, (_, (digest, _)) in zip(rows, chunk):
+                self.hashes[row] = digest
+                written.setdefault(digest, int(row))
+
+        self._maybe_build_ivf()
+        self.save()
+        return encoded
+
+    def remove(self, doc_ids: Iterable[Hashable]):
+        """Drop documents from the index, freeing their rows"""
+        for doc_id in doc_ids:
+            row = self.row_of.pop(doc_id, None)
+            if row is None:
+                continue
+            self.ids[row] = None
+            self.hashes[row] = b''
+            self.valid[row] = False
+            self.vectors[row] = 0
+            self.free.append(row)
+            self._lists = None
+        self.save()
+
+    def search(self,
+               query: np.ndarray,
+               top_k: int = 5,
+               doc_ids: Optional[Iterable[Hashable]] = None) -> List[Tuple[Hashable, float]]:
+        """
+        (document id, cosine similarity) of the top_k nearest documents
+
+        doc_ids restricts the search to those documents (scored exactly).
+        """
+        if not self.row_of:
+            return []
+        query = self._normalize(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        rows_used = len(self.ids)
+
+        if doc_ids is not None:
+            rows = np.sort(np.fromiter((self.row_of[d] for d in doc_ids if d in self.row_of), dtype=np.int64))
+            if len(rows) < len(self.row_of):
+                return self._top_k(rows, self.vectors[rows] @ query, top_k)
+
+        if self.centroids is not None:
+            order, offsets = self._inverted_lists()
+            probes = np.argsort(self.centroids @ query)[-self.n_probe:]
+            rows = np.sort(np.concatenate([order[offsets[p]:offsets[p + 1]] for p in probes]))
+            if len(rows) >= top_k:
+                return self._top_k(rows, self.vectors[rows] @ query, top_k)
+
+        # Exact scan in blocks so the product never materializes more than block_rows scores at once
+        best_rows, best_scores = [], []
+        for start in range(0, rows_used, self.block_rows):
+            stop = min(start + self.block_rows, rows_used)
+            scores = self.vectors[start:stop] @ query
+            scores[~self.valid[start:stop]] = -np.inf
+            keep = np.argpartition(-scores, min(top_k, len(scores)) - 1)[:top_k]
+            best_rows.append(keep + start)
+            best_scores.append(scores[keep])
+        rows, scores = np.concatenate(best_rows), np.concatenate(best_scores)
+        finite = np.isfinite(scores)
+        return self._top_k(rows[finite], scores[finite], top_k)
+
+    def build_ivf(self, n_lists: Optional[int] = None, sample_size: int = 100000, seed: int = 42):
+        """Cluster the stored rows into n_lists inverted lists (default sqrt(rows))"""
+        rows = np.flatnonzero(self.valid[:len(self.ids)])
+        n_lists = n_lists or max(int(np.sqrt(len(rows))), 1)
+        rng = np.random.default_rng(seed)
+        sample = rows if len(rows) <= sample_size else np.sort(rng.choice(rows, sample_size, replace=False))
+
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, random_state=seed, batch_size=4096, n_init=1)
+        kmeans.fit(self.vectors[sample])
+        self.centroids = self._normalize(kmeans.cluster_centers_.astype(np.float32))
+
+        # Assign in blocks that keep the row x centroid score matrix near 64MB
+        block_rows = max(2 ** 24 // n_lists, 1)
+        self.list_ids = np.zeros(len(self.valid), dtype=np.int32)
+        for start in range(0, len(self.ids), block_rows):
+            stop = min(start + block_rows, len(self.ids))
+            self.list_ids[start:stop] = np.argmax(self.vectors[start:stop] @ self.centroids.T, axis=1)
+        self.ivf_rows = len(rows)
+        self._lists = None
+        self.logger.info(f"Built IVF layer with {n_lists} lists over {len(rows)} documents")
+
+    def save(self):
+        if not self.root or self.vectors is None:
+            return
+        if isinstance(self.vectors, np.memmap):
+            self.vectors.flush()
+        state = {
+            'model': self.model,
+            'dim': self.dim,
+            'capacity': len(self.valid),
+            'ids': self.ids,
+            'hashes': self.hashes,
+            'valid': self.valid,
+            'centroids': self.centroids,
+            'list_ids': self.list_ids,
+            'ivf_rows': self.ivf_rows
+        }
+        staging = self.root / f"{self.INDEX_FILE}.tmp"
+        joblib.dump(state, staging)
+        os.replace(staging, self.root / self.INDEX_FILE)
+
+    def _load(self):
+        path = self.root / self.INDEX_FILE
+        if not path.exists():
+            return
+        state = joblib.load(path)
+        if state['model'] != self.model:
+            self.logger.info(f"Embedding index was built with {state['model']}; starting over for {self.model}")
+            return
+
+        self.dim = state['dim']
+        self.ids = state['ids']
+        self.hashes = state['hashes']
+        self.valid = state['valid']
+        self.centroids = state['centroids']
+        self.list_ids = state['list_ids']
+        self.ivf_rows = state['ivf_rows']
+        self.row_of = {doc_id: row for row, doc_id in enumerate(self.ids) if doc_id is not None}
+        self.free = [row for row, doc_id in enumerate(self.ids) if doc_id is None]
+        self.vectors = np.memmap(self.root / self.VECTORS_FILE, dtype=np.float32, mode='r+',
+                                 shape=(state['capacity'], self.dim))
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Valid rows grouped by IVF list, with each list's start offset"""
+        if self._lists is None:
+            rows = np.flatnonzero(self.valid[:len(self.ids)])
+            list_ids = self.list_ids[rows]
+            order = rows[np.argsort(list_ids, kind='stable')]
+            offsets = np.searchsorted(np.sort(list_ids), np.arange(len(self.centroids) + 1))
+            self._lists = (order, offsets)
+        return self._lists
+
+    def _row_for(self, doc_id: Hashable, dim: int) -> int:
+        row = self.row_of.get(doc_id)
+        if row is not None:
+            return row
+        if self.free:
+            row = self.free.pop()
+        else:
+            row = len(self.ids)
+            self.ids.append(None)
+            self._reserve(row + 1, dim)
+        self.ids[row] = doc_id
+        self.row_of[doc_id] = row
+        return row
+
+    def _reserve(self, rows: int, dim: int):
+        """Grow the matrix (doubling) to hold at least rows rows"""
+        capacity = len(self.valid)
+        if self.vectors is not None and rows <= capacity:
+            return
+        if self.dim is None:
+            self.dim = dim
+        new_capacity = max(rows, capacity * 2, 1024)
+
+        if self.root:
+            path = self.root / self.VECTORS_FILE
+            if self.vectors is not None:
+                self.vectors.flush()
+                self.vectors = None
+            with open(path, 'ab') as handle:
+                handle.truncate(new_capacity * self.dim * 4)
+            self.vectors = np.memmap(path, dtype=np.float32, mode='r+', shape=(new_capacity, self.dim))
+        else:
+            vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+            if self.vectors is not None:
+                vectors[:capacity] = self.vectors
+            self.vectors = vectors
+
+        self.valid = np.concatenate([self.valid, np.zeros(new_capacity - capacity, dtype=bool)])
+        self.list_ids = np.concatenate([self.list_ids, np.zeros(new_capacity - capacity, dtype=np.int32)])
+        self.hashes = np.concatenate([self.hashes, np.zeros(new_capacity - capacity, dtype='S32')])
+
+    def _maybe_build_ivf(self):
+        """Build the IVF layer at ivf_min_rows and rebuild whenever the index doubles"""
+        if len(self.row_of) < self.ivf_min_rows:
+            return
+        if self.centroids is None or len(self.row_of) >= 2 * self.ivf_rows:
+            self.build_ivf()
+
+    def _top_k(self, rows: np.ndarray, scores: np.ndarray, top_k: int) -> List[Tuple[Hashable, float]]:
+        if len(scores) > top_k:
+            keep = np.argpartition(-scores, top_k - 1)[:top_k]
+            rows, scores = rows[keep], scores[keep]
+        order = np.argsort(-scores, kind='stable')
+        return [(self.ids[rows[i]], float(scores[i])) for i in order]
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
@@ -0,0 +1,148 @@
+"""
+Fans Prophet fits for many market series out over a process pool
+"""
+import json
+import hashlib
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Hashable, Iterator, Mapping, Optional, Tuple
+
+import joblib
+import pandas as pd
+from prophet import Prophet
+from prophet.serialize import model_to_json
+
+from .model_registry import ModelRegistry
+
+
+def _fit_series(frame: pd.DataFrame, prophet_params: Dict, periods: int, freq: Any) -> Tuple[str, pd.DataFrame]:
+    """Fit one series and forecast it; runs in a worker process"""
+    # cmdstanpy logs every fit at INFO
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+
+    model = Prophet(**prophet_params)
+    model.fit(frame)
+    future = model.make_future_dataframe(periods=periods, freq=freq)
+    return model_to_json(model), model.predict(future)
+
+
+class ForecastScheduler:
+    """
+    Prophet forecasts for a set of named series (e.g. one per town and metric)
+
+    Each series is fitted in its own worker process and results are yielded
+    as fits complete. Fitted models and forecasts are cached under a hash
+    of the series data and fit settings, so a series with no new data
+    points is served from cache instead of being refitted. With cache_dir
+    the cache persists across processes; in memory only the max_cached
+    most recently used results are kept.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache_dir: Optional[str] = None,
+                 max_cached: int = 128):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_workers = max_workers
+        self.max_cached = max_cached
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache: OrderedDict = OrderedDict()
+
+    def forecast(self,
+                 series: Mapping[Hashable, pd.DataFrame],
+                 periods: int,
+                 freq: Any = 'D',
+                 prophet_params: Optional[Dict] = None) -> Iterator[Tuple[Hashable, Dict]]:
+        """
+        Yield (name, result) per series as each forecast becomes available
+
+        series maps a name to a frame with Prophet's ds and y columns.
+        result holds the full forecast frame, the fitted model as Prophet
+        JSON, and whether it came from cache. Series that fail to fit are
+        logged and skipped.
+        """
+        prophet_params = prophet_params or {}
+        pending = {}
+        for name, frame in series.items():
+            key = self._cache_key(frame, prophet_params, periods, freq)
+            cached = self._cached(key)
+            if cached is not None:
+                yield name, dict(cached, cached=True)
+            else:
+                pending[name] = (key, frame)
+
+        if not pending:
+            return
+
+        if len(pending) == 1 or self.max_workers == 1:
+            for name, (key, frame) in pending.items():
+                try:
+                    result = self._store(key, *_fit_series(frame, prophet_params, periods, freq))
+                except Exception as e:
+                    self.logger.warning(f"Error forecasting {name}: {str(e)}")
+                    continue
+                yield name, dict(result, cached=False)
+            return
+
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            future_to_series = {
+                executor.submit(_fit_series, frame, prophet_params, periods, freq): (name, key)
+                for name, (key, frame) in pending.items()
+            }
+            for future in as_completed(future_to_series):
+                name, key = future_to_series[future]
+                try:
+                    result = self._store(key, *future.result())
+                except Exception as e:
+                    self.logger.warning(f"Error forecasting {name}: {str(e)}")
+                    continue
+                yield name, dict(result, cached=False)
+        finally:
+            # Stop queued fits if the caller stops consuming early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def forecast_one(self,
+                     frame: pd.DataFrame,
+                     periods: int,
+                     freq: Any = 'D',
+                     prophet_params: Optional[Dict] = None) -> Optional[Dict]:
+        """Forecast a single series in-process (cached like forecast())"""
+        for _, result in self.forecast({None: frame}, periods, freq, prophet_params):
+            return result
+        return None
+
+    def _cache_key(self, frame: pd.DataFrame, prophet_params: Dict, periods: int, freq: Any) -> str:
+        settings = json.dumps([prophet_params, periods, freq], sort_keys=True, default=str)
+        return hashlib.sha256(
+            (ModelRegistry.data_hash(frame[['ds', 'y']]) + settings).encode()
+        ).hexdigest()
+
+    def _cached(self, key: str) -> Optional[Dict]:
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if self.cache_dir:
+            path = self.cache_dir / f"{key}.joblib"
+            if path.exists():
+                try:
+                    return self._remember(key, joblib.load(path))
+                except Exception as e:
+                    self.logger.warning(f"Ignoring unreadable forecast cache {path.name}: {str(e)}")
+        return None
+
+    def _remember(self, key: str, result: Dict) -> Dict:
+        """Keep result in the in-memory cache, dropping the least recently used"""
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return result
+
+    def _store(self, key: str, model_json: str, forecast: pd.DataFrame) -> Dict:
+        result = self._remember(key, {'model': model_json, 'forecast': forecast})
+        if self.cache_dir:
+            joblib.dump(result, self.cache_dir / f"{key}.joblib")
+        return result
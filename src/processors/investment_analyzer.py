@@ -30,12 +30,39 @@ class InvestmentAnalyzer:
             'min_data_points': 5,      # Minimum points for trend analysis
             'forecast_horizon': 12,     # Months to forecast
             'confidence_level': 0.95,   # For prediction intervals
-            'min_roi': 0.05            # Minimum ROI to consider
+            'min_roi': 0.05,           # Minimum ROI to consider
+            'simulation_paths': 10000,             # Monte Carlo paths per scenario
+            'simulation_chunk_cells': 5_000_000,   # Properties x paths evaluated at once
+            'appreciation_volatility': 0.02,       # Std dev of annual appreciation draws
+            'holding_period_jitter': 1,            # +/- years around the scenario holding period
+            'improvement_cost_volatility': 0.25,   # Lognormal sigma of improvement cost overruns
+            'improvement_return_volatility': 0.3   # Std dev of the improvement value multiple
         }
         
         # Update from config
-        if 'analysis_params' in config:
-            self.params.update(config['analysis_params'])
+        if 'analysis_params' in self.config:
+            self.params.update(self.config['analysis_params'])
+
+    # Investment scenario presets; improvements are a share of current value
+    SCENARIOS = {
+        'base': {
+            'holding_period': 5,    # years
+            'improvement_ratio': 0,
+            'appreciation_rate': 0.03
+        },
+        'improve': {
+            'holding_period': 2,
+            'improvement_ratio': 0.15,
+            'appreciation_rate': 0.04
+        },
+        'long_term': {
+            'holding_period': 10,
+            'improvement_ratio': 0.05,
+            'appreciation_rate': 0.03
+        }
+    }
+    # Value added per dollar of improvements
+    IMPROVEMENT_RETURN = 1.5
 
     def analyze_investment_patterns(self, properties: List[Dict]) -> Dict:
         """
@@ -66,27 +93,13 @@ class InvestmentAnalyzer:
             if not current_value:
                 return {}
             
-            # Define scenarios
-            scenarios = {
-                'base': {
-                    'holding_period': 5,    # years
-                    'improvements': 0,
-                    'appreciation_rate': 0.03
-                },
-                'improve': {
-                    'holding_period': 2,
-                    'improvements': current_value * 0.15,
-                    'appreciation_rate': 0.04
-                },
-                'long_term': {
-                    'holding_period': 10,
-                    'improvements': current_value * 0.05,
-                    'appreciation_rate': 0.03
-                }
-            }
-            
             # Calculate ROI for specified scenario
-            scenario_params = scenarios.get(scenario, scenarios['base'])
+            preset = self.SCENARIOS.get(scenario, self.SCENARIOS['base'])
+            scenario_params = {
+                'holding_period': preset['holding_period'],
+                'improvements': current_value * preset['improvement_ratio'],
+                'appreciation_rate': preset['appreciation_rate']
+            }
             
             roi_analysis = self._calculate_roi(
                 property_data,
@@ -99,6 +112,51 @@ class InvestmentAnalyzer:
             self.logger.error(f"Error analyzing ROI: {str(e)}")
             return {}
 
+    def simulate_roi(self,
+                     properties: List[Dict],
+                     scenarios: Optional[List[str]] = None,
+                     paths: Optional[int] = None,
+                     seed: Optional[int] = None) -> Dict:
+        """
+        Monte Carlo ROI distribution for a portfolio under scenario presets
+
+        Each path draws a market appreciation rate and holding period around
+        the scenario preset; improvement cost overruns and the value the
+        improvements add are drawn per property and path. Properties are
+        evaluated in chunks of at most simulation_chunk_cells properties x
+        paths, so memory stays flat however large the portfolio is.
+
+        Returns, per scenario, P5/P50/P95 ROI and annualized ROI (percent)
+        for each property with an assessed value, plus the same percentiles
+        for the portfolio as a whole.
+        """
+        try:
+            paths = paths or self.params['simulation_paths']
+            scenarios = scenarios or list(self.SCENARIOS)
+
+            valued = [
+                (prop.get('property_id'), prop.get('assessment', {}).get('total_value'))
+                for prop in properties
+            ]
+            valued = [(pid, value) for pid, value in valued if value]
+            if not valued:
+                return {}
+
+            property_ids = [pid for pid, _ in valued]
+            values = np.array([value for _, value in valued], dtype=float)
+            rng = np.random.default_rng(seed)
+
+            return {
+                name: self._simulate_scenario(
+                    property_ids, values, self.SCENARIOS.get(name, self.SCENARIOS['base']), paths, rng
+                )
+                for name in scenarios
+            }
+
+        except Exception as e:
+            self.logger.error(f"Error simulating ROI: {str(e)}")
+            return {}
+
     def forecast_market_trends(self, 
                              historical_data: List[Dict],
                              forecast_type: str = 'value') -> Dict:
@@ -166,6 +224,81 @@ class InvestmentAnalyzer:
             self.logger.error(f"Error scoring opportunities: {str(e)}")
             return []
 
+    def _simulate_scenario(self,
+                           property_ids: List,
+                           values: np.ndarray,
+                           preset: Dict,
+                           paths: int,
+                           rng: np.random.Generator) -> Dict:
+        """ROI percentiles for one scenario preset"""
+        percentiles = [5, 50, 95]
+
+        # Market-wide draws, shared by every property on a path
+        appreciation = np.maximum(
+            rng.normal(preset['appreciation_rate'], self.params['appreciation_volatility'], paths),
+            -0.99
+        )
+        jitter = self.params['holding_period_jitter']
+        holding = np.maximum(
+            preset['holding_period'] + rng.integers(-jitter, jitter + 1, paths), 1
+        ).astype(float)
+        growth = (1 + appreciation) ** holding
+
+        portfolio_return = np.zeros(paths)
+        portfolio_investment = np.zeros(paths)
+        roi_bands, annual_bands = [], []
+
+        chunk_size = max(1, self.params['simulation_chunk_cells'] // paths)
+        for start in range(0, len(values), chunk_size):
+            value = values[start:start + chunk_size, np.newaxis]
+
+            improvements = np.zeros((len(value), paths))
+            improvement_value = improvements
+            if preset['improvement_ratio'] > 0:
+                improvements = value * preset['improvement_ratio'] * rng.lognormal(
+                    0, self.params['improvement_cost_volatility'], improvements.shape
+                )
+                improvement_value = improvements * np.maximum(rng.normal(
+                    self.IMPROVEMENT_RETURN, self.params['improvement_return_volatility'],
+                    improvements.shape
+                ), 0)
+
+            total_investment = value + improvements
+            total_return = value * growth + improvement_value - total_investment
+            roi = total_return / total_investment * 100
+            annual_roi = ((1 + roi / 100) ** (1 / holding) - 1) * 100
+
+            roi_bands.append(np.percentile(roi, percentiles, axis=1).T)
+            annual_bands.append(np.percentile(annual_roi, percentiles, axis=1).T)
+            portfolio_return += total_return.sum(axis=0)
+            portfolio_investment += total_investment.sum(axis=0)
+
+        roi_bands = np.vstack(roi_bands).tolist()
+        annual_bands = np.vstack(annual_bands).tolist()
+
+        portfolio_roi = portfolio_return / portfolio_investment * 100
+        portfolio_annual = ((1 + portfolio_roi / 100) ** (1 / holding) - 1) * 100
+
+        def bands(row):
+            return {f"p{pct}": float(value) for pct, value in zip(percentiles, row)}
+
+        return {
+            'scenario': dict(preset, paths=paths),
+            'portfolio': {
+                'total_value': float(values.sum()),
+                'roi': bands(np.percentile(portfolio_roi, percentiles)),
+                'annual_roi': bands(np.percentile(portfolio_annual, percentiles))
+            },
+            'properties': [
+                {
+                    'property_id': pid,
+                    'roi': bands(roi_row),
+                    'annual_roi': bands(annual_row)
+                }
+                for pid, roi_row, annual_row in zip(property_ids, roi_bands, annual_bands)
+            ]
+        }
+
     def _analyze_buyer_patterns(self, properties: List[Dict]) -> Dict:
         """Analyze patterns in buyer behavior"""
         try:
@@ -445,7 +578,7 @@ class InvestmentAnalyzer:
             
             # Add improvement value
             if improvements > 0:
-                future_value += improvements * 1.5  # Assume 50% return on improvements
+                future_value += improvements * self.IMPROVEMENT_RETURN  # Assume 50% return on improvements
             
             # Calculate returns
             total_return = future_value - total_investment
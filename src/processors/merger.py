@@ -2,15 +2,51 @@
 Data merger for combining and linking data from different sources
 """
 import logging
-from typing import Dict, List, Any, Optional
+import os
+import re
+import heapq
+import pickle
+import shutil
+import tempfile
+from typing import Dict, List, Any, Optional, Iterable, Iterator
 from datetime import datetime
+from collections import Counter
+from itertools import groupby, islice
 import pandas as pd
 import numpy as np
+from scipy import sparse
+from rapidfuzz import fuzz, process, utils
 
 from ..utils.address_matcher import AddressMatcher
-from ..utils.name_matcher import NameMatcher
 from ..models.property_models import Property, Owner, Transaction, Permit, Violation, UtilityRecord
 
+# Tokens too common in owner names to be useful as blocking keys
+OWNER_NAME_STOPWORDS = {
+    'the', 'and', 'of', 'llc', 'inc', 'corp', 'co', 'ltd', 'lp', 'llp',
+    'trust', 'trustee', 'trustees', 'tr', 'revocable', 'living', 'family',
+    'estate', 'etal', 'et', 'al', 'jr', 'sr', 'ii', 'iii', 'heirs'
+}
+
+
+def _soundex(token: str) -> str:
+    """American Soundex code for a lowercase alphabetic token"""
+    codes = {
+        **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'),
+        **dict.fromkeys('dt', '3'), 'l': '4', **dict.fromkeys('mn', '5'), 'r': '6'
+    }
+    result = token[0].upper()
+    previous = codes.get(token[0], '')
+    for char in token[1:]:
+        code = codes.get(char, '')
+        if code and code != previous:
+            result += code
+            if len(result) == 4:
+                break
+        if char not in 'hw':
+            previous = code
+    return result.ljust(4, '0')
+
+
 class DataMerger:
     """
     Merges data from different sources and creates relationships
@@ -28,7 +64,6 @@ class DataMerger:
         
         # Initialize matchers
         self.address_matcher = AddressMatcher()
-        self.name_matcher = NameMatcher()
         
         # Configure merge thresholds
         self.thresholds = {
@@ -39,17 +74,36 @@ class DataMerger:
         }
         
         # Update thresholds from config
-        if 'merge_thresholds' in config:
-            self.thresholds.update(config['merge_thresholds'])
+        if 'merge_thresholds' in self.config:
+            self.thresholds.update(self.config['merge_thresholds'])
+        
+        # Indexed mode groups child tables by property_id once instead of
+        # scanning every table for every assessment row
+        self.merge_mode = self.config.get('merge_mode', 'indexed')
+        
+        # Blocked mode only scores owner pairs that share a name key; blocks
+        # with more pairs than the cap (e.g. "john") are scored in length bands
+        self.owner_merge_mode = self.config.get('owner_merge_mode', 'blocked')
+        self.owner_block_max_pairs = self.config.get('owner_block_max_pairs', 100000)
+        self.owner_match_workers = self.config.get('owner_match_workers', 1)
+        
+        # Records per sorted run when streaming transaction chains
+        self.chain_run_size = self.config.get('chain_run_size', 100000)
 
     def merge_property_data(self, 
                           assessment_data: List[Dict],
                           transaction_data: List[Dict],
                           permit_data: List[Dict],
                           violation_data: List[Dict],
-                          utility_data: List[Dict]) -> List[Dict]:
+                          utility_data: List[Dict],
+                          mode: Optional[str] = None) -> List[Dict]:
         """
         Merge all property-related data into unified records
+        
+        Args:
+            mode: 'indexed' (default) builds a property_id index over each
+                child table once; 'scan' filters every child table per
+                property. Both produce the same record shape.
         """
         try:
             # Convert to dataframes for easier processing
@@ -59,6 +113,13 @@ class DataMerger:
             df_violations = pd.DataFrame(violation_data)
             df_utilities = pd.DataFrame(utility_data)
             
+            mode = mode or self.merge_mode
+            if mode == 'indexed':
+                return self._merge_property_data_indexed(
+                    df_assessment, df_transactions, df_permits,
+                    df_violations, df_utilities
+                )
+            
             # Start with assessment data as base
             merged_properties = []
             
@@ -97,34 +158,131 @@ class DataMerger:
             self.logger.error(f"Error in merge_property_data: {str(e)}")
             return []
 
+    def _merge_property_data_indexed(self,
+                                     df_assessment: pd.DataFrame,
+                                     df_transactions: pd.DataFrame,
+                                     df_permits: pd.DataFrame,
+                                     df_violations: pd.DataFrame,
+                                     df_utilities: pd.DataFrame) -> List[Dict]:
+        """
+        Hash-join merge: index each child table by property_id once and
+        attach the matching rows to each assessment record
+        """
+        children = [
+            (df_transactions, 'date', self._merge_transactions, self._attach_transactions),
+            (df_permits, 'issue_date', self._merge_permits, self._attach_permits),
+            (df_violations, 'reported_date', self._merge_violations, self._attach_violations),
+            (df_utilities, 'reading_date', self._merge_utilities, self._attach_utilities)
+        ]
+        indexes = [
+            (self._build_property_index(df, date_column), df, merge, attach)
+            for df, date_column, merge, attach in children
+        ]
+        
+        merged_properties = []
+        for assessment_row in df_assessment.to_dict('records'):
+            try:
+                property_record = self._create_base_property(assessment_row)
+                property_id = property_record['property_id']
+                
+                for index, df, merge, attach in indexes:
+                    if index is None:
+                        # Table could not be indexed; keep scan behaviour
+                        property_record = merge(property_record, df)
+                    else:
+                        property_record = attach(
+                            property_record, index.get(property_id, [])
+                        )
+                
+                property_record['_merged'] = True
+                property_record['_merged_at'] = datetime.now().isoformat()
+                
+                merged_properties.append(property_record)
+                
+            except Exception as e:
+                self.logger.error(f"Error merging property: {str(e)}")
+                continue
+        
+        return merged_properties
+
+    def _build_property_index(self, df: pd.DataFrame, date_column: str) -> Optional[Dict[Any, List[Dict]]]:
+        """
+        Index a child table as property_id -> date-sorted records
+        
+        An empty table (which has no columns at all) indexes to {}. Returns
+        None when a non-empty table has no usable property_id or date
+        column, so the caller can fall back to per-property scanning.
+        """
+        if df.empty:
+            return {}
+        
+        try:
+            df = df.assign(**{date_column: pd.to_datetime(df[date_column])})
+            df = df.sort_values(date_column, kind='mergesort')
+            
+            index = {}
+            for record in df.to_dict('records'):
+                property_id = record['property_id']
+                if pd.isna(property_id):
+                    continue
+                index.setdefault(property_id, []).append(record)
+            
+            return index
+            
+        except Exception as e:
+            self.logger.warning(f"Cannot index on {date_column}, falling back to scan: {str(e)}")
+            return None
+
+    def _property_rows(self, df: pd.DataFrame, property_id: Any, date_column: str) -> List[Dict]:
+        """Scan a child table for one property's rows, sorted by date"""
+        rows = df[df['property_id'] == property_id]
+        if len(rows) > 0:
+            rows = rows.assign(**{date_column: pd.to_datetime(rows[date_column])})
+            rows = rows.sort_values(date_column, kind='mergesort')
+        return rows.to_dict('records')
+
     def merge_owner_data(self, 
                         primary_owners: List[Dict],
-                        secondary_owners: List[Dict]) -> List[Dict]:
+                        secondary_owners: List[Dict],
+                        mode: Optional[str] = None) -> List[Dict]:
         """
         Merge and deduplicate owner records
         Links related owners and business entities
+        
+        Args:
+            mode: 'blocked' (default) scores only owner pairs sharing a
+                name token or phonetic key; 'dense' scores every pair.
         """
         try:
             # Convert to dataframes
-            df_primary = pd.DataFrame(primary_owners)
-            df_secondary = pd.DataFrame(secondary_owners)
-            
-            # Create similarity matrix
-            similarities = self._create_owner_similarity_matrix(
-                df_primary, df_secondary
-            )
+            df_primary = pd.DataFrame(primary_owners).reset_index(drop=True)
+            df_secondary = pd.DataFrame(secondary_owners).reset_index(drop=True)
+            
+            # Create similarity matrix (primary x secondary, sparse)
+            mode = mode or self.owner_merge_mode
+            if mode == 'blocked':
+                similarities = self._create_blocked_similarity_matrix(
+                    df_primary, df_secondary
+                )
+            else:
+                similarities = sparse.csr_matrix(np.nan_to_num(
+                    self._create_owner_similarity_matrix(
+                        df_primary, df_secondary
+                    ).to_numpy(dtype=float)
+                ))
             
             # Merge similar owners
             merged_owners = []
-            processed_indices = set()
+            matched_secondary = set()
+            threshold = self.thresholds['name_similarity']
             
             for i, primary_row in df_primary.iterrows():
-                if i in processed_indices:
-                    continue
-                    
                 # Find similar owners
-                similar_mask = similarities[i] >= self.thresholds['name_similarity']
-                similar_indices = similar_mask[similar_mask].index
+                start, end = similarities.indptr[i], similarities.indptr[i + 1]
+                scores = similarities.data[start:end]
+                similar_indices = np.sort(
+                    similarities.indices[start:end][scores >= threshold]
+                )
                 
                 if len(similar_indices) > 0:
                     # Merge all similar owners
@@ -136,16 +294,15 @@ class DataMerger:
                     merged_owners.append(merged_owner)
                     
                     # Mark as processed
-                    processed_indices.add(i)
-                    processed_indices.update(similar_indices)
+                    matched_secondary.update(similar_indices.tolist())
                 else:
                     # No similar owners found, keep original
                     merged_owners.append(primary_row.to_dict())
             
             # Add any unprocessed secondary owners
-            remaining_secondary = df_secondary.index.difference(processed_indices)
-            for i in remaining_secondary:
-                merged_owners.append(df_secondary.iloc[i].to_dict())
+            for j in range(len(df_secondary)):
+                if j not in matched_secondary:
+                    merged_owners.append(df_secondary.iloc[j].to_dict())
             
             return merged_owners
             
@@ -162,7 +319,7 @@ class DataMerger:
             
             # Sort by date
             df['date'] = pd.to_datetime(df['date'])
-            df = df.sort_values('date')
+            df = df.sort_values('date', kind='mergesort')
             
             # Group by property
             chains = []
@@ -185,7 +342,90 @@ class DataMerger:
             self.logger.error(f"Error in merge_transaction_chains: {str(e)}")
             return []
 
-    def _create_base_property(self, assessment_data: pd.Series) -> Dict:
+    def iter_transaction_chains(self,
+                                transactions: Iterable[Dict],
+                                run_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Streaming variant of merge_transaction_chains with bounded memory
+        
+        Transactions are read in runs of run_size records, each run is
+        sorted by (property_id, date) and spilled to a temporary file, and
+        the runs are k-way merged so that chains are yielded one property at
+        a time. Only one run plus one property's transactions are held in
+        memory at once.
+        """
+        run_size = run_size or self.chain_run_size
+        spill_dir = tempfile.mkdtemp(prefix='chains_', dir=self.config.get('spill_dir'))
+        try:
+            runs = []
+            for chunk in self._chunked(transactions, run_size):
+                runs.append(self._spill_transaction_run(chunk, spill_dir, len(runs)))
+            
+            merged = heapq.merge(
+                *(self._read_transaction_run(path) for path in runs),
+                key=self._transaction_sort_key
+            )
+            for property_id, records in groupby(merged, key=lambda t: t['property_id']):
+                chain_transactions = list(records)
+                yield {
+                    'property_id': property_id,
+                    'transactions': chain_transactions,
+                    'summary': {
+                        'total_transactions': len(chain_transactions),
+                        'price_history': [t['price'] for t in chain_transactions],
+                        'ownership_duration': self._ownership_durations_from_records(
+                            chain_transactions
+                        ),
+                        'price_trends': self._price_trends_from_records(chain_transactions)
+                    }
+                }
+                
+        except Exception as e:
+            self.logger.error(f"Error in iter_transaction_chains: {str(e)}")
+            
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+    def _chunked(self, records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+        """Split an iterable of records into lists of at most size items"""
+        iterator = iter(records)
+        while True:
+            chunk = list(islice(iterator, size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _spill_transaction_run(self, chunk: List[Dict], spill_dir: str, run_number: int) -> str:
+        """Sort one run by (property_id, date) and write it to disk"""
+        df = pd.DataFrame(chunk)
+        df['date'] = pd.to_datetime(df['date'])
+        df = df[df['property_id'].notna()]
+        df = df.sort_values(['property_id', 'date'], kind='mergesort')
+        
+        path = os.path.join(spill_dir, f"run_{run_number:05d}.pkl")
+        with open(path, 'wb') as f:
+            for record in df.to_dict('records'):
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    def _read_transaction_run(self, path: str) -> Iterator[Dict]:
+        """Read a spilled run back one record at a time"""
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    @staticmethod
+    def _transaction_sort_key(transaction: Dict) -> tuple:
+        """(property_id, date) ordering with missing dates last, as in sort_values"""
+        date = transaction['date']
+        if pd.isna(date):
+            return (transaction['property_id'], 1, pd.Timestamp.min)
+        return (transaction['property_id'], 0, date)
+
+    def _create_base_property(self, assessment_data: Any) -> Dict:
         """Create base property record from assessment data"""
         return {
             'property_id': assessment_data.get('property_id'),
@@ -216,28 +456,30 @@ class DataMerger:
         """Merge transaction data into property record"""
         try:
             # Find related transactions
-            property_transactions = df_transactions[
-                df_transactions['property_id'] == property_record['property_id']
-            ]
+            property_transactions = self._property_rows(
+                df_transactions, property_record['property_id'], 'date'
+            )
+            return self._attach_transactions(property_record, property_transactions)
             
+        except Exception as e:
+            self.logger.error(f"Error merging transactions: {str(e)}")
+            return property_record
+
+    def _attach_transactions(self, property_record: Dict, property_transactions: List[Dict]) -> Dict:
+        """Attach date-sorted transaction rows to property record"""
+        try:
             if len(property_transactions) > 0:
-                # Sort by date
-                property_transactions['date'] = pd.to_datetime(
-                    property_transactions['date']
-                )
-                property_transactions = property_transactions.sort_values('date')
-                
                 # Add transaction history
-                property_record['transactions'] = property_transactions.to_dict('records')
+                property_record['transactions'] = property_transactions
                 
                 # Add transaction summary
                 property_record['transaction_summary'] = {
                     'total_transactions': len(property_transactions),
-                    'last_sale_date': property_transactions['date'].max().isoformat(),
-                    'last_sale_price': float(
-                        property_transactions.iloc[-1]['price']
-                    ),
-                    'price_history': property_transactions['price'].tolist()
+                    'last_sale_date': max(
+                        t['date'] for t in property_transactions if pd.notna(t['date'])
+                    ).isoformat(),
+                    'last_sale_price': float(property_transactions[-1]['price']),
+                    'price_history': [t['price'] for t in property_transactions]
                 }
             else:
                 property_record['transactions'] = []
@@ -255,30 +497,35 @@ class DataMerger:
         """Merge permit data into property record"""
         try:
             # Find related permits
-            property_permits = df_permits[
-                df_permits['property_id'] == property_record['property_id']
-            ]
+            property_permits = self._property_rows(
+                df_permits, property_record['property_id'], 'issue_date'
+            )
+            return self._attach_permits(property_record, property_permits)
             
+        except Exception as e:
+            self.logger.error(f"Error merging permits: {str(e)}")
+            return property_record
+
+    def _attach_permits(self, property_record: Dict, property_permits: List[Dict]) -> Dict:
+        """Attach date-sorted permit rows to property record"""
+        try:
             if len(property_permits) > 0:
-                # Sort by date
-                property_permits['issue_date'] = pd.to_datetime(
-                    property_permits['issue_date']
-                )
-                property_permits = property_permits.sort_values('issue_date')
-                
                 # Add permit history
-                property_record['permits'] = property_permits.to_dict('records')
+                property_record['permits'] = property_permits
                 
                 # Add permit summary
                 property_record['permit_summary'] = {
                     'total_permits': len(property_permits),
-                    'active_permits': len(
-                        property_permits[property_permits['status'] == 'in_progress']
+                    'active_permits': sum(
+                        1 for p in property_permits if p['status'] == 'in_progress'
                     ),
                     'total_value': float(
-                        property_permits['estimated_cost'].sum()
+                        sum(p['estimated_cost'] for p in property_permits
+                            if pd.notna(p['estimated_cost']))
                     ),
-                    'permit_types': property_permits['permit_type'].unique().tolist()
+                    'permit_types': list(dict.fromkeys(
+                        p['permit_type'] for p in property_permits
+                    ))
                 }
             else:
                 property_record['permits'] = []
@@ -296,31 +543,38 @@ class DataMerger:
         """Merge violation data into property record"""
         try:
             # Find related violations
-            property_violations = df_violations[
-                df_violations['property_id'] == property_record['property_id']
-            ]
+            property_violations = self._property_rows(
+                df_violations, property_record['property_id'], 'reported_date'
+            )
+            return self._attach_violations(property_record, property_violations)
             
+        except Exception as e:
+            self.logger.error(f"Error merging violations: {str(e)}")
+            return property_record
+
+    def _attach_violations(self, property_record: Dict, property_violations: List[Dict]) -> Dict:
+        """Attach date-sorted violation rows to property record"""
+        try:
             if len(property_violations) > 0:
-                # Sort by date
-                property_violations['reported_date'] = pd.to_datetime(
-                    property_violations['reported_date']
-                )
-                property_violations = property_violations.sort_values('reported_date')
-                
                 # Add violation history
-                property_record['violations'] = property_violations.to_dict('records')
+                property_record['violations'] = property_violations
                 
                 # Add violation summary
+                severity_counts = Counter(
+                    v['severity'] for v in property_violations if pd.notna(v['severity'])
+                )
                 property_record['violation_summary'] = {
                     'total_violations': len(property_violations),
-                    'open_violations': len(
-                        property_violations[property_violations['status'] == 'open']
+                    'open_violations': sum(
+                        1 for v in property_violations if v['status'] == 'open'
                     ),
                     'total_fines': float(
-                        property_violations['fines'].sum()
+                        sum(v['fines'] for v in property_violations if pd.notna(v['fines']))
                     ),
-                    'violation_types': property_violations['violation_type'].unique().tolist(),
-                    'severity_counts': property_violations['severity'].value_counts().to_dict()
+                    'violation_types': list(dict.fromkeys(
+                        v['violation_type'] for v in property_violations
+                    )),
+                    'severity_counts': dict(severity_counts.most_common())
                 }
             else:
                 property_record['violations'] = []
@@ -338,13 +592,24 @@ class DataMerger:
         """Merge utility data into property record"""
         try:
             # Find related utility records
-            property_utilities = df_utilities[
-                df_utilities['property_id'] == property_record['property_id']
-            ]
+            property_utilities = self._property_rows(
+                df_utilities, property_record['property_id'], 'reading_date'
+            )
+            return self._attach_utilities(property_record, property_utilities)
             
+        except Exception as e:
+            self.logger.error(f"Error merging utilities: {str(e)}")
+            return property_record
+
+    def _attach_utilities(self, property_record: Dict, property_utilities: List[Dict]) -> Dict:
+        """Attach date-sorted utility rows to property record"""
+        try:
             if len(property_utilities) > 0:
-                # Group by utility type
-                utility_groups = property_utilities.groupby('utility_type')
+                # Group by utility type, keeping reading_date order
+                utility_groups = {}
+                for reading in property_utilities:
+                    if pd.notna(reading['utility_type']):
+                        utility_groups.setdefault(reading['utility_type'], []).append(reading)
                 
                 # Process each utility type
                 property_record['utilities'] = {}
@@ -352,23 +617,22 @@ class DataMerger:
                     'total_records': len(property_utilities)
                 }
                 
-                for utility_type, group in utility_groups:
-                    # Sort by date
-                    group['reading_date'] = pd.to_datetime(group['reading_date'])
-                    group = group.sort_values('reading_date')
+                for utility_type in sorted(utility_groups):
+                    group = utility_groups[utility_type]
+                    usage = [r['usage'] for r in group if pd.notna(r['usage'])]
                     
                     # Calculate usage statistics
                     usage_stats = {
-                        'total_usage': float(group['usage'].sum()),
-                        'average_usage': float(group['usage'].mean()),
-                        'max_usage': float(group['usage'].max()),
-                        'min_usage': float(group['usage'].min()),
-                        'last_reading': group.iloc[-1].to_dict()
+                        'total_usage': float(sum(usage)),
+                        'average_usage': float(np.mean(usage)) if usage else float('nan'),
+                        'max_usage': float(max(usage)) if usage else float('nan'),
+                        'min_usage': float(min(usage)) if usage else float('nan'),
+                        'last_reading': group[-1]
                     }
                     
                     # Add to property record
                     property_record['utilities'][utility_type] = {
-                        'records': group.to_dict('records'),
+                        'records': group,
                         'statistics': usage_stats
                     }
             else:
@@ -386,26 +650,155 @@ class DataMerger:
     def _create_owner_similarity_matrix(self, df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
         """Create similarity matrix between owner records"""
         try:
-            similarities = pd.DataFrame(
-                index=df1.index,
-                columns=df2.index,
-                dtype=float
+            scores = process.cdist(
+                self._owner_match_strings(df1),
+                self._owner_match_strings(df2),
+                scorer=fuzz.ratio,
+                dtype=np.float64,
+                workers=self.owner_match_workers
             )
-            
-            for i in df1.index:
-                for j in df2.index:
-                    similarity = self.name_matcher.similarity(
-                        df1.loc[i, 'name'],
-                        df2.loc[j, 'name']
-                    )
-                    similarities.loc[i, j] = similarity
-            
-            return similarities
+            return pd.DataFrame(scores / 100, index=df1.index, columns=df2.index)
             
         except Exception as e:
             self.logger.error(f"Error creating similarity matrix: {str(e)}")
             return pd.DataFrame()
 
+    def _create_blocked_similarity_matrix(self, df1: pd.DataFrame, df2: pd.DataFrame) -> sparse.csr_matrix:
+        """
+        Score only owner pairs that share a blocking key
+        
+        Blocking keys are the three letter prefix and Soundex code of every
+        significant name token plus a four letter prefix of the whole name,
+        which covers "SMITH JOHN" vs "John Smith", common misspellings and
+        dropped spaces. Names with a single significant token also share one
+        catch-all block, so a typo in the first letter ("Kowalski" vs
+        "Cowalski") is still compared, and names made only of stopwords
+        ("The Trust") are keyed by their normalised string. Each block is
+        scored in bulk with rapidfuzz cdist,
+        using the same scores as the dense matrix. Only scores reaching the
+        name_similarity threshold are kept; other pairs are implicit zeros.
+        """
+        shape = (len(df1), len(df2))
+        try:
+            keys1 = self._owner_blocking_keys(df1)
+            keys2 = self._owner_blocking_keys(df2)
+            strings1 = self._owner_match_strings(df1)
+            strings2 = self._owner_match_strings(df2)
+            lengths1 = np.array([len(string) for string in strings1])
+            lengths2 = np.array([len(string) for string in strings2])
+            
+            blocks2 = keys2.groupby('key')['position'].apply(np.array)
+            found_rows, found_cols, found_scores = [], [], []
+            scored = 0
+            for key, rows in keys1.groupby('key')['position']:
+                if key not in blocks2.index:
+                    continue
+                for rows_part, cols_part, scores in self._score_owner_block(
+                    strings1, strings2, lengths1, lengths2, rows.to_numpy(), blocks2[key]
+                ):
+                    scored += scores.size
+                    hit_rows, hit_cols = np.nonzero(scores)
+                    found_rows.append(rows_part[hit_rows])
+                    found_cols.append(cols_part[hit_cols])
+                    found_scores.append(scores[hit_rows, hit_cols] / 100)
+            
+            self.logger.debug(
+                f"Scored {scored} candidate owner pairs "
+                f"of {shape[0] * shape[1]} possible"
+            )
+            if not found_rows:
+                return sparse.csr_matrix(shape, dtype=float)
+            
+            # Pairs sharing several keys were scored once per block
+            rows = np.concatenate(found_rows)
+            cols = np.concatenate(found_cols)
+            _, first = np.unique(rows * shape[1] + cols, return_index=True)
+            return sparse.csr_matrix(
+                (np.concatenate(found_scores)[first], (rows[first], cols[first])), shape=shape
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Error creating blocked similarity matrix: {str(e)}")
+            return sparse.csr_matrix(shape, dtype=float)
+
+    def _score_owner_block(self, strings1: List[str], strings2: List[str],
+                           lengths1: np.ndarray, lengths2: np.ndarray,
+                           rows: np.ndarray, cols: np.ndarray) -> Iterator[tuple]:
+        """
+        Yield (rows, cols, scores) for one block, scores zeroed below the threshold
+        
+        A block with more than owner_block_max_pairs pairs is split into
+        bands of rows by name length, each scored only against the columns
+        whose length lets fuzz.ratio reach the threshold
+        (ratio <= 2 * shorter / (shorter + longer)), so no qualifying pair
+        is dropped.
+        """
+        ratio = self.thresholds['name_similarity']
+        rows = rows[np.argsort(lengths1[rows], kind='stable')]
+        cols = cols[np.argsort(lengths2[cols], kind='stable')]
+        col_lengths = lengths2[cols]
+        band = max(1, self.owner_block_max_pairs // len(cols))
+        
+        for start in range(0, len(rows), band):
+            rows_part = rows[start:start + band]
+            if len(rows) > band and ratio > 0:
+                low = lengths1[rows_part[0]] * ratio / (2 - ratio)
+                high = lengths1[rows_part[-1]] * (2 - ratio) / ratio
+                cols_part = cols[np.searchsorted(col_lengths, low - 1e-9, side='left'):
+                                 np.searchsorted(col_lengths, high + 1e-9, side='right')]
+            else:
+                cols_part = cols
+            if len(cols_part) == 0:
+                continue
+            
+            yield rows_part, cols_part, process.cdist(
+                [strings1[i] for i in rows_part],
+                [strings2[j] for j in cols_part],
+                scorer=fuzz.ratio,
+                score_cutoff=ratio * 100,
+                dtype=np.float64,
+                workers=self.owner_match_workers
+            )
+
+    def _owner_match_strings(self, df: pd.DataFrame) -> List[str]:
+        """Owner names normalised for scoring: lowercase alphanumeric tokens, sorted"""
+        names = df['name'] if 'name' in df.columns else pd.Series([None] * len(df))
+        return [
+            ' '.join(sorted(utils.default_process(name).split())) if isinstance(name, str) else ''
+            for name in names
+        ]
+
+    def _owner_blocking_keys(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Build a (key, position) table of blocking keys for owner names"""
+        keys = []
+        positions = []
+        names = df['name'] if 'name' in df.columns else pd.Series([None] * len(df))
+        match_strings = self._owner_match_strings(df)
+        
+        for position, name in enumerate(names):
+            if not isinstance(name, str):
+                continue
+            tokens = [
+                token for token in re.findall(r'[a-z]+', name.lower())
+                if len(token) > 1 and token not in OWNER_NAME_STOPWORDS
+            ]
+            if not tokens:
+                if not match_strings[position]:
+                    continue
+                name_keys = {f"n:{match_strings[position]}"}
+            else:
+                name_keys = {f"p:{''.join(tokens)[:4]}"}
+                for token in tokens:
+                    name_keys.add(f"t:{token[:3]}")
+                    name_keys.add(f"s:{_soundex(token)}")
+                if len(tokens) == 1:
+                    name_keys.add('c:')
+            
+            keys.extend(name_keys)
+            positions.extend([position] * len(name_keys))
+        
+        return pd.DataFrame({'key': keys, 'position': positions})
+
     def _merge_owner_group(self, group: pd.DataFrame) -> Dict:
         """Merge a group of similar owner records"""
         try:
@@ -441,26 +834,28 @@ class DataMerger:
 
     def _calculate_ownership_durations(self, transactions: pd.DataFrame) -> List[Dict]:
         """Calculate ownership duration for each period"""
+        return self._ownership_durations_from_records(transactions.to_dict('records'))
+
+    def _ownership_durations_from_records(self, transactions: List[Dict]) -> List[Dict]:
+        """Calculate ownership durations from date-sorted transaction rows"""
         try:
             durations = []
-            for i in range(len(transactions) - 1):
+            for current, following in zip(transactions, transactions[1:]):
                 duration = {
-                    'owner': transactions.iloc[i]['buyer'],
-                    'start_date': transactions.iloc[i]['date'].isoformat(),
-                    'end_date': transactions.iloc[i + 1]['date'].isoformat(),
-                    'days': (transactions.iloc[i + 1]['date'] - 
-                            transactions.iloc[i]['date']).days
+                    'owner': current['buyer'],
+                    'start_date': current['date'].isoformat(),
+                    'end_date': following['date'].isoformat(),
+                    'days': (following['date'] - current['date']).days
                 }
                 durations.append(duration)
             
             # Add current owner
             if len(transactions) > 0:
                 current_duration = {
-                    'owner': transactions.iloc[-1]['buyer'],
-                    'start_date': transactions.iloc[-1]['date'].isoformat(),
+                    'owner': transactions[-1]['buyer'],
+                    'start_date': transactions[-1]['date'].isoformat(),
                     'end_date': None,
-                    'days': (datetime.now() - 
-                            transactions.iloc[-1]['date']).days
+                    'days': (datetime.now() - transactions[-1]['date']).days
                 }
                 durations.append(current_duration)
             
@@ -472,47 +867,44 @@ class DataMerger:
 
     def _calculate_price_trends(self, transactions: pd.DataFrame) -> Dict:
         """Calculate price trends from transaction history"""
+        if len(transactions) < 2:
+            return {}
+        return self._price_trends_from_records(
+            transactions.sort_values('date').to_dict('records')
+        )
+
+    def _price_trends_from_records(self, transactions: List[Dict]) -> Dict:
+        """Calculate price trends from date-sorted transaction rows"""
         try:
             if len(transactions) < 2:
                 return {}
             
             # Calculate price changes
-            transactions = transactions.sort_values('date')
             price_changes = []
-            
-            for i in range(len(transactions) - 1):
+            for current, following in zip(transactions, transactions[1:]):
                 change = {
-                    'from_date': transactions.iloc[i]['date'].isoformat(),
-                    'to_date': transactions.iloc[i + 1]['date'].isoformat(),
-                    'from_price': float(transactions.iloc[i]['price']),
-                    'to_price': float(transactions.iloc[i + 1]['price']),
-                    'change': float(
-                        transactions.iloc[i + 1]['price'] - 
-                        transactions.iloc[i]['price']
-                    ),
+                    'from_date': current['date'].isoformat(),
+                    'to_date': following['date'].isoformat(),
+                    'from_price': float(current['price']),
+                    'to_price': float(following['price']),
+                    'change': float(following['price'] - current['price']),
                     'change_percent': float(
-                        (transactions.iloc[i + 1]['price'] - 
-                         transactions.iloc[i]['price']) / 
-                        transactions.iloc[i]['price'] * 100
+                        (following['price'] - current['price']) /
+                        current['price'] * 100
                     )
                 }
                 price_changes.append(change)
             
             # Calculate overall trend
-            total_change = float(
-                transactions.iloc[-1]['price'] - 
-                transactions.iloc[0]['price']
-            )
-            total_change_percent = float(
-                (transactions.iloc[-1]['price'] - 
-                 transactions.iloc[0]['price']) / 
-                transactions.iloc[0]['price'] * 100
-            )
+            first_price = transactions[0]['price']
+            last_price = transactions[-1]['price']
             
             return {
                 'price_changes': price_changes,
-                'total_change': total_change,
-                'total_change_percent': total_change_percent,
+                'total_change': float(last_price - first_price),
+                'total_change_percent': float(
+                    (last_price - first_price) / first_price * 100
+                ),
                 'average_change_percent': float(
                     np.mean([c['change_percent'] for c in price_changes])
                 )
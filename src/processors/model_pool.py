@@ -0,0 +1,152 @@
+"""
+Process-wide pool of lazily loaded NLP models
+"""
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+class ModelPool:
+    """
+    NLP models loaded on first use and shared by every analyzer in the process
+
+    spaCy pipelines and transformers pipelines are loaded the first time an
+    analyzer asks for them, never in constructors, and each distinct model
+    is loaded once per process no matter how many analyzers use it.
+    Concurrent first requests for the same model wait on a per-model lock
+    rather than loading it twice.
+
+    Transformers pipelines always run on CPU. backend selects how:
+        'pytorch'   - the stock PyTorch model
+        'quantized' - PyTorch with int8 dynamic quantization of Linear layers
+        'onnx'      - exported to ONNX Runtime through optimum
+    """
+
+    BACKENDS = ('pytorch', 'quantized', 'onnx')
+
+    _shared: Optional['ModelPool'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._models: Dict[Hashable, Any] = {}
+        self._locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.load_times: Dict[Hashable, float] = {}
+
+    @classmethod
+    def shared(cls) -> 'ModelPool':
+        """The pool used by analyzers that aren't given one"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Model stored under key, calling loader to create it on first use"""
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            model = self._models.get(key)
+            if model is None:
+                start = time.perf_counter()
+                model = loader()
+                self.load_times[key] = time.perf_counter() - start
+                self.logger.info(f"Loaded {key} in {self.load_times[key]:.1f}s")
+                self._models[key] = model
+        return model
+
+    def spacy(self, name: str = 'en_core_web_sm', disable: Iterable[str] = ()) -> Any:
+        """spaCy pipeline, optionally with components disabled"""
+        disable = tuple(sorted(disable))
+
+        def load():
+            import spacy
+            return spacy.load(name, disable=list(disable))
+
+        return self.get(('spacy', name, disable), load)
+
+    def pipeline(self, task: str, model: str, backend: str = 'pytorch') -> Any:
+        """transformers pipeline for task on CPU with the given backend"""
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown model backend {backend}; expected one of {self.BACKENDS}")
+        return self.get(('pipeline', task, model, backend), lambda: self._load_pipeline(task, model, backend))
+
+    def tokenizer(self, model: str) -> Any:
+        def load():
+            from transformers import AutoTokenizer
+            return AutoTokenizer.from_pretrained(model)
+
+        return self.get(('tokenizer', model), load)
+
+    def sequence_classifier(self, model: str, backend: str = 'pytorch') -> Any:
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown model backend {backend}; expected one of {self.BACKENDS}")
+        return self.get(
+            ('sequence_classifier', model, backend),
+            lambda: self._load_model('text-classification', model, backend)
+        )
+
+    def encoder(self, model: str, backend: str = 'pytorch') -> Any:
+        """Base model without a task head; its output has last_hidden_state on every backend"""
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown model backend {backend}; expected one of {self.BACKENDS}")
+        return self.get(
+            ('encoder', model, backend),
+            lambda: self._load_model('feature-extraction', model, backend)
+        )
+
+    def loaded(self) -> List[Hashable]:
+        """Keys of the models loaded so far"""
+        return list(self._models)
+
+    def clear(self, key: Optional[Hashable] = None):
+        """Drop one loaded model, or all of them, so the next use reloads"""
+        with self._lock:
+            if key is None:
+                self._models.clear()
+            else:
+                self._models.pop(key, None)
+
+    def _load_pipeline(self, task: str, model: str, backend: str) -> Any:
+        from transformers import pipeline
+
+        if backend == 'pytorch':
+            return pipeline(task, model=model, device=-1)
+        return pipeline(
+            task,
+            model=self._load_model(task, model, backend),
+            tokenizer=self.tokenizer(model),
+            device=-1
+        )
+
+    def _load_model(self, task: str, model: str, backend: str) -> Any:
+        seq2seq = task in ('summarization', 'translation', 'text2text-generation')
+
+        features = task == 'feature-extraction'
+
+        if backend == 'onnx':
+            from optimum.onnxruntime import (
+                ORTModelForFeatureExtraction, ORTModelForSeq2SeqLM, ORTModelForSequenceClassification
+            )
+            if features:
+                model_class = ORTModelForFeatureExtraction
+            else:
+                model_class = ORTModelForSeq2SeqLM if seq2seq else ORTModelForSequenceClassification
+            return model_class.from_pretrained(model, export=True)
+
+        from transformers import AutoModel, AutoModelForSeq2SeqLM, AutoModelForSequenceClassification
+        if features:
+            model_class = AutoModel
+        else:
+            model_class = AutoModelForSeq2SeqLM if seq2seq else AutoModelForSequenceClassification
+        loaded = model_class.from_pretrained(model)
+        loaded.eval()
+        if backend == 'quantized':
+            import torch
+            loaded = torch.quantization.quantize_dynamic(loaded, {torch.nn.Linear}, dtype=torch.qint8)
+        return loaded
@@ -0,0 +1,225 @@
+"""
+Versioned on-disk registry of trained model artifacts
+"""
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import pandas as pd
+
+class ModelRegistry:
+    """
+    Trained models stored by name and version
+
+    A version is derived from the training-data hash and the feature
+    schema, so retraining on identical inputs finds the existing artifacts
+    instead of fitting again. Each version directory holds one joblib file
+    per artifact (model, scaler, ...) and a meta.json with hashes, schema
+    and metrics. Artifacts are loaded memory-mapped and only on request.
+
+    Every model name has an active version; saving promotes by default, and
+    promote()/rollback() move the pointer while keeping a history. Versions
+    rolled back from are remembered until promoted again explicitly.
+
+    Layout:
+        <root>/<name>/<version>/<artifact>.joblib
+        <root>/<name>/<version>/meta.json
+        <root>/<name>/active.json
+    """
+
+    META_FILE = 'meta.json'
+    ACTIVE_FILE = 'active.json'
+
+    def __init__(self, root: str):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def data_hash(records: Any) -> str:
+        """Stable hash of training records (a DataFrame or JSON-serializable data)"""
+        digest = hashlib.sha256()
+        if isinstance(records, pd.DataFrame):
+            digest.update(json.dumps(list(map(str, records.columns))).encode())
+            digest.update(pd.util.hash_pandas_object(records.astype(str), index=False).values.tobytes())
+        else:
+            digest.update(json.dumps(records, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def feature_schema(features: pd.DataFrame) -> List[Tuple[str, str]]:
+        """Ordered (column, dtype) pairs of a feature frame"""
+        return [(str(column), str(dtype)) for column, dtype in features.dtypes.items()]
+
+    @classmethod
+    def version_key(cls, data_hash: str, feature_schema: List) -> str:
+        schema_hash = hashlib.sha256(json.dumps(feature_schema).encode()).hexdigest()
+        return f"{data_hash[:16]}-{schema_hash[:8]}"
+
+    def find(self, name: str, data_hash: str, feature_schema: List) -> Optional[str]:
+        """Version trained on this data and schema, if one is registered"""
+        version = self.version_key(data_hash, feature_schema)
+        return version if (self.root / name / version / self.META_FILE).exists() else None
+
+    def save(self,
+             name: str,
+             artifacts: Dict[str, Any],
+             data_hash: str,
+             feature_schema: List,
+             metrics: Optional[Dict] = None,
+             promote: bool = True) -> str:
+        """Write artifacts as a new version; returns the version key"""
+        version = self.version_key(data_hash, feature_schema)
+        target = self.root / name / version
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write into a temp dir and rename, so readers never see half a version
+        staging = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=target.parent))
+        try:
+            for artifact, obj in artifacts.items():
+                joblib.dump(obj, staging / f"{artifact}.joblib")
+            meta = {
+                'name': name,
+                'version': version,
+                'data_hash': data_hash,
+                'feature_schema': feature_schema,
+                'artifacts': sorted(artifacts),
+                'metrics': metrics or {},
+                'created_at': datetime.now().isoformat()
+            }
+            (staging / self.META_FILE).write_text(json.dumps(meta, indent=2, default=float))
+
+            if target.exists():
+                shutil.rmtree(target)
+            os.replace(staging, target)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+        if promote:
+            self.promote(name, version)
+        return version
+
+    def load(self, name: str, artifact: str = 'model', version: Optional[str] = None) -> Any:
+        """Load one artifact of a version (the active one by default), memory-mapped"""
+        version = version or self.active_version(name)
+        if version is None:
+            return None
+        path = self.root / name / version / f"{artifact}.joblib"
+        if not path.exists():
+            return None
+        return joblib.load(path, mmap_mode='r')
+
+    def metadata(self, name: str, version: Optional[str] = None) -> Optional[Dict]:
+        version = version or self.active_version(name)
+        if version is None:
+            return None
+        path = self.root / name / version / self.META_FILE
+        return json.loads(path.read_text()) if path.exists() else None
+
+    def versions(self, name: str) -> List[Dict]:
+        """Metadata for every version of a model, oldest first"""
+        model_dir = self.root / name
+        if not model_dir.exists():
+            return []
+        metas = [
+            json.loads(path.read_text())
+            for path in model_dir.glob(f"*/{self.META_FILE}")
+            if not path.parent.name.startswith('.')
+        ]
+        return sorted(metas, key=lambda meta: meta['created_at'])
+
+    def active_version(self, name: str) -> Optional[str]:
+        return self._read_active(name).get('version')
+
+    def promote(self, name: str, version: str):
+        """Make version the active one, remembering the previous for rollback"""
+        if not (self.root / name / version / self.META_FILE).exists():
+            raise ValueError(f"Unknown version {version} of model {name}")
+
+        active = self._read_active(name)
+        history = active.get('history', [])
+        if active.get('version') and active['version'] != version:
+            history.append(active['version'])
+        rolled_back = [v for v in active.get('rolled_back', []) if v != version]
+        self._write_active(name, {'version': version, 'history': history, 'rolled_back': rolled_back})
+        self.logger.info(f"Promoted {name} model version {version}")
+
+    def rollback(self, name: str) -> Optional[str]:
+        """Reactivate the previously active version; returns it, or None if there is none"""
+        active = self._read_active(name)
+        history = active.get('history', [])
+        if not history:
+            return None
+        version = history.pop()
+        rolled_back = active.get('rolled_back', [])
+        if active['version'] not in rolled_back:
+            rolled_back.append(active['version'])
+        self._write_active(name, {
+            'version': version, 'history': history, 'rolled_back': rolled_back, 'from_rollback': True
+        })
+        self.logger.info(f"Rolled back {name} model to version {version}")
+        return version
+
+    def is_rolled_back(self, name: str, version: str) -> bool:
+        """Whether version was rolled back from and not promoted since"""
+        return version in self._read_active(name).get('rolled_back', [])
+
+    def active_from_rollback(self, name: str) -> bool:
+        """Whether the active version was reached by a rollback, with no promotion since"""
+        return self._read_active(name).get('from_rollback', False)
+
+    def _read_active(self, name: str) -> Dict:
+        path = self.root / name / self.ACTIVE_FILE
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def _write_active(self, name: str, active: Dict):
+        path = self.root / name / self.ACTIVE_FILE
+        staging = path.with_suffix('.tmp')
+        staging.write_text(json.dumps(active))
+        os.replace(staging, path)
+
+
+class LazyModels(dict):
+    """
+    Dict of loaded models that pulls missing entries from a registry
+
+    artifacts maps each key to its (registry name, artifact). A known key
+    with no registered version reads as None, like an untrained slot.
+    """
+
+    def __init__(self, registry: Optional[ModelRegistry], artifacts: Dict[str, Tuple[str, str]]):
+        super().__init__()
+        self.registry = registry
+        self.artifacts = artifacts
+
+    def __missing__(self, key):
+        if key not in self.artifacts:
+            raise KeyError(key)
+        if self.registry is None:
+            return None
+        name, artifact = self.artifacts[key]
+        model = self.registry.load(name, artifact)
+        if model is not None:
+            self[key] = model
+        return model
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def evict(self, name: str):
+        """Drop loaded artifacts of a registry name so the next access reloads"""
+        for key, (registry_name, _) in self.artifacts.items():
+            if registry_name == name:
+                self.pop(key, None)
@@ -2,14 +2,14 @@
 Analyzes networks and relationships between properties, owners, and market activities
 """
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 import networkx as nx
 from networkx.algorithms import community
 from sklearn.cluster import DBSCAN
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
 import json
 
 class NetworkAnalyzer:
@@ -31,12 +31,14 @@ class NetworkAnalyzer:
             'name_similarity_threshold': 85,  # Fuzzy matching threshold
             'transaction_window': 180,        # Days to consider related transactions
             'geographic_radius': 0.5,         # Miles for geographic clustering
-            'min_relationship_strength': 2    # Minimum connections for strong relationship
+            'min_relationship_strength': 2,   # Minimum connections for strong relationship
+            'name_match_workers': -1,         # Threads for batched name scoring (-1 = all cores)
+            'name_match_block_size': 256      # Owners scored per cdist batch
         }
         
         # Update from config
-        if 'network_params' in config:
-            self.params.update(config['network_params'])
+        if 'network_params' in self.config:
+            self.params.update(self.config['network_params'])
         
         # Initialize network storage
         self.networks = {
@@ -286,34 +288,95 @@ class NetworkAnalyzer:
     def _connect_related_owners(self, G: nx.Graph, owner_properties: Dict) -> None:
         """Connect owners based on various relationships"""
         try:
-            # Connect by similar names
             owners = list(owner_properties.keys())
-            for i in range(len(owners)):
-                for j in range(i + 1, len(owners)):
-                    if fuzz.ratio(owners[i], owners[j]) >= self.params['name_similarity_threshold']:
-                        G.add_edge(
-                            owners[i],
-                            owners[j],
-                            relationship_type='similar_name',
-                            strength=fuzz.ratio(owners[i], owners[j]) / 100
-                        )
+
+            # Connect by similar names
+            for i, j, score in self._similar_name_pairs(owners):
+                G.add_edge(
+                    owners[i],
+                    owners[j],
+                    relationship_type='similar_name',
+                    strength=score / 100
+                )
             
             # Connect by shared properties
-            for i in range(len(owners)):
-                for j in range(i + 1, len(owners)):
-                    shared = set(owner_properties[owners[i]]) & set(owner_properties[owners[j]])
-                    if shared:
-                        G.add_edge(
-                            owners[i],
-                            owners[j],
-                            relationship_type='shared_property',
-                            shared_properties=list(shared),
-                            strength=len(shared)
-                        )
+            for i, j in self._shared_property_pairs(owners, owner_properties):
+                shared = set(owner_properties[owners[i]]) & set(owner_properties[owners[j]])
+                G.add_edge(
+                    owners[i],
+                    owners[j],
+                    relationship_type='shared_property',
+                    shared_properties=list(shared),
+                    strength=len(shared)
+                )
             
         except Exception as e:
             self.logger.error(f"Error connecting related owners: {str(e)}")
 
+    def _similar_name_pairs(self, owners: List[str]) -> List[Tuple[int, int, int]]:
+        """
+        (i, j, score) for owner pairs i < j whose fuzz.ratio score reaches the threshold
+
+        Scores are the integer-rounded ratio the per-pair fuzzywuzzy loop
+        produced. Names are sorted by length and scored in blocks with
+        rapidfuzz cdist, each block only against names short enough to reach
+        the threshold (ratio <= 2 * shorter / (shorter + longer)), so no
+        qualifying pair is skipped. Survivors are re-scored exactly.
+        """
+        threshold = self.params['name_similarity_threshold']
+        # Rounded scores reach the threshold from threshold - 0.5 up; leave slack
+        cutoff = max(threshold - 1, 0)
+        ratio = cutoff / 100
+
+        order = sorted(range(len(owners)), key=lambda i: len(owners[i]))
+        names = [owners[i] for i in order]
+        lengths = np.array([len(name) for name in names])
+        block_size = self.params['name_match_block_size']
+
+        pairs = []
+        for start in range(0, len(names), block_size):
+            stop = min(start + block_size, len(names))
+            if ratio > 0:
+                max_length = int(lengths[stop - 1] * (2 - ratio) / ratio + 1e-9)
+                end = int(np.searchsorted(lengths, max_length, side='right'))
+            else:
+                end = len(names)
+
+            scores = process.cdist(
+                names[start:stop],
+                names[start:end],
+                scorer=fuzz.ratio,
+                score_cutoff=cutoff,
+                workers=self.params['name_match_workers']
+            )
+            rows, cols = np.nonzero(scores >= cutoff)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                a, b = start + row, start + col
+                if b <= a:
+                    continue
+                score = int(round(fuzz.ratio(names[a], names[b])))
+                if score >= threshold:
+                    i, j = sorted((order[a], order[b]))
+                    pairs.append((i, j, score))
+
+        pairs.sort()
+        return pairs
+
+    def _shared_property_pairs(self, owners: List[str], owner_properties: Dict) -> List[Tuple[int, int]]:
+        """Owner pairs i < j that share a property, from a property -> owners index"""
+        property_owners = {}
+        for i, owner in enumerate(owners):
+            for property_id in owner_properties[owner]:
+                property_owners.setdefault(property_id, set()).add(i)
+
+        pairs = set()
+        for members in property_owners.values():
+            members = sorted(members)
+            for a in range(len(members)):
+                for b in range(a + 1, len(members)):
+                    pairs.add((members[a], members[b]))
+        return sorted(pairs)
+
     def _detect_owner_communities(self, G: nx.Graph) -> List[Dict]:
         """Detect and analyze owner communities"""
         try:
@@ -0,0 +1,287 @@
+"""
+Disk-backed cache of NLP results keyed by model and text hash
+"""
+import time
+import pickle
+import sqlite3
+import hashlib
+import logging
+import threading
+from importlib import metadata
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+class NLPResultCache:
+    """
+    Entities, sentiment, summaries etc. computed once per distinct text
+
+    Results are stored in SQLite under (model, kind, text hash), where
+    model names the model and its version (see model_key) and kind the
+    result type, so a model upgrade or a different backend never serves
+    stale results. Values are pickled, so anything from dicts to NumPy
+    vectors can be cached.
+
+    The cache is bounded by max_bytes of stored values: once exceeded, the
+    least recently used entries are evicted down to evict_to of the limit.
+    Hits and misses are counted per kind for this instance; stats() also
+    reports the stored size.
+
+    Without path the cache lives in memory for the life of the instance;
+    analyzers use NullResultCache instead when no path is configured.
+    """
+
+    # Connection settings: WAL lets several processes read while one writes
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL"
+    )
+
+    # Keys per IN (...) query, below SQLite's bound-parameter limit
+    QUERY_BATCH = 500
+
+    # Entries used within this many seconds keep their last_used stamp, so a
+    # warm run doesn't rewrite every row it reads
+    TOUCH_INTERVAL = 3600
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 max_bytes: int = 512 * 2 ** 20,
+                 evict_to: float = 0.9):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = path or ':memory:'
+        self.max_bytes = max_bytes
+        self.evict_to = evict_to
+
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        if self.path != ':memory:':
+            for pragma in self.PRAGMAS:
+                self.conn.execute(pragma)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS nlp_results (
+                model TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, kind, text_hash)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_nlp_results_last_used ON nlp_results (last_used);
+        """)
+        self._total_bytes = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM nlp_results"
+        ).fetchone()[0]
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    @staticmethod
+    def model_key(name: str, *packages: str) -> str:
+        """
+        name@versions, with the installed versions of packages
+
+        Model packages such as spaCy pipelines are versioned themselves, so
+        pass the model name as one of packages; for hub models pass the
+        library that runs them.
+        """
+        versions = []
+        for package in packages:
+            try:
+                versions.append(f"{package}={metadata.version(package)}")
+            except metadata.PackageNotFoundError:
+                versions.append(f"{package}=?")
+        return f"{name}@{','.join(versions)}" if versions else name
+
+    def cached(self,
+               model: str,
+               kind: str,
+               texts: Sequence[str],
+               compute: Callable[[List[str]], Sequence[Any]]) -> List[Any]:
+        """
+        Results for texts, calling compute only on texts not already cached
+
+        compute receives the distinct uncached texts in one list and must
+        return one result per text, in order.
+        """
+        hashes = [self.text_hash(text) for text in texts]
+        found = self.get_many(model, kind, hashes)
+
+        missing = {}
+        for digest, text in zip(hashes, texts):
+            if digest not in found:
+                missing.setdefault(digest, text)
+        if missing:
+            computed = dict(zip(missing, compute(list(missing.values()))))
+            self.put_many(model, kind, computed)
+            found.update(computed)
+
+        return [found[digest] for digest in hashes]
+
+    def get_many(self, model: str, kind: str, hashes: Sequence[str]) -> Dict[str, Any]:
+        """Cached values by text hash (hashes without an entry are left out)"""
+        unique = list(dict.fromkeys(hashes))
+        found, stale = {}, []
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(unique), self.QUERY_BATCH):
+                chunk = unique[start:start + self.QUERY_BATCH]
+                rows = self.conn.execute(
+                    f"SELECT text_hash, value, last_used FROM nlp_results "
+                    f"WHERE model = ? AND kind = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [model, kind, *chunk]
+                ).fetchall()
+                for digest, value, last_used in rows:
+                    found[digest] = pickle.loads(value)
+                    if now - last_used > self.TOUCH_INTERVAL:
+                        stale.append((now, model, kind, digest))
+
+            if stale:
+                self.conn.execute("BEGIN")
+                self.conn.executemany(
+                    "UPDATE nlp_results SET last_used = ? WHERE model = ? AND kind = ? AND text_hash = ?",
+                    stale
+                )
+                self.conn.execute("COMMIT")
+
+        self.hits[kind] += sum(1 for digest in hashes if digest in found)
+        self.misses[kind] += sum(1 for digest in hashes if digest not in found)
+        return found
+
+    def put_many(self, model: str, kind: str, values: Dict[str, Any]):
+        """Store values by text hash, then evict if over max_bytes"""
+        now = time.time()
+        rows = []
+        for digest, value in values.items():
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((model, kind, digest, blob, len(blob), now))
+
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                replaced = 0
+                for start in range(0, len(rows), self.QUERY_BATCH):
+                    chunk = [row[2] for row in rows[start:start + self.QUERY_BATCH]]
+                    replaced += self.conn.execute(
+                        f"SELECT COALESCE(SUM(size), 0) FROM nlp_results "
+                        f"WHERE model = ? AND kind = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                        [model, kind, *chunk]
+                    ).fetchone()[0]
+                self.conn.executemany("INSERT OR REPLACE INTO nlp_results VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self._total_bytes += sum(row[4] for row in rows) - replaced
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def stats(self) -> Dict:
+        """Hit rates for this instance and the stored size"""
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        kinds = set(self.hits) | set(self.misses)
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM nlp_results").fetchone()[0]
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'by_kind': {
+                kind: {
+                    'hits': self.hits[kind],
+                    'misses': self.misses[kind],
+                    'hit_rate': self.hits[kind] / (self.hits[kind] + self.misses[kind])
+                }
+                for kind in sorted(kinds) if self.hits[kind] + self.misses[kind]
+            },
+            'entries': entries,
+            'bytes': self._total_bytes,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions
+        }
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM nlp_results")
+            self._total_bytes = 0
+
+    def close(self):
+        self.conn.close()
+
+    def _evict(self):
+        """Delete least recently used entries until under evict_to x max_bytes (lock held)"""
+        # Other processes may share the file, so size up from the table itself
+        self._total_bytes = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM nlp_results"
+        ).fetchone()[0]
+        excess = self._total_bytes - self.max_bytes * self.evict_to
+        victims, freed = [], 0
+        cursor = self.conn.execute("SELECT model, kind, text_hash, size FROM nlp_results ORDER BY last_used")
+        for model, kind, digest, size in cursor:
+            if freed >= excess:
+                break
+            victims.append((model, kind, digest))
+            freed += size
+        cursor.close()
+
+        self.conn.execute("BEGIN")
+        self.conn.executemany(
+            "DELETE FROM nlp_results WHERE model = ? AND kind = ? AND text_hash = ?", victims
+        )
+        self.conn.execute("COMMIT")
+        self._total_bytes -= freed
+        self.evictions += len(victims)
+        self.logger.info(f"Evicted {len(victims)} cached NLP results ({freed / 2 ** 20:.1f}MB)")
+
+
+class NullResultCache(NLPResultCache):
+    """
+    Cache that stores nothing, for analyzers without nlp_cache_path
+
+    cached() still computes each distinct text once per call, and misses
+    are counted so stats() reports the same shape.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = None
+        self.max_bytes = 0
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.evictions = 0
+        self._total_bytes = 0
+
+    def get_many(self, model: str, kind: str, hashes: Sequence[str]) -> Dict[str, Any]:
+        self.misses[kind] += len(hashes)
+        return {}
+
+    def put_many(self, model: str, kind: str, values: Dict[str, Any]):
+        pass
+
+    def stats(self) -> Dict:
+        misses = sum(self.misses.values())
+        return {
+            'hits': 0,
+            'misses': misses,
+            'hit_rate': 0.0,
+            'by_kind': {
+                kind: {'hits': 0, 'misses': count, 'hit_rate': 0.0}
+                for kind, count in sorted(self.misses.items()) if count
+            },
+            'entries': 0,
+            'bytes': 0,
+            'max_bytes': 0,
+            'evictions': 0
+        }
+
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
@@ -35,13 +35,34 @@ class OpportunityDetector:
         }
         
         # Update weights from config
-        if 'scoring_weights' in config:
-            self.weights.update(config['scoring_weights'])
+        if 'scoring_weights' in self.config:
+            self.weights.update(self.config['scoring_weights'])
 
-    def detect_opportunities(self, properties: List[Dict]) -> List[Dict]:
+        # 'columnar' scores all properties as arrays; 'rowwise' is the per-row path
+        self.scoring_mode = self.config.get('scoring_mode', 'columnar')
+
+    def detect_opportunities(self, properties: List[Dict], mode: Optional[str] = None) -> List[Dict]:
         """
         Detect investment opportunities across properties
         """
+        if (mode or self.scoring_mode) == 'rowwise':
+            return self._detect_opportunities_rowwise(properties)
+
+        try:
+            columns = self._extract_scoring_columns(properties)
+            scores = self._score_matrix(columns)
+
+            # Weighted total for every property in one matrix-vector product
+            totals = scores @ self._weight_vector()
+
+            return self._rank_opportunities(columns['property_id'], scores, totals)
+
+        except Exception as e:
+            self.logger.error(f"Error detecting opportunities: {str(e)}")
+            return []
+
+    def _detect_opportunities_rowwise(self, properties: List[Dict]) -> List[Dict]:
+        """Per-row scoring over a DataFrame"""
         try:
             opportunities = []
             
@@ -175,6 +196,171 @@ class OpportunityDetector:
             self.logger.error(f"Error analyzing comparative advantage: {str(e)}")
             return {}
 
+    # Sub-scores in score-matrix column order
+    SCORE_NAMES = ['value', 'growth', 'condition', 'location', 'market', 'risk']
+    IMPROVEMENT_PERMIT_TYPES = ('renovation', 'improvement')
+
+    def _extract_scoring_columns(self, properties: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Flatten the fields scoring needs into typed arrays in one pass
+
+        Missing fields take the same defaults as the row-wise path. Rows
+        whose fields can't be used (non-numeric values, zero denominators)
+        are marked invalid for that sub-score, which then scores 0 - the
+        row-wise path's behaviour when a row raised.
+        """
+        n = len(properties)
+        columns = {
+            'property_id': np.empty(n, dtype=object),
+            'total_value': np.full(n, np.nan),
+            'land_value': np.zeros(n),
+            'square_feet': np.ones(n),
+            'year_built': np.full(n, 1900.0),
+            'improvements': np.zeros(n),
+            'violation_count': np.zeros(n),
+            'value_valid': np.ones(n, dtype=bool),
+            'condition_valid': np.ones(n, dtype=bool)
+        }
+
+        for i, prop in enumerate(properties):
+            columns['property_id'][i] = prop['property_id']
+
+            try:
+                assessment = prop.get('assessment', {})
+                if 'total_value' in assessment:
+                    columns['total_value'][i] = float(assessment['total_value'])
+                columns['land_value'][i] = float(assessment.get('land_value', 0))
+                columns['square_feet'][i] = float(prop.get('square_feet', 1))
+            except (AttributeError, TypeError, ValueError):
+                columns['value_valid'][i] = False
+                columns['condition_valid'][i] = False
+
+            try:
+                columns['year_built'][i] = float(prop.get('year_built', 1900))
+                columns['improvements'][i] = sum(
+                    p.get('estimated_cost', 0)
+                    for p in prop.get('permits', [])
+                    if p.get('permit_type') in self.IMPROVEMENT_PERMIT_TYPES
+                )
+                columns['violation_count'][i] = len(prop.get('violations', []))
+            except (AttributeError, TypeError, ValueError):
+                columns['condition_valid'][i] = False
+
+        return columns
+
+    def _score_matrix(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """n x len(SCORE_NAMES) matrix of sub-scores"""
+        scores = np.zeros((len(columns['property_id']), len(self.SCORE_NAMES)))
+        scores[:, self.SCORE_NAMES.index('value')] = self._value_score_column(columns)
+        scores[:, self.SCORE_NAMES.index('condition')] = self._condition_score_column(columns)
+
+        # Growth, location, market and risk depend on per-factor rules
+        # (_calculate_school_score, _calculate_demand_score, ...) that have no
+        # implementation yet; every row fails in the row-wise path and scores
+        # 0, so those columns stay zero here too.
+        return scores
+
+    def _value_score_column(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Value scores: cheap per square foot and high land value share"""
+        total_value = columns['total_value']
+        missing = np.isnan(total_value)
+        square_feet = columns['square_feet']
+        valid = columns['value_valid'] & (square_feet != 0) & (missing | (total_value != 0))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_per_sqft = np.where(missing, 0.0, total_value) / square_feet
+            land_value_ratio = columns['land_value'] / np.where(missing, 1.0, total_value)
+
+        price_score = 1 - self._min_max_scale(price_per_sqft, valid)  # Lower price is better
+        land_score = self._min_max_scale(land_value_ratio, valid)     # Higher land value ratio is better
+        return np.where(valid, 0.7 * price_score + 0.3 * land_score, 0.0)
+
+    def _condition_score_column(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Condition scores from age, improvement permits and violations"""
+        total_value = np.where(np.isnan(columns['total_value']), 1.0, columns['total_value'])
+        valid = columns['condition_valid'] & (total_value != 0)
+
+        # Older properties score lower; unknown (NaN) years score 0
+        age = datetime.now().year - columns['year_built']
+        age_score = np.nan_to_num(np.maximum(0, 1 - age / 100), nan=0.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            improvement_score = np.minimum(1, columns['improvements'] / total_value)
+        violation_score = np.maximum(0, 1 - columns['violation_count'] * 0.1)
+
+        score = 0.4 * age_score + 0.4 * improvement_score + 0.2 * violation_score
+        return np.where(valid, score, 0.0)
+
+    def _weight_vector(self) -> np.ndarray:
+        """self.weights as a vector in score-matrix column order"""
+        unknown = set(self.weights) - set(self.SCORE_NAMES)
+        if unknown:
+            self.logger.warning(f"Ignoring weights for unknown scores: {sorted(unknown)}")
+        return np.array([self.weights.get(name, 0.0) for name in self.SCORE_NAMES])
+
+    def _rank_opportunities(self, property_ids: np.ndarray, scores: np.ndarray,
+                            totals: np.ndarray) -> List[Dict]:
+        """Build opportunity records, highest total score first"""
+        high, low = 0.7, 0.3
+        column = {name: scores[:, k] for k, name in enumerate(self.SCORE_NAMES)}
+
+        # Insight masks, in the order _generate_insights emits them
+        insight_rules = [
+            (column['value'] > high, {'type': 'value', 'level': 'high',
+                                      'message': 'Property shows strong value opportunity'}),
+            (column['growth'] > high, {'type': 'growth', 'level': 'high',
+                                       'message': 'High potential for appreciation'}),
+            (column['condition'] < low, {'type': 'condition', 'level': 'opportunity',
+                                         'message': 'Property may benefit from improvements'}),
+            (column['location'] > high, {'type': 'location', 'level': 'positive',
+                                         'message': 'Excellent location characteristics'}),
+            (column['market'] > high, {'type': 'market', 'level': 'favorable',
+                                       'message': 'Strong market conditions'}),
+            (column['risk'] < low, {'type': 'risk', 'level': 'warning',
+                                    'message': 'Higher risk factors present'})
+        ]
+
+        # Same precedence as _classify_opportunity
+        opportunity_types = np.select(
+            [
+                (column['value'] > high) & (column['condition'] < low),
+                column['value'] > high,
+                (column['growth'] > high) & (column['market'] > high),
+                column['growth'] > high,
+                (column['location'] > high) & (column['condition'] < low),
+                column['location'] > high,
+                (scores > 0.5).all(axis=1)
+            ],
+            ['value_add', 'value_buy', 'growth_market', 'development_potential',
+             'location_improvement', 'premium_location', 'balanced_opportunity'],
+            default='standard'
+        )
+
+        score_keys = [f"{name}_score" for name in self.SCORE_NAMES]
+        score_rows = scores.tolist()
+        masks = np.column_stack([mask for mask, _ in insight_rules]) if len(totals) else None
+
+        opportunities = []
+        for i in np.argsort(-totals, kind='stable').tolist():
+            opportunities.append({
+                'property_id': property_ids[i],
+                'scores': dict(zip(score_keys, score_rows[i])),
+                'total_score': float(totals[i]),
+                'insights': [dict(insight) for (_, insight), hit in zip(insight_rules, masks[i]) if hit],
+                'opportunity_type': str(opportunity_types[i])
+            })
+        return opportunities
+
+    @staticmethod
+    def _min_max_scale(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """MinMaxScaler arithmetic over the valid entries"""
+        if not valid.any():
+            return np.zeros_like(values)
+        data_min = values[valid].min()
+        data_range = values[valid].max() - data_min
+        scale = 1.0 / data_range if data_range != 0 else 1.0
+        return values * scale - data_min * scale
+
     def _calculate_value_scores(self, df: pd.DataFrame) -> Dict[str, float]:
         """Calculate value opportunity scores"""
         try:
@@ -0,0 +1,158 @@
+"""
+Incremental owner network index built on a disjoint-set forest
+"""
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+class DisjointSet:
+    """
+    Union-find with path halving and union by size
+
+    Each root also holds its component's members, merged small-into-large,
+    so a component can be listed without scanning every node.
+    """
+
+    def __init__(self):
+        self.parent: Dict[Hashable, Hashable] = {}
+        self.members: Dict[Hashable, List[Hashable]] = {}
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self.parent
+
+    def add(self, node: Hashable) -> Hashable:
+        if node not in self.parent:
+            self.parent[node] = node
+            self.members[node] = [node]
+        return node
+
+    def find(self, node: Hashable) -> Hashable:
+        parent = self.parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, a: Hashable, b: Hashable) -> Tuple[Hashable, Optional[Hashable]]:
+        """Merge the sets of a and b; returns (new root, absorbed root or None)"""
+        root_a, root_b = self.find(self.add(a)), self.find(self.add(b))
+        if root_a == root_b:
+            return root_a, None
+        if len(self.members[root_a]) < len(self.members[root_b]):
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.members[root_a].extend(self.members.pop(root_b))
+        return root_a, root_b
+
+    def roots(self) -> Iterable[Hashable]:
+        return self.members.keys()
+
+
+class OwnerNetworkIndex:
+    """
+    Owners connected through shared properties
+
+    Owners and properties are nodes in one disjoint-set forest: every owner
+    of a property (current owner, buyers and sellers) is unioned with that
+    property, so each component is an owner network plus its properties.
+    Property records are indexed by property_id for stats, and networks
+    whose membership or transactions changed since the last call to
+    changed_networks() are tracked, so callers can refresh only those.
+    """
+
+    OWNER = 'owner'
+    PROPERTY = 'property'
+
+    def __init__(self):
+        self.sets = DisjointSet()
+        self.records: Dict[str, List[Dict]] = {}
+        self._dirty: Set[Hashable] = set()
+
+    def add_property(self, prop: Dict):
+        """
+        Index a property record and link all of its owners
+
+        The index keeps a shallow copy with its own transaction list, so
+        add_transaction never changes the caller's record.
+        """
+        property_id = prop['property_id']
+        record = dict(prop)
+        if 'transactions' in prop:
+            record['transactions'] = list(prop['transactions'])
+        self.records.setdefault(property_id, []).append(record)
+        node = self._touch((self.PROPERTY, property_id))
+
+        owners = []
+        if 'owner' in prop:
+            owners.append(prop['owner'].get('name'))
+        for trans in prop.get('transactions', []):
+            owners.extend([trans.get('buyer'), trans.get('seller')])
+        self._link(node, owners)
+
+    def add_transaction(self, property_id: str, transaction: Dict):
+        """
+        Record a new transaction on a property and link its buyer and seller
+
+        The transaction is appended to the indexed record's transaction list;
+        properties seen for the first time get a minimal record.
+        """
+        records = self.records.get(property_id)
+        if not records:
+            records = self.records[property_id] = [{'property_id': property_id}]
+        records[-1].setdefault('transactions', []).append(transaction)
+
+        node = self._touch((self.PROPERTY, property_id))
+        self._link(node, [transaction.get('buyer'), transaction.get('seller')])
+
+    def network(self, root: Hashable) -> Tuple[Set[str], Set[str]]:
+        """(owners, property ids) for the component rooted at root"""
+        owners, properties = set(), set()
+        for kind, key in self.sets.members[root]:
+            (owners if kind == self.OWNER else properties).add(key)
+        return owners, properties
+
+    def network_of(self, owner: str) -> Optional[Tuple[Set[str], Set[str]]]:
+        node = (self.OWNER, owner)
+        if node not in self.sets:
+            return None
+        return self.network(self.sets.find(node))
+
+    def networks(self, min_owners: int = 2) -> Dict[Hashable, Tuple[Set[str], Set[str]]]:
+        """All components with at least min_owners owners, keyed by root"""
+        found = {}
+        for root in self.sets.roots():
+            owners, properties = self.network(root)
+            if len(owners) >= min_owners:
+                found[root] = (owners, properties)
+        return found
+
+    def changed_networks(self) -> Tuple[Set[Hashable], Set[Hashable]]:
+        """
+        (changed roots, absorbed roots) since the last call
+
+        Absorbed roots belonged to networks that were merged into another
+        and no longer exist.
+        """
+        changed, absorbed = set(), set()
+        for root in self._dirty:
+            if root in self.sets.members:
+                changed.add(self.sets.find(root))
+            else:
+                absorbed.add(root)
+        self._dirty = set()
+        return changed, absorbed
+
+    def property_records(self, property_ids: Iterable[str]) -> List[Dict]:
+        return [record for pid in property_ids for record in self.records.get(pid, [])]
+
+    def _link(self, property_node: Tuple[str, str], owners: Iterable[Optional[str]]):
+        for owner in owners:
+            if not owner:
+                continue
+            root, absorbed = self.sets.union(property_node, (self.OWNER, owner))
+            self._dirty.add(root)
+            if absorbed is not None:
+                self._dirty.add(absorbed)
+
+    def _touch(self, node: Tuple[str, str]) -> Tuple[str, str]:
+        self.sets.add(node)
+        self._dirty.add(self.sets.find(node))
+        return node
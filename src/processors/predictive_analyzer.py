@@ -6,12 +6,15 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor, IsolationForest
+from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import DBSCAN
 from sklearn.model_selection import train_test_split
 import xgboost as xgb
 from prophet import Prophet
+from .model_registry import ModelRegistry, LazyModels
+from .forecast_scheduler import ForecastScheduler
+from .anomaly_service import AnomalyService
 
 class PredictiveAnalyzer:
     """
@@ -23,49 +26,112 @@ class PredictiveAnalyzer:
     5. Anomaly detection
     """
     
+    # Model slot -> (registry name, artifact)
+    MODEL_ARTIFACTS = {
+        'value': ('value', 'model'),
+        'opportunity_score': ('opportunity', 'score_model'),
+        'opportunity_type': ('opportunity', 'type_model'),
+        'risk_score': ('risk', 'score_model'),
+        'risk_factors': ('risk', 'factor_model'),
+        'risk_factor_labels': ('risk', 'factor_labels'),
+        'anomaly': ('anomaly', 'model'),
+        'trend_median_price': ('trend_median_price', 'model'),
+        'trend_sales_volume': ('trend_sales_volume', 'model'),
+        'trend_days_on_market': ('trend_days_on_market', 'model')
+    }
+    SCALER_ARTIFACTS = {
+        'value': ('value', 'scaler'),
+        'anomaly': ('anomaly', 'scaler')
+    }
+    # Value model features and their fill values
+    VALUE_FEATURES = {
+        'square_feet': 0,
+        'bedrooms': 0,
+        'bathrooms': 0,
+        'year_built': 1900,
+        'lot_size': 0,
+        'latitude': 0,
+        'longitude': 0,
+        'condition_score': 0
+    }
+    VALUE_HORIZONS = (1, 3, 5)
+
     def __init__(self, config: Dict = None):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.config = config or {}
         
+        # Trained models are versioned in the registry when model_dir is set;
+        # they load lazily, on first use
+        self.registry = (
+            ModelRegistry(self.config['model_dir']) if self.config.get('model_dir') else None
+        )
+        self.promote_trained = self.config.get('promote_trained_models', True)
+        
+        # Value predictions: horizons compound at this annual rate, and
+        # intervals cover this share of outcomes
+        self.value_appreciation_rate = self.config.get('value_appreciation_rate', 0.03)
+        self.value_interval_level = self.config.get('value_interval_level', 0.9)
+        self.prediction_chunk_size = self.config.get('prediction_chunk_size', 100000)
+        # Observed/predicted ratio quantiles from the value model's test split
+        self.value_interval_ratios = None
+        
+        # Market forecasts: one Prophet fit per series, across processes
+        forecast_cache = self.config.get('forecast_cache_dir') or (
+            f"{self.config['model_dir']}/forecasts" if self.config.get('model_dir') else None
+        )
+        self.forecast_scheduler = ForecastScheduler(
+            max_workers=self.config.get('forecast_workers'),
+            cache_dir=forecast_cache
+        )
+        
+        # Anomalies: only new or changed properties are scored between refits
+        self.anomaly_service = AnomalyService(
+            self.registry,
+            state_path=(
+                f"{self.config['model_dir']}/anomaly_state.joblib"
+                if self.config.get('model_dir') else None
+            ),
+            config=self.config.get('anomaly_params'),
+            promote=self.promote_trained
+        )
+        
         # Configure models
-        self.models = {
-            'value': None,
-            'trends': None,
-            'opportunity': None,
-            'risk': None,
-            'anomaly': None
-        }
+        self.models = LazyModels(self.registry, self.MODEL_ARTIFACTS)
         
         # Configure feature importance tracking
         self.feature_importance = {}
         
         # Initialize scalers
-        self.scalers = {}
+        self.scalers = LazyModels(self.registry, self.SCALER_ARTIFACTS)
 
     def train_models(self, training_data: List[Dict]) -> Dict:
         """
         Train all predictive models
+
+        With a registry, models already trained on the same data and
+        feature schema are reused instead of refitted.
         """
         try:
             results = {}
             
             # Prepare training data
             df = pd.DataFrame(training_data)
+            data_hash = ModelRegistry.data_hash(training_data) if self.registry else None
             
             # Train value prediction model
-            results['value'] = self._train_value_model(df)
+            results['value'] = self._train_value_model(df, data_hash)
             
             # Train trend forecasting model
-            results['trends'] = self._train_trend_model(df)
+            results['trends'] = self._train_trend_model(df, data_hash)
             
             # Train opportunity prediction model
-            results['opportunity'] = self._train_opportunity_model(df)
+            results['opportunity'] = self._train_opportunity_model(df, data_hash)
             
             # Train risk prediction model
-            results['risk'] = self._train_risk_model(df)
+            results['risk'] = self._train_risk_model(df, data_hash)
             
             # Train anomaly detection model
-            results['anomaly'] = self._train_anomaly_model(df)
+            results['anomaly'] = self._train_anomaly_model(df, data_hash)
             
             return results
             
@@ -73,10 +139,65 @@ class PredictiveAnalyzer:
             self.logger.error(f"Error training models: {str(e)}")
             return {}
 
-    def predict_property_values(self, properties: List[Dict]) -> List[Dict]:
+    def promote_model(self, name: str, version: str):
+        """Activate a registered version of a model"""
+        self.registry.promote(name, version)
+        self._evict(name)
+
+    def rollback_model(self, name: str) -> Optional[str]:
+        """Reactivate the previous version of a model"""
+        version = self.registry.rollback(name)
+        self._evict(name)
+        return version
+
+    def _evict(self, name: str):
+        self.models.evict(name)
+        self.scalers.evict(name)
+        if name == 'value':
+            self.value_interval_ratios = None
+
+    def _registered_result(self, name: str, data_hash: Optional[str], schema: List) -> Optional[Dict]:
+        """
+        Metrics of a registered model trained on the same inputs
+
+        The version is activated only where training would have promoted
+        it (promote_trained_models), and never if it was rolled back.
+        """
+        if not (self.registry and data_hash):
+            return None
+        version = self.registry.find(name, data_hash, schema)
+        if version is None:
+            return None
+        if (self.promote_trained and self.registry.active_version(name) != version
+                and not self.registry.is_rolled_back(name, version)):
+            self.registry.promote(name, version)
+        self._evict(name)
+        self.logger.info(f"Reusing {name} model version {version}")
+        return self.registry.metadata(name, version)['metrics']
+
+    def _register(self, name: str, artifacts: Dict, data_hash: Optional[str],
+                  schema: List, metrics: Dict):
+        if not (self.registry and data_hash):
+            return
+        version = self.registry.save(
+            name, artifacts, data_hash, schema, metrics, promote=self.promote_trained
+        )
+        if not self.promote_trained:
+            # Keep serving the active version; the new one waits for promotion
+            self._evict(name)
+        self.logger.info(f"Registered {name} model version {version}")
+
+    def predict_property_values(self, properties: List[Dict], batch: bool = True) -> List[Dict]:
         """
         Predict future property values
+
+        The batch path scores all properties as one feature matrix; the
+        per-property path (batch=False) gives the same results one row at
+        a time.
         """
+        if batch:
+            return self._predict_property_values_batch(properties)
+
         try:
             predictions = []
             
@@ -112,6 +233,124 @@ class PredictiveAnalyzer:
             self.logger.error(f"Error predicting property values: {str(e)}")
             return []
 
+    def _predict_property_values_batch(self, properties: List[Dict]) -> List[Dict]:
+        """Value predictions for all properties, one model call per chunk"""
+        try:
+            model = self.models['value']
+            if model is None:
+                self.logger.warning("No trained value model")
+                return []
+
+            predictions = []
+            for start in range(0, len(properties), self.prediction_chunk_size):
+                chunk = properties[start:start + self.prediction_chunk_size]
+                features = self._extract_value_features_batch(pd.DataFrame(chunk))
+                values, lower, upper = self._predict_value_batch(features)
+                factors = self._identify_value_factors_batch(features)
+
+                growth = {
+                    f'{years}_year': (1 + self.value_appreciation_rate) ** years
+                    for years in self.VALUE_HORIZONS
+                }
+                values, lower, upper = values.tolist(), lower.tolist(), upper.tolist()
+                for i, prop in enumerate(chunk):
+                    predictions.append({
+                        'property_id': prop['property_id'],
+                        'current_value': prop.get('assessment', {}).get('total_value'),
+                        'predictions': {
+                            horizon: values[i] * factor for horizon, factor in growth.items()
+                        },
+                        'confidence_intervals': {
+                            horizon: {'lower': lower[i] * factor, 'upper': upper[i] * factor}
+                            for horizon, factor in growth.items()
+                        },
+                        'factors': factors[i]
+                    })
+
+            return predictions
+
+        except Exception as e:
+            self.logger.error(f"Error predicting property values: {str(e)}")
+            return []
+
+    def _extract_value_features_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Numeric value-model features, one row per property"""
+        return pd.DataFrame({
+            name: (
+                pd.to_numeric(df[name], errors='coerce').fillna(default)
+                if name in df.columns else pd.Series(default, index=df.index)
+            ).astype(float)
+            for name, default in self.VALUE_FEATURES.items()
+        })
+
+    def _extract_value_features(self, prop: Dict) -> pd.DataFrame:
+        return self._extract_value_features_batch(pd.DataFrame([prop]))
+
+    def _predict_value_batch(self, features: pd.DataFrame):
+        """(current value, interval lower, interval upper) arrays"""
+        model = self.models['value']
+        scaled = self.scalers['value'].transform(features)
+        values = model.predict(scaled).astype(float)
+
+        if hasattr(model, 'estimators_'):
+            # Bagged trees: interval from the spread of per-tree predictions
+            tail = (1 - self.value_interval_level) / 2 * 100
+            tree_predictions = np.stack([tree.predict(scaled) for tree in model.estimators_])
+            lower, upper = np.percentile(tree_predictions, [tail, 100 - tail], axis=0)
+            return values, lower, upper
+
+        ratios = self._value_interval_ratios()
+        if ratios is None:
+            return values, values.copy(), values.copy()
+        return values, values * ratios[0], values * ratios[1]
+
+    def _predict_value(self, features: pd.DataFrame, years: int) -> float:
+        values, _, _ = self._predict_value_batch(features)
+        return float(values[0] * (1 + self.value_appreciation_rate) ** years)
+
+    def _calculate_value_confidence(self, features: pd.DataFrame) -> Dict:
+        _, lower, upper = self._predict_value_batch(features)
+        return {
+            f'{years}_year': {
+                'lower': float(lower[0]) * (1 + self.value_appreciation_rate) ** years,
+                'upper': float(upper[0]) * (1 + self.value_appreciation_rate) ** years
+            }
+            for years in self.VALUE_HORIZONS
+        }
+
+    def _value_interval_ratios(self) -> Optional[List[float]]:
+        if self.value_interval_ratios is None and self.registry:
+            meta = self.registry.metadata('value')
+            if meta:
+                self.value_interval_ratios = meta['metrics'].get('interval_ratios')
+        return self.value_interval_ratios
+
+    def _identify_value_factors_batch(self, features: pd.DataFrame, top: int = 3) -> List[List[Dict]]:
+        """Per property, the features with the largest importance x |standardized value|"""
+        importances = getattr(self.models['value'], 'feature_importances_', None)
+        if importances is None:
+            return [[] for _ in range(len(features))]
+
+        weighted = np.abs(self.scalers['value'].transform(features)) * np.asarray(importances)
+        order = np.argsort(-weighted, axis=1, kind='stable')[:, :top]
+        names = np.asarray(features.columns)[order].tolist()
+        weights = np.take_along_axis(weighted, order, axis=1).tolist()
+        return [
+            [{'feature': name, 'weight': weight} for name, weight in zip(row_names, row_weights)]
+            for row_names, row_weights in zip(names, weights)
+        ]
+
+    def _identify_value_factors(self, features: pd.DataFrame) -> List[Dict]:
+        return self._identify_value_factors_batch(features)[0]
+
+    # Market metrics forecast per series
+    TREND_METRICS = ['median_price', 'sales_volume', 'days_on_market']
+    TREND_PROPHET_PARAMS = {
+        'yearly_seasonality': True,
+        'weekly_seasonality': True,
+        'daily_seasonality': False
+    }
+
     def forecast_market_trends(self, 
                              market_data: List[Dict],
                              forecast_period: int = 12) -> Dict:
@@ -119,57 +358,65 @@ class PredictiveAnalyzer:
         Forecast market trends using Prophet
         """
         try:
-            forecasts = {}
-            
-            # Prepare data for Prophet
-            df = pd.DataFrame(market_data)
-            
-            # Forecast different metrics
-            metrics = ['median_price', 'sales_volume', 'days_on_market']
-            
-            for metric in metrics:
-                try:
-                    # Prepare Prophet dataframe
-                    prophet_df = pd.DataFrame({
-                        'ds': pd.to_datetime(df['date']),
-                        'y': df[metric]
-                    })
-                    
-                    # Create and fit model
-                    model = Prophet(
-                        yearly_seasonality=True,
-                        weekly_seasonality=True,
-                        daily_seasonality=False
-                    )
-                    model.fit(prophet_df)
-                    
-                    # Make future dataframe
-                    future = model.make_future_dataframe(
-                        periods=forecast_period,
-                        freq='M'
-                    )
-                    
-                    # Forecast
-                    forecast = model.predict(future)
-                    
-                    # Extract results
-                    forecasts[metric] = {
-                        'forecast': forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
-                        .tail(forecast_period)
-                        .to_dict('records'),
-                        'components': model.plot_components(forecast)
-                    }
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error forecasting {metric}: {str(e)}")
-                    continue
-            
-            return forecasts
+            return {
+                forecast['metric']: {
+                    'forecast': forecast['forecast'],
+                    'components': forecast['components']
+                }
+                for forecast in self.forecast_regions(
+                    market_data, forecast_period, region_key=None
+                )
+            }
             
         except Exception as e:
             self.logger.error(f"Error forecasting market trends: {str(e)}")
             return {}
 
+    def forecast_regions(self,
+                         market_data: List[Dict],
+                         forecast_period: int = 12,
+                         region_key: Optional[str] = 'region'):
+        """
+        Forecast every metric of every region, yielding results as they finish
+
+        market_data rows carry a date, the metrics and (unless region_key is
+        None) a region. Each region/metric series is fitted in parallel;
+        series unchanged since their last fit come straight from cache.
+        """
+        try:
+            df = pd.DataFrame(market_data)
+            if df.empty:
+                return
+            df['date'] = pd.to_datetime(df['date'])
+            
+            series = {}
+            groups = df.groupby(region_key, sort=False) if region_key else [(None, df)]
+            for region, region_df in groups:
+                for metric in self.TREND_METRICS:
+                    if metric not in region_df.columns:
+                        continue
+                    series[(region, metric)] = pd.DataFrame({
+                        'ds': region_df['date'],
+                        'y': region_df[metric]
+                    }).dropna().reset_index(drop=True)
+            
+            results = self.forecast_scheduler.forecast(
+                series, forecast_period, freq=pd.offsets.MonthEnd(), prophet_params=self.TREND_PROPHET_PARAMS
+            )
+            for (region, metric), result in results:
+                forecast = result['forecast'].tail(forecast_period)
+                components = [c for c in ('trend', 'yearly', 'weekly') if c in forecast.columns]
+                yield {
+                    'region': region,
+                    'metric': metric,
+                    'forecast': forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].to_dict('records'),
+                    'components': forecast[['ds'] + components].to_dict('records'),
+                    'cached': result['cached']
+                }
+            
+        except Exception as e:
+            self.logger.error(f"Error forecasting regions: {str(e)}")
+
     def predict_opportunities(self, properties: List[Dict]) -> List[Dict]:
         """
         Predict investment opportunities
@@ -252,44 +499,43 @@ class PredictiveAnalyzer:
     def detect_anomalies(self, properties: List[Dict]) -> List[Dict]:
         """
         Detect anomalies in property data
+
+        Properties unchanged since the last run keep their stored scores;
+        the model is refitted only when due or when the data has drifted.
         """
         try:
             results = []
             
             # Convert to dataframe
             df = pd.DataFrame(properties)
+            if df.empty:
+                return []
             
             # Extract features for anomaly detection
             features = self._extract_anomaly_features(df)
             
-            # Detect anomalies
-            anomalies = self._detect_property_anomalies(features)
+            # Score new and changed properties
+            scores = self.anomaly_service.score(features)
+            anomalies = scores[scores['label'] == -1]
+            
+            # Standardized distance from the training data, per feature
+            reference = self.anomaly_service.reference
+            z_scores = (
+                features.loc[anomalies.index] - pd.Series(reference['mean'])
+            ) / pd.Series(reference['std'])
+            factors = self._identify_anomaly_factors(z_scores)
             
             # Analyze anomalies
-            for i, prop in df.iterrows():
-                try:
-                    if anomalies[i] == -1:  # Anomaly detected
-                        analysis = {
-                            'property_id': prop['property_id'],
-                            'anomaly_type': self._classify_anomaly(
-                                features.iloc[i]
-                            ),
-                            'anomaly_score': self._calculate_anomaly_score(
-                                features.iloc[i]
-                            ),
-                            'contributing_factors': self._identify_anomaly_factors(
-                                features.iloc[i]
-                            ),
-                            'recommendations': self._generate_anomaly_recommendations(
-                                features.iloc[i]
-                            )
-                        }
-                        
-                        results.append(analysis)
-                        
-                except Exception as e:
-                    self.logger.warning(f"Error analyzing anomaly: {str(e)}")
-                    continue
+            for property_id, score, property_factors in zip(
+                anomalies.index, anomalies['score'].tolist(), factors
+            ):
+                results.append({
+                    'property_id': property_id,
+                    'anomaly_type': self._classify_anomaly(property_factors),
+                    'anomaly_score': score,
+                    'contributing_factors': property_factors,
+                    'recommendations': self._generate_anomaly_recommendations(property_factors)
+                })
             
             return results
             
@@ -297,11 +543,78 @@ class PredictiveAnalyzer:
             self.logger.error(f"Error detecting anomalies: {str(e)}")
             return []
 
-    def _train_value_model(self, df: pd.DataFrame) -> Dict:
+    def _extract_anomaly_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Numeric anomaly features indexed by property_id"""
+        def column(name, default=0):
+            if name not in df.columns:
+                return pd.Series(default, index=df.index, dtype=float)
+            return pd.to_numeric(df[name], errors='coerce').fillna(default).astype(float)
+        
+        def nested(name, key):
+            values = df[name] if name in df.columns else pd.Series(None, index=df.index)
+            return pd.to_numeric(pd.Series(
+                [v.get(key) if isinstance(v, dict) else None for v in values], index=df.index
+            ), errors='coerce').fillna(0)
+        
+        def count(name):
+            values = df[name] if name in df.columns else pd.Series(None, index=df.index)
+            return pd.Series([len(v) if isinstance(v, list) else 0 for v in values],
+                             index=df.index, dtype=float)
+        
+        features = pd.DataFrame({
+            'square_feet': column('square_feet'),
+            'year_built': column('year_built', 1900),
+            'total_value': nested('assessment', 'total_value'),
+            'land_value': nested('assessment', 'land_value'),
+            'transaction_count': count('transactions'),
+            'permit_count': count('permits'),
+            'violation_count': count('violations')
+        })
+        features['value_per_sqft'] = (
+            features['total_value'] / features['square_feet'].where(features['square_feet'] > 0)
+        ).fillna(0)
+        features.index = df['property_id'].values
+        return features
+
+    def _identify_anomaly_factors(self, z_scores: pd.DataFrame, top: int = 3) -> List[List[Dict]]:
+        """Per row, the features furthest from the training data, in standard deviations"""
+        values = z_scores.to_numpy()
+        order = np.argsort(-np.abs(values), axis=1, kind='stable')[:, :top]
+        names = np.asarray(z_scores.columns)[order].tolist()
+        scores = np.take_along_axis(values, order, axis=1).tolist()
+        return [
+            [{'feature': name, 'z_score': z} for name, z in zip(row_names, row_scores)]
+            for row_names, row_scores in zip(names, scores)
+        ]
+
+    def _classify_anomaly(self, factors: List[Dict]) -> str:
+        if not factors or abs(factors[0]['z_score']) < 2:
+            return 'unusual_combination'
+        direction = 'high' if factors[0]['z_score'] > 0 else 'low'
+        return f"{direction}_{factors[0]['feature']}"
+
+    def _generate_anomaly_recommendations(self, factors: List[Dict]) -> List[str]:
+        outliers = [f for f in factors if abs(f['z_score']) >= 2]
+        if not outliers:
+            return ['Review the record: no single value is extreme, but the combination is rare']
+        return [
+            f"Verify {f['feature'].replace('_', ' ')}: "
+            f"{'well above' if f['z_score'] > 0 else 'well below'} comparable properties"
+            for f in outliers
+        ]
+
+    def _train_value_model(self, df: pd.DataFrame, data_hash: Optional[str] = None) -> Dict:
         """Train value prediction model"""
         try:
             # Extract features and target
             features = self._extract_value_features_batch(df)
+            schema = ModelRegistry.feature_schema(features)
+            registered = self._registered_result('value', data_hash, schema)
+            if registered is not None:
+                # Interval ratios are loaded with whichever version is active
+                self.feature_importance['value'] = registered.get('feature_importance', {})
+                return registered
+            
             target = df['assessment'].apply(
                 lambda x: x.get('total_value')
             ).fillna(0)
@@ -336,17 +649,31 @@ class PredictiveAnalyzer:
             train_score = model.score(X_train_scaled, y_train)
             test_score = model.score(X_test_scaled, y_test)
             
-            return {
+            # Prediction intervals from observed/predicted ratios on held-out rows
+            test_predictions = model.predict(X_test_scaled)
+            positive = test_predictions > 0
+            tail = (1 - self.value_interval_level) / 2
+            self.value_interval_ratios = [
+                float(q) for q in np.quantile(
+                    np.asarray(y_test)[positive] / test_predictions[positive], [tail, 1 - tail]
+                )
+            ] if positive.any() else None
+            
+            results = {
                 'train_score': float(train_score),
                 'test_score': float(test_score),
-                'feature_importance': self.feature_importance['value']
+                'feature_importance': self.feature_importance['value'],
+                'interval_ratios': self.value_interval_ratios
             }
+            self._register('value', {'model': model, 'scaler': scaler}, data_hash, schema, results)
+            
+            return results
             
         except Exception as e:
             self.logger.error(f"Error training value model: {str(e)}")
             return {}
 
-    def _train_trend_model(self, df: pd.DataFrame) -> Dict:
+    def _train_trend_model(self, df: pd.DataFrame, data_hash: Optional[str] = None) -> Dict:
         """Train market trend forecasting model"""
         try:
             results = {}
@@ -361,6 +688,11 @@ class PredictiveAnalyzer:
                         'ds': pd.to_datetime(df['date']),
                         'y': df[metric]
                     })
+                    schema = ModelRegistry.feature_schema(prophet_df)
+                    registered = self._registered_result(f'trend_{metric}', data_hash, schema)
+                    if registered is not None:
+                        results[metric] = registered
+                        continue
                     
                     # Create and fit model
                     model = Prophet(
@@ -393,6 +725,8 @@ class PredictiveAnalyzer:
                         'rmse': float(performance['rmse'].mean()),
                         'mape': float(performance['mape'].mean())
                     }
+                    self._register(f'trend_{metric}', {'model': model}, data_hash, schema,
+                                   results[metric])
                     
                 except Exception as e:
                     self.logger.warning(f"Error training {metric} model: {str(e)}")
@@ -404,11 +738,15 @@ class PredictiveAnalyzer:
             self.logger.error(f"Error training trend model: {str(e)}")
             return {}
 
-    def _train_opportunity_model(self, df: pd.DataFrame) -> Dict:
+    def _train_opportunity_model(self, df: pd.DataFrame, data_hash: Optional[str] = None) -> Dict:
         """Train opportunity prediction model"""
         try:
             # Extract features
             features = self._extract_opportunity_features_batch(df)
+            schema = ModelRegistry.feature_schema(features)
+            registered = self._registered_result('opportunity', data_hash, schema)
+            if registered is not None:
+                return registered
             
             # Create target variables
             targets = {
@@ -452,6 +790,10 @@ class PredictiveAnalyzer:
                     type_model.score(features, targets['opportunity_type'])
                 )
             }
+            self._register(
+                'opportunity', {'score_model': score_model, 'type_model': type_model},
+                data_hash, schema, results
+            )
             
             return results
             
@@ -459,11 +801,15 @@ class PredictiveAnalyzer:
             self.logger.error(f"Error training opportunity model: {str(e)}")
             return {}
 
-    def _train_risk_model(self, df: pd.DataFrame) -> Dict:
+    def _train_risk_model(self, df: pd.DataFrame, data_hash: Optional[str] = None) -> Dict:
         """Train risk prediction model"""
         try:
             # Extract features
             features = self._extract_risk_features_batch(df)
+            schema = ModelRegistry.feature_schema(features)
+            registered = self._registered_result('risk', data_hash, schema)
+            if registered is not None:
+                return registered
             
             # Create target variables
             targets = {
@@ -513,6 +859,11 @@ class PredictiveAnalyzer:
                     ])
                 )
             }
+            self._register(
+                'risk',
+                {'score_model': score_model, 'factor_model': factor_model, 'factor_labels': mlb},
+                data_hash, schema, results
+            )
             
             return results
             
@@ -520,43 +871,32 @@ class PredictiveAnalyzer:
             self.logger.error(f"Error training risk model: {str(e)}")
             return {}
 
-    def _train_anomaly_model(self, df: pd.DataFrame) -> Dict:
-        """Train anomaly detection model"""
+    def _train_anomaly_model(self, df: pd.DataFrame, data_hash: Optional[str] = None,
+                             explain: Optional[bool] = None) -> Dict:
+        """
+        Train anomaly detection model
+
+        The RandomForest feature-importance fit runs only with explain=True
+        (or anomaly_params.feature_importance).
+        """
         try:
             # Extract features
             features = self._extract_anomaly_features(df)
+            schema = ModelRegistry.feature_schema(features)
+            registered = self._registered_result('anomaly', data_hash, schema)
+            if registered is not None:
+                self.feature_importance['anomaly'] = registered.get('feature_importance', {})
+                return registered
             
-            # Scale features
-            scaler = StandardScaler()
-            features_scaled = scaler.fit_transform(features)
-            
-            # Train isolation forest
-            model = IsolationForest(
-                contamination=0.1,
-                random_state=42
-            )
-            model.fit(features_scaled)
+            # Fit and register the scaler and isolation forest
+            results = self.anomaly_service.fit(features, explain=explain, data_hash=data_hash)
             
             # Save model and scaler
-            self.models['anomaly'] = model
-            self.scalers['anomaly'] = scaler
+            self.models['anomaly'] = self.anomaly_service.model
+            self.scalers['anomaly'] = self.anomaly_service.scaler
+            self.feature_importance['anomaly'] = results['feature_importance']
             
-            # Calculate feature importance using random forest
-            rf_model = RandomForestClassifier(n_estimators=100)
-            
-            # Create synthetic labels (normal vs anomaly)
-            labels = model.predict(features_scaled)
-            rf_model.fit(features_scaled, labels)
-            
-            self.feature_importance['anomaly'] = dict(
-                zip(features.columns, rf_model.feature_importances_)
-            )
-            
-            return {
-                'n_samples_train': len(features),
-                'n_features': features.shape[1],
-                'feature_importance': self.feature_importance['anomaly']
-            }
+            return results
             
         except Exception as e:
             self.logger.error(f"Error training anomaly model: {str(e)}")
@@ -8,6 +8,7 @@ import pandas as pd
 import numpy as np
 from sklearn.cluster import DBSCAN
 from geopy.distance import geodesic
+from .owner_networks import OwnerNetworkIndex
 
 class RelationshipAnalyzer:
     """
@@ -33,8 +34,12 @@ class RelationshipAnalyzer:
         }
         
         # Update from config
-        if 'analysis_params' in config:
-            self.params.update(config['analysis_params'])
+        if 'analysis_params' in self.config:
+            self.params.update(self.config['analysis_params'])
+
+        # Owner network index and per-network results, kept for incremental updates
+        self.owner_network_index: Optional[OwnerNetworkIndex] = None
+        self._owner_networks: Dict[Any, Dict] = {}
 
     def analyze_geographic_clusters(self, properties: List[Dict]) -> List[Dict]:
         """
@@ -108,75 +113,62 @@ class RelationshipAnalyzer:
         Identifies related owners and investment groups
         """
         try:
-            # Build owner network
-            owner_properties = {}  # owner -> properties
-            property_owners = {}   # property -> owners
-            
+            # Owners and properties are joined in one union-find forest
+            index = OwnerNetworkIndex()
             for prop in properties:
-                # Get current and historical owners
-                owners = set()
-                
-                # Current owner
-                if 'owner' in prop:
-                    owners.add(prop['owner'].get('name'))
-                
-                # Historical owners from transactions
-                for trans in prop.get('transactions', []):
-                    owners.add(trans.get('buyer'))
-                    owners.add(trans.get('seller'))
-                
-                # Remove None values
-                owners = {o for o in owners if o}
-                
-                # Update mappings
-                property_owners[prop['property_id']] = owners
-                for owner in owners:
-                    if owner not in owner_properties:
-                        owner_properties[owner] = set()
-                    owner_properties[owner].add(prop['property_id'])
-            
-            # Find owner networks
-            networks = []
-            processed_owners = set()
-            
-            for owner in owner_properties:
-                if owner in processed_owners:
-                    continue
-                
-                # Find related owners
-                network = self._find_related_owners(
-                    owner,
-                    owner_properties,
-                    property_owners
-                )
-                
-                if len(network) > 1:  # Only include networks with multiple owners
-                    # Get all properties in network
-                    network_properties = set()
-                    for network_owner in network:
-                        network_properties.update(owner_properties[network_owner])
-                    
-                    # Calculate network statistics
-                    network_stats = self._calculate_network_stats(
-                        network,
-                        network_properties,
-                        properties
-                    )
-                    
-                    networks.append({
-                        'owners': list(network),
-                        'properties': list(network_properties),
-                        'statistics': network_stats
-                    })
-                
-                processed_owners.update(network)
-            
-            return networks
+                index.add_property(prop)
+            index.changed_networks()
+
+            self.owner_network_index = index
+            self._owner_networks = {
+                root: self._build_network(index, owners, property_ids)
+                for root, (owners, property_ids) in index.networks().items()
+            }
+            return list(self._owner_networks.values())
             
         except Exception as e:
             self.logger.error(f"Error in owner network analysis: {str(e)}")
             return []
 
+    def update_owner_networks(self, transactions: List[Dict]) -> List[Dict]:
+        """
+        Add new transactions to the networks from analyze_owner_networks
+        Only networks the transactions touch are recomputed
+        """
+        try:
+            if self.owner_network_index is None:
+                self.owner_network_index = OwnerNetworkIndex()
+            index = self.owner_network_index
+
+            for trans in transactions:
+                index.add_transaction(trans['property_id'], trans)
+
+            changed, absorbed = index.changed_networks()
+            for root in absorbed | changed:
+                self._owner_networks.pop(root, None)
+            for root in changed:
+                owners, property_ids = index.network(root)
+                if len(owners) > 1:  # Only include networks with multiple owners
+                    self._owner_networks[root] = self._build_network(index, owners, property_ids)
+
+            return list(self._owner_networks.values())
+
+        except Exception as e:
+            self.logger.error(f"Error updating owner networks: {str(e)}")
+            return list(self._owner_networks.values())
+
+    def _build_network(self, index: OwnerNetworkIndex,
+                       owners: Set[str], property_ids: Set[str]) -> Dict:
+        return {
+            'owners': list(owners),
+            'properties': list(property_ids),
+            'statistics': self._calculate_network_stats(
+                owners,
+                property_ids,
+                index.property_records(property_ids)
+            )
+        }
+
     def analyze_market_patterns(self, properties: List[Dict]) -> Dict:
         """
         Analyze market activity patterns
@@ -279,46 +271,12 @@ class RelationshipAnalyzer:
             self.logger.error(f"Error calculating cluster stats: {str(e)}")
             return {}
 
-    def _find_related_owners(self,
-                           start_owner: str,
-                           owner_properties: Dict[str, Set[str]],
-                           property_owners: Dict[str, Set[str]]) -> Set[str]:
-        """Find network of related owners through shared properties"""
-        try:
-            related = {start_owner}
-            to_process = {start_owner}
-            
-            while to_process:
-                owner = to_process.pop()
-                
-                # Get all properties owned by this owner
-                properties = owner_properties[owner]
-                
-                # Find other owners of these properties
-                for prop_id in properties:
-                    for other_owner in property_owners[prop_id]:
-                        if other_owner not in related:
-                            related.add(other_owner)
-                            to_process.add(other_owner)
-            
-            return related
-            
-        except Exception as e:
-            self.logger.error(f"Error finding related owners: {str(e)}")
-            return {start_owner}
-
     def _calculate_network_stats(self,
                                owners: Set[str],
                                property_ids: Set[str],
-                               all_properties: List[Dict]) -> Dict:
+                               network_properties: List[Dict]) -> Dict:
         """Calculate statistics for an owner network"""
         try:
-            # Get full property details
-            network_properties = [
-                p for p in all_properties
-                if p['property_id'] in property_ids
-            ]
-            
             stats = {
                 'owner_count': len(owners),
                 'property_count': len(property_ids),
@@ -6,12 +6,14 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
-from transformers import pipeline
-import spacy
 from textblob import TextBlob
 import re
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+from scipy import sparse
+
+from .model_pool import ModelPool
+from .nlp_cache import NLPResultCache, NullResultCache
 
 class TextAnalyzer:
     """
@@ -23,18 +25,15 @@ class TextAnalyzer:
     5. Legal documents
     """
     
-    def __init__(self, config: Dict = None):
+    def __init__(self,
+                 config: Dict = None,
+                 model_pool: Optional[ModelPool] = None,
+                 result_cache: Optional[NLPResultCache] = None):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.config = config or {}
         
-        # Load NLP models
-        self.nlp = spacy.load('en_core_web_sm')
-        
-        # Initialize sentiment analyzer
-        self.sentiment_analyzer = pipeline(
-            'sentiment-analysis',
-            model='distilbert-base-uncased-finetuned-sst-2-english'
-        )
+        # NLP models load on first use and are shared process-wide
+        self.model_pool = model_pool or ModelPool.shared()
         
         # Initialize text vectorizer
         self.vectorizer = TfidfVectorizer(
@@ -46,8 +45,38 @@ class TextAnalyzer:
         self.params = {
             'min_description_length': 50,
             'max_summary_length': 200,
-            'similarity_threshold': 0.7
+            'similarity_threshold': 0.7,
+            'similarity_block_size': 1000,  # Rows per block when finding similar pairs
+            'spacy_model': 'en_core_web_sm',
+            'sentiment_model': 'distilbert-base-uncased-finetuned-sst-2-english',
+            'model_backend': 'pytorch',     # 'pytorch', 'quantized' or 'onnx'
+            'nlp_batch_size': 64,           # Documents per nlp.pipe batch
+            'nlp_processes': 1,             # nlp.pipe worker processes
+            'inference_batch_size': 16,     # Texts per transformers forward pass
+            'nlp_cache_max_bytes': 512 * 2 ** 20
         }
+        self.params.update(self.config.get('text_params', {}))
+        
+        # Per-text results are cached across runs when nlp_cache_path is set
+        if result_cache is None:
+            cache_path = self.config.get('nlp_cache_path')
+            result_cache = NLPResultCache(
+                cache_path,
+                max_bytes=self.params['nlp_cache_max_bytes']
+            ) if cache_path else NullResultCache()
+        self.result_cache = result_cache
+
+    @property
+    def nlp(self):
+        return self.model_pool.spacy(self.params['spacy_model'])
+
+    @property
+    def sentiment_analyzer(self):
+        return self.model_pool.pipeline(
+            'sentiment-analysis',
+            self.params['sentiment_model'],
+            self.params['model_backend']
+        )
 
     def analyze_property_descriptions(self, properties: List[Dict]) -> Dict:
         """
@@ -89,6 +118,9 @@ class TextAnalyzer:
                 'summaries': self._generate_summaries(descriptions)
             }
             
+            stats = self.result_cache.stats()
+            self.logger.info(f"NLP result cache hit rate {stats['hit_rate']:.1%} ({stats['hits']} hits)")
+            
             return results
             
         except Exception as e:
@@ -246,20 +278,24 @@ class TextAnalyzer:
                 'locations': set()
             }
             
-            for desc in descriptions:
-                doc = self.nlp(desc)
-                
-                # Extract noun phrases
-                for chunk in doc.noun_chunks:
+            # Noun phrases per description; only uncached text is parsed
+            noun_chunks = self.result_cache.cached(
+                NLPResultCache.model_key(self.params['spacy_model'], self.params['spacy_model'], 'spacy'),
+                'noun_chunks',
+                descriptions,
+                self._parse_noun_chunks
+            )
+            for chunks in noun_chunks:
+                for chunk in chunks:
                     # Classify features
-                    if self._is_amenity(chunk.text):
-                        features['amenities'].add(chunk.text.lower())
-                    elif self._is_improvement(chunk.text):
-                        features['improvements'].add(chunk.text.lower())
-                    elif self._is_condition(chunk.text):
-                        features['conditions'].add(chunk.text.lower())
-                    elif self._is_location(chunk.text):
-                        features['locations'].add(chunk.text.lower())
+                    if self._is_amenity(chunk):
+                        features['amenities'].add(chunk.lower())
+                    elif self._is_improvement(chunk):
+                        features['improvements'].add(chunk.lower())
+                    elif self._is_condition(chunk):
+                        features['conditions'].add(chunk.lower())
+                    elif self._is_location(chunk):
+                        features['locations'].add(chunk.lower())
             
             # Convert sets to sorted lists
             return {
@@ -271,54 +307,85 @@ class TextAnalyzer:
             self.logger.error(f"Error extracting features: {str(e)}")
             return {}
 
+    def _parse_noun_chunks(self, descriptions: List[str]) -> List[List[str]]:
+        docs = self.nlp.pipe(
+            descriptions,
+            batch_size=self.params['nlp_batch_size'],
+            n_process=self.params['nlp_processes']
+        )
+        return [[chunk.text for chunk in doc.noun_chunks] for doc in docs]
+
     def _analyze_description_sentiment(self, descriptions: List[str]) -> List[Dict]:
         """Analyze sentiment in property descriptions"""
         try:
-            results = []
-            
-            for desc in descriptions:
-                # Get overall sentiment
-                sentiment = TextBlob(desc).sentiment
-                
-                # Get aspect-based sentiment
-                aspects = self._extract_aspect_sentiment(desc)
-                
-                results.append({
-                    'overall': {
-                        'polarity': float(sentiment.polarity),
-                        'subjectivity': float(sentiment.subjectivity)
-                    },
-                    'aspects': aspects
-                })
-            
-            return results
+            return self.result_cache.cached(
+                NLPResultCache.model_key('textblob', 'textblob'),
+                'description_sentiment',
+                descriptions,
+                lambda texts: [self._description_sentiment(desc) for desc in texts]
+            )
             
         except Exception as e:
             self.logger.error(f"Error analyzing sentiment: {str(e)}")
             return []
 
+    def _description_sentiment(self, desc: str) -> Dict:
+        # Get overall sentiment
+        sentiment = TextBlob(desc).sentiment
+        
+        # Get aspect-based sentiment
+        aspects = self._extract_aspect_sentiment(desc)
+        
+        return {
+            'overall': {
+                'polarity': float(sentiment.polarity),
+                'subjectivity': float(sentiment.subjectivity)
+            },
+            'aspects': aspects
+        }
+
     def _find_similar_descriptions(self, vectors) -> List[Dict]:
-        """Find similar property descriptions"""
+        """
+        Find similar property descriptions
+        
+        Cosine similarities are computed as sparse products of
+        similarity_block_size rows against the rows after them, so memory
+        is bounded by the block rather than the full n x n matrix, and only
+        pairs above similarity_threshold are kept. Scores stay float64 so
+        values and tie order match the dense cosine_similarity result.
+        """
         try:
-            similarities = []
-            
-            # Calculate similarity matrix
-            sim_matrix = cosine_similarity(vectors)
-            
-            # Find similar pairs
-            for i in range(len(sim_matrix)):
-                for j in range(i + 1, len(sim_matrix)):
-                    if sim_matrix[i][j] > self.params['similarity_threshold']:
-                        similarities.append({
-                            'pair': (i, j),
-                            'score': float(sim_matrix[i][j])
-                        })
-            
-            return sorted(
-                similarities,
-                key=lambda x: x['score'],
-                reverse=True
-            )
+            vectors = normalize(sparse.csr_matrix(vectors, dtype=np.float64))
+            threshold = self.params['similarity_threshold']
+            block_size = self.params['similarity_block_size']
+            
+            rows, cols, scores = [], [], []
+            for start in range(0, vectors.shape[0], block_size):
+                block = vectors[start:start + block_size] @ vectors[start:].T
+                
+                # Drop scores at or below the threshold before expanding to
+                # coordinates, then keep the upper triangle (j > i)
+                block.data[block.data <= threshold] = 0
+                block.eliminate_zeros()
+                block = block.tocoo()
+                keep = block.col > block.row
+                rows.append(block.row[keep] + start)
+                cols.append(block.col[keep] + start)
+                scores.append(block.data[keep])
+            
+            if not scores:
+                return []
+            rows, cols, scores = np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
+            
+            # Highest score first; ties in (i, j) order
+            order = np.lexsort((cols, rows, -scores))
+            return [
+                {
+                    'pair': (int(rows[k]), int(cols[k])),
+                    'score': float(scores[k])
+                }
+                for k in order
+            ]
             
         except Exception as e:
             self.logger.error(f"Error finding similarities: {str(e)}")
@@ -457,10 +524,21 @@ class TextAnalyzer:
         try:
             results = []
             
-            for report in report_texts:
-                # Analyze overall sentiment
-                sentiment = self.sentiment_analyzer(report['content'])[0]
-                
+            # Overall sentiment in batched forward passes, for uncached reports only
+            sentiments = self.result_cache.cached(
+                NLPResultCache.model_key(
+                    f"{self.params['sentiment_model']}:{self.params['model_backend']}", 'transformers'
+                ),
+                'sentiment',
+                [report['content'] for report in report_texts],
+                lambda texts: self.sentiment_analyzer(
+                    texts,
+                    batch_size=self.params['inference_batch_size'],
+                    truncation=True
+                )
+            )
+            
+            for report, sentiment in zip(report_texts, sentiments):
                 # Analyze aspect-specific sentiment
                 aspects = {
                     'price_sentiment': self._analyze_price_sentiment(
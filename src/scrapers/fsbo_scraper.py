@@ -11,17 +11,22 @@ import re
 import json
 import logging
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Union, Tuple
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin, urlparse
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
-from src.scrapers.scraper_base import ScraperBase, LeadData
+from src.scrapers.scraper_base import ScraperBase, LeadData, DomainRateLimiter
+from src.scrapers.lead_sink import LeadSink
+from src.utils.http_cache import CachedSession, HTTPCache
 
 # Setup logging
 logging.basicConfig(
@@ -41,6 +46,9 @@ class CraigslistScraper(ScraperBase):
         base_url: str = "https://maine.craigslist.org",
         search_area: str = "brunswick",  # Options: portland, maine, brunswick, etc.
         search_radius: int = 25,  # Miles
+        max_concurrency: int = 4,
+        requests_per_second: float = 2.0,
+        request_timeout: float = 30.0,
         **kwargs
     ):
         """
@@ -50,6 +58,9 @@ class CraigslistScraper(ScraperBase):
             base_url: Base URL for Craigslist
             search_area: Area to search within
             search_radius: Search radius in miles
+            max_concurrency: Listing detail pages fetched at once
+            requests_per_second: Request rate limit per domain
+            request_timeout: Seconds before a request is abandoned
             **kwargs: Additional arguments to pass to ScraperBase
         """
         super().__init__(name="craigslist_fsbo", **kwargs)
@@ -57,6 +68,9 @@ class CraigslistScraper(ScraperBase):
         self.base_url = base_url
         self.search_area = search_area
         self.search_radius = search_radius
+        self.max_concurrency = max(1, max_concurrency)
+        self.request_timeout = request_timeout
+        self.rate_limiter = DomainRateLimiter(requests_per_second)
         
         # Define search parameters
         self.search_params = {
@@ -74,6 +88,13 @@ class CraigslistScraper(ScraperBase):
             "Accept-Language": "en-US,en;q=0.9"
         }
         
+        # One keep-alive session for every request; result and listing
+        # pages are revalidated rather than re-downloaded
+        self.session = CachedSession(HTTPCache.shared(self.config.get('http_cache_dir')))
+        adapter = HTTPAdapter(pool_maxsize=self.max_concurrency + 1)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
         self.logger.info(f"Initialized Craigslist FSBO scraper for {search_area}")
     
     def _build_search_url(self) -> str:
@@ -99,39 +120,40 @@ class CraigslistScraper(ScraperBase):
         """
         Run the Craigslist FSBO scraper
         
+        Listing detail pages are fetched by up to max_concurrency worker
+        threads while the next result page is prefetched; every request
+        waits on the per-domain rate limit instead of fixed sleeps. Leads
+        come back in result-page order.
+        
+        With a lead sink attached, leads are only streamed to the sink as
+        they are built and are not kept.
+        
         Args:
             max_pages: Maximum number of pages to scrape
             max_listings: Maximum number of listings to scrape
             
         Returns:
-            List of normalized lead data dictionaries
+            List of normalized lead data dictionaries (empty when streaming
+            to a lead sink)
         """
         self.logger.info(f"Starting Craigslist FSBO scraper")
         leads = []
-        processed_count = 0
+        found = 0
         
         search_url = self._build_search_url()
         self.logger.info(f"Search URL: {search_url}")
         
-        # Scrape listing pages
-        for page in range(max_pages):
-            # Modify URL for pagination
-            page_url = search_url
-            if page > 0:
-                page_url = f"{search_url}&s={page * 120}"  # Craigslist uses 120 items per page
-            
-            self.logger.info(f"Scraping page {page + 1} at {page_url}")
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='listing') as detail_pool, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix='results') as page_pool:
+            next_page = page_pool.submit(self._fetch_results_page, search_url, 0)
             
-            try:
-                # Get the page content
-                response = requests.get(page_url, headers=self.headers)
-                response.raise_for_status()
-                
-                # Parse the HTML
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find all listing items
-                listings = soup.select('li.result-row')
+            # Scrape listing pages
+            for page in range(max_pages):
+                try:
+                    listings = next_page.result()
+                except Exception as e:
+                    self.logger.error(f"Error scraping page {page + 1}: {e}")
+                    break
                 
                 if not listings:
                     self.logger.info(f"No more listings found on page {page + 1}")
@@ -139,87 +161,156 @@ class CraigslistScraper(ScraperBase):
                 
                 self.logger.info(f"Found {len(listings)} listings on page {page + 1}")
                 
-                # Process each listing
-                for listing in listings:
-                    # Extract listing ID
-                    data_id = listing.get('data-pid')
-                    
-                    if not data_id or self.is_processed(data_id):
-                        continue
-                    
-                    try:
-                        # Find the listing URL
-                        link_elem = listing.select_one('a.result-title')
-                        if not link_elem:
-                            continue
-                        
-                        listing_url = link_elem.get('href')
-                        listing_title = link_elem.text.strip()
-                        
-                        # Extract basic data from listing preview
-                        price_elem = listing.select_one('.result-price')
-                        price_text = price_elem.text.strip() if price_elem else None
-                        price = self._extract_price(price_text) if price_text else None
-                        
-                        # Extract date
-                        date_elem = listing.select_one('.result-date')
-                        date_text = date_elem.get('datetime') if date_elem else None
-                        listing_date = datetime.fromisoformat(date_text) if date_text else datetime.now()
-                        
-                        # Extract location
-                        location_elem = listing.select_one('.result-hood')
-                        location = location_elem.text.strip('()') if location_elem else None
-                        
-                        # Get detailed listing data
-                        listing_data = self._scrape_listing_details(listing_url)
-                        
-                        if listing_data:
-                            # Create normalized lead data
-                            lead_data = self._create_lead_data(
-                                data_id, 
-                                listing_url, 
-                                listing_title, 
-                                price, 
-                                listing_date, 
-                                location, 
-                                listing_data
-                            )
-                            
-                            leads.append(lead_data.to_dict())
-                            self.mark_processed(data_id, {
-                                'url': listing_url,
-                                'title': listing_title,
-                                'price': price
-                            })
-                            
-                            processed_count += 1
-                            if processed_count >= max_listings:
-                                self.logger.info(f"Reached maximum number of listings ({max_listings})")
-                                break
-                    
-                    except Exception as e:
-                        self.logger.error(f"Error processing listing {data_id}: {e}")
+                # Prefetch the next page while this one's details download
+                if page + 1 < max_pages:
+                    next_page = page_pool.submit(self._fetch_results_page, search_url, page + 1)
                 
-                if processed_count >= max_listings:
-                    break
+                page_leads = self._scrape_listings(listings, detail_pool, max_listings - found)
+                found += len(page_leads)
+                if self.lead_sink is None:
+                    leads.extend(page_leads)
                 
-                # Add delay between pages
-                self.random_delay(2.0, 5.0)
-            
-            except Exception as e:
-                self.logger.error(f"Error scraping page {page + 1}: {e}")
-                break
+                if found >= max_listings:
+                    self.logger.info(f"Reached maximum number of listings ({max_listings})")
+                    next_page.cancel()
+                    break
         
         # Save cache
         self.save_cache()
         
-        # Save leads to file
-        if leads:
+        # Save leads to file, unless they were already streamed to a lead sink
+        if leads and self.lead_sink is None:
             self.save_leads(leads)
         
-        self.logger.info(f"Completed Craigslist FSBO scraper. Found {len(leads)} new leads")
+        self.logger.info(f"HTTP cache: {self.session.cache.stats()}")
+        self.logger.info(f"Completed Craigslist FSBO scraper. Found {found} new leads")
+        return leads
+    
+    def _fetch_results_page(self, search_url: str, page: int) -> List:
+        """Listing rows on one page of search results"""
+        # Modify URL for pagination
+        page_url = search_url
+        if page > 0:
+            page_url = f"{search_url}&s={page * 120}"  # Craigslist uses 120 items per page
+        
+        self.logger.info(f"Scraping page {page + 1} at {page_url}")
+        
+        # Get the page content
+        response = self._get(page_url)
+        response.raise_for_status()
+        
+        # Parse the HTML and find all listing items
+        soup = BeautifulSoup(response.content, 'html.parser')
+        return soup.select('li.result-row')
+    
+    def _scrape_listings(self, listings: List, pool: ThreadPoolExecutor, limit: int) -> List[Dict]:
+        """
+        Leads for up to limit unprocessed listings on a result page
+        
+        Detail fetches run in a window of max_concurrency ahead of the
+        listing being turned into a lead, so leads are built, marked
+        processed and counted in page order, and at most a window's worth
+        of fetches is wasted once the limit is reached.
+        """
+        leads = []
+        previews = iter(self._listing_previews(listings))
+        pending = deque()
+        
+        def fill():
+            while len(pending) < self.max_concurrency:
+                preview = next(previews, None)
+                if preview is None:
+                    return
+                pending.append((preview, pool.submit(self._scrape_listing_details, preview['url'])))
+        
+        fill()
+        while pending and len(leads) < limit:
+            preview, future = pending.popleft()
+            fill()
+            data_id = preview['data_id']
+            try:
+                # Get detailed listing data
+                listing_data = future.result()
+                
+                if listing_data:
+                    # Create normalized lead data
+                    lead_data = self._create_lead_data(
+                        data_id, 
+                        preview['url'], 
+                        preview['title'], 
+                        preview['price'], 
+                        preview['listing_date'], 
+                        preview['location'], 
+                        listing_data
+                    )
+                    
+                    lead = lead_data.to_dict()
+                    leads.append(lead)
+                    self.emit_lead(lead)
+                    self.mark_processed(data_id, {
+                        'url': preview['url'],
+                        'title': preview['title'],
+                        'price': preview['price']
+                    })
+            
+            except Exception as e:
+                self.logger.error(f"Error processing listing {data_id}: {e}")
+        
+        for _, future in pending:
+            future.cancel()
         return leads
     
+    def _listing_previews(self, listings: List) -> List[Dict]:
+        """Basic data from the result rows of listings not yet processed"""
+        previews = []
+        seen = set()
+        for listing in listings:
+            # Extract listing ID
+            data_id = listing.get('data-pid')
+            
+            if not data_id or data_id in seen or self.is_processed(data_id):
+                continue
+            seen.add(data_id)
+            
+            try:
+                # Find the listing URL
+                link_elem = listing.select_one('a.result-title')
+                if not link_elem:
+                    continue
+                
+                # Extract basic data from listing preview
+                price_elem = listing.select_one('.result-price')
+                price_text = price_elem.text.strip() if price_elem else None
+                
+                # Extract date
+                date_elem = listing.select_one('.result-date')
+                date_text = date_elem.get('datetime') if date_elem else None
+                
+                # Extract location
+                location_elem = listing.select_one('.result-hood')
+                
+                previews.append({
+                    'data_id': data_id,
+                    'url': link_elem.get('href'),
+                    'title': link_elem.text.strip(),
+                    'price': self._extract_price(price_text) if price_text else None,
+                    'listing_date': datetime.fromisoformat(date_text) if date_text else datetime.now(),
+                    'location': location_elem.text.strip('()') if location_elem else None
+                })
+            
+            except Exception as e:
+                self.logger.error(f"Error processing listing {data_id}: {e}")
+        
+        return previews
+    
+    def _get(self, url: str, user_agent: Optional[str] = None) -> requests.Response:
+        """GET through the shared session once the domain's rate limit allows"""
+        self.rate_limiter.wait(url)
+        headers = dict(self.headers)
+        if user_agent:
+            headers["User-Agent"] = user_agent
+        return self.session.get(url, headers=headers, timeout=self.request_timeout)
+    
     def _scrape_listing_details(self, listing_url: str) -> Dict:
         """
         Scrape detailed information from a listing page
@@ -232,8 +323,7 @@ class CraigslistScraper(ScraperBase):
         """
         try:
             # Get the listing page
-            self.headers["User-Agent"] = self.get_random_user_agent()
-            response = requests.get(listing_url, headers=self.headers)
+            response = self._get(listing_url, user_agent=self.get_random_user_agent())
             response.raise_for_status()
             
             # Parse the HTML
@@ -664,6 +754,8 @@ class FSBOScraper:
         self.use_craigslist = use_craigslist
         self.use_facebook = use_facebook
         self.config = config or {}
+        # JSON Lines file of the last run's leads
+        self.lead_file = None
         
         # Initialize scrapers
         self.scrapers = []
@@ -682,43 +774,66 @@ class FSBOScraper:
         
         self.logger.info(f"Initialized FSBO scraper with {len(self.scrapers)} active scrapers")
     
-    def run(self) -> Dict[str, List[Dict]]:
+    def run(self) -> Dict[str, int]:
         """
-        Run all FSBO scrapers
+        Run all FSBO scrapers in parallel
+        
+        Each scraper runs in its own thread, so a slow source no longer
+        holds up the rest. Leads are appended to one JSON Lines file
+        (fsbo_leads_<timestamp>.jsonl, kept in self.lead_file) as each
+        scraper produces them, and a compact index of the run is written
+        next to it once all sources finish; scrapers skip their own
+        per-source lead files meanwhile. Leads are not held in memory:
+        read them back with iter_leads().
         
         Returns:
-            Dictionary of leads by source
+            Dictionary of lead counts by source
         """
         self.logger.info("Starting FSBO scraper")
-        all_leads = {}
-        
-        for scraper in self.scrapers:
-            try:
-                self.logger.info(f"Running {scraper.name} scraper")
-                leads = scraper.run()
-                all_leads[scraper.name] = leads
-                self.logger.info(f"{scraper.name} found {len(leads)} leads")
-            except Exception as e:
-                self.logger.error(f"Error running {scraper.name} scraper: {e}")
+        counts = {}
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = Path(self.output_dir) if self.output_dir else project_root / 'data' / 'leads'
+        self.lead_file = output_path / f"fsbo_leads_{timestamp}.jsonl"
+        
+        max_workers = self.config.get('max_parallel_sources') or len(self.scrapers) or 1
+        with LeadSink(self.lead_file) as sink, \
+                ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fsbo') as pool:
+            futures = {pool.submit(self._run_scraper, scraper, sink): scraper for scraper in self.scrapers}
+            for future in as_completed(futures):
+                scraper = futures[future]
+                try:
+                    future.result()
+                    counts[scraper.name] = sink.counts[scraper.name]
+                    self.logger.info(f"{scraper.name} found {counts[scraper.name]} leads")
+                except Exception as e:
+                    self.logger.error(f"Error running {scraper.name} scraper: {e}")
         
-        # Combine all leads into a single file
-        if all_leads:
-            combined_leads = []
-            for source_leads in all_leads.values():
-                combined_leads.extend(source_leads)
-            
-            if combined_leads:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_path = Path(self.output_dir) if self.output_dir else project_root / 'data' / 'leads'
-                output_path.mkdir(parents=True, exist_ok=True)
-                
-                with open(output_path / f"fsbo_leads_{timestamp}.json", 'w') as f:
-                    json.dump(combined_leads, f, indent=2)
-                
-                self.logger.info(f"Saved {len(combined_leads)} combined leads")
+        if len(sink):
+            self.logger.info(f"Saved {len(sink)} combined leads to {self.lead_file} (index {sink.index_path})")
         
         self.logger.info("Completed FSBO scraper")
-        return all_leads
+        return counts
+    
+    def iter_leads(self) -> Iterator[Dict]:
+        """Leads written by the last run, read back from its JSON Lines file"""
+        if self.lead_file and self.lead_file.exists():
+            yield from LeadSink.read_leads(self.lead_file)
+    
+    def _run_scraper(self, scraper: ScraperBase, sink: LeadSink):
+        """
+        Run one scraper with its leads streamed to sink
+        
+        Scrapers that emit leads as they go return nothing; any leads a
+        scraper returns instead are written to the sink when it finishes.
+        """
+        self.logger.info(f"Running {scraper.name} scraper")
+        scraper.lead_sink = sink
+        try:
+            for lead in scraper.run() or []:
+                sink.write(scraper.name, lead)
+        finally:
+            scraper.lead_sink = None
 
 
 def main():
@@ -749,13 +864,15 @@ def main():
         config=config
     )
     
-    leads = scraper.run()
+    counts = scraper.run()
     
     # Print summary
-    total_leads = sum(len(source_leads) for source_leads in leads.values())
+    total_leads = sum(counts.values())
     print(f"Found {total_leads} total leads:")
-    for source, source_leads in leads.items():
-        print(f"  - {source}: {len(source_leads)} leads")
+    for source, count in counts.items():
+        print(f"  - {source}: {count} leads")
+    if total_leads:
+        print(f"Leads written to {scraper.lead_file}")
 
 
 if __name__ == "__main__":
@@ -204,12 +204,12 @@ class LeadPipelineIntegrator:
         else:
             # Run scrapers
             if run_fsbo and self.fsbo_scraper:
-                fsbo_leads = self.fsbo_scraper.run()
+                self.fsbo_scraper.run()
                 
-                # Flatten the dictionary of leads by source
-                for source_leads in fsbo_leads.values():
-                    all_leads.extend(source_leads)
-                    pipeline_results["leads"]["fsbo"].extend(source_leads)
+                # Leads from every source, streamed back from the run's lead file
+                for lead in self.fsbo_scraper.iter_leads():
+                    all_leads.append(lead)
+                    pipeline_results["leads"]["fsbo"].append(lead)
                 
                 self.logger.info(f"Collected {len(pipeline_results['leads']['fsbo'])} FSBO leads")
             
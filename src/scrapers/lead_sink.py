@@ -0,0 +1,104 @@
+"""
+Lead Sink Module
+
+Append-only JSON Lines output shared by scrapers running in parallel, with a
+compact index of what was written.
+"""
+
+import json
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+# Per-lead fields kept in the index, after source and the lead's position in the file
+INDEX_FIELDS = ['source_id', 'urgency', 'price', 'city', 'zip_code']
+
+
+class LeadSink:
+    """
+    Thread-safe JSON Lines writer for leads as scrapers produce them
+
+    Each lead is written as one compact JSON line and flushed at once, so a
+    crash loses at most the line being written and readers can follow the
+    file while scraping is still running. On close, an index is written next
+    to the file (<name>.index.json) with per-source counts and, per lead,
+    the source, byte offset and length of its line and the INDEX_FIELDS,
+    enough to rank or look up leads without loading the whole file.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open the sink
+
+        Args:
+            path: JSON Lines file to append leads to
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.path.with_suffix('.index.json')
+        self.counts = Counter()
+        self._entries: List[list] = []
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'ab')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    def write(self, source: str, lead: Dict):
+        """Append one lead from source"""
+        line = json.dumps(lead, separators=(',', ':'), default=str).encode('utf-8') + b'\n'
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+            self.counts[source] += 1
+            self._entries.append([source, offset, len(line)] + [lead.get(field) for field in INDEX_FIELDS])
+
+    def close(self) -> Optional[Path]:
+        """
+        Close the file and write the index
+
+        Returns:
+            Path of the index, or None if no leads were written (the empty
+            file is removed)
+        """
+        with self._lock:
+            if self._file.closed:
+                return self.index_path if self.index_path.exists() else None
+            self._file.close()
+            if not self._entries:
+                self.path.unlink(missing_ok=True)
+                return None
+
+            index = {
+                'leads_file': self.path.name,
+                'total': len(self._entries),
+                'sources': dict(self.counts),
+                'fields': ['source', 'offset', 'length'] + INDEX_FIELDS,
+                'entries': self._entries
+            }
+            with open(self.index_path, 'w') as f:
+                json.dump(index, f, separators=(',', ':'), default=str)
+            return self.index_path
+
+    @staticmethod
+    def read_leads(path: Union[str, Path]) -> Iterator[Dict]:
+        """Iterate over the leads in a JSON Lines file"""
+        with open(path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    @staticmethod
+    def read_lead(path: Union[str, Path], offset: int, length: int) -> Dict:
+        """Load the single lead at an index entry's offset and length"""
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
@@ -9,11 +9,13 @@ import sys
 import json
 import logging
 import random
+import threading
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, Tuple
+from urllib.parse import urlparse
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
@@ -25,6 +27,35 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+class DomainRateLimiter:
+    """
+    Thread-safe per-domain rate limit (token bucket)
+    
+    wait() reserves the next request slot for the URL's domain and sleeps
+    until it comes up, so any number of worker threads together stay
+    within requests_per_second per domain, with bursts of up to burst.
+    """
+    
+    def __init__(self, requests_per_second: float = 2.0, burst: int = 1):
+        self.rate = requests_per_second
+        self.burst = max(burst, 1)
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def wait(self, url: str):
+        """Block until a request to url's domain is allowed"""
+        if self.rate <= 0:
+            return
+        domain = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(domain, [self.burst, now])
+            # Tokens may go negative: each waiter has reserved its own slot
+            tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+            self._buckets[domain] = [tokens, now]
+        if tokens < 0:
+            time.sleep(-tokens / self.rate)
+
 class ScraperBase(ABC):
     """
     Base class for all lead generation scrapers
@@ -79,6 +110,9 @@ class ScraperBase(ABC):
         # Initialize cache
         self._init_cache()
         
+        # Set by a runner that streams leads from several scrapers to one file
+        self.lead_sink = None
+        
         self.logger.info(f"Initialized {name} scraper")
     
     def _init_cache(self):
@@ -142,6 +176,11 @@ class ScraperBase(ABC):
             self.logger.error(f"Error saving leads: {e}")
             return None
     
+    def emit_lead(self, lead: Dict):
+        """Hand a finished lead to the attached lead sink, if any"""
+        if self.lead_sink is not None:
+            self.lead_sink.write(self.name, lead)
+    
     @abstractmethod
     def run(self, *args, **kwargs):
         """Run the scraper"""
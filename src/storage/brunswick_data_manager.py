@@ -1,7 +1,7 @@
 """
 Advanced data management capabilities for Brunswick data
 """
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Union, Any, Tuple
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -9,10 +9,11 @@ import json
 import logging
 from datetime import datetime, timedelta
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 import csv
 import xlsxwriter
 from .brunswick_data_store import BrunswickDataStore, CleaningResult
+from .store_pipeline import StorePipeline, PipelineStats
+from .query_planner import QueryBuilder, IndexManager
 
 class BrunswickDataManager:
     def __init__(self, store: BrunswickDataStore):
@@ -20,45 +21,42 @@ class BrunswickDataManager:
         self.logger = logging.getLogger(__name__)
         self.export_dir = Path("exports")
         self.export_dir.mkdir(parents=True, exist_ok=True)
+        self.last_pipeline_stats: Optional[PipelineStats] = None
+        
+        # Parameterized search with indexes built from observed filters
+        self.query_builder = QueryBuilder(store.get_connection)
+        self.index_manager = IndexManager(store.get_connection, self.query_builder.columns)
+        self.index_manager.ensure_default_indexes(
+            [table for table, schema in store.table_schemas.items() if schema]
+        )
         
     async def batch_process(
         self,
         items: List[Dict],
         item_type: str,
         batch_size: int = 100,
-        max_workers: int = 4
+        max_workers: int = 4,
+        queue_depth: int = 8,
+        write_batch_size: int = 5000
     ) -> List[CleaningResult]:
-        """Process items in batches using ThreadPoolExecutor"""
-        results = []
-        
-        # Split items into batches
-        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        """
+        Clean items in a process pool and store them through one writer
         
-        async def process_batch(batch: List[Dict]) -> List[CleaningResult]:
-            batch_results = []
-            store_method = getattr(self.store, f"store_{item_type}")
-            
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Process items in parallel
-                futures = [
-                    executor.submit(store_method, item)
-                    for item in batch
-                ]
-                
-                for future in futures:
-                    try:
-                        _, cleaning_result = future.result()
-                        batch_results.append(cleaning_result)
-                    except Exception as e:
-                        self.logger.error(f"Error processing item: {e}")
-                        
-            return batch_results
-            
-        # Process all batches
-        for batch in batches:
-            batch_results = await process_batch(batch)
-            results.extend(batch_results)
-            
+        batch_size items are cleaned per worker task, write_batch_size rows
+        are committed per transaction, and at most queue_depth batches are
+        buffered between stages. Per-stage counters for the run are kept on
+        self.last_pipeline_stats.
+        """
+        pipeline = StorePipeline(
+            self.store,
+            item_type,
+            clean_workers=max_workers,
+            clean_batch_size=batch_size,
+            write_batch_size=write_batch_size,
+            queue_depth=queue_depth
+        )
+        results = await pipeline.run(items)
+        self.last_pipeline_stats = pipeline.stats
         return results
         
     def transform_data(self, data: Dict, transforms: List[str]) -> Dict:
@@ -110,46 +108,52 @@ class BrunswickDataManager:
         limit: Optional[int] = None,
         offset: int = 0,
         sort_by: Optional[str] = None,
-        sort_order: str = "ASC"
+        sort_order: str = "ASC",
+        after: Optional[Tuple[Any, int]] = None
     ) -> List[Dict]:
-        """Search data with advanced filtering"""
+        """
+        Search data with advanced filtering
+        
+        Pass after=(last sort value, last rowid) from search_page instead of
+        offset to page through large result sets with a keyset seek.
+        """
+        return self.search_page(
+            query, item_type, limit, offset, sort_by, sort_order, after
+        )['results']
+        
+    def search_page(
+        self,
+        query: Dict[str, Any],
+        item_type: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort_by: Optional[str] = None,
+        sort_order: str = "ASC",
+        after: Optional[Tuple[Any, int]] = None
+    ) -> Dict[str, Any]:
+        """Search and return results with a keyset cursor for the next page"""
+        compiled = self.query_builder.build(
+            item_type, query, limit, offset, sort_by, sort_order, after
+        )
+        self.index_manager.observe(item_type, compiled)
+        
         with self.store.get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Build query
-            base_query = f"SELECT * FROM {item_type}"
-            where_clauses = []
-            params = []
-            
-            for field, value in query.items():
-                if isinstance(value, dict):
-                    # Handle operators (e.g., {"gt": 100})
-                    for op, op_value in value.items():
-                        where_clause = self._build_operator_clause(field, op, op_value)
-                        where_clauses.append(where_clause)
-                        params.append(op_value)
-                else:
-                    # Simple equality
-                    where_clauses.append(f"{field} = ?")
-                    params.append(value)
-                    
-            if where_clauses:
-                base_query += " WHERE " + " AND ".join(where_clauses)
-                
-            # Add sorting
-            if sort_by:
-                base_query += f" ORDER BY {sort_by} {sort_order}"
-                
-            # Add limit and offset
-            if limit is not None:
-                base_query += f" LIMIT {limit} OFFSET {offset}"
-                
-            # Execute query
-            cursor.execute(base_query, params)
+            cursor.execute(compiled.sql, compiled.params)
             results = [dict(row) for row in cursor.fetchall()]
             
-            return results
+        next_cursor = None
+        if results:
+            last = results[-1]
+            next_cursor = (last.get(sort_by) if sort_by else None, last['_rowid'])
+        for row in results:
+            row.pop('_rowid', None)
             
+        return {
+            'results': results,
+            'next_cursor': next_cursor if limit is not None and len(results) == limit else None
+        }
+        
     def _merge_address_components(self, data: Dict) -> Dict:
         """Merge split address components"""
         if all(k in data for k in ['street_number', 'street_name', 'street_type']):
@@ -298,30 +302,6 @@ class BrunswickDataManager:
         with open(filepath, 'w') as f:
             json.dump(data, f, indent=2, default=str)
             
-    def _build_operator_clause(
-        self,
-        field: str,
-        operator: str,
-        value: Any
-    ) -> str:
-        """Build SQL where clause for operators"""
-        op_map = {
-            'eq': '=',
-            'neq': '!=',
-            'gt': '>',
-            'gte': '>=',
-            'lt': '<',
-            'lte': '<=',
-            'like': 'LIKE',
-            'in': 'IN',
-            'between': 'BETWEEN'
-        }
-        
-        if operator not in op_map:
-            raise ValueError(f"Unsupported operator: {operator}")
-            
-        return f"{field} {op_map[operator]} ?"
-        
     def _get_neighborhood(self, address: str) -> Optional[str]:
         """Get Brunswick neighborhood for address"""
         # This would typically use GIS data
@@ -2,7 +2,7 @@
 SQLite-based storage system for Brunswick data with data cleaning and normalization
 """
 import sqlite3
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Iterable, Iterator, Callable
 import json
 import logging
 from datetime import datetime
@@ -12,6 +12,65 @@ import usaddress
 import re
 from dataclasses import dataclass
 from contextlib import contextmanager
+from itertools import islice
+
+# Connection settings for bulk loads: WAL lets readers continue during the
+# load, NORMAL sync is durable at each commit in WAL mode, 64 MB page cache
+BULK_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY"
+)
+
+BUSINESS_UPSERT_SQL = """
+    INSERT INTO businesses (
+        name, normalized_name, address, normalized_address,
+        phone, website, category, source, last_updated, raw_data
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (normalized_name, normalized_address) 
+    DO UPDATE SET
+        phone = excluded.phone,
+        website = excluded.website,
+        category = excluded.category,
+        source = excluded.source,
+        last_updated = excluded.last_updated,
+        raw_data = excluded.raw_data
+"""
+
+PROPERTY_UPSERT_SQL = """
+    INSERT INTO properties (
+        map_lot, address, normalized_address,
+        tax_account, assessment, zoning,
+        last_updated, raw_data
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (map_lot) 
+    DO UPDATE SET
+        address = excluded.address,
+        normalized_address = excluded.normalized_address,
+        tax_account = excluded.tax_account,
+        assessment = excluded.assessment,
+        zoning = excluded.zoning,
+        last_updated = excluded.last_updated,
+        raw_data = excluded.raw_data
+"""
+
+PERMIT_UPSERT_SQL = """
+    INSERT INTO permits (
+        permit_number, type, status,
+        issue_date, expiration_date,
+        property_id, business_id, raw_data
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (permit_number) 
+    DO UPDATE SET
+        type = excluded.type,
+        status = excluded.status,
+        issue_date = excluded.issue_date,
+        expiration_date = excluded.expiration_date,
+        property_id = excluded.property_id,
+        business_id = excluded.business_id,
+        raw_data = excluded.raw_data
+"""
 
 @dataclass
 class CleaningResult:
@@ -20,16 +79,278 @@ class CleaningResult:
     changes: List[str]
     warnings: List[str]
 
-class BrunswickDataStore:
-    def __init__(self, db_path: str = "brunswick_data.db"):
-        self.db_path = db_path
+class BrunswickRecordCleaner:
+    """
+    Cleaning and normalization of business, property and permit records
+
+    Needs no database, so pipeline worker processes can clean records
+    without opening the store.
+    """
+    def __init__(self):
         self.logger = logging.getLogger(__name__)
         
+        # Address normalization patterns
+        self.address_patterns = {
+            'street_types': {
+                'ST': 'STREET',
+                'RD': 'ROAD',
+                'AVE': 'AVENUE',
+                'DR': 'DRIVE',
+                'LN': 'LANE',
+                'CT': 'COURT',
+                'CIR': 'CIRCLE',
+                'BLVD': 'BOULEVARD',
+                'HWY': 'HIGHWAY'
+            },
+            'directions': {
+                'N': 'NORTH',
+                'S': 'SOUTH',
+                'E': 'EAST',
+                'W': 'WEST',
+                'NE': 'NORTHEAST',
+                'NW': 'NORTHWEST',
+                'SE': 'SOUTHEAST',
+                'SW': 'SOUTHWEST'
+            }
+        }
+        
+    def cleaner(self, item_type: str) -> Callable[[Dict], CleaningResult]:
+        """Cleaning function for an item type"""
+        cleaners = {
+            'business': self._clean_business_data,
+            'property': self._clean_property_data,
+            'permit': self._clean_permit_data
+        }
+        if item_type not in cleaners:
+            raise ValueError(f"Unknown item type: {item_type}")
+        return cleaners[item_type]
+        
+    def _clean_business_data(self, data: Dict) -> CleaningResult:
+        """Clean and normalize business data"""
+        original = data.copy()
+        cleaned = {}
+        changes = []
+        warnings = []
+        
+        # Clean business name
+        if name := data.get('name'):
+            cleaned['name'] = name.strip()
+            cleaned['normalized_name'] = self._normalize_business_name(name)
+            if cleaned['name'] != name:
+                changes.append(f"Cleaned business name: {name} -> {cleaned['name']}")
+                
+        # Normalize address
+        if address := data.get('address'):
+            cleaned_address = self._normalize_address(address)
+            cleaned['address'] = cleaned_address.get('formatted_address')
+            cleaned['normalized_address'] = cleaned_address.get('normalized_address')
+            if cleaned['address'] != address:
+                changes.append(f"Normalized address: {address} -> {cleaned['address']}")
+                
+        # Clean phone number
+        if phone := data.get('phone'):
+            cleaned['phone'] = self._clean_phone_number(phone)
+            if cleaned['phone'] != phone:
+                changes.append(f"Cleaned phone: {phone} -> {cleaned['phone']}")
+                
+        # Clean website
+        if website := data.get('website'):
+            cleaned['website'] = self._clean_url(website)
+            if cleaned['website'] != website:
+                changes.append(f"Cleaned website: {website} -> {cleaned['website']}")
+                
+        # Copy other fields
+        cleaned.update({
+            k: v for k, v in data.items()
+            if k not in cleaned and v is not None
+        })
+        
+        return CleaningResult(original, cleaned, changes, warnings)
+        
+    def _clean_property_data(self, data: Dict) -> CleaningResult:
+        """Clean and normalize property data"""
+        original = data.copy()
+        cleaned = {}
+        changes = []
+        warnings = []
+        
+        # Clean map-lot
+        if map_lot := data.get('map_lot'):
+            cleaned['map_lot'] = self._clean_map_lot(map_lot)
+            if cleaned['map_lot'] != map_lot:
+                changes.append(f"Cleaned map-lot: {map_lot} -> {cleaned['map_lot']}")
+                
+        # Normalize address
+        if address := data.get('address'):
+            cleaned_address = self._normalize_address(address)
+            cleaned['address'] = cleaned_address.get('formatted_address')
+            cleaned['normalized_address'] = cleaned_address.get('normalized_address')
+            if cleaned['address'] != address:
+                changes.append(f"Normalized address: {address} -> {cleaned['address']}")
+                
+        # Clean assessment value
+        if assessment := data.get('assessment'):
+            try:
+                cleaned['assessment'] = float(str(assessment).replace('$', '').replace(',', ''))
+                if str(cleaned['assessment']) != str(assessment):
+                    changes.append(f"Cleaned assessment: {assessment} -> {cleaned['assessment']}")
+            except ValueError:
+                warnings.append(f"Invalid assessment value: {assessment}")
+                
+        # Copy other fields
+        cleaned.update({
+            k: v for k, v in data.items()
+            if k not in cleaned and v is not None
+        })
+        
+        return CleaningResult(original, cleaned, changes, warnings)
+        
+    def _clean_permit_data(self, data: Dict) -> CleaningResult:
+        """Clean permit data"""
+        original = data.copy()
+        cleaned = {}
+        changes = []
+        warnings = []
+        
+        # Clean permit number
+        if permit_number := data.get('permit_number'):
+            cleaned['permit_number'] = permit_number.strip().upper()
+            if cleaned['permit_number'] != permit_number:
+                changes.append(f"Cleaned permit number: {permit_number} -> {cleaned['permit_number']}")
+                
+        # Clean dates
+        for date_field in ['issue_date', 'expiration_date']:
+            if date_value := data.get(date_field):
+                try:
+                    cleaned[date_field] = pd.to_datetime(date_value).strftime('%Y-%m-%d')
+                    if cleaned[date_field] != date_value:
+                        changes.append(f"Cleaned {date_field}: {date_value} -> {cleaned[date_field]}")
+                except ValueError:
+                    warnings.append(f"Invalid {date_field}: {date_value}")
+                    
+        # Normalize status
+        if status := data.get('status'):
+            cleaned['status'] = self._normalize_permit_status(status)
+            if cleaned['status'] != status:
+                changes.append(f"Normalized status: {status} -> {cleaned['status']}")
+                
+        # Copy other fields
+        cleaned.update({
+            k: v for k, v in data.items()
+            if k not in cleaned and v is not None
+        })
+        
+        return CleaningResult(original, cleaned, changes, warnings)
+        
+    def _normalize_address(self, address: str) -> Dict:
+        """Normalize address format"""
+        try:
+            # Parse address
+            components, address_type = usaddress.tag(address)
+            
+            # Standardize components
+            street_number = components.get('AddressNumber', '')
+            street_name = components.get('StreetName', '').upper()
+            street_type = components.get('StreetNamePostType', '').upper()
+            unit = components.get('OccupancyIdentifier', '')
+            
+            # Normalize street type
+            if street_type in self.address_patterns['street_types']:
+                street_type = self.address_patterns['street_types'][street_type]
+                
+            # Build normalized address
+            parts = [
+                street_number,
+                street_name,
+                street_type,
+                f"UNIT {unit}" if unit else None,
+                "BRUNSWICK",
+                "ME"
+            ]
+            
+            normalized = ' '.join(p for p in parts if p)
+            
+            return {
+                'normalized_address': normalized,
+                'formatted_address': f"{street_number} {street_name} {street_type}".title(),
+                'components': components
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error normalizing address: {e}")
+            return {'normalized_address': address, 'formatted_address': address, 'components': {}}
+            
+    def _normalize_business_name(self, name: str) -> str:
+        """Normalize business name"""
+        # Remove common business suffixes
+        suffixes = ['LLC', 'INC', 'CORP', 'LTD', 'CO', 'COMPANY']
+        normalized = name.upper()
+        for suffix in suffixes:
+            normalized = re.sub(rf'\b{suffix}\b\.?', '', normalized)
+            
+        # Remove punctuation and extra spaces
+        normalized = re.sub(r'[^\w\s]', '', normalized)
+        normalized = ' '.join(normalized.split())
+        
+        return normalized
+        
+    def _clean_phone_number(self, phone: str) -> str:
+        """Clean and format phone number"""
+        # Remove non-numeric characters
+        digits = re.sub(r'\D', '', phone)
+        
+        # Ensure 10 digits
+        if len(digits) == 10:
+            return f"+1{digits}"
+        elif len(digits) == 11 and digits.startswith('1'):
+            return f"+{digits}"
+        return phone
+        
+    def _clean_url(self, url: str) -> str:
+        """Clean and normalize URL"""
+        url = url.lower().strip()
+        if not url.startswith(('http://', 'https://')):
+            url = f"https://{url}"
+        return url
+        
+    def _clean_map_lot(self, map_lot: str) -> str:
+        """Clean map-lot format"""
+        # Remove spaces and normalize format
+        cleaned = re.sub(r'\s+', '', map_lot.upper())
+        # Ensure proper format (e.g., "123-A-45")
+        if match := re.match(r'^(\d+)-([A-Z])-(\d+)$', cleaned):
+            return cleaned
+        return map_lot
+        
+    def _normalize_permit_status(self, status: str) -> str:
+        """Normalize permit status"""
+        status_map = {
+            'ACTIVE': ['ACTIVE', 'CURRENT', 'VALID'],
+            'PENDING': ['PENDING', 'IN REVIEW', 'SUBMITTED'],
+            'EXPIRED': ['EXPIRED', 'TERMINATED', 'CLOSED'],
+            'APPROVED': ['APPROVED', 'GRANTED', 'ISSUED'],
+            'DENIED': ['DENIED', 'REJECTED', 'REFUSED']
+        }
+        
+        status = status.upper()
+        for normalized, variants in status_map.items():
+            if status in variants:
+                return normalized
+        return status
+
+
+class BrunswickDataStore(BrunswickRecordCleaner):
+    def __init__(self, db_path: str = "brunswick_data.db", bulk_batch_size: int = 10000):
+        super().__init__()
+        self.db_path = db_path
+        self.bulk_batch_size = bulk_batch_size
+        
         # Ensure database directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         
         # Initialize database and cache schemas
         self.table_schemas = {}
+        self.required_columns = {}
         self._init_database()
         self._cache_schemas()
         
@@ -159,7 +480,9 @@ class BrunswickDataStore:
             cursor = conn.cursor()
             for table in ['businesses', 'properties', 'licenses']:
                 cursor.execute(f"PRAGMA table_info({table})")
-                self.table_schemas[table] = {row[1]: row[2].upper() for row in cursor.fetchall()}
+                columns = cursor.fetchall()
+                self.table_schemas[table] = {row[1]: row[2].upper() for row in columns}
+                self.required_columns[table] = [row[1] for row in columns if row[3]]
             
     def insert(self, table: str, data: Dict):
         """Insert data into a table"""
@@ -175,8 +498,7 @@ class BrunswickDataStore:
             filtered_data = {k: v for k, v in data.items() if k in table_schema}
             
             # Check for missing required columns
-            cursor.execute(f"PRAGMA table_info({table})")
-            required_columns = [row[1] for row in cursor.fetchall() if row[3]]
+            required_columns = self.required_columns.get(table, [])
             missing_columns = [col for col in required_columns if col not in filtered_data]
             
             if missing_columns:
@@ -209,31 +531,6 @@ class BrunswickDataStore:
                 self.logger.error(f"Error inserting into {table}: {e}\nQuery: {query}\nValues: {filtered_data}")
                 raise
         
-        # Address normalization patterns
-        self.address_patterns = {
-            'street_types': {
-                'ST': 'STREET',
-                'RD': 'ROAD',
-                'AVE': 'AVENUE',
-                'DR': 'DRIVE',
-                'LN': 'LANE',
-                'CT': 'COURT',
-                'CIR': 'CIRCLE',
-                'BLVD': 'BOULEVARD',
-                'HWY': 'HIGHWAY'
-            },
-            'directions': {
-                'N': 'NORTH',
-                'S': 'SOUTH',
-                'E': 'EAST',
-                'W': 'WEST',
-                'NE': 'NORTHEAST',
-                'NW': 'NORTHWEST',
-                'SE': 'SOUTHEAST',
-                'SW': 'SOUTHWEST'
-            }
-        }
-        
     @contextmanager
     def get_connection(self):
         """Context manager for database connections"""
@@ -322,32 +619,10 @@ class BrunswickDataStore:
             cursor = conn.cursor()
             
             try:
-                cursor.execute("""
-                    INSERT INTO businesses (
-                        name, normalized_name, address, normalized_address,
-                        phone, website, category, source, last_updated, raw_data
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT (normalized_name, normalized_address) 
-                    DO UPDATE SET
-                        phone = excluded.phone,
-                        website = excluded.website,
-                        category = excluded.category,
-                        source = excluded.source,
-                        last_updated = excluded.last_updated,
-                        raw_data = excluded.raw_data
-                    RETURNING id
-                """, (
-                    cleaned_data['name'],
-                    cleaned_data['normalized_name'],
-                    cleaned_data['address'],
-                    cleaned_data['normalized_address'],
-                    cleaned_data.get('phone'),
-                    cleaned_data.get('website'),
-                    cleaned_data.get('category'),
-                    cleaned_data.get('source'),
-                    datetime.now().isoformat(),
-                    json.dumps(business_data)
-                ))
+                cursor.execute(
+                    BUSINESS_UPSERT_SQL + " RETURNING id",
+                    self._business_row(cleaned_data, business_data)
+                )
                 
                 business_id = cursor.fetchone()[0]
                 conn.commit()
@@ -368,32 +643,10 @@ class BrunswickDataStore:
             cursor = conn.cursor()
             
             try:
-                cursor.execute("""
-                    INSERT INTO properties (
-                        map_lot, address, normalized_address,
-                        tax_account, assessment, zoning,
-                        last_updated, raw_data
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT (map_lot) 
-                    DO UPDATE SET
-                        address = excluded.address,
-                        normalized_address = excluded.normalized_address,
-                        tax_account = excluded.tax_account,
-                        assessment = excluded.assessment,
-                        zoning = excluded.zoning,
-                        last_updated = excluded.last_updated,
-                        raw_data = excluded.raw_data
-                    RETURNING id
-                """, (
-                    cleaned_data['map_lot'],
-                    cleaned_data['address'],
-                    cleaned_data['normalized_address'],
-                    cleaned_data.get('tax_account'),
-                    cleaned_data.get('assessment'),
-                    cleaned_data.get('zoning'),
-                    datetime.now().isoformat(),
-                    json.dumps(property_data)
-                ))
+                cursor.execute(
+                    PROPERTY_UPSERT_SQL + " RETURNING id",
+                    self._property_row(cleaned_data, property_data)
+                )
                 
                 property_id = cursor.fetchone()[0]
                 conn.commit()
@@ -414,32 +667,10 @@ class BrunswickDataStore:
             cursor = conn.cursor()
             
             try:
-                cursor.execute("""
-                    INSERT INTO permits (
-                        permit_number, type, status,
-                        issue_date, expiration_date,
-                        property_id, business_id, raw_data
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT (permit_number) 
-                    DO UPDATE SET
-                        type = excluded.type,
-                        status = excluded.status,
-                        issue_date = excluded.issue_date,
-                        expiration_date = excluded.expiration_date,
-                        property_id = excluded.property_id,
-                        business_id = excluded.business_id,
-                        raw_data = excluded.raw_data
-                    RETURNING id
-                """, (
-                    cleaned_data['permit_number'],
-                    cleaned_data['type'],
-                    cleaned_data['status'],
-                    cleaned_data.get('issue_date'),
-                    cleaned_data.get('expiration_date'),
-                    cleaned_data.get('property_id'),
-                    cleaned_data.get('business_id'),
-                    json.dumps(permit_data)
-                ))
+                cursor.execute(
+                    PERMIT_UPSERT_SQL + " RETURNING id",
+                    self._permit_row(cleaned_data, permit_data)
+                )
                 
                 permit_id = cursor.fetchone()[0]
                 conn.commit()
@@ -450,215 +681,182 @@ class BrunswickDataStore:
                 conn.rollback()
                 raise
                 
-    def _clean_business_data(self, data: Dict) -> CleaningResult:
-        """Clean and normalize business data"""
-        original = data.copy()
-        cleaned = {}
-        changes = []
-        warnings = []
+    @contextmanager
+    def get_bulk_connection(self):
+        """
+        Connection for bulk loads: tuned pragmas and explicit transactions
         
-        # Clean business name
-        if name := data.get('name'):
-            cleaned['name'] = name.strip()
-            cleaned['normalized_name'] = self._normalize_business_name(name)
-            if cleaned['name'] != name:
-                changes.append(f"Cleaned business name: {name} -> {cleaned['name']}")
-                
-        # Normalize address
-        if address := data.get('address'):
-            cleaned_address = self._normalize_address(address)
-            cleaned['address'] = cleaned_address.get('formatted_address')
-            cleaned['normalized_address'] = cleaned_address.get('normalized_address')
-            if cleaned['address'] != address:
-                changes.append(f"Normalized address: {address} -> {cleaned['address']}")
-                
-        # Clean phone number
-        if phone := data.get('phone'):
-            cleaned['phone'] = self._clean_phone_number(phone)
-            if cleaned['phone'] != phone:
-                changes.append(f"Cleaned phone: {phone} -> {cleaned['phone']}")
-                
-        # Clean website
-        if website := data.get('website'):
-            cleaned['website'] = self._clean_url(website)
-            if cleaned['website'] != website:
-                changes.append(f"Cleaned website: {website} -> {cleaned['website']}")
-                
-        # Copy other fields
-        cleaned.update({
-            k: v for k, v in data.items()
-            if k not in cleaned and v is not None
-        })
+        isolation_level=None disables the sqlite3 module's implicit
+        transactions so each batch is committed exactly once by the caller.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            for pragma in BULK_PRAGMAS:
+                conn.execute(pragma)
+            yield conn
+        finally:
+            conn.close()
+            
+    def bulk_store_businesses(self, businesses: Iterable[Dict],
+                              batch_size: Optional[int] = None) -> List[CleaningResult]:
+        """Clean and upsert many businesses over one connection"""
+        return self.bulk_store('business', businesses, batch_size)
         
-        return CleaningResult(original, cleaned, changes, warnings)
+    def bulk_store_properties(self, properties: Iterable[Dict],
+                              batch_size: Optional[int] = None) -> List[CleaningResult]:
+        """Clean and upsert many properties over one connection"""
+        return self.bulk_store('property', properties, batch_size)
         
-    def _clean_property_data(self, data: Dict) -> CleaningResult:
-        """Clean and normalize property data"""
-        original = data.copy()
-        cleaned = {}
-        changes = []
-        warnings = []
+    def bulk_store_permits(self, permits: Iterable[Dict],
+                           batch_size: Optional[int] = None) -> List[CleaningResult]:
+        """Clean and upsert many permits over one connection"""
+        return self.bulk_store('permit', permits, batch_size)
         
-        # Clean map-lot
-        if map_lot := data.get('map_lot'):
-            cleaned['map_lot'] = self._clean_map_lot(map_lot)
-            if cleaned['map_lot'] != map_lot:
-                changes.append(f"Cleaned map-lot: {map_lot} -> {cleaned['map_lot']}")
-                
-        # Normalize address
-        if address := data.get('address'):
-            cleaned_address = self._normalize_address(address)
-            cleaned['address'] = cleaned_address.get('formatted_address')
-            cleaned['normalized_address'] = cleaned_address.get('normalized_address')
-            if cleaned['address'] != address:
-                changes.append(f"Normalized address: {address} -> {cleaned['address']}")
-                
-        # Clean assessment value
-        if assessment := data.get('assessment'):
-            try:
-                cleaned['assessment'] = float(str(assessment).replace('$', '').replace(',', ''))
-                if str(cleaned['assessment']) != str(assessment):
-                    changes.append(f"Cleaned assessment: {assessment} -> {cleaned['assessment']}")
-            except ValueError:
-                warnings.append(f"Invalid assessment value: {assessment}")
-                
-        # Copy other fields
-        cleaned.update({
-            k: v for k, v in data.items()
-            if k not in cleaned and v is not None
-        })
+    def bulk_store(self, item_type: str, items: Iterable[Dict],
+                   batch_size: Optional[int] = None) -> List[CleaningResult]:
+        """
+        Clean and upsert items of one type in batched transactions
         
-        return CleaningResult(original, cleaned, changes, warnings)
+        Each batch of batch_size items is written with executemany inside a
+        single transaction. Items that fail cleaning are logged and skipped;
+        a failing batch is rolled back and the error re-raised.
+        """
+        clean = self._bulk_handlers(item_type)[0]
+        results = []
         
-    def _clean_permit_data(self, data: Dict) -> CleaningResult:
-        """Clean permit data"""
-        original = data.copy()
-        cleaned = {}
-        changes = []
-        warnings = []
-        
-        # Clean permit number
-        if permit_number := data.get('permit_number'):
-            cleaned['permit_number'] = permit_number.strip().upper()
-            if cleaned['permit_number'] != permit_number:
-                changes.append(f"Cleaned permit number: {permit_number} -> {cleaned['permit_number']}")
+        with self.get_bulk_connection() as conn:
+            for batch in self._batched(items, batch_size or self.bulk_batch_size):
+                cleaning_results = [clean(item) for item in batch]
+                results.extend(self.write_batch(conn, item_type, cleaning_results))
                 
-        # Clean dates
-        for date_field in ['issue_date', 'expiration_date']:
-            if date_value := data.get(date_field):
-                try:
-                    cleaned[date_field] = pd.to_datetime(date_value).strftime('%Y-%m-%d')
-                    if cleaned[date_field] != date_value:
-                        changes.append(f"Cleaned {date_field}: {date_value} -> {cleaned[date_field]}")
-                except ValueError:
-                    warnings.append(f"Invalid {date_field}: {date_value}")
-                    
-        # Normalize status
-        if status := data.get('status'):
-            cleaned['status'] = self._normalize_permit_status(status)
-            if cleaned['status'] != status:
-                changes.append(f"Normalized status: {status} -> {cleaned['status']}")
-                
-        # Copy other fields
-        cleaned.update({
-            k: v for k, v in data.items()
-            if k not in cleaned and v is not None
-        })
+        return results
         
-        return CleaningResult(original, cleaned, changes, warnings)
+    def write_batch(self, conn: sqlite3.Connection, item_type: str,
+                    cleaning_results: List[CleaningResult]) -> List[CleaningResult]:
+        """Upsert already-cleaned items in one transaction, returning those written"""
+        _, sql, to_row = self._bulk_handlers(item_type)
         
-    def _normalize_address(self, address: str) -> Dict:
-        """Normalize address format"""
-        try:
-            # Parse address
-            components, address_type = usaddress.tag(address)
-            
-            # Standardize components
-            street_number = components.get('AddressNumber', '')
-            street_name = components.get('StreetName', '').upper()
-            street_type = components.get('StreetNamePostType', '').upper()
-            unit = components.get('OccupancyIdentifier', '')
-            
-            # Normalize street type
-            if street_type in self.address_patterns['street_types']:
-                street_type = self.address_patterns['street_types'][street_type]
+        rows = []
+        written = []
+        for result in cleaning_results:
+            try:
+                rows.append(to_row(result.cleaned, result.original))
+                written.append(result)
+            except (KeyError, TypeError) as e:
+                self.logger.error(f"Skipping {item_type} missing required field {e}: {result.original}")
                 
-            # Build normalized address
-            parts = [
-                street_number,
-                street_name,
-                street_type,
-                f"UNIT {unit}" if unit else None,
-                "BRUNSWICK",
-                "ME"
-            ]
-            
-            normalized = ' '.join(p for p in parts if p)
-            
-            return {
-                'normalized_address': normalized,
-                'formatted_address': f"{street_number} {street_name} {street_type}".title(),
-                'components': components
-            }
+        if not rows:
+            return written
             
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(sql, rows)
+            conn.execute("COMMIT")
         except Exception as e:
-            self.logger.error(f"Error normalizing address: {e}")
-            return {'normalized_address': address, 'formatted_address': address, 'components': {}}
+            self.logger.error(f"Error bulk storing {len(rows)} {item_type} records: {e}")
+            conn.execute("ROLLBACK")
+            raise
             
-    def _normalize_business_name(self, name: str) -> str:
-        """Normalize business name"""
-        # Remove common business suffixes
-        suffixes = ['LLC', 'INC', 'CORP', 'LTD', 'CO', 'COMPANY']
-        normalized = name.upper()
-        for suffix in suffixes:
-            normalized = re.sub(rf'\b{suffix}\b\.?', '', normalized)
-            
-        # Remove punctuation and extra spaces
-        normalized = re.sub(r'[^\w\s]', '', normalized)
-        normalized = ' '.join(normalized.split())
-        
-        return normalized
+        return written
         
-    def _clean_phone_number(self, phone: str) -> str:
-        """Clean and format phone number"""
-        # Remove non-numeric characters
-        digits = re.sub(r'\D', '', phone)
+    def bulk_insert(self, table: str, rows: Iterable[Dict],
+                    batch_size: Optional[int] = None) -> int:
+        """Insert many rows into a table over one connection, returning the count"""
+        table_schema = self.table_schemas.get(table)
+        if not table_schema:
+            raise ValueError(f"Unknown table: {table}")
+        required_columns = self.required_columns.get(table, [])
         
-        # Ensure 10 digits
-        if len(digits) == 10:
-            return f"+1{digits}"
-        elif len(digits) == 11 and digits.startswith('1'):
-            return f"+{digits}"
-        return phone
+        inserted = 0
+        with self.get_bulk_connection() as conn:
+            for batch in self._batched(rows, batch_size or self.bulk_batch_size):
+                # Rows with the same column set share one prepared statement
+                statements = {}
+                for data in batch:
+                    filtered_data = {
+                        k: (int(v) if isinstance(v, bool) else v)
+                        for k, v in data.items() if k in table_schema
+                    }
+                    missing_columns = [col for col in required_columns if col not in filtered_data]
+                    if missing_columns:
+                        raise ValueError(f"Missing required columns: {missing_columns}")
+                    if not filtered_data:
+                        continue
+                    cols = tuple(filtered_data)
+                    statements.setdefault(cols, []).append(tuple(filtered_data.values()))
+                    
+                try:
+                    conn.execute("BEGIN")
+                    for cols, values in statements.items():
+                        placeholders = ', '.join('?' for _ in cols)
+                        conn.executemany(
+                            f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders})",
+                            values
+                        )
+                        inserted += len(values)
+                    conn.execute("COMMIT")
+                except sqlite3.Error as e:
+                    self.logger.error(f"Error bulk inserting into {table}: {e}")
+                    conn.execute("ROLLBACK")
+                    raise
+                    
+        return inserted
         
-    def _clean_url(self, url: str) -> str:
-        """Clean and normalize URL"""
-        url = url.lower().strip()
-        if not url.startswith(('http://', 'https://')):
-            url = f"https://{url}"
-        return url
+    def _bulk_handlers(self, item_type: str) -> Tuple[Callable, str, Callable]:
+        """Cleaner, upsert statement and row builder for an item type"""
+        clean = self.cleaner(item_type)
+        handlers = {
+            'business': (BUSINESS_UPSERT_SQL, self._business_row),
+            'property': (PROPERTY_UPSERT_SQL, self._property_row),
+            'permit': (PERMIT_UPSERT_SQL, self._permit_row)
+        }
+        return (clean, *handlers[item_type])
         
-    def _clean_map_lot(self, map_lot: str) -> str:
-        """Clean map-lot format"""
-        # Remove spaces and normalize format
-        cleaned = re.sub(r'\s+', '', map_lot.upper())
-        # Ensure proper format (e.g., "123-A-45")
-        if match := re.match(r'^(\d+)-([A-Z])-(\d+)$', cleaned):
-            return cleaned
-        return map_lot
+    @staticmethod
+    def _batched(items: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+        """Split an iterable into lists of at most size items"""
+        iterator = iter(items)
+        while batch := list(islice(iterator, size)):
+            yield batch
+            
+    def _business_row(self, cleaned_data: Dict, business_data: Dict) -> Tuple:
+        """Parameters for BUSINESS_UPSERT_SQL"""
+        return (
+            cleaned_data['name'],
+            cleaned_data['normalized_name'],
+            cleaned_data['address'],
+            cleaned_data['normalized_address'],
+            cleaned_data.get('phone'),
+            cleaned_data.get('website'),
+            cleaned_data.get('category'),
+            cleaned_data.get('source'),
+            datetime.now().isoformat(),
+            json.dumps(business_data)
+        )
         
-    def _normalize_permit_status(self, status: str) -> str:
-        """Normalize permit status"""
-        status_map = {
-            'ACTIVE': ['ACTIVE', 'CURRENT', 'VALID'],
-            'PENDING': ['PENDING', 'IN REVIEW', 'SUBMITTED'],
-            'EXPIRED': ['EXPIRED', 'TERMINATED', 'CLOSED'],
-            'APPROVED': ['APPROVED', 'GRANTED', 'ISSUED'],
-            'DENIED': ['DENIED', 'REJECTED', 'REFUSED']
-        }
+    def _property_row(self, cleaned_data: Dict, property_data: Dict) -> Tuple:
+        """Parameters for PROPERTY_UPSERT_SQL"""
+        return (
+            cleaned_data['map_lot'],
+            cleaned_data['address'],
+            cleaned_data['normalized_address'],
+            cleaned_data.get('tax_account'),
+            cleaned_data.get('assessment'),
+            cleaned_data.get('zoning'),
+            datetime.now().isoformat(),
+            json.dumps(property_data)
+        )
         
-        status = status.upper()
-        for normalized, variants in status_map.items():
-            if status in variants:
-                return normalized
-        return status
+    def _permit_row(self, cleaned_data: Dict, permit_data: Dict) -> Tuple:
+        """Parameters for PERMIT_UPSERT_SQL"""
+        return (
+            cleaned_data['permit_number'],
+            cleaned_data['type'],
+            cleaned_data['status'],
+            cleaned_data.get('issue_date'),
+            cleaned_data.get('expiration_date'),
+            cleaned_data.get('property_id'),
+            cleaned_data.get('business_id'),
+            json.dumps(permit_data)
+        )
@@ -0,0 +1,297 @@
+"""
+Parameterized query building and index management for Brunswick data searches
+"""
+import sqlite3
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Columns that the reports and dashboards filter on most often; indexed
+# up front wherever a table has them
+DEFAULT_INDEXED_COLUMNS = ['address', 'neighborhood', 'type', 'map_lot', 'zoning', 'assessment']
+
+
+@dataclass
+class CompiledQuery:
+    """SQL text plus bound parameters for one search"""
+    sql: str
+    params: List[Any]
+    filter_columns: Tuple[str, ...]
+    range_columns: Tuple[str, ...]
+    sort_by: Optional[str]
+
+
+class QueryBuilder:
+    """
+    Compiles search filters into parameterized SQL
+
+    Filters are {field: value} for equality or {field: {op: value}} for
+    operators. 'in' takes a list and 'between' a (low, high) pair. Table and
+    column names are checked against the live schema, and the SQL text for
+    each query shape is cached so repeated searches only rebuild params.
+    """
+
+    OPERATORS = {
+        'eq': '=',
+        'neq': '!=',
+        'gt': '>',
+        'gte': '>=',
+        'lt': '<',
+        'lte': '<=',
+        'like': 'LIKE',
+        'in': 'IN',
+        'between': 'BETWEEN'
+    }
+    RANGE_OPERATORS = {'gt', 'gte', 'lt', 'lte', 'between', 'like'}
+
+    def __init__(self, get_connection):
+        self.get_connection = get_connection
+        self.logger = logging.getLogger(__name__)
+        self._columns: Dict[str, set] = {}
+        self._sql_cache: Dict[tuple, tuple] = {}
+
+    def columns(self, table: str) -> set:
+        """Column names for a table, cached after the first lookup"""
+        if table not in self._columns:
+            with self.get_connection() as conn:
+                rows = conn.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+            if not rows:
+                raise ValueError(f"Unknown table: {table}")
+            self._columns[table] = {row[1] for row in rows}
+        return self._columns[table]
+
+    def invalidate(self, table: Optional[str] = None):
+        """Forget cached schema after a table is altered"""
+        if table is None:
+            self._columns.clear()
+            self._sql_cache.clear()
+        else:
+            self._columns.pop(table, None)
+            self._sql_cache = {k: v for k, v in self._sql_cache.items() if k[0] != table}
+
+    def build(
+        self,
+        table: str,
+        query: Dict[str, Any],
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort_by: Optional[str] = None,
+        sort_order: str = "ASC",
+        after: Optional[Tuple[Any, int]] = None
+    ) -> CompiledQuery:
+        """
+        Compile a search into SQL
+
+        after is a keyset cursor (last sort value, last rowid) from the
+        previous page; when given, OFFSET is not used. The last sort value
+        may be NULL: SQLite sorts NULLs first ascending and last descending,
+        and the seek follows that order.
+        """
+        columns = self.columns(table)
+        sort_order = sort_order.upper()
+        if sort_order not in ("ASC", "DESC"):
+            raise ValueError(f"Unsupported sort order: {sort_order}")
+        if sort_by is not None and sort_by not in columns:
+            raise ValueError(f"Unknown column for {table}: {sort_by}")
+
+        # Normalise filters into (field, op, value) and derive the shape key
+        filters = []
+        for field, value in query.items():
+            if field not in columns:
+                raise ValueError(f"Unknown column for {table}: {field}")
+            if isinstance(value, dict):
+                for op, op_value in value.items():
+                    if op not in self.OPERATORS:
+                        raise ValueError(f"Unsupported operator: {op}")
+                    filters.append((field, op, op_value))
+            else:
+                filters.append((field, 'eq', value))
+
+        shape = (
+            table,
+            tuple(
+                (field, op,
+                 len(value) if op == 'in' else None,
+                 value is None and op in ('eq', 'neq'))
+                for field, op, value in filters
+            ),
+            sort_by, sort_order, limit is not None, after is not None, bool(offset),
+            after is not None and bool(sort_by) and after[0] is None
+        )
+
+        params = []
+        for field, op, value in filters:
+            if op == 'in':
+                params.extend(value)
+            elif op == 'between':
+                low, high = value
+                params.extend([low, high])
+            elif value is None and op in ('eq', 'neq'):
+                continue
+            else:
+                params.append(value)
+
+        if after is not None:
+            last_value, last_rowid = after
+            params.extend([last_value, last_rowid] if sort_by and last_value is not None else [last_rowid])
+        if limit is not None:
+            params.append(limit)
+            if offset and after is None:
+                params.append(offset)
+
+        if shape not in self._sql_cache:
+            self._sql_cache[shape] = self._compile(table, filters, sort_by, sort_order,
+                                                   limit is not None, after is not None,
+                                                   bool(offset), shape[-1])
+        sql = self._sql_cache[shape]
+
+        return CompiledQuery(
+            sql=sql,
+            params=params,
+            filter_columns=tuple(dict.fromkeys(
+                field for field, op, _ in filters if op not in self.RANGE_OPERATORS
+            )),
+            range_columns=tuple(dict.fromkeys(
+                field for field, op, _ in filters if op in self.RANGE_OPERATORS
+            )),
+            sort_by=sort_by
+        )
+
+    def _compile(self, table, filters, sort_by, sort_order, has_limit, has_after, has_offset,
+                 after_null=False) -> str:
+        """Build the SQL text for one query shape"""
+        where_clauses = []
+        for field, op, value in filters:
+            column = _quote(field)
+            if op == 'in':
+                if len(value) == 0:
+                    where_clauses.append("0 = 1")
+                else:
+                    where_clauses.append(f"{column} IN ({', '.join('?' for _ in value)})")
+            elif op == 'between':
+                where_clauses.append(f"{column} BETWEEN ? AND ?")
+            elif value is None and op == 'eq':
+                where_clauses.append(f"{column} IS NULL")
+            elif value is None and op == 'neq':
+                where_clauses.append(f"{column} IS NOT NULL")
+            else:
+                where_clauses.append(f"{column} {self.OPERATORS[op]} ?")
+
+        if has_after:
+            comparison = '>' if sort_order == 'ASC' else '<'
+            if sort_by:
+                column = _quote(sort_by)
+                # NULLs sort first ascending, last descending
+                if after_null and sort_order == 'ASC':
+                    seek = f"({column} IS NULL AND rowid > ?) OR {column} IS NOT NULL"
+                elif after_null:
+                    seek = f"{column} IS NULL AND rowid < ?"
+                elif sort_order == 'ASC':
+                    seek = f"({column}, rowid) > (?, ?)"
+                else:
+                    seek = f"({column}, rowid) < (?, ?) OR {column} IS NULL"
+                where_clauses.append(f"({seek})")
+            else:
+                where_clauses.append(f"rowid {comparison} ?")
+
+        sql = f"SELECT *, rowid AS _rowid FROM {_quote(table)}"
+        if where_clauses:
+            sql += " WHERE " + " AND ".join(where_clauses)
+
+        # rowid breaks ties so keyset pages are stable
+        if sort_by:
+            sql += f" ORDER BY {_quote(sort_by)} {sort_order}, rowid {sort_order}"
+        elif has_after or has_limit:
+            sql += f" ORDER BY rowid {sort_order}"
+
+        if has_limit:
+            sql += " LIMIT ?"
+            if has_offset and not has_after:
+                sql += " OFFSET ?"
+        return sql
+
+
+class IndexManager:
+    """
+    Creates secondary indexes from observed query patterns
+
+    Each search reports its equality, range and sort columns. Once a
+    pattern has been seen min_observations times, a composite index is
+    created with equality columns first, then the first range column, then
+    the sort column, which is the order SQLite can use them in.
+    """
+
+    def __init__(self, get_connection, columns, min_observations: int = 3,
+                 max_indexes_per_table: int = 12):
+        self.get_connection = get_connection
+        self.columns = columns
+        self.min_observations = min_observations
+        self.max_indexes_per_table = max_indexes_per_table
+        self.logger = logging.getLogger(__name__)
+        self.patterns: Counter = Counter()
+        self._indexes: Dict[str, set] = {}
+
+    def existing_indexes(self, table: str) -> set:
+        """Column tuples already covered by an index on the table"""
+        if table not in self._indexes:
+            indexes = set()
+            with self.get_connection() as conn:
+                for index in conn.execute(f"PRAGMA index_list({_quote(table)})").fetchall():
+                    info = conn.execute(f"PRAGMA index_info({_quote(index[1])})").fetchall()
+                    indexes.add(tuple(row[2] for row in sorted(info, key=lambda r: r[0])))
+            self._indexes[table] = indexes
+        return self._indexes[table]
+
+    def ensure_default_indexes(self, tables: List[str]):
+        """Index the commonly filtered columns that each table has"""
+        for table in tables:
+            columns = self.columns(table)
+            for column in DEFAULT_INDEXED_COLUMNS:
+                if column in columns:
+                    self.create_index(table, (column,))
+
+    def observe(self, table: str, compiled: CompiledQuery) -> Optional[Tuple[str, ...]]:
+        """Record a query pattern and index it once it recurs"""
+        index_columns = list(compiled.filter_columns)
+        if compiled.range_columns:
+            index_columns.append(compiled.range_columns[0])
+        if compiled.sort_by and compiled.sort_by not in index_columns:
+            index_columns.append(compiled.sort_by)
+        if not index_columns:
+            return None
+
+        pattern = (table, tuple(index_columns))
+        self.patterns[pattern] += 1
+        if self.patterns[pattern] == self.min_observations:
+            return self.create_index(table, tuple(index_columns))
+        return None
+
+    def create_index(self, table: str, columns: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+        """Create an index unless an existing one already leads with these columns"""
+        existing = self.existing_indexes(table)
+        if any(index[:len(columns)] == columns for index in existing):
+            return None
+        if len(existing) >= self.max_indexes_per_table:
+            self.logger.warning(f"Index limit reached for {table}, not indexing {columns}")
+            return None
+
+        name = f"idx_{table}_{'_'.join(columns)}"
+        column_sql = ', '.join(_quote(column) for column in columns)
+        try:
+            with self.get_connection() as conn:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote(name)} ON {_quote(table)} ({column_sql})")
+                conn.execute(f"ANALYZE {_quote(table)}")
+                conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error creating index {name}: {e}")
+            return None
+
+        existing.add(columns)
+        self.logger.info(f"Created index {name}")
+        return columns
+
+
+def _quote(identifier: str) -> str:
+    """Quote an SQL identifier"""
+    return '"' + identifier.replace('"', '""') + '"'
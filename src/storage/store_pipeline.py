@@ -0,0 +1,202 @@
+"""
+Producer/consumer pipeline for loading cleaned records into BrunswickDataStore
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+from .brunswick_data_store import BrunswickDataStore, BrunswickRecordCleaner, CleaningResult
+
+# Cleaner used by cleaning worker processes, created once per process; it
+# never opens the database the writer is loading
+_worker_cleaner: Optional[BrunswickRecordCleaner] = None
+
+
+def _init_clean_worker():
+    """Process pool initializer: build the cleaner once per worker"""
+    global _worker_cleaner
+    _worker_cleaner = BrunswickRecordCleaner()
+
+
+def _clean_items(item_type: str, items: List[Dict]) -> List[CleaningResult]:
+    """Run the store's cleaning (address parsing etc.) for a batch of items"""
+    clean = _worker_cleaner.cleaner(item_type)
+    return [clean(item) for item in items]
+
+
+@dataclass
+class StageStats:
+    """Throughput counters for one pipeline stage"""
+    items: int = 0
+    batches: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    def record(self, items: int, busy_seconds: float = 0.0):
+        now = time.perf_counter()
+        if self.started is None:
+            self.started = now
+        self.finished = now
+        self.items += items
+        self.batches += 1
+        self.busy_seconds += busy_seconds
+
+    @property
+    def items_per_second(self) -> float:
+        if self.started is None or self.finished is None or self.finished <= self.started:
+            return 0.0
+        return self.items / (self.finished - self.started)
+
+
+@dataclass
+class PipelineStats:
+    """Per-stage counters for a StorePipeline run"""
+    read: StageStats = field(default_factory=StageStats)
+    clean: StageStats = field(default_factory=StageStats)
+    write: StageStats = field(default_factory=StageStats)
+    elapsed: float = 0.0
+
+    def summary(self) -> Dict:
+        return {
+            stage: {
+                'items': stats.items,
+                'batches': stats.batches,
+                'errors': stats.errors,
+                'busy_seconds': round(stats.busy_seconds, 3),
+                'items_per_second': round(stats.items_per_second, 1)
+            }
+            for stage, stats in (('read', self.read), ('clean', self.clean), ('write', self.write))
+        }
+
+
+class StorePipeline:
+    """
+    Read -> clean -> write pipeline for one item type
+
+    Cleaning runs in a process pool; a single writer thread owns one bulk
+    connection and commits write_batch_size rows per transaction. Both
+    queues are bounded by queue_depth, so a slow writer stalls cleaning and
+    slow cleaning stalls reading instead of buffering the whole input.
+    """
+
+    def __init__(
+        self,
+        store: BrunswickDataStore,
+        item_type: str,
+        clean_workers: int = 4,
+        clean_batch_size: int = 100,
+        write_batch_size: int = 5000,
+        queue_depth: int = 8
+    ):
+        # Fail fast on unknown item types
+        store._bulk_handlers(item_type)
+
+        self.store = store
+        self.item_type = item_type
+        self.clean_workers = clean_workers
+        self.clean_batch_size = clean_batch_size
+        self.write_batch_size = write_batch_size
+        self.queue_depth = queue_depth
+        self.stats = PipelineStats()
+        self.logger = logging.getLogger(__name__)
+        self._conn = None
+        self._conn_context = None
+
+    async def run(self, items: Iterable[Dict]) -> List[CleaningResult]:
+        """Load all items, returning the cleaning results that were written"""
+        start = time.perf_counter()
+        clean_queue = asyncio.Queue(maxsize=self.queue_depth)
+        write_queue = asyncio.Queue(maxsize=self.queue_depth)
+
+        with ProcessPoolExecutor(
+            max_workers=self.clean_workers,
+            initializer=_init_clean_worker
+        ) as pool, ThreadPoolExecutor(max_workers=1) as writer:
+            stages = [
+                asyncio.create_task(self._read(items, pool, clean_queue)),
+                asyncio.create_task(self._collect(clean_queue, write_queue)),
+                asyncio.create_task(self._write(write_queue, writer))
+            ]
+            try:
+                _, _, results = await asyncio.gather(*stages)
+            finally:
+                for stage in stages:
+                    stage.cancel()
+                await asyncio.get_running_loop().run_in_executor(writer, self._close_connection)
+
+        self.stats.elapsed = time.perf_counter() - start
+        self.logger.info(f"Stored {self.item_type} records: {self.stats.summary()}")
+        return results
+
+    async def _read(self, items: Iterable[Dict], pool: ProcessPoolExecutor,
+                    clean_queue: asyncio.Queue):
+        """Submit cleaning batches in input order; blocks when the queue is full"""
+        loop = asyncio.get_running_loop()
+        iterator = iter(items)
+        try:
+            while batch := list(islice(iterator, self.clean_batch_size)):
+                future = loop.run_in_executor(pool, _clean_items, self.item_type, batch)
+                await clean_queue.put((future, len(batch)))
+                self.stats.read.record(len(batch))
+        finally:
+            await clean_queue.put(None)
+
+    async def _collect(self, clean_queue: asyncio.Queue, write_queue: asyncio.Queue):
+        """Gather cleaned batches into write-sized transactions"""
+        buffer = []
+        try:
+            while (entry := await clean_queue.get()) is not None:
+                future, size = entry
+                start = time.perf_counter()
+                try:
+                    buffer.extend(await future)
+                    self.stats.clean.record(size, time.perf_counter() - start)
+                except Exception as e:
+                    self.stats.clean.errors += size
+                    self.logger.error(f"Error cleaning {size} {self.item_type} records: {e}")
+                    continue
+
+                if len(buffer) >= self.write_batch_size:
+                    await write_queue.put(buffer)
+                    buffer = []
+
+            if buffer:
+                await write_queue.put(buffer)
+        finally:
+            await write_queue.put(None)
+
+    async def _write(self, write_queue: asyncio.Queue,
+                     writer: ThreadPoolExecutor) -> List[CleaningResult]:
+        """Single writer: one transaction per write batch"""
+        loop = asyncio.get_running_loop()
+        written = []
+        while (batch := await write_queue.get()) is not None:
+            start = time.perf_counter()
+            try:
+                stored = await loop.run_in_executor(writer, self._write_batch, batch)
+                written.extend(stored)
+                self.stats.write.record(len(stored), time.perf_counter() - start)
+                self.stats.write.errors += len(batch) - len(stored)
+            except Exception as e:
+                self.stats.write.errors += len(batch)
+                self.logger.error(f"Error writing {len(batch)} {self.item_type} records: {e}")
+        return written
+
+    def _write_batch(self, batch: List[CleaningResult]) -> List[CleaningResult]:
+        """Runs on the writer thread, which owns the bulk connection"""
+        if self._conn is None:
+            self._conn_context = self.store.get_bulk_connection()
+            self._conn = self._conn_context.__enter__()
+        return self.store.write_batch(self._conn, self.item_type, batch)
+
+    def _close_connection(self):
+        if self._conn_context is not None:
+            self._conn_context.__exit__(None, None, None)
+            self._conn = None
+            self._conn_context = None
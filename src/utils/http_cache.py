@@ -0,0 +1,402 @@
+"""
+Shared on-disk HTTP cache with conditional revalidation for requests and aiohttp
+"""
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / 'data' / 'cache' / 'http'
+
+# Describe the transfer rather than the stored body
+TRANSFER_HEADERS = ('content-length', 'content-encoding', 'transfer-encoding')
+
+@dataclass
+class CacheEntry:
+    """Stored response metadata; the body lives in the content store under body_hash"""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body_hash: str
+    size: int
+    stored_at: float
+    expires_at: Optional[float] = None
+    no_cache: bool = False
+    vary: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    @property
+    def etag(self) -> Optional[str]:
+        return _header(self.headers, 'ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return _header(self.headers, 'Last-Modified')
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Servable without contacting the server"""
+        if self.no_cache or self.expires_at is None:
+            return False
+        return (now or time.time()) < self.expires_at
+
+@dataclass
+class HTTPResult:
+    """A response body and headers, fetched or served from the cache"""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    from_cache: bool = False
+
+    @property
+    def charset(self) -> Optional[str]:
+        """charset from Content-Type, if the server sent one"""
+        match = re.search(r'charset=["\']?([\w.:-]+)', _header(self.headers, 'Content-Type') or '', re.IGNORECASE)
+        return match.group(1) if match else None
+
+    def text(self, encoding: Optional[str] = None) -> str:
+        return self.body.decode(encoding or self.charset or 'utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+class HTTPCache:
+    """
+    Conditional-request cache shared by the collectors and scrapers
+
+    Successful GET responses are kept on disk: bodies in a content-addressed
+    store (bodies/<sha256[:2]>/<sha256>, so identical documents at several
+    URLs are stored once) and headers in an SQLite index keyed by URL.
+
+    Cache-Control is honored the way a private cache would: no-store
+    responses are never stored, max-age (less Age) or Expires
+    make a response servable without a request until it goes stale, and
+    no-cache or a stale entry is revalidated with If-None-Match /
+    If-Modified-Since. A 304 reply serves the stored body. Responses with
+    neither a freshness lifetime nor a validator are not worth keeping and
+    are skipped.
+
+    stats() reports fresh hits, revalidations, misses and the bytes that
+    didn't have to be transferred. Use CachedSession for requests and
+    HTTPCache.get for aiohttp sessions.
+    """
+
+    # Connection settings: WAL lets several collector processes share the index
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL"
+    )
+
+    _shared: Dict[str, 'HTTPCache'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.body_dir = self.cache_dir / 'bodies'
+        self.body_dir.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stored = 0
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(
+            str(self.cache_dir / 'index.db'), isolation_level=None, check_same_thread=False
+        )
+        for pragma in self.PRAGMAS:
+            self.conn.execute(pragma)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                entry TEXT NOT NULL
+            )
+        """)
+
+    @classmethod
+    def shared(cls, cache_dir: Optional[str] = None) -> 'HTTPCache':
+        """Process-wide cache instance for cache_dir"""
+        key = str(Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(key)
+            return cls._shared[key]
+
+    def lookup(self, url: str, request_headers: Optional[Dict[str, str]] = None) -> Optional[CacheEntry]:
+        """Stored entry for url, unless its Vary'd request headers differ"""
+        with self._lock:
+            row = self.conn.execute("SELECT entry FROM http_cache WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(**json.loads(row[0]))
+        for name, value in entry.vary.items():
+            if _header(request_headers or {}, name) != value:
+                return None
+        if not self._body_path(entry.body_hash).exists():
+            return None
+        return entry
+
+    def conditional_headers(self, entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for revalidating entry"""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        elif not entry.etag:
+            headers['If-Modified-Since'] = formatdate(entry.stored_at, usegmt=True)
+        return headers
+
+    def read_body(self, entry: CacheEntry) -> bytes:
+        return self._body_path(entry.body_hash).read_bytes()
+
+    def hit(self, entry: CacheEntry) -> bytes:
+        """Body of a fresh entry, counted as a hit"""
+        self.hits += 1
+        self.bytes_saved += entry.size
+        return self.read_body(entry)
+
+    def not_modified(self, entry: CacheEntry, headers: Dict[str, str]) -> bytes:
+        """Record a 304 for entry: merge the new headers and renew its lifetime"""
+        merged = dict(entry.headers)
+        merged.update({
+            name: value for name, value in headers.items()
+            if name.lower() not in TRANSFER_HEADERS
+        })
+        entry.headers = merged
+        entry.stored_at = time.time()
+        entry.expires_at, entry.no_cache, store = _freshness(merged, entry.stored_at)
+        if store:
+            self._write_entry(entry)
+        self.revalidated += 1
+        self.bytes_saved += entry.size
+        return self.read_body(entry)
+
+    def store(self,
+              url: str,
+              status: int,
+              headers: Dict[str, str],
+              body: bytes,
+              request_headers: Optional[Dict[str, str]] = None) -> bool:
+        """Record a downloaded response; False if it isn't cacheable"""
+        self.misses += 1
+        self.bytes_downloaded += len(body)
+        if status != 200:
+            return False
+        headers = {
+            name: value for name, value in headers.items()
+            if name.lower() not in TRANSFER_HEADERS
+        }
+        now = time.time()
+        expires_at, no_cache, store = _freshness(headers, now)
+        has_validator = _header(headers, 'ETag') or _header(headers, 'Last-Modified')
+        vary = [name.strip() for name in (_header(headers, 'Vary') or '').split(',') if name.strip()]
+        if not store or '*' in vary or (expires_at is None and not has_validator):
+            return False
+
+        body_hash = hashlib.sha256(body).hexdigest()
+        self._write_body(body_hash, body)
+        self._write_entry(CacheEntry(
+            url=url,
+            status=status,
+            headers=headers,
+            body_hash=body_hash,
+            size=len(body),
+            stored_at=now,
+            expires_at=expires_at,
+            no_cache=no_cache,
+            vary={name: _header(request_headers or {}, name) for name in vary}
+        ))
+        self.stored += 1
+        return True
+
+    async def get(self, session, url: str, **kwargs) -> HTTPResult:
+        """
+        GET url through an aiohttp ClientSession, served or revalidated from the cache
+
+        Keyword arguments go to session.get; params are folded into the URL
+        so they are part of the cache key.
+        """
+        params = kwargs.pop('params', None)
+        if params:
+            url = requests.Request('GET', url, params=params).prepare().url
+        headers = dict(kwargs.pop('headers', None) or {})
+        entry = self.lookup(url, headers)
+        if entry is not None and entry.is_fresh():
+            return HTTPResult(url, entry.status, entry.headers, self.hit(entry), from_cache=True)
+
+        headers.update(self.conditional_headers(entry))
+        async with session.get(url, headers=headers, **kwargs) as response:
+            body = await response.read()
+            response_headers = dict(response.headers)
+            if response.status == 304 and entry is not None:
+                body = self.not_modified(entry, response_headers)
+                return HTTPResult(url, entry.status, entry.headers, body, from_cache=True)
+            self.store(url, response.status, response_headers, body, headers)
+            return HTTPResult(url, response.status, response_headers, body)
+
+    def fresh(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[HTTPResult]:
+        """The cached response for url if it can be served without a request"""
+        entry = self.lookup(url, headers)
+        if entry is None or not entry.is_fresh():
+            return None
+        return HTTPResult(url, entry.status, entry.headers, self.hit(entry), from_cache=True)
+
+    def stats(self) -> Dict:
+        requests_made = self.revalidated + self.misses
+        served = self.hits + self.revalidated
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0]
+        return {
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'stored': self.stored,
+            'hit_rate': served / (served + self.misses) if served + self.misses else 0.0,
+            'requests': requests_made,
+            'bytes_saved': self.bytes_saved,
+            'bytes_downloaded': self.bytes_downloaded,
+            'entries': entries
+        }
+
+    def prune(self) -> int:
+        """Delete stored bodies no entry refers to; returns the number removed"""
+        with self._lock:
+            referenced = {
+                json.loads(entry)['body_hash']
+                for (entry,) in self.conn.execute("SELECT entry FROM http_cache")
+            }
+        removed = 0
+        for path in self.body_dir.glob('*/*'):
+            if path.name not in referenced:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM http_cache")
+        self.prune()
+
+    def _body_path(self, body_hash: str) -> Path:
+        return self.body_dir / body_hash[:2] / body_hash
+
+    def _write_body(self, body_hash: str, body: bytes):
+        """Store body once; written to a temp file and renamed so readers never see it partial"""
+        path = self._body_path(body_hash)
+        if path.exists():
+            return
+        path.parent.mkdir(exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(body)
+        os.replace(temp_path, path)
+
+    def _write_entry(self, entry: CacheEntry):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, entry) VALUES (?, ?)",
+                (entry.url, json.dumps(entry.__dict__))
+            )
+
+class CachedSession(requests.Session):
+    """
+    requests.Session whose GETs go through an HTTPCache
+
+    Fresh entries are answered without a request and stale ones are
+    revalidated; either way the response is a normal requests.Response
+    with from_cache set. Other methods and streamed GETs bypass the cache.
+    """
+
+    def __init__(self, cache: Optional[HTTPCache] = None):
+        super().__init__()
+        self.cache = cache or HTTPCache.shared()
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != 'GET' or kwargs.get('stream') or args:
+            return super().request(method, url, *args, **kwargs)
+
+        prepared_url = requests.Request('GET', url, params=kwargs.get('params')).prepare().url
+        request_headers = {**self.headers, **(kwargs.get('headers') or {})}
+        entry = self.cache.lookup(prepared_url, request_headers)
+        if entry is not None and entry.is_fresh():
+            return self._cached_response(prepared_url, entry, self.cache.hit(entry))
+
+        kwargs['headers'] = {**(kwargs.get('headers') or {}), **self.cache.conditional_headers(entry)}
+        response = super().request(method, url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            body = self.cache.not_modified(entry, dict(response.headers))
+            return self._cached_response(prepared_url, entry, body)
+
+        self.cache.store(prepared_url, response.status_code, dict(response.headers),
+                         response.content, request_headers)
+        response.from_cache = False
+        return response
+
+    @staticmethod
+    def _cached_response(url: str, entry: CacheEntry, body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry.status
+        response.reason = 'OK'
+        response.url = url
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response.from_cache = True
+        return response
+
+def _header(headers: Dict[str, str], name: str) -> Optional[str]:
+    """Case-insensitive header lookup"""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+def _freshness(headers: Dict[str, str], now: float):
+    """(expires_at, no_cache, storable) from Cache-Control, Age and Expires"""
+    directives = {}
+    for part in (_header(headers, 'Cache-Control') or '').split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip('"')
+
+    if 'no-store' in directives:
+        return None, True, False
+    no_cache = 'no-cache' in directives
+
+    max_age = _int(directives.get('max-age'))
+    if max_age is not None:
+        return now + max_age - (_int(_header(headers, 'Age')) or 0), no_cache, True
+
+    expires = _header(headers, 'Expires')
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp(), no_cache, True
+        except (TypeError, ValueError):
+            # An invalid Expires means already expired
+            return now, no_cache, True
+    return None, no_cache, True
+
+def _int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -94,13 +94,14 @@ async def get_suggestions(property_id: int):
 @app.get("/api/map/properties")
 async def get_map_properties(
     bounds: str = Query(..., description="Map bounds: lat1,lng1,lat2,lng2"),
+    zoom: Optional[int] = Query(None, description="Map zoom level, used for clustering"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum pins or clusters returned"),
     filters: Optional[str] = Query(None, description="JSON encoded filters")
 ):
-    """Get properties within map bounds"""
+    """Get properties (or clusters of them) within map bounds"""
     try:
         lat1, lng1, lat2, lng2 = map(float, bounds.split(","))
-        properties = finder.find_in_bounds(lat1, lng1, lat2, lng2)
-        return {"properties": properties}
+        return finder.find_in_bounds(lat1, lng1, lat2, lng2, zoom=zoom, limit=limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
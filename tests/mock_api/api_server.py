@@ -1,7 +1,7 @@
 """
 Mock API server for testing
 """
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, make_response, request
 import time
 from typing import Dict, List
 import random
@@ -26,6 +26,21 @@ RATE_LIMITS = {
     'utility_api': {'calls': 0, 'reset_time': time.time(), 'limit': 20}
 }
 
+# Crawlable mock town site: page n links to pages n * fanout + 1 .. n * fanout + fanout
+SITE_CONFIG = {
+    'pages': 500,
+    'fanout': 8,
+    'slow_fraction': 0.02,
+    'slow_seconds': 1.0,
+    'parcels': 20
+}
+
+# Mock Craigslist real estate search: listing pages and their detail pages
+CRAIGSLIST_CONFIG = {
+    'listings': 300,
+    'per_page': 120
+}
+
 def require_api_key(api_name: str):
     """
     Decorator to check API key
@@ -92,6 +107,16 @@ def simulate_latency():
     """
     time.sleep(random.uniform(0.1, 0.5))
 
+def simulate_page_latency(page_id: int):
+    """
+    Simulate page load time; a fixed few pages are very slow
+    """
+    rng = random.Random(page_id)
+    if rng.random() < SITE_CONFIG['slow_fraction']:
+        time.sleep(SITE_CONFIG['slow_seconds'])
+    else:
+        time.sleep(rng.uniform(0.01, 0.05))
+
 def simulate_error(probability: float = 0.1) -> bool:
     """
     Randomly simulate API errors
@@ -253,6 +278,79 @@ def get_utilities():
         }
     })
 
+@app.route('/site/page/<int:page_id>', methods=['GET'])
+def get_site_page(page_id: int):
+    """
+    Mock municipal site page for crawler tests and benchmarks
+    """
+    if page_id >= SITE_CONFIG['pages']:
+        return 'Not found', 404
+    simulate_page_latency(page_id)
+
+    fanout = SITE_CONFIG['fanout']
+    children = range(page_id * fanout + 1, min(page_id * fanout + fanout + 1, SITE_CONFIG['pages']))
+    section = ['assessing', 'parcels', 'permits', 'news'][page_id % 4]
+    parcels = ''.join(
+        f'<div class="parcel"><span class="id">{page_id:03d}-{i:04d}</span>'
+        f'<span class="owner">Owner {i}</span><input type="checkbox" name="p{i}"></div>'
+        for i in range(SITE_CONFIG['parcels'])
+    )
+    links = ''.join(
+        f'<li><a href="/site/page/{child}">{section} {child}</a></li>' for child in children
+    )
+    html = f"""<html>
+<head><title>Town page {page_id}</title></head>
+<body>
+<h1>{section.title()} {page_id}</h1>
+<p>{' '.join(['Town of Brunswick property records and services.'] * 20)}</p>
+<div class="parcels">{parcels}</div>
+<ul>{links}</ul>
+<a href="/site/page/0">Home</a> <a href="/site/page/{max(page_id - 1, 0)}#top">Previous</a>
+</body>
+</html>"""
+    # Pages change rarely: revalidate every time, 304 when the ETag matches
+    response = make_response(html)
+    response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@app.route('/cl/search/rea', methods=['GET'])
+@app.route('/cl/search/<area>/rea', methods=['GET'])
+def get_craigslist_results(area: str = 'maine'):
+    """
+    Mock Craigslist search results page (offset by the s parameter)
+    """
+    time.sleep(random.uniform(0.05, 0.1))
+    offset = int(request.args.get('s', 0))
+    stop = min(offset + CRAIGSLIST_CONFIG['per_page'], CRAIGSLIST_CONFIG['listings'])
+    rows = ''.join(
+        f'<li class="result-row" data-pid="{7000000 + i}">'
+        f'<time class="result-date" datetime="2026-01-{i % 28 + 1:02d}T09:00:00"></time>'
+        f'<a class="result-title" href="{request.host_url}cl/listing/{7000000 + i}.html">'
+        f'FSBO {i % 5 + 2} bed home {"- must sell" if i % 7 == 0 else ""}</a>'
+        f'<span class="result-price">${150 + i % 400},000</span>'
+        f'<span class="result-hood">({["Brunswick", "Topsham", "Bath"][i % 3]})</span></li>'
+        for i in range(offset, stop)
+    )
+    return f'<html><body><ul class="rows">{rows}</ul></body></html>'
+
+@app.route('/cl/listing/<int:pid>.html', methods=['GET'])
+def get_craigslist_listing(pid: int):
+    """
+    Mock Craigslist listing detail page
+    """
+    rng = random.Random(pid)
+    time.sleep(rng.uniform(0.05, 0.2))
+    i = pid - 7000000
+    return f"""<html><body>
+<section id="postingbody">{i + 10} Maine Street, Brunswick, ME 04011. For sale by owner,
+{rng.randrange(1, 4)} acres, built in {1900 + i % 120}. {'Motivated seller, priced to sell.' if i % 4 == 0 else ''}</section>
+<p class="attrgroup"><span>{i % 5 + 2}BR / {i % 3 + 1}Ba</span><span>sqft: {1000 + 10 * i}</span></p>
+<div id="thumbs">{''.join(f'<a href="https://images.example.com/{pid}/{n}.jpg"></a>' for n in range(i % 12))}</div>
+<div id="map" data-latitude="43.91" data-longitude="-69.96"></div>
+<div class="reply_options">Call 207-555-{i % 10000:04d}</div>
+</body></html>"""
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """
@@ -0,0 +1,129 @@
+"""
+Tests for the crawl frontier and SmartCrawler scheduling
+"""
+import time
+import pickle
+import asyncio
+import tempfile
+import threading
+import unittest
+
+from werkzeug.serving import make_server
+
+from dataclasses import fields
+
+from src.collectors.crawl_frontier import CrawlFrontier, HostPoliteness, TokenBucket
+from src.collectors.page_parser import parse_page
+from src.collectors.smart_crawler import PageFeatures, SmartCrawler
+from tests.mock_api.api_server import app, SITE_CONFIG
+
+class TestCrawlFrontier(unittest.TestCase):
+    def test_priority_order_and_dedupe(self):
+        async def drain():
+            frontier = CrawlFrontier(max_depth=3, priority=lambda url, depth: depth - ('tax' in url))
+            self.assertTrue(frontier.push('http://town.gov/news', 1))
+            self.assertTrue(frontier.push('http://town.gov/', 0))
+            self.assertTrue(frontier.push('http://town.gov/tax', 2))
+            self.assertTrue(frontier.push('http://town.gov/about', 1))
+            self.assertFalse(frontier.push('http://town.gov/news#latest', 2))
+            self.assertFalse(frontier.push('http://town.gov/deep', 3))
+            return [(await frontier.get())[1] for _ in range(len(frontier))]
+
+        self.assertEqual(asyncio.run(drain()), [
+            'http://town.gov/', 'http://town.gov/news', 'http://town.gov/tax', 'http://town.gov/about'
+        ])
+
+    def test_host_rate_limit(self):
+        async def requests(count):
+            politeness = HostPoliteness(concurrency=2, rate=20, burst=1)
+            start = time.monotonic()
+            for _ in range(count):
+                async with politeness.slot('town.gov'):
+                    pass
+            return time.monotonic() - start
+
+        # First request is free, the rest wait 1/20s each
+        self.assertGreaterEqual(asyncio.run(requests(6)), 0.2)
+        bucket = TokenBucket(rate=0)
+        asyncio.run(bucket.acquire())
+
+class TestPageParser(unittest.TestCase):
+    def test_parse_page_plain_data(self):
+        body = b'''<html><head><title>Assessor</title></head><body>
+            <form action="/search" role="search"><input type="search" name="q" required></form>
+            <script>fetch('api/parcels/list')</script>
+            <a href="/records.csv">Download</a> <a href="page/2#top">Next</a>
+            <a href="http://elsewhere.com/">Out</a> <a href="mailto:clerk@town.gov">Mail</a>
+            <img src="/map.png"></body></html>'''
+        parsed = parse_page('http://town.gov/assessor/', body, 'http://town.gov')
+
+        self.assertEqual(pickle.loads(pickle.dumps(parsed)), parsed)
+        self.assertLessEqual(set(parsed['features']), {f.name for f in fields(PageFeatures)})
+        self.assertEqual(parsed['title'], 'Assessor')
+        self.assertEqual(parsed['content_type'], 'form')
+        self.assertTrue(parsed['features']['has_search'])
+        self.assertTrue(parsed['features']['has_downloads'])
+        self.assertEqual(parsed['extracted_data']['api_endpoints'], ['api/parcels/list'])
+        self.assertEqual(parsed['extracted_data']['forms'][0]['fields'][0]['required'], True)
+        self.assertEqual(parsed['related_pages'], [
+            'http://town.gov/records.csv', 'http://town.gov/assessor/page/2#top'
+        ])
+        self.assertEqual(parsed['image_urls'], ['http://town.gov/map.png'])
+
+class TestSmartCrawler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.site_config = dict(SITE_CONFIG)
+        SITE_CONFIG.update({'pages': 60, 'fanout': 4, 'slow_fraction': 0.0})
+        cls.server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.start_url = f"http://127.0.0.1:{cls.server.server_port}/site/page/0"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        SITE_CONFIG.update(cls.site_config)
+
+    def crawl(self, **config):
+        async def run():
+            config.setdefault('http_cache_dir', tempfile.mkdtemp())
+            async with SmartCrawler({'cache_dir': tempfile.mkdtemp(), **config}) as crawler:
+                pages = await crawler.crawl(self.start_url)
+            return crawler, pages
+        return asyncio.run(run())
+
+    def test_crawl_bounded_concurrency(self):
+        crawler, pages = self.crawl(concurrency=8, per_host_concurrency=3, per_host_rate=0)
+        self.assertEqual(len(pages), 60)
+        self.assertIn(self.start_url, pages)
+        self.assertLessEqual(crawler.stats.peak_in_flight, 3)
+        summary = crawler.stats.summary()
+        self.assertEqual(summary['pages'], 60)
+        self.assertEqual(summary['statuses'], {200: 60})
+        self.assertGreater(crawler.graph.number_of_edges(), 0)
+
+    def test_parse_pool_matches_inline(self):
+        outlines = []
+        for workers in (0, 2):
+            crawler, pages = self.crawl(parse_workers=workers, per_host_rate=0)
+            outlines.append({url: (page.title, page.related_pages) for url, page in pages.items()})
+            self.assertGreaterEqual(crawler.stats.summary()['loop_blocked_seconds'], 0)
+        self.assertEqual(outlines[0], outlines[1])
+
+    def test_recrawl_revalidates(self):
+        http_cache_dir = tempfile.mkdtemp()
+        _, first = self.crawl(http_cache_dir=http_cache_dir, per_host_rate=0)
+        crawler, second = self.crawl(http_cache_dir=http_cache_dir, per_host_rate=0)
+        self.assertEqual(set(second), set(first))
+        self.assertGreaterEqual(crawler.http_cache.stats()['revalidated'], 60)
+        self.assertEqual(crawler.stats.bytes, 0)
+
+    def test_crawl_limits(self):
+        _, pages = self.crawl(max_pages=10, per_host_rate=0)
+        self.assertEqual(len(pages), 10)
+        # Depth 0 is the home page, depth 1 its four children
+        _, pages = self.crawl(max_depth=2, per_host_rate=0)
+        self.assertEqual(len(pages), 5)
+
+if __name__ == '__main__':
+    unittest.main()
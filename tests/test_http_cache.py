@@ -0,0 +1,80 @@
+"""
+Tests for the shared HTTP conditional-request cache
+"""
+import asyncio
+import tempfile
+import threading
+import unittest
+
+import aiohttp
+from werkzeug.serving import make_server
+
+from src.utils.http_cache import CachedSession, HTTPCache
+from tests.mock_api.api_server import app
+
+class TestHTTPCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        self.cache = HTTPCache(tempfile.mkdtemp())
+
+    def test_requests_revalidation(self):
+        session = CachedSession(self.cache)
+        url = f"{self.base_url}/site/page/3"
+        first = session.get(url)
+        second = session.get(url)
+
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.text, first.text)
+        stats = self.cache.stats()
+        self.assertEqual((stats['misses'], stats['revalidated'], stats['hits']), (1, 1, 0))
+        self.assertEqual(stats['bytes_saved'], len(first.content))
+
+    def test_aiohttp_revalidation(self):
+        async def fetch_twice():
+            async with aiohttp.ClientSession() as session:
+                url = f"{self.base_url}/site/page/4"
+                return [await self.cache.get(session, url) for _ in range(2)]
+
+        first, second = asyncio.run(fetch_twice())
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.body, first.body)
+        self.assertIn('Town page 4', second.text())
+        self.assertEqual(self.cache.stats()['revalidated'], 1)
+
+    def test_cache_control(self):
+        url = 'http://town.gov/records.csv'
+        self.assertTrue(self.cache.store(url, 200, {'Cache-Control': 'max-age=600'}, b'a,b\n1,2\n'))
+        entry = self.cache.lookup(url)
+        self.assertTrue(entry.is_fresh())
+        self.assertEqual(self.cache.hit(entry), b'a,b\n1,2\n')
+
+        # Aged past max-age: stale, revalidated with the stored validators
+        self.cache.store(url, 200, {'Cache-Control': 'max-age=600', 'Age': '900', 'ETag': '"v2"'}, b'x')
+        entry = self.cache.lookup(url)
+        self.assertFalse(entry.is_fresh())
+        self.assertEqual(self.cache.conditional_headers(entry), {'If-None-Match': '"v2"'})
+
+        self.assertFalse(self.cache.store('http://town.gov/private', 200, {'Cache-Control': 'no-store'}, b'x'))
+        self.assertFalse(self.cache.store('http://town.gov/plain', 200, {}, b'x'))
+        self.assertIsNone(self.cache.lookup('http://town.gov/private'))
+
+        # Identical bodies are stored once
+        self.cache.store('http://town.gov/copy.csv', 200, {'ETag': '"a"'}, b'x')
+        self.assertEqual(len(list(self.cache.body_dir.glob('*/*'))), 2)
+        # The first records.csv body is no longer referenced
+        self.assertEqual(self.cache.prune(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
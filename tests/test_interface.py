@@ -0,0 +1,228 @@
+"""
+Tests for the property finder search index
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.models import property_models
+from src.models.property_models import Property, Owner
+from src.interface.search_index import PropertySearchIndex
+from src.interface.spatial_index import PropertySpatialIndex
+
+def create_tables(engine):
+    property_models.Base.metadata.create_all(engine, tables=[
+        model.__table__ for model in (
+            Owner, Property, property_models.Transaction, property_models.Permit,
+            property_models.Violation, property_models.PropertyScore,
+            property_models.UtilityRecord
+        )
+    ])
+
+class TestPropertySearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        create_tables(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.index = PropertySearchIndex()
+        self.index.register()
+
+        with self.Session() as session:
+            smith = Owner(name="SMITH JOHN", business_name="Smith Holdings LLC")
+            jones = Owner(name="JONES MARY")
+            session.add_all([
+                Property(parcel_id="U01-001", address="12 Maine St", owner=smith),
+                Property(parcel_id="U01-002", address="14 Maine St", owner=jones),
+                Property(parcel_id="U02-001", address="3 Bath Rd", owner=smith),
+            ])
+            session.commit()
+
+    def tearDown(self):
+        self.index.unregister()
+        self.engine.dispose()
+
+    def _addresses(self, text):
+        with self.Session() as session:
+            ids = self.index.search(session, text)
+            return [session.get(Property, pid).address for pid in ids]
+
+    def test_substring_and_owner_matches(self):
+        self.assertEqual(sorted(self._addresses("maine")), ["12 Maine St", "14 Maine St"])
+        self.assertEqual(sorted(self._addresses("holdings")), ["12 Maine St", "3 Bath Rd"])
+        self.assertEqual(self._addresses("12 Maine")[0], "12 Maine St")
+
+    def test_short_text_falls_back(self):
+        with self.Session() as session:
+            self.assertIsNone(self.index.search(session, "12"))
+
+    def test_incremental_sync(self):
+        self._addresses("maine")  # builds the index
+
+        with self.Session() as session:
+            session.add(Property(parcel_id="U03-001", address="7 Federal St"))
+            session.query(Owner).filter_by(name="JONES MARY").one().name = "BROWN MARY"
+            session.delete(session.query(Property).filter_by(parcel_id="U02-001").one())
+            session.commit()
+
+        self.assertEqual(self._addresses("federal"), ["7 Federal St"])
+        self.assertEqual(self._addresses("brown"), ["14 Maine St"])
+        self.assertEqual(self._addresses("jones"), [])
+        self.assertEqual(self._addresses("bath"), [])
+
+    def test_rolled_back_changes_are_not_indexed(self):
+        self._addresses("maine")
+
+        with self.Session() as session:
+            session.add(Property(parcel_id="U04-001", address="9 Pleasant St"))
+            session.flush()
+            session.rollback()
+
+        self.assertEqual(self._addresses("pleasant"), [])
+
+    def test_file_database_index_is_committed(self):
+        self.index.unregister()
+        engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'properties.db')}")
+        create_tables(engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            session.add_all([
+                Property(parcel_id="U01-001", address="12 Maine St"),
+                Property(parcel_id="U01-002", address="14 Maine St"),
+            ])
+            session.commit()
+
+        try:
+            # Built from a read-only session, then read from new sessions and a fresh index
+            for index in (PropertySearchIndex(), PropertySearchIndex()):
+                for _ in range(2):
+                    with Session() as session:
+                        self.assertEqual(len(index.search(session, "maine")), 2)
+
+            # An index left empty by an earlier failed build is rebuilt
+            with engine.begin() as conn:
+                conn.exec_driver_sql(f"DELETE FROM {PropertySearchIndex.TABLE}")
+            with Session() as session:
+                self.assertEqual(len(PropertySearchIndex().search(session, "maine")), 2)
+        finally:
+            engine.dispose()
+
+class TestPropertySpatialIndex(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        create_tables(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.index = PropertySpatialIndex()
+        self.index.register()
+
+        # 10 x 10 block of parcels downtown plus one out on Harpswell Rd
+        with self.Session() as session:
+            session.add_all([
+                Property(parcel_id=f"U{row:02d}-{col:02d}",
+                         latitude=43.910 + row * 0.0005, longitude=-69.965 + col * 0.0005)
+                for row in range(10) for col in range(10)
+            ])
+            session.add(Property(parcel_id="R01-001", latitude=43.85, longitude=-69.95))
+            session.add(Property(parcel_id="R01-002"))  # not geocoded
+            session.commit()
+
+    def tearDown(self):
+        self.index.unregister()
+        self.engine.dispose()
+
+    def test_points_within_bounds(self):
+        with self.Session() as session:
+            found = self.index.query(session, (43.9118, -69.9652, 43.9102, -69.9638))
+        self.assertFalse(found['truncated'])
+        self.assertEqual(found['clusters'], [])
+        self.assertEqual(len(found['points']), 3 * 3)
+
+    def test_clusters_over_limit(self):
+        with self.Session() as session:
+            found = self.index.query(session, (43.80, -70.0, 44.0, -69.9), zoom=14, limit=20)
+        self.assertEqual(found['points'], [])
+        self.assertEqual(sum(cluster['count'] for cluster in found['clusters']), 101)
+        self.assertLessEqual(len(found['clusters']), 20)
+
+        with self.Session() as session:
+            found = self.index.query(session, (43.80, -70.0, 44.0, -69.9), zoom=18, limit=20)
+        self.assertEqual(len(found['points']), 20)
+        self.assertTrue(found['truncated'])
+
+    def test_incremental_sync(self):
+        with self.Session() as session:
+            self.index.query(session, (43.0, -70.0, 44.0, -69.0))
+
+        with self.Session() as session:
+            session.query(Property).filter_by(parcel_id="R01-002").one().latitude = 43.70
+            session.query(Property).filter_by(parcel_id="R01-002").one().longitude = -69.80
+            session.delete(session.query(Property).filter_by(parcel_id="R01-001").one())
+            session.commit()
+
+        with self.Session() as session:
+            moved = self.index.query(session, (43.69, -69.81, 43.71, -69.79))['points']
+            removed = self.index.query(session, (43.84, -69.96, 43.86, -69.94))['points']
+            self.assertEqual(
+                [session.get(Property, pid).parcel_id for pid in moved], ["R01-002"]
+            )
+            clusters = self.index.query(session, (43.0, -70.0, 44.0, -69.0), zoom=10, limit=5)
+        self.assertEqual(removed, [])
+        self.assertEqual(sum(cluster['count'] for cluster in clusters['clusters']), 101)
+
+    def test_file_database_index_is_committed(self):
+        self.index.unregister()
+        engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'properties.db')}")
+        create_tables(engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            session.add_all([
+                Property(parcel_id=f"U01-{i:03d}", latitude=43.91 + i * 0.001, longitude=-69.96)
+                for i in range(5)
+            ])
+            session.commit()
+
+        bounds = (43.90, -69.97, 43.92, -69.95)
+        try:
+            # Built from a read-only session, then read from new sessions and a fresh index
+            for index in (PropertySpatialIndex(), PropertySpatialIndex()):
+                for _ in range(2):
+                    with Session() as session:
+                        self.assertEqual(len(index.query(session, bounds)['points']), 5)
+                    with Session() as session:
+                        clusters = index.query(session, bounds, zoom=10, limit=1)['clusters']
+                    self.assertEqual(sum(cluster['count'] for cluster in clusters), 5)
+        finally:
+            engine.dispose()
+
+class TestSharedIndexes(unittest.TestCase):
+    def tearDown(self):
+        PropertySearchIndex.shared().unregister()
+        PropertySpatialIndex.shared().unregister()
+
+    def test_each_flush_syncs_once(self):
+        engine = create_engine("sqlite://")
+        create_tables(engine)
+        Session = sessionmaker(bind=engine)
+
+        # What two PropertyFinders ask for
+        first = (PropertySearchIndex.shared(), PropertySpatialIndex.shared())
+        second = (PropertySearchIndex.shared(), PropertySpatialIndex.shared())
+        self.assertEqual([a is b for a, b in zip(first, second)], [True, True])
+
+        try:
+            with patch.object(PropertySearchIndex, 'sync_properties', autospec=True) as search_sync, \
+                    patch.object(PropertySpatialIndex, 'sync_properties', autospec=True) as spatial_sync:
+                with Session() as session:
+                    session.add(Property(parcel_id="U01-001", address="12 Maine St",
+                                         latitude=43.91, longitude=-69.96))
+                    session.commit()
+            self.assertEqual(search_sync.call_count, 1)
+            self.assertEqual(spatial_sync.call_count, 1)
+        finally:
+            engine.dispose()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,13 +6,24 @@ from unittest.mock import patch, MagicMock
 import json
 import os
 from datetime import datetime
+import pandas as pd
 
 from src.processors.cleaner import DataCleaner
 from src.processors.standardizer import DataStandardizer
 from src.processors.merger import DataMerger
 from src.processors.enricher import DataEnricher
 from src.processors.text_analyzer import TextAnalyzer
+from src.processors.advanced_text_analyzer import AdvancedTextAnalyzer
 from src.processors.network_analyzer import NetworkAnalyzer
+from src.processors.relationship_analyzer import RelationshipAnalyzer
+from src.processors.opportunity_detector import OpportunityDetector
+from src.processors.investment_analyzer import InvestmentAnalyzer
+from src.processors.model_registry import ModelRegistry, LazyModels
+from src.processors.predictive_analyzer import PredictiveAnalyzer
+from src.processors.anomaly_service import AnomalyService
+from src.processors.model_pool import ModelPool
+from src.processors.embedding_index import EmbeddingIndex
+from src.processors.nlp_cache import NLPResultCache, NullResultCache
 
 class TestDataCleaner(unittest.TestCase):
     def setUp(self):
@@ -134,6 +145,123 @@ class TestDataMerger(unittest.TestCase):
         self.assertGreaterEqual(result[0]['merge_confidence'], 0.0)
         self.assertLessEqual(result[0]['merge_confidence'], 1.0)
 
+    def test_indexed_property_merge_matches_scan(self):
+        assessment = [
+            {'property_id': 'P123', 'address': '123 Main St', 'total_value': 300000},
+            {'property_id': 'P456', 'address': '456 Oak St', 'total_value': 250000}
+        ]
+        transactions = [
+            {'property_id': 'P123', 'date': '2020-05-01', 'price': 280000, 'buyer': 'Doe'},
+            {'property_id': 'P123', 'date': '2015-03-01', 'price': 200000, 'buyer': 'Roe'}
+        ]
+        permits = [
+            {'property_id': 'P456', 'issue_date': '2024-01-10', 'status': 'in_progress',
+             'estimated_cost': 5000, 'permit_type': 'ELECTRICAL'}
+        ]
+        violations = [
+            {'property_id': 'P123', 'reported_date': '2023-07-01', 'status': 'open',
+             'fines': 250, 'violation_type': 'CODE', 'severity': 'low'}
+        ]
+        utilities = [
+            {'property_id': 'P456', 'reading_date': '2024-02-01',
+             'utility_type': 'water', 'usage': 12.5}
+        ]
+        args = (assessment, transactions, permits, violations, utilities)
+
+        scanned = self.merger.merge_property_data(*args, mode='scan')
+        indexed = self.merger.merge_property_data(*args, mode='indexed')
+        for record in scanned + indexed:
+            record.pop('_merged_at')
+
+        self.assertEqual(scanned, indexed)
+        self.assertEqual(indexed[0]['transaction_summary']['total_transactions'], 2)
+        self.assertEqual(indexed[1]['permit_summary']['active_permits'], 1)
+
+    def test_indexed_property_merge_with_empty_child_tables(self):
+        assessment = [{'property_id': f'P{i}', 'total_value': 1000 * i} for i in range(3)]
+
+        with self.assertNoLogs('DataMerger', level='WARNING'):
+            merged = self.merger.merge_property_data(assessment, [], [], [], [], mode='indexed')
+
+        self.assertEqual(len(merged), 3)
+        for record in merged:
+            self.assertEqual(record['transactions'], [])
+            self.assertEqual(record['permit_summary']['total_permits'], 0)
+            self.assertEqual(record['violation_summary']['total_violations'], 0)
+            self.assertEqual(record['utilities'], {})
+
+    def test_blocked_owner_merge_matches_dense(self):
+        primary = [
+            {'name': 'SMITH JOHN', 'phone': '2075551234'},
+            {'name': 'Mary Jones', 'phone': '2075559876'},
+            {'name': 'Brunswick Holdings LLC'}
+        ]
+        secondary = [
+            {'name': 'John Smith', 'email': 'jsmith@example.com'},
+            {'name': 'JONES, MARY', 'email': 'mjones@example.com'},
+            {'name': 'Harpswell Marine Inc'}
+        ]
+
+        dense = self.merger.merge_owner_data(primary, secondary, mode='dense')
+        blocked = self.merger.merge_owner_data(primary, secondary, mode='blocked')
+        self.assertEqual(dense, blocked)
+
+    def test_oversized_owner_blocks_are_split_not_dropped(self):
+        primary = [{'name': f'{first} Johnson'} for first in ('Ann', 'Bob', 'Carl', 'Dana', 'Edwina')]
+        primary.append({'name': 'Johnson Family Trust'})
+        secondary = [{'name': f'JOHNSON, {first.upper()}'} for first in ('Ann', 'Rob', 'Carla', 'Edwin')]
+        secondary.append({'name': 'Jonson Ann'})
+
+        merger = DataMerger({'owner_block_max_pairs': 4})
+        dense = merger.merge_owner_data(primary, secondary, mode='dense')
+        blocked = merger.merge_owner_data(primary, secondary, mode='blocked')
+        self.assertEqual(dense, blocked)
+        # Every Johnson block is over the cap, yet the matches are found
+        self.assertLess(len(blocked), len(primary) + len(secondary))
+
+    def test_blocked_owner_merge_keeps_keyless_and_single_token_names(self):
+        primary = [{'name': 'The Trust'}, {'name': 'Kowalski'}]
+        secondary = [{'name': 'TRUST, THE'}, {'name': 'Cowalski'}]
+
+        dense = self.merger.merge_owner_data(primary, secondary, mode='dense')
+        blocked = self.merger.merge_owner_data(primary, secondary, mode='blocked')
+        self.assertEqual(len(dense), 2)
+        self.assertEqual(dense, blocked)
+
+    def test_owner_blocking_keys(self):
+        keys = self.merger._owner_blocking_keys(
+            pd.DataFrame({'name': ['SMITH, JOHN A', 'Smyth John', None]})
+        )
+        by_position = keys.groupby('position')['key'].apply(set)
+        self.assertIn('s:S530', by_position[0] & by_position[1])
+        self.assertIn('t:joh', by_position[0] & by_position[1])
+        self.assertNotIn(2, by_position.index)
+
+    def test_streaming_transaction_chains_match_in_memory(self):
+        transactions = [
+            {'property_id': 'P2', 'date': '2019-06-01', 'price': 310000, 'buyer': 'Lee'},
+            {'property_id': 'P1', 'date': '2012-01-15', 'price': 150000, 'buyer': 'Roe'},
+            {'property_id': 'P1', 'date': '2005-03-01', 'price': 120000, 'buyer': 'Doe'},
+            {'property_id': 'P2', 'date': '2010-09-30', 'price': 250000, 'buyer': 'Kim'},
+            {'property_id': 'P1', 'date': '2021-07-04', 'price': 240000, 'buyer': 'Poe'}
+        ]
+
+        expected = self.merger.merge_transaction_chains(transactions)
+        # run_size=2 forces several spilled runs to be merged
+        streamed = list(self.merger.iter_transaction_chains(iter(transactions), run_size=2))
+
+        self.assertEqual(
+            [chain['property_id'] for chain in streamed],
+            [chain['property_id'] for chain in expected]
+        )
+        for chain, expected_chain in zip(streamed, expected):
+            self.assertEqual(chain['transactions'], expected_chain['transactions'])
+            self.assertEqual(
+                chain['summary']['price_trends'],
+                expected_chain['summary']['price_trends']
+            )
+        self.assertEqual(streamed[0]['summary']['price_history'], [120000, 150000, 240000])
+
 class TestDataEnricher(unittest.TestCase):
     def setUp(self):
         self.enricher = DataEnricher()
@@ -204,6 +332,31 @@ class TestTextAnalyzer(unittest.TestCase):
         )
         self.assertEqual(result['features'], [])
 
+    def test_similar_descriptions_match_dense(self):
+        import random
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+        rng = random.Random(11)
+        words = ['hardwood', 'kitchen', 'garage', 'porch', 'pool', 'basement', 'roof', 'deck']
+        descriptions = [' '.join(rng.choices(words, k=4)) for _ in range(120)]
+        vectors = TfidfVectorizer().fit_transform(descriptions)
+
+        dense = cosine_similarity(vectors)
+        expected = sorted(
+            [
+                {'pair': (i, j), 'score': float(dense[i][j])}
+                for i in range(len(dense)) for j in range(i + 1, len(dense))
+                if dense[i][j] > self.analyzer.params['similarity_threshold']
+            ],
+            key=lambda x: x['score'],
+            reverse=True
+        )
+
+        self.analyzer.params['similarity_block_size'] = 7
+        result = self.analyzer._find_similar_descriptions(vectors)
+        self.assertTrue(any(e['score'] > 1 - 1e-9 for e in expected))
+        self.assertEqual(result, expected)
+
 class TestNetworkAnalyzer(unittest.TestCase):
     def setUp(self):
         self.analyzer = NetworkAnalyzer()
@@ -257,5 +410,660 @@ class TestNetworkAnalyzer(unittest.TestCase):
         self.assertEqual(result['network_stats']['node_count'], 0)
         self.assertEqual(result['network_stats']['edge_count'], 0)
 
+    def test_connect_related_owners(self):
+        import networkx as nx
+        owner_properties = {
+            'SMITH JOHN A': ['P1'],
+            'SMITH JOHN': ['P2'],
+            'Bay Holdings LLC': ['P1', 'P3'],
+            'Unrelated Owner': ['P4']
+        }
+        G = nx.Graph()
+        G.add_nodes_from(owner_properties)
+        self.analyzer._connect_related_owners(G, owner_properties)
+
+        self.assertEqual(G.edges['SMITH JOHN A', 'SMITH JOHN']['relationship_type'], 'similar_name')
+        self.assertEqual(G.edges['SMITH JOHN A', 'SMITH JOHN']['strength'], 0.91)
+        self.assertEqual(G.edges['SMITH JOHN A', 'Bay Holdings LLC']['shared_properties'], ['P1'])
+        self.assertEqual(G.number_of_edges(), 2)
+
+class TestRelationshipAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = RelationshipAnalyzer()
+        self.test_data = [
+            {
+                'property_id': 'P1',
+                'owner': {'name': 'John Doe'},
+                'assessment': {'total_value': 300000},
+                'transactions': [{'buyer': 'John Doe', 'seller': 'Jane Smith'}]
+            },
+            {
+                'property_id': 'P2',
+                'owner': {'name': 'Jane Smith'},
+                'assessment': {'total_value': 200000},
+                'transactions': []
+            },
+            {
+                'property_id': 'P3',
+                'owner': {'name': 'Bay Holdings LLC'},
+                'assessment': {'total_value': 500000},
+                'transactions': [{'buyer': 'Bay Holdings LLC', 'seller': 'Ann Lee'}]
+            },
+            {
+                'property_id': 'P4',
+                'owner': {'name': 'Solo Owner'},
+                'transactions': []
+            }
+        ]
+
+    def _networks(self, result):
+        return sorted((sorted(n['owners']), sorted(n['properties'])) for n in result)
+
+    def test_analyze_owner_networks(self):
+        result = self.analyzer.analyze_owner_networks(self.test_data)
+        self.assertEqual(self._networks(result), [
+            (['Ann Lee', 'Bay Holdings LLC'], ['P3']),
+            (['Jane Smith', 'John Doe'], ['P1', 'P2'])
+        ])
+        stats = {tuple(sorted(n['owners'])): n['statistics'] for n in result}
+        self.assertEqual(stats[('Jane Smith', 'John Doe')]['total_value'], 500000)
+        self.assertEqual(stats[('Jane Smith', 'John Doe')]['transaction_volume'], 1)
+
+    def test_update_owner_networks_merges_incrementally(self):
+        self.analyzer.analyze_owner_networks(self.test_data)
+        result = self.analyzer.update_owner_networks([
+            {'property_id': 'P4', 'buyer': 'Solo Owner', 'seller': 'Ann Lee'},
+            {'property_id': 'P5', 'buyer': 'Tom Gray', 'seller': 'New Seller'}
+        ])
+        self.assertEqual(self._networks(result), [
+            (['Ann Lee', 'Bay Holdings LLC', 'Solo Owner'], ['P3', 'P4']),
+            (['Jane Smith', 'John Doe'], ['P1', 'P2']),
+            (['New Seller', 'Tom Gray'], ['P5'])
+        ])
+        # The caller's records are left as they were
+        self.assertEqual(self.test_data[3]['transactions'], [])
+
+    def test_handle_empty_data(self):
+        self.assertEqual(self.analyzer.analyze_owner_networks([]), [])
+
+class TestOpportunityDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = OpportunityDetector()
+        self.properties = [
+            {
+                'property_id': f'P{i:03d}',
+                'square_feet': 1200 + i * 37,
+                'year_built': 1920 + i * 3,
+                'assessment': {'total_value': 150000 + (i * 7919) % 200000,
+                               'land_value': 40000 + (i * 104729) % 60000},
+                'permits': [{'permit_type': 'renovation', 'estimated_cost': 5000 * (i % 4)}],
+                'violations': [{}] * (i % 5)
+            }
+            for i in range(30)
+        ]
+
+    def test_columnar_matches_rowwise(self):
+        columnar = self.detector.detect_opportunities(self.properties)
+        rowwise = self.detector.detect_opportunities(self.properties, mode='rowwise')
+
+        self.assertEqual([o['property_id'] for o in columnar], [o['property_id'] for o in rowwise])
+        for col, row in zip(columnar, rowwise):
+            self.assertAlmostEqual(col['total_score'], row['total_score'])
+            for name, score in row['scores'].items():
+                self.assertAlmostEqual(col['scores'][name], score)
+            self.assertEqual(col['insights'], row['insights'])
+            self.assertEqual(col['opportunity_type'], row['opportunity_type'])
+
+    def test_invalid_rows_score_zero(self):
+        properties = self.properties[:3] + [{'property_id': 'BAD', 'square_feet': 0,
+                                             'assessment': {'total_value': 0}}]
+        scores = {o['property_id']: o['scores'] for o in self.detector.detect_opportunities(properties)}
+        self.assertEqual(scores['BAD']['value_score'], 0.0)
+        self.assertEqual(scores['BAD']['condition_score'], 0.0)
+
+    def test_handle_empty_data(self):
+        self.assertEqual(self.detector.detect_opportunities([]), [])
+
+class TestInvestmentAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = InvestmentAnalyzer()
+        self.properties = [
+            {'property_id': f'P{i:03d}', 'assessment': {'total_value': 100000 + i * 25000}}
+            for i in range(12)
+        ] + [{'property_id': 'NOVALUE', 'assessment': {}}]
+
+    def test_simulation_without_volatility_matches_analyze_roi(self):
+        analyzer = InvestmentAnalyzer({'analysis_params': {
+            'appreciation_volatility': 0, 'holding_period_jitter': 0,
+            'improvement_cost_volatility': 0, 'improvement_return_volatility': 0,
+            'simulation_chunk_cells': 5 * 20  # several chunks
+        }})
+        simulated = analyzer.simulate_roi(self.properties, paths=20, seed=1)
+
+        for scenario in ('base', 'improve', 'long_term'):
+            results = simulated[scenario]['properties']
+            self.assertEqual(len(results), 12)
+            for prop, result in zip(self.properties, results):
+                expected = analyzer.analyze_roi(prop, scenario)['returns']
+                for pct in ('p5', 'p50', 'p95'):
+                    self.assertAlmostEqual(result['roi'][pct], expected['roi'])
+                    self.assertAlmostEqual(result['annual_roi'][pct], expected['annual_roi'])
+
+    def test_simulation_percentiles(self):
+        simulated = self.analyzer.simulate_roi(self.properties, scenarios=['improve'], paths=2000, seed=7)
+        self.assertEqual(list(simulated), ['improve'])
+        portfolio = simulated['improve']['portfolio']
+        self.assertLess(portfolio['roi']['p5'], portfolio['roi']['p50'])
+        self.assertLess(portfolio['roi']['p50'], portfolio['roi']['p95'])
+        for result in simulated['improve']['properties']:
+            self.assertLessEqual(result['annual_roi']['p5'], result['annual_roi']['p95'])
+
+        again = self.analyzer.simulate_roi(self.properties, scenarios=['improve'], paths=2000, seed=7)
+        self.assertEqual(simulated, again)
+
+    def test_handle_empty_data(self):
+        self.assertEqual(self.analyzer.simulate_roi([]), {})
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.preprocessing import StandardScaler
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.registry = ModelRegistry(self.tmp_dir.name)
+        self.features = pd.DataFrame({'square_feet': [900, 1400, 2100, 3000],
+                                      'year_built': [1950, 1978, 1999, 2015]})
+        self.target = [150000, 210000, 320000, 450000]
+        self.model = RandomForestRegressor(n_estimators=5, random_state=0).fit(self.features, self.target)
+        self.scaler = StandardScaler().fit(self.features)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _save(self, data, promote=True):
+        return self.registry.save(
+            'value', {'model': self.model, 'scaler': self.scaler},
+            ModelRegistry.data_hash(data), ModelRegistry.feature_schema(self.features),
+            {'r2': 0.9}, promote=promote
+        )
+
+    def test_versions_keyed_by_data_and_schema(self):
+        data = [{'property_id': 'P1', 'square_feet': 900}]
+        version = self._save(data)
+        schema = ModelRegistry.feature_schema(self.features)
+
+        self.assertEqual(self.registry.find('value', ModelRegistry.data_hash(data), schema), version)
+        self.assertIsNone(self.registry.find('value', ModelRegistry.data_hash(data + data), schema))
+        self.assertIsNone(self.registry.find('value', ModelRegistry.data_hash(data), schema[:1]))
+
+        model = self.registry.load('value')
+        self.assertEqual(list(model.predict(self.features)), list(self.model.predict(self.features)))
+        self.assertEqual(self.registry.metadata('value')['metrics'], {'r2': 0.9})
+
+    def test_promote_and_rollback(self):
+        first = self._save([1])
+        second = self._save([2])
+        self.assertEqual(self.registry.active_version('value'), second)
+        self.assertEqual([meta['version'] for meta in self.registry.versions('value')], [first, second])
+
+        self.assertEqual(self.registry.rollback('value'), first)
+        self.assertEqual(self.registry.active_version('value'), first)
+        self.assertTrue(self.registry.is_rolled_back('value', second))
+        self.assertIsNone(self.registry.rollback('value'))
+
+        third = self._save([3], promote=False)
+        self.assertEqual(self.registry.active_version('value'), first)
+        self.registry.promote('value', third)
+        self.assertEqual(self.registry.active_version('value'), third)
+        with self.assertRaises(ValueError):
+            self.registry.promote('value', 'missing')
+
+    def test_lazy_models(self):
+        models = LazyModels(self.registry, {'value': ('value', 'model'), 'risk': ('risk', 'model')})
+        self.assertIsNone(models['value'])
+        self.assertIsNone(models.get('risk'))
+        with self.assertRaises(KeyError):
+            models['unknown']
+
+        self._save([1])
+        self.assertEqual(list(models['value'].predict(self.features)),
+                         list(self.model.predict(self.features)))
+        self.assertIn('value', models)
+        models.evict('value')
+        self.assertNotIn('value', models)
+
+class TestPredictiveAnalyzer(unittest.TestCase):
+    def setUp(self):
+        import random
+        rng = random.Random(3)
+        self.properties = []
+        for i in range(200):
+            square_feet = rng.randrange(700, 3500)
+            year_built = rng.randrange(1900, 2020)
+            self.properties.append({
+                'property_id': f'P{i:04d}',
+                'square_feet': square_feet,
+                'bedrooms': rng.randrange(1, 6),
+                'year_built': year_built,
+                'assessment': {'total_value': square_feet * 150 + (year_built - 1900) * 800}
+            })
+        self.analyzer = PredictiveAnalyzer()
+        self.analyzer._train_value_model(pd.DataFrame(self.properties))
+
+    def test_batch_matches_per_property(self):
+        batch = self.analyzer.predict_property_values(self.properties[:20])
+        rows = self.analyzer.predict_property_values(self.properties[:20], batch=False)
+        self.assertEqual(len(batch), 20)
+        for b, r in zip(batch, rows):
+            self.assertEqual(b['property_id'], r['property_id'])
+            for horizon in ('1_year', '3_year', '5_year'):
+                self.assertAlmostEqual(b['predictions'][horizon], r['predictions'][horizon], places=4)
+                self.assertAlmostEqual(b['confidence_intervals'][horizon]['lower'],
+                                       r['confidence_intervals'][horizon]['lower'], places=4)
+            self.assertLessEqual(b['confidence_intervals']['1_year']['lower'], b['predictions']['1_year'] * 1.5)
+            self.assertEqual([f['feature'] for f in b['factors']], [f['feature'] for f in r['factors']])
+        self.assertGreater(batch[0]['predictions']['5_year'], batch[0]['predictions']['1_year'])
+
+    def test_forest_intervals_from_trees(self):
+        from sklearn.ensemble import RandomForestRegressor
+        features = self.analyzer._extract_value_features_batch(pd.DataFrame(self.properties))
+        scaled = self.analyzer.scalers['value'].transform(features)
+        target = [p['assessment']['total_value'] for p in self.properties]
+        self.analyzer.models['value'] = RandomForestRegressor(n_estimators=20, random_state=0).fit(scaled, target)
+
+        for pred in self.analyzer.predict_property_values(self.properties[:10]):
+            interval = pred['confidence_intervals']['1_year']
+            self.assertLessEqual(interval['lower'], interval['upper'])
+
+    def test_untrained_model(self):
+        self.assertEqual(PredictiveAnalyzer().predict_property_values(self.properties), [])
+
+    def test_registered_model_loads_lazily(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as model_dir:
+            trainer = PredictiveAnalyzer({'model_dir': model_dir})
+            data_hash = ModelRegistry.data_hash(self.properties)
+            trained = trainer._train_value_model(pd.DataFrame(self.properties), data_hash)
+
+            scorer = PredictiveAnalyzer({'model_dir': model_dir})
+            self.assertNotIn('value', scorer.models)
+            self.assertEqual(scorer.predict_property_values(self.properties[:5]),
+                             trainer.predict_property_values(self.properties[:5]))
+
+            reused = scorer._train_value_model(pd.DataFrame(self.properties), data_hash)
+            self.assertEqual(reused['test_score'], trained['test_score'])
+
+    def test_reuse_respects_promotion_and_rollback(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as model_dir:
+            analyzer = PredictiveAnalyzer({'model_dir': model_dir})
+            first_hash = ModelRegistry.data_hash(self.properties)
+            second_hash = ModelRegistry.data_hash(self.properties[:150])
+            analyzer._train_value_model(pd.DataFrame(self.properties), first_hash)
+            first = analyzer.registry.active_version('value')
+            analyzer._train_value_model(pd.DataFrame(self.properties[:150]), second_hash)
+            second = analyzer.registry.active_version('value')
+
+            # Retraining on rolled back inputs reuses the version without reactivating it
+            self.assertEqual(analyzer.rollback_model('value'), first)
+            analyzer._train_value_model(pd.DataFrame(self.properties[:150]), second_hash)
+            self.assertEqual(analyzer.registry.active_version('value'), first)
+
+            # Without promote_trained_models the active version is left alone
+            staging = PredictiveAnalyzer({'model_dir': model_dir, 'promote_trained_models': False})
+            staging.promote_model('value', second)
+            staging._train_value_model(pd.DataFrame(self.properties), first_hash)
+            self.assertEqual(staging.registry.active_version('value'), second)
+
+class TestForecastRegions(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        dates = pd.date_range('2021-01-31', periods=30, freq=pd.offsets.MonthEnd())
+        self.market_data = [
+            {'region': region, 'date': date.strftime('%Y-%m-%d'),
+             'median_price': base + i * 1000, 'sales_volume': 20 + i % 7}
+            for region, base in (('Brunswick', 300000), ('Topsham', 280000))
+            for i, date in enumerate(dates)
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _analyzer(self, workers):
+        return PredictiveAnalyzer({'forecast_workers': workers,
+                                   'forecast_cache_dir': self.tmp_dir.name})
+
+    @staticmethod
+    def _fake_fit(frame, prophet_params, periods, freq):
+        future = pd.date_range(frame['ds'].max(), periods=periods + 1, freq=freq)[1:]
+        forecast = pd.DataFrame({'ds': list(frame['ds']) + list(future)})
+        forecast['yhat'] = forecast['yhat_lower'] = forecast['yhat_upper'] = forecast['trend'] = 1.0
+        return '{}', forecast
+
+    def test_forecasts_every_region_in_parallel(self):
+        market_data = [{k: v for k, v in row.items() if k != 'sales_volume'} for row in self.market_data]
+        results = list(self._analyzer(2).forecast_regions(market_data, forecast_period=6))
+        self.assertEqual(sorted((r['region'], r['metric']) for r in results),
+                         [('Brunswick', 'median_price'), ('Topsham', 'median_price')])
+        for result in results:
+            self.assertEqual(len(result['forecast']), 6)
+            self.assertFalse(result['cached'])
+
+    def test_unchanged_series_are_not_refitted(self):
+        with patch('src.processors.forecast_scheduler._fit_series', side_effect=self._fake_fit) as fit:
+            list(self._analyzer(1).forecast_regions(self.market_data, forecast_period=6))
+            self.assertEqual(fit.call_count, 4)
+
+            # A fresh analyzer sharing the cache directory, with one new Brunswick month
+            market_data = self.market_data + [{'region': 'Brunswick', 'date': '2023-07-31',
+                                               'median_price': 331000, 'sales_volume': 22}]
+            cached = {
+                (r['region'], r['metric']): r['cached']
+                for r in self._analyzer(1).forecast_regions(market_data, forecast_period=6)
+            }
+        self.assertEqual(fit.call_count, 6)
+        self.assertEqual(cached, {
+            ('Brunswick', 'median_price'): False, ('Brunswick', 'sales_volume'): False,
+            ('Topsham', 'median_price'): True, ('Topsham', 'sales_volume'): True
+        })
+
+    def test_memory_cache_is_bounded(self):
+        from src.processors.forecast_scheduler import ForecastScheduler
+        scheduler = ForecastScheduler(max_workers=1, max_cached=2)
+        frames = [
+            pd.DataFrame({'ds': pd.date_range('2021-01-01', periods=10), 'y': range(i, i + 10)})
+            for i in range(3)
+        ]
+        with patch('src.processors.forecast_scheduler._fit_series', side_effect=self._fake_fit):
+            for frame in frames:
+                scheduler.forecast_one(frame, periods=3)
+            self.assertEqual(len(scheduler._cache), 2)
+            self.assertTrue(scheduler.forecast_one(frames[2], periods=3)['cached'])
+
+        # The oldest series was evicted, and a failed refit gives no result
+        with patch('src.processors.forecast_scheduler._fit_series', side_effect=ValueError('no fit')):
+            self.assertIsNone(scheduler.forecast_one(frames[0], periods=3))
+
+class TestAnomalyService(unittest.TestCase):
+    def setUp(self):
+        import random
+        import tempfile
+        rng = random.Random(5)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.properties = [
+            {
+                'property_id': f'P{i:04d}',
+                'square_feet': rng.randrange(900, 2500),
+                'year_built': rng.randrange(1920, 2015),
+                'assessment': {'total_value': rng.randrange(150000, 400000),
+                               'land_value': rng.randrange(40000, 90000)},
+                'permits': [{}] * rng.randrange(0, 3)
+            }
+            for i in range(400)
+        ]
+        self.properties[7]['assessment']['total_value'] = 9500000
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _analyzer(self):
+        return PredictiveAnalyzer({'model_dir': self.tmp_dir.name})
+
+    def test_detects_outliers(self):
+        anomalies = self._analyzer().detect_anomalies(self.properties)
+        outlier = next(a for a in anomalies if a['property_id'] == 'P0007')
+        self.assertEqual(outlier['anomaly_type'], 'high_total_value')
+        self.assertTrue(outlier['recommendations'])
+        self.assertEqual(self._analyzer().detect_anomalies([]), [])
+
+    def test_only_changed_properties_are_scored(self):
+        self._analyzer().detect_anomalies(self.properties)
+        version = self._analyzer().registry.active_version('anomaly')
+
+        # Next run in a new process: a few edits and one new property
+        self.properties[3]['square_feet'] = 1800
+        self.properties.append(dict(self.properties[10], property_id='P9999'))
+        analyzer = self._analyzer()
+        features = analyzer._extract_anomaly_features(pd.DataFrame(self.properties))
+        scores = analyzer.anomaly_service.score(features)
+
+        self.assertEqual(sorted(scores.index[scores['changed']]), ['P0003', 'P9999'])
+        self.assertEqual(analyzer.registry.active_version('anomaly'), version)
+        self.assertEqual(analyzer.anomaly_service.feature_importance, {})
+
+    def test_state_keeps_id_types_and_current_properties(self):
+        import os
+        features = self._analyzer()._extract_anomaly_features(pd.DataFrame(self.properties))
+        features.index = pd.Index([i if i % 2 else f'P{i:04d}' for i in range(len(features))], dtype=object)
+        registry = ModelRegistry(os.path.join(self.tmp_dir.name, 'registry'))
+        state_path = os.path.join(self.tmp_dir.name, 'anomaly_state.joblib')
+        AnomalyService(registry, state_path).score(features)
+
+        # A new process sees the mixed ids as unchanged
+        service = AnomalyService(registry, state_path)
+        scores = service.score(features.iloc[:300])
+        self.assertFalse(scores['changed'].any())
+        reloaded = AnomalyService(registry, state_path)
+        reloaded._load()
+        self.assertEqual(len(reloaded._current_state()), 300)
+
+    def test_refit_keeps_rolled_back_version_active(self):
+        analyzer = self._analyzer()
+        analyzer.detect_anomalies(self.properties)
+        first = analyzer.registry.active_version('anomaly')
+        self.properties[3]['square_feet'] = 1800
+        self._analyzer().anomaly_service.fit(
+            self._analyzer()._extract_anomaly_features(pd.DataFrame(self.properties))
+        )
+        self.assertEqual(self._analyzer().rollback_model('anomaly'), first)
+
+        # A scheduled refit in the next run registers a version but doesn't promote it
+        self.properties[5]['square_feet'] = 1700
+        analyzer = self._analyzer()
+        analyzer.anomaly_service.params['refit_days'] = -1
+        versions = len(analyzer.registry.versions('anomaly'))
+        analyzer.detect_anomalies(self.properties)
+        self.assertEqual(len(analyzer.registry.versions('anomaly')), versions + 1)
+        self.assertEqual(analyzer.registry.active_version('anomaly'), first)
+        self.assertEqual(analyzer.anomaly_service.version, first)
+
+    def test_fits_follow_promote_trained_models(self):
+        analyzer = PredictiveAnalyzer({'model_dir': self.tmp_dir.name, 'promote_trained_models': False})
+        features = analyzer._extract_anomaly_features(pd.DataFrame(self.properties))
+        self.assertFalse(analyzer.anomaly_service.promote)
+
+        # Nothing active yet, so the first fit scores but isn't promoted
+        analyzer.anomaly_service.score(features)
+        self.assertIsNone(analyzer.registry.active_version('anomaly'))
+        self.assertEqual(len(analyzer.registry.versions('anomaly')), 1)
+
+    def test_drift_triggers_refit(self):
+        service = AnomalyService(config={'min_drift_rows': 20})
+        features = self._analyzer()._extract_anomaly_features(pd.DataFrame(self.properties))
+        service.score(features)
+        model = service.model
+
+        shifted = features.copy()
+        shifted.iloc[:100, shifted.columns.get_loc('square_feet')] *= 3
+        scores = service.score(shifted)
+        self.assertIsNot(service.model, model)
+        self.assertTrue(scores['changed'].all())
+
+class TestModelPool(unittest.TestCase):
+    def test_loads_once_and_shares(self):
+        import threading
+        pool = ModelPool()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return object()
+
+        models = []
+        threads = [threading.Thread(target=lambda: models.append(pool.get('m', loader))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(m) for m in models}), 1)
+
+        pool.clear('m')
+        pool.get('m', loader)
+        self.assertEqual(len(calls), 2)
+
+    def test_analyzer_defers_model_loading(self):
+        pool = ModelPool()
+        analyzer = TextAnalyzer(model_pool=pool)
+        self.assertIs(analyzer.model_pool, pool)
+        self.assertEqual(pool.loaded(), [])
+        self.assertIs(TextAnalyzer().model_pool, ModelPool.shared())
+        with self.assertRaises(ValueError):
+            pool.pipeline('sentiment-analysis', 'some-model', backend='tpu')
+
+class TestEmbeddingIndex(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.encoded = []
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _encode(self, texts):
+        """Bag of words over a tiny vocabulary"""
+        import numpy as np
+        vocab = ['pool', 'garage', 'barn', 'dock', 'porch', 'attic']
+        self.encoded.extend(texts)
+        return np.array([[text.split().count(word) + 0.01 for word in vocab] for text in texts])
+
+    def test_incremental_updates_persist(self):
+        documents = {f'D{i}': f"house with {'pool' if i % 2 else 'garage'} and porch {i}" for i in range(50)}
+        index = EmbeddingIndex(self.tmp_dir.name, model='bow')
+        self.assertEqual(index.update(documents, self._encode), 50)
+
+        # A new process sees the stored embeddings and only encodes changed content
+        documents['D3'] = 'dock dock dock'
+        documents['D99'] = documents['D1']
+        reopened = EmbeddingIndex(self.tmp_dir.name, model='bow')
+        self.assertEqual(reopened.update(documents, self._encode), 1)
+        self.assertEqual(self.encoded[-1], 'dock dock dock')
+        self.assertEqual(reopened.search(self._encode(['dock'])[0], 1)[0][0], 'D3')
+
+        reopened.remove(['D3'])
+        self.assertNotIn('D3', [doc_id for doc_id, _ in reopened.search(self._encode(['dock'])[0], 5)])
+        self.assertEqual(len(EmbeddingIndex(self.tmp_dir.name, model='bow')), 50)
+        self.assertEqual(len(EmbeddingIndex(self.tmp_dir.name, model='other')), 0)
+
+    def test_search_matches_cosine_similarity(self):
+        import numpy as np
+        from sklearn.metrics.pairwise import cosine_similarity
+        words = ['pool', 'garage', 'barn', 'dock', 'porch', 'attic']
+        rng = np.random.default_rng(3)
+        documents = {i: ' '.join(rng.choice(words, 6)) for i in range(300)}
+        index = EmbeddingIndex(model='bow')
+        index.update(documents, self._encode)
+
+        query = self._encode(['barn dock dock'])[0]
+        expected = cosine_similarity([query], self._encode(list(documents.values())))[0]
+        hits = index.search(query, 5)
+        self.assertTrue(np.allclose([score for _, score in hits], np.sort(expected)[::-1][:5], atol=1e-5))
+
+        subset = index.search(query, 3, doc_ids=range(10))
+        self.assertEqual([doc_id for doc_id, _ in subset], list(np.argsort(-expected[:10], kind='stable')[:3]))
+
+        # Probing every list of the IVF layer is exact
+        index.build_ivf(n_lists=8)
+        index.n_probe = 8
+        self.assertEqual(index.search(query, 5), hits)
+
+class TestAdvancedTextAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = AdvancedTextAnalyzer(model_pool=ModelPool())
+
+    def _encode(self, texts):
+        """Bag of words over a tiny vocabulary"""
+        import numpy as np
+        vocab = ['pool', 'garage', 'barn', 'dock', 'porch', 'attic']
+        words = [text.lower().replace('.', ' ').split() for text in texts]
+        return np.array([[tokens.count(word) + 0.01 for word in vocab] for tokens in words])
+
+    def test_semantic_search_with_documents(self):
+        documents = [
+            {'document_id': 'a', 'content': 'Pool pool. Big yard.'},
+            {'document_id': 'b', 'content': 'Quiet street. Deep water dock on the river.'},
+            {'document_id': 'c', 'content': 'Garage and barn.'}
+        ]
+        with patch.object(self.analyzer, '_encode_texts', self._encode):
+            results = self.analyzer.semantic_search('dock', documents, 1)
+            self.assertEqual(len(results), 1)
+            self.assertEqual(results[0]['document'], documents[1])
+            self.assertEqual(results[0]['highlights'], ['Deep water dock on the river.'])
+
+            # Later searches run over everything indexed so far
+            hits = self.analyzer.semantic_search('garage')
+            self.assertEqual(hits[0]['document'], {'document_id': 'c'})
+            self.assertEqual(hits[0]['highlights'], [])
+        self.assertEqual(self.analyzer.model_pool.loaded(), [])
+
+class TestNLPResultCache(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'nlp.db')
+        self.computed = []
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _upper(self, texts):
+        self.computed.extend(texts)
+        return [{'text': text.upper()} for text in texts]
+
+    def test_only_new_text_is_computed(self):
+        cache = NLPResultCache(self.path)
+        texts = ['sunny cape', 'needs roof', 'sunny cape']
+        self.assertEqual(cache.cached('m@1', 'entities', texts, self._upper)[2], {'text': 'SUNNY CAPE'})
+        self.assertEqual(self.computed, ['sunny cape', 'needs roof'])
+        cache.close()
+
+        # Next run: one new description, and a model upgrade misses everything
+        cache = NLPResultCache(self.path)
+        cache.cached('m@1', 'entities', texts + ['new deck'], self._upper)
+        self.assertEqual(self.computed[2:], ['new deck'])
+        cache.cached('m@2', 'entities', ['needs roof'], self._upper)
+        self.assertEqual(self.computed[3:], ['needs roof'])
+
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (3, 2))
+        self.assertAlmostEqual(stats['by_kind']['entities']['hit_rate'], 0.6)
+        self.assertEqual(stats['entries'], 4)
+
+    def test_evicts_least_recently_used(self):
+        cache = NLPResultCache(self.path, max_bytes=2000)
+        cache.TOUCH_INTERVAL = 0
+        for i in range(10):
+            cache.cached('m', 'summary', [f'text {i}'], lambda texts: ['x' * 300 for _ in texts])
+            cache.cached('m', 'summary', ['text 0'], self._upper)
+        stats = cache.stats()
+        self.assertLessEqual(stats['bytes'], 2000)
+        self.assertGreater(stats['evictions'], 0)
+        self.assertEqual(self.computed, [])
+        self.assertTrue(cache.get_many('m', 'summary', [NLPResultCache.text_hash('text 0')]))
+
+    def test_no_path_configured_stores_nothing(self):
+        cache = TextAnalyzer(model_pool=ModelPool()).result_cache
+        self.assertIsInstance(cache, NullResultCache)
+        cache.cached('m', 'entities', ['a', 'b', 'a'], self._upper)
+        cache.cached('m', 'entities', ['a'], self._upper)
+        self.assertEqual(self.computed, ['a', 'b', 'a'])
+        self.assertEqual(cache.stats()['misses'], 4)
+
+        configured = TextAnalyzer({'nlp_cache_path': self.path}, model_pool=ModelPool())
+        self.assertNotIsInstance(configured.result_cache, NullResultCache)
+        configured.result_cache.close()
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,139 @@
+"""
+Tests for the FSBO scrapers
+"""
+import os
+import json
+import time
+import tempfile
+import threading
+import unittest
+
+from werkzeug.serving import make_server
+
+from src.scrapers.scraper_base import DomainRateLimiter, ScraperBase
+from src.scrapers.fsbo_scraper import CraigslistScraper, FSBOScraper
+from src.scrapers.lead_sink import LeadSink
+from tests.mock_api.api_server import app
+
+class MockCraigslistTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}/cl"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+class TestCraigslistScraper(MockCraigslistTestCase):
+    def make_scraper(self, cache_dir=None, **kwargs):
+        return CraigslistScraper(
+            base_url=self.base_url,
+            output_dir=tempfile.mkdtemp(),
+            cache_dir=cache_dir or tempfile.mkdtemp(),
+            config={'http_cache_dir': tempfile.mkdtemp()},
+            requests_per_second=0,
+            **kwargs
+        )
+
+    @staticmethod
+    def comparable(leads):
+        return [{k: v for k, v in lead.items() if k not in ('created_at', 'updated_at')} for lead in leads]
+
+    def test_concurrent_matches_sequential(self):
+        sequential = self.make_scraper(max_concurrency=1).run(max_pages=2, max_listings=30)
+        concurrent = self.make_scraper(max_concurrency=8).run(max_pages=2, max_listings=30)
+        self.assertEqual(len(concurrent), 30)
+        self.assertEqual(self.comparable(concurrent), self.comparable(sequential))
+        self.assertEqual(concurrent[0]['contact_info'], {'phone': '207-555-0000'})
+
+    def test_pagination_and_dedupe(self):
+        cache_dir = tempfile.mkdtemp()
+        first = self.make_scraper(cache_dir, max_concurrency=8).run(max_pages=3, max_listings=150)
+        self.assertEqual([lead['source_id'] for lead in first],
+                         [str(7000000 + i) for i in range(150)])
+
+        # Already processed listings are skipped on the next run
+        second = self.make_scraper(cache_dir, max_concurrency=8).run(max_pages=3, max_listings=500)
+        self.assertEqual([lead['source_id'] for lead in second],
+                         [str(7000000 + i) for i in range(150, 300)])
+        self.assertEqual(self.make_scraper(cache_dir).run(max_pages=3), [])
+
+    def test_streaming_to_sink_keeps_no_leads(self):
+        scraper = self.make_scraper(max_concurrency=4)
+        with LeadSink(os.path.join(tempfile.mkdtemp(), 'leads.jsonl')) as sink:
+            scraper.lead_sink = sink
+            self.assertEqual(scraper.run(max_pages=1, max_listings=20), [])
+        self.assertEqual(sink.counts, {'craigslist_fsbo': 20})
+
+class SlowScraper(ScraperBase):
+    """Returns a few leads slowly, to run alongside Craigslist"""
+
+    def run(self):
+        leads = []
+        for i in range(3):
+            time.sleep(0.2)
+            leads.append({'source': 'slow', 'source_id': f"slow-{i}", 'urgency': i})
+        return leads
+
+    def normalize_data(self, raw_data):
+        return raw_data
+
+class TestFSBOScraper(MockCraigslistTestCase):
+    def test_parallel_sources_stream_to_jsonl(self):
+        output_dir = tempfile.mkdtemp()
+        fsbo = FSBOScraper(output_dir=output_dir, config={'craigslist': {
+            'base_url': self.base_url,
+            'cache_dir': tempfile.mkdtemp(),
+            'config': {'http_cache_dir': tempfile.mkdtemp()},
+            'requests_per_second': 0
+        }})
+        slow = SlowScraper('slow', output_dir=tempfile.mkdtemp(), cache_dir=tempfile.mkdtemp())
+        fsbo.scrapers.append(slow)
+
+        counts = fsbo.run()
+        self.assertEqual(counts, {'craigslist_fsbo': 100, 'slow': 3})
+
+        # One compact line per lead, in place of the per-source lead files
+        self.assertEqual(sorted(path.name for path in fsbo.scrapers[0].output_dir.iterdir()),
+                         [fsbo.lead_file.with_suffix('.index.json').name, fsbo.lead_file.name])
+        streamed = list(fsbo.iter_leads())
+        self.assertEqual(len(streamed), 103)
+        self.assertEqual(sorted(lead['source_id'] for lead in streamed if lead['source'] == 'slow'),
+                         ['slow-0', 'slow-1', 'slow-2'])
+        self.assertEqual(list(slow.output_dir.iterdir()), [])
+
+        with open(fsbo.lead_file.with_suffix('.index.json')) as f:
+            index = json.load(f)
+        self.assertEqual(index['sources'], {'craigslist_fsbo': 100, 'slow': 3})
+        entry = dict(zip(index['fields'], index['entries'][-1]))
+        lead = LeadSink.read_lead(fsbo.lead_file, entry['offset'], entry['length'])
+        self.assertEqual(lead['source_id'], entry['source_id'])
+
+    def test_no_leads_leaves_no_files(self):
+        output_dir = tempfile.mkdtemp()
+        fsbo = FSBOScraper(output_dir=output_dir, use_craigslist=False)
+        self.assertEqual(fsbo.run(), {})
+        self.assertFalse(fsbo.lead_file.exists())
+        self.assertFalse(fsbo.lead_file.with_suffix('.index.json').exists())
+
+class TestDomainRateLimiter(unittest.TestCase):
+    def test_rate_per_domain(self):
+        limiter = DomainRateLimiter(requests_per_second=20)
+        start = time.monotonic()
+        threads = [
+            threading.Thread(target=limiter.wait, args=('https://maine.craigslist.org/search',))
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        limiter.wait('https://other.example.com/')
+        self.assertLess(time.monotonic() - start, 0.1)
+        for thread in threads:
+            thread.join()
+        # First request is free, the other five wait 1/20s each
+        self.assertGreaterEqual(time.monotonic() - start, 0.24)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+"""
+Tests for Brunswick SQLite storage
+"""
+import unittest
+from unittest.mock import patch
+import asyncio
+import tempfile
+import os
+import json
+
+from src.storage.brunswick_data_store import BrunswickDataStore
+from src.storage.brunswick_data_manager import BrunswickDataManager
+from src.storage import store_pipeline
+
+class TestBrunswickDataStoreBulk(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = BrunswickDataStore(
+            db_path=os.path.join(self.tmp_dir.name, 'brunswick.db'),
+            bulk_batch_size=2
+        )
+        self.properties = [
+            {'map_lot': '101-A-1', 'address': '12 Maine St', 'assessment': '$250,000'},
+            {'map_lot': '101-A-2', 'address': '14 Maine St', 'assessment': 310000},
+            {'map_lot': '102-B-7', 'address': '3 Bath Rd', 'zoning': 'HC1'}
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _rows(self, table):
+        with self.store.get_connection() as conn:
+            return [dict(row) for row in conn.execute(f"SELECT * FROM {table} ORDER BY id")]
+
+    def test_bulk_store_properties_matches_single_store(self):
+        results = self.store.bulk_store_properties(self.properties)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0].cleaned['assessment'], 250000.0)
+
+        rows = self._rows('properties')
+        self.assertEqual([row['map_lot'] for row in rows], ['101-A-1', '101-A-2', '102-B-7'])
+        self.assertEqual(json.loads(rows[2]['raw_data']), self.properties[2])
+
+    def test_bulk_store_upserts_on_conflict(self):
+        self.store.bulk_store_properties(self.properties)
+        self.store.bulk_store_properties([
+            {'map_lot': '101-A-1', 'address': '12 Maine St', 'assessment': 275000}
+        ])
+
+        rows = self._rows('properties')
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['assessment'], 275000.0)
+
+    def test_bulk_store_skips_invalid_items(self):
+        results = self.store.bulk_store_permits([
+            {'permit_number': ' bp-1 ', 'type': 'BUILDING', 'status': 'issued'},
+            {'permit_number': 'BP-2', 'status': 'pending'}  # missing type
+        ])
+
+        self.assertEqual(len(results), 1)
+        rows = self._rows('permits')
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['permit_number'], 'BP-1')
+        self.assertEqual(rows[0]['status'], 'APPROVED')
+
+    def test_bulk_connection_uses_wal(self):
+        with self.store.get_bulk_connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, 'wal')
+
+class TestBrunswickDataManagerBatchProcess(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)  # manager creates ./exports
+        self.store = BrunswickDataStore(db_path=os.path.join(self.tmp_dir.name, 'brunswick.db'))
+        self.manager = BrunswickDataManager(store=self.store)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def test_batch_process_pipeline(self):
+        businesses = [
+            {'name': f'Business {i} LLC', 'address': f'{i} Maine St', 'phone': '207-555-0100'}
+            for i in range(25)
+        ]
+        businesses.append({'address': '1 Bath Rd'})  # no name, skipped by writer
+
+        results = asyncio.run(self.manager.batch_process(
+            businesses, 'business', batch_size=4, max_workers=2,
+            queue_depth=2, write_batch_size=10
+        ))
+
+        self.assertEqual(len(results), 25)
+        self.assertEqual(results[0].cleaned['phone'], '+12075550100')
+        with self.store.get_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM businesses").fetchone()[0]
+        self.assertEqual(count, 25)
+
+        stats = self.manager.last_pipeline_stats
+        self.assertEqual(stats.read.items, 26)
+        self.assertEqual(stats.clean.items, 26)
+        self.assertEqual(stats.write.items, 25)
+        self.assertEqual(stats.write.errors, 1)
+        self.assertEqual(stats.write.batches, 3)
+
+    def test_clean_workers_do_not_open_the_database(self):
+        business = {'name': ' Maine Coast LLC ', 'address': '12 Maine St', 'phone': '207-555-0100'}
+        with patch('sqlite3.connect') as connect:
+            store_pipeline._init_clean_worker()
+            result = store_pipeline._clean_items('business', [business])[0]
+        connect.assert_not_called()
+        self.assertEqual(result.cleaned, self.store.cleaner('business')(business).cleaned)
+
+class TestBrunswickDataManagerSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        self.store = BrunswickDataStore(db_path=os.path.join(self.tmp_dir.name, 'brunswick.db'))
+        self.store.bulk_store_properties([
+            {'map_lot': f'{100 + i}-A-{i}', 'address': f'{i} Maine St',
+             'assessment': 100000 + i * 10000, 'zoning': ['TC1', 'HC1', 'R1'][i % 3]}
+            for i in range(20)
+        ])
+        self.manager = BrunswickDataManager(store=self.store)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def test_in_and_between_operators(self):
+        results = self.manager.search(
+            {'zoning': {'in': ['TC1', 'R1']}, 'assessment': {'between': [150000, 250000]}},
+            'properties',
+            sort_by='assessment'
+        )
+        self.assertEqual(
+            [row['assessment'] for row in results],
+            [150000.0, 160000.0, 180000.0, 190000.0, 210000.0, 220000.0, 240000.0, 250000.0]
+        )
+        self.assertNotIn('_rowid', results[0])
+
+    def test_rejects_unknown_columns(self):
+        with self.assertRaises(ValueError):
+            self.manager.search({'zoning = zoning; --': 'x'}, 'properties')
+
+    def test_keyset_pagination_covers_all_rows(self):
+        seen = []
+        cursor = None
+        while True:
+            page = self.manager.search_page(
+                {}, 'properties', limit=6, sort_by='zoning', after=cursor
+            )
+            seen.extend(row['map_lot'] for row in page['results'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+        offset_rows = self.manager.search({}, 'properties', sort_by='zoning')
+        self.assertEqual(seen, [row['map_lot'] for row in offset_rows])
+        self.assertEqual(len(set(seen)), 20)
+
+    def test_keyset_pagination_over_nullable_column(self):
+        with self.store.get_connection() as conn:
+            conn.execute("UPDATE properties SET assessment = NULL WHERE rowid % 5 = 0")
+            conn.commit()
+
+        for sort_order in ('ASC', 'DESC'):
+            seen = []
+            cursor = None
+            while True:
+                page = self.manager.search_page(
+                    {'zoning': {'neq': 'R1'}}, 'properties', limit=3,
+                    sort_by='assessment', sort_order=sort_order, after=cursor
+                )
+                seen.extend(row['map_lot'] for row in page['results'])
+                cursor = page['next_cursor']
+                if cursor is None:
+                    break
+
+            offset_rows = self.manager.search(
+                {'zoning': {'neq': 'R1'}}, 'properties', sort_by='assessment', sort_order=sort_order
+            )
+            self.assertEqual(seen, [row['map_lot'] for row in offset_rows])
+            self.assertEqual(len(seen), 14)
+
+    def test_default_and_observed_indexes(self):
+        indexes = self.manager.index_manager.existing_indexes('properties')
+        self.assertIn(('zoning',), indexes)
+        self.assertIn(('assessment',), indexes)
+
+        for _ in range(3):
+            self.manager.search({'zoning': 'TC1', 'assessment': {'gte': 150000}}, 'properties')
+        self.assertIn(('zoning', 'assessment'), indexes)
+
+        with self.store.get_connection() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM properties WHERE zoning = ? AND assessment >= ?",
+                ['TC1', 150000]
+            ).fetchall()
+        self.assertIn('idx_properties_zoning_assessment', ' '.join(row[3] for row in plan))
+
+if __name__ == '__main__':
+    unittest.main()